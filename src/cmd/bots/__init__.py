@@ -4,6 +4,7 @@ from src.common.register import Register
 
 register_ai_room_bots = Register("ai-room-bots")
 register_ai_fastapi_ws_bots = Register("fastapi-ws-bots")
+register_ai_fastapi_webrtc_bots = Register("fastapi-webrtc-bots")
 
 
 class BotInfo(BaseModel):
@@ -236,3 +237,12 @@ def import_fastapi_websocket_bots(bot_name: str = "DummyBot"):
         return True
 
     return False
+
+
+def import_fastapi_webrtc_bots(bot_name: str = "DummyBot"):
+    if "FastapiWebRTCBot" in bot_name:
+        from . import fastapi_webrtc_bot
+
+        return True
+
+    return False
@@ -6,6 +6,7 @@ import uuid
 
 from apipeline.frames.control_frames import EndFrame
 from apipeline.pipeline.task import PipelineTask
+from apipeline.processors.frame_processor import FrameProcessor
 
 from src.processors.omni.base import VisionVoiceProcessorBase
 from src.processors.voice.base import VoiceProcessorBase
@@ -144,7 +145,40 @@ class AIBot(IBot):
                 logging.info("use default asr engine processor")
                 asr = ASREnvInit.initASREngine()
                 self._bot_config.asr = ASRConfig(tag=asr.SELECTED_TAG, args=asr.get_args_dict())
-            asr_processor = ASRProcessor(asr=asr, session=self.session)
+            language_tracker = None
+            if self._bot_config.asr.language_tracker is not None:
+                from src.modules.speech.asr.language_tracker import ASRLanguageTracker
+
+                language_tracker = ASRLanguageTracker(**self._bot_config.asr.language_tracker)
+            segment_gate = None
+            if self._bot_config.asr.segment_gate is not None:
+                from src.modules.speech.hallucination.segment_gate import SpeechSegmentGate
+
+                gate_args = dict(self._bot_config.asr.segment_gate)
+                use_vad = gate_args.pop("use_vad", True)
+                vad_tag = gate_args.pop("vad_tag", None)
+                vad_args = gate_args.pop("vad_args", None) or {}
+                gate_vad_analyzer = None
+                if use_vad:
+                    # the vad analyzer is stateful, don't share it with the transport vad
+                    if vad_tag:
+                        gate_vad_analyzer = VADAnalyzerEnvInit.getEngine(vad_tag, **vad_args)
+                    else:
+                        gate_vad_analyzer = self.get_vad_analyzer()
+                segment_gate = SpeechSegmentGate(vad_analyzer=gate_vad_analyzer, **gate_args)
+            hallucination = None
+            if self._bot_config.asr.hallucination is not None:
+                from src.modules.speech.hallucination.asr_filter import ASRHallucinationFilter
+
+                hallucination = ASRHallucinationFilter(**self._bot_config.asr.hallucination)
+            asr_processor = ASRProcessor(
+                asr=asr,
+                session=self.session,
+                language_tracker=language_tracker,
+                latency_profile=self._bot_config.asr.latency_profile,
+                segment_gate=segment_gate,
+                hallucination=hallucination,
+            )
         return asr_processor
 
     def get_vision_llm_processor(self, llm_config: LLMConfig | None = None) -> LLMProcessor:
@@ -169,7 +203,9 @@ class AIBot(IBot):
         """
         if not llm:
             llm = self._bot_config.llm
-        if llm and llm.tag and "google" in llm.tag:
+        if llm and llm.backends:
+            llm_processor = self.get_llm_router_processor(llm)
+        elif llm and llm.tag and "google" in llm.tag:
             llm_processor = self.get_google_llm_processor(llm)
         elif llm and llm.tag and "litellm" in llm.tag:
             llm_processor = self.get_litellm_processor(llm)
@@ -179,6 +215,19 @@ class AIBot(IBot):
             llm_processor = self.get_google_llm_processor(llm)
         return llm_processor
 
+    def get_llm_router_processor(self, llm: LLMConfig) -> LLMProcessor:
+        """
+        route over the openai compatible backends, e.g.:
+        {"backends": [{"base_url": "https://api.groq.com/openai/v1", "model": "llama-3.1-70b-versatile"},
+        {"base_url": "https://api.together.xyz/v1", "model": "meta-llama/Llama-3.3-70B-Instruct-Turbo"}]}
+        """
+        from src.processors.llm.router_llm_processor import LLMRouterProcessor
+
+        backends = [self.get_openai_llm_processor(backend) for backend in llm.backends]
+        llm_processor = LLMRouterProcessor(backends=backends, router_args=llm.router)
+        self.set_llm_context_args(llm_processor, llm)
+        return llm_processor
+
     def get_openai_llm_processor(self, llm: LLMConfig | None = None) -> LLMProcessor:
         from src.processors.llm.openai_llm_processor import (
             OpenAILLMProcessor,
@@ -198,6 +247,7 @@ class AIBot(IBot):
                     base_url=llm.base_url,
                     api_key=api_key,
                 )
+                self.set_llm_context_args(llm_processor, llm)
                 return llm_processor
             elif "together" in llm.base_url:
                 # https://docs.together.ai/docs/chat-models
@@ -212,6 +262,7 @@ class AIBot(IBot):
             base_url=llm.base_url,
             api_key=api_key,
         )
+        self.set_llm_context_args(llm_processor, llm)
         return llm_processor
 
     def get_google_llm_processor(self, llm: LLMConfig) -> LLMProcessor:
@@ -229,14 +280,43 @@ class AIBot(IBot):
                 model=model,
             )
 
+        self.set_llm_context_args(llm_processor, llm)
         return llm_processor
 
     def get_litellm_processor(self, llm: LLMConfig) -> LLMProcessor:
         from src.processors.llm.litellm_processor import LiteLLMProcessor
 
         llm_processor = LiteLLMProcessor(model=llm.model, set_verbose=False)
+        self.set_llm_context_args(llm_processor, llm)
         return llm_processor
 
+    def set_llm_context_args(self, llm_processor: LLMProcessor, llm: LLMConfig | None):
+        """
+        - token budget for the llm context messages, e.g.: {"max_tokens": 4096, "strategy": "summarize"}
+        - image attachments, e.g.: {"max_side": 768, "format": "WEBP", "max_image_turns": 1}
+        - function calls, e.g.: {"timeout_s": 10, "filler_texts": ["Let me check."]}
+        - speculative generation on interim transcripts, e.g.: {"max_distance": 0.1}
+        - prompt cache of the static prefix, e.g.: {"cache_control": "on"}
+        """
+        if not llm:
+            return
+        if llm.context_window:
+            from src.processors.aggregators.llm_context_window import LLMContextWindow
+
+            llm_processor.set_context_window(LLMContextWindow(**llm.context_window))
+        if llm.image_store:
+            from src.processors.aggregators.image_attachment_store import ImageAttachmentStore
+
+            llm_processor.set_image_store(ImageAttachmentStore(**llm.image_store))
+        if llm.function_call:
+            llm_processor.set_function_call_args(**llm.function_call)
+        if llm.prompt_cache is not None:
+            from src.processors.aggregators.prompt_prefix_cache import PromptPrefixCache
+
+            llm_processor.set_prompt_cache(PromptPrefixCache(**llm.prompt_cache))
+        if llm.speculative is not None:
+            llm_processor.set_speculative_args(**llm.speculative)
+
     def get_llm_processor(self, llm: LLMConfig | None = None) -> LLMProcessor:
         if not llm:
             llm = self._bot_config.llm
@@ -287,6 +367,11 @@ class AIBot(IBot):
 
         return processor
 
+    def get_video_frame_gate_processor(self, gate_args: dict | None = None) -> FrameProcessor:
+        from src.processors.video_frame_gate_processor import VideoFrameGateProcessor
+
+        return VideoFrameGateProcessor(gate_args=gate_args)
+
     def get_vision_ocr_processor(self) -> AIProcessor:
         from src.processors.vision.ocr_processor import OCRProcessor
 
@@ -0,0 +1,45 @@
+import logging
+
+from apipeline.frames.control_frames import EndFrame
+
+from src.cmd.bots.base import AIBot
+from src.services.webrtc_client import WebRTCTransportClient
+from src.transports.webrtc import WebRTCTransport
+from src.types.network.webrtc import WebRTCParams
+
+
+class AIFastapiWebRTCBot(AIBot):
+    def __init__(
+        self,
+        webrtc_client: WebRTCTransportClient | None = None,
+        webrtc_params: WebRTCParams | None = None,
+        **args,
+    ) -> None:
+        super().__init__(**args)
+        self._webrtc_client = webrtc_client
+        # the peer connection params (ice servers, data channel label) of the client
+        self._webrtc_params = webrtc_params or WebRTCParams()
+
+    def set_webrtc_client(
+        self, webrtc_client: WebRTCTransportClient, webrtc_params: WebRTCParams | None = None
+    ):
+        self._webrtc_client = webrtc_client
+        if webrtc_params is not None:
+            self._webrtc_params = webrtc_params
+
+    async def on_client_connected(
+        self,
+        transport: WebRTCTransport,
+        peer_id: str,
+    ):
+        logging.info(f"on_client_connected peer:{peer_id}")
+        self.session.set_client_id(client_id=peer_id)
+
+    async def on_client_disconnected(
+        self,
+        transport: WebRTCTransport,
+        peer_id: str,
+    ):
+        logging.info(f"on_client_disconnected peer:{peer_id}")
+        if self.task is not None:
+            await self.task.queue_frame(EndFrame())
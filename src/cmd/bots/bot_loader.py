@@ -5,11 +5,20 @@ import os
 import pathlib
 from typing import Literal
 
-from src.cmd.bots import import_bots, import_fastapi_websocket_bots, import_websocket_bots
+from src.cmd.bots import (
+    import_bots,
+    import_fastapi_webrtc_bots,
+    import_fastapi_websocket_bots,
+    import_websocket_bots,
+)
 from src.cmd.bots.base import AIBot
 from src.common.types import BotRunArgs
 from src.cmd.bots.run import RunBotInfo
-from src.cmd.bots import register_ai_fastapi_ws_bots, register_ai_room_bots
+from src.cmd.bots import (
+    register_ai_fastapi_webrtc_bots,
+    register_ai_fastapi_ws_bots,
+    register_ai_room_bots,
+)
 
 
 """
@@ -39,7 +48,9 @@ class BotLoader:
     async def load_bot(
         local_file_path: str | pathlib.PosixPath,
         is_re_init=False,
-        bot_type: Literal["room_bot", "ws_bot", "fastapi_ws_bot"] = "room_bot",
+        bot_type: Literal[
+            "room_bot", "ws_bot", "fastapi_ws_bot", "fastapi_webrtc_bot"
+        ] = "room_bot",
     ) -> AIBot:
         """
         load once from str or pathlib.PosixPath(for container volume)
@@ -107,6 +118,19 @@ class BotLoader:
                     run_bot = register_ai_fastapi_ws_bots[bot_info.chat_bot_name](
                         websocket=None, **vars(bot_args)
                     )
+                case "fastapi_webrtc_bot":
+                    if import_fastapi_webrtc_bots(bot_info.chat_bot_name) is False:
+                        detail = f"un import bot: {bot_info.chat_bot_name}"
+                        raise Exception(detail)
+
+                    logging.info(f"register bots: {register_ai_fastapi_webrtc_bots.items()}")
+                    if bot_info.chat_bot_name not in register_ai_fastapi_webrtc_bots:
+                        detail = f"bot {bot_info.chat_bot_name} don't exist"
+                        raise Exception(detail)
+
+                    run_bot = register_ai_fastapi_webrtc_bots[bot_info.chat_bot_name](
+                        webrtc_client=None, **vars(bot_args)
+                    )
             BotLoader.run_bots[bot_info.chat_bot_name] = run_bot
 
             return run_bot
@@ -0,0 +1,381 @@
+import argparse
+import asyncio
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import time
+import wave
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from src.common.logger import Logger
+from src.common.types import INT16_MAX_ABS_VALUE, RATE, SessionCtx
+
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+AUDIO_FILE_EXTENSIONS = {".wav", ".mp3", ".mp4", ".m4a", ".flac", ".ogg", ".aac", ".webm"}
+
+
+def list_audio_files(input_path: str) -> list[str]:
+    """
+    input: audio files directory, or manifest file
+    - .jsonl: one {"audio": path} per line
+    - other: one audio path per line
+    """
+    if os.path.isdir(input_path):
+        files = glob.glob(os.path.join(input_path, "**", "*"), recursive=True)
+        return sorted(f for f in files if os.path.splitext(f)[1].lower() in AUDIO_FILE_EXTENSIONS)
+
+    files = []
+    with open(input_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if input_path.endswith(".jsonl"):
+                line = json.loads(line)["audio"]
+            files.append(line)
+    return files
+
+
+def load_audio(audio_file: str, sample_rate: int = RATE) -> bytes:
+    """
+    decode audio file to 16-bit mono pcm with sample rate
+    """
+    with open(audio_file, "rb") as f:
+        is_wav = f.read(4) == b"RIFF"
+    if is_wav:
+        with wave.open(audio_file, "rb") as wf:
+            if (
+                wf.getframerate() == sample_rate
+                and wf.getnchannels() == 1
+                and wf.getsampwidth() == 2
+            ):
+                return wf.readframes(wf.getnframes())
+
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(audio_file)
+    audio = audio.set_frame_rate(sample_rate).set_channels(1).set_sample_width(2)
+    return audio.raw_data
+
+
+def split_at_silence(
+    pcm: bytes,
+    sample_rate: int = RATE,
+    max_chunk_secs: float = 30.0,
+    search_secs: float = 5.0,
+    frame_ms: int = 30,
+) -> list[tuple[int, int]]:
+    """
+    split long audio into chunks (start_sample, end_sample) no longer than max_chunk_secs,
+    cut at the quietest frame (vad boundary) in the last search_secs of each chunk
+    """
+    samples = np.frombuffer(pcm, dtype=np.int16)
+    num_samples = len(samples)
+    max_chunk = int(max_chunk_secs * sample_rate)
+    if num_samples <= max_chunk:
+        return [(0, num_samples)] if num_samples > 0 else []
+
+    frame_len = int(sample_rate * frame_ms / 1000)
+    num_frames = num_samples // frame_len
+    frames = samples[: num_frames * frame_len].reshape(num_frames, frame_len)
+    energy = np.mean((frames.astype(np.float32) / INT16_MAX_ABS_VALUE) ** 2, axis=1)
+
+    search_frames = max(1, int(search_secs * sample_rate / frame_len))
+    chunks = []
+    start = 0
+    while num_samples - start > max_chunk:
+        end_frame = (start + max_chunk) // frame_len
+        begin_frame = max(start // frame_len + 1, end_frame - search_frames)
+        cut_frame = begin_frame + int(np.argmin(energy[begin_frame:end_frame]))
+        # cut at the middle of the quietest frame
+        end = cut_frame * frame_len + frame_len // 2
+        chunks.append((start, end))
+        start = end
+    chunks.append((start, num_samples))
+    return chunks
+
+
+def load_done(output_path: str) -> tuple[set, set]:
+    """
+    return done (audio, chunk) set and done audio files set from jsonl output
+    """
+    done_chunks = set()
+    done_files = set()
+    if not os.path.exists(output_path):
+        return done_chunks, done_files
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # the last line of an interrupted run
+                continue
+            if record.get("done"):
+                done_files.add(record["audio"])
+            else:
+                done_chunks.add((record["audio"], record["chunk"]))
+    return done_chunks, done_files
+
+
+def load_transcripts(output_path: str) -> dict[str, str]:
+    """
+    return audio file -> transcript text (chunks joined in order) from jsonl output
+    """
+    chunks: dict[str, dict[int, str]] = {}
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("done"):
+                continue
+            chunks.setdefault(record["audio"], {})[record["chunk"]] = record["text"]
+    return {
+        audio: " ".join(texts[i].strip() for i in sorted(texts)) for audio, texts in chunks.items()
+    }
+
+
+# asr engine loaded once per worker process
+_worker_asr = None
+_worker_session = None
+
+
+def init_worker(asr_tag: str, asr_args: dict):
+    global _worker_asr, _worker_session
+    from src.modules.speech.asr import ASREnvInit
+    from src.common.session import Session
+
+    Logger.init(os.getenv("LOG_LEVEL", "info").upper(), is_file=False)
+    _worker_asr = ASREnvInit.initASREngine(asr_tag, **asr_args)
+    _worker_session = Session(**SessionCtx(f"batch_transcribe_{os.getpid()}").__dict__)
+
+
+def transcribe_chunk(audio_file: str, chunk: int, start_s: float, end_s: float, pcm: bytes):
+    _worker_asr.set_audio_data(pcm)
+    res = asyncio.run(_worker_asr.transcribe(_worker_session))
+    return {
+        "audio": audio_file,
+        "chunk": chunk,
+        "start": round(start_s, 3),
+        "end": round(end_s, 3),
+        "language": res.get("language"),
+        "text": res.get("text", ""),
+    }
+
+
+class BatchTranscriber:
+    """
+    batch transcribe audio files with a process pool of asr workers (each loads the model once),
+    long files are chunked at vad boundaries, results are appended to a resumable jsonl output:
+    - {"audio", "chunk", "start", "end", "language", "text"} per chunk
+    - {"audio", "done": true, "duration"} when all chunks of the audio file are done
+    a failed chunk is logged, its audio file is left not done, retried by the resumed run
+    """
+
+    def __init__(
+        self,
+        asr_tag: str,
+        asr_args: dict,
+        output_path: str,
+        workers: int = 1,
+        max_chunk_secs: float = 30.0,
+        sample_rate: int = RATE,
+        mp_start_method: str = "spawn",
+    ) -> None:
+        self._asr_tag = asr_tag
+        self._asr_args = asr_args
+        self._output_path = output_path
+        # 0: transcribe in the current process
+        self._workers = workers
+        self._max_chunk_secs = max_chunk_secs
+        self._sample_rate = sample_rate
+        self._mp_start_method = mp_start_method
+
+        self._audio_secs = 0.0
+        self._chunks = 0
+        self._files = 0
+        self._failed_chunks = 0
+        self._start_time = 0.0
+
+    @property
+    def stats(self) -> dict:
+        wall_secs = time.perf_counter() - self._start_time if self._start_time else 0.0
+        return {
+            "files": self._files,
+            "chunks": self._chunks,
+            "failed_chunks": self._failed_chunks,
+            "audio_secs": self._audio_secs,
+            "wall_secs": wall_secs,
+            "audio_hours_per_wall_hour": self._audio_secs / wall_secs if wall_secs else 0.0,
+        }
+
+    def _iter_chunks(self, audio_files: list[str], done_chunks: set, done_files: set):
+        for audio_file in audio_files:
+            if audio_file in done_files:
+                logging.info(f"{audio_file} is done, skip")
+                continue
+            try:
+                pcm = load_audio(audio_file, self._sample_rate)
+            except Exception as e:
+                logging.exception(f"load {audio_file} Exception: {e}")
+                continue
+            duration = len(pcm) / 2 / self._sample_rate
+            spans = split_at_silence(pcm, self._sample_rate, self._max_chunk_secs)
+            todo = [i for i in range(len(spans)) if (audio_file, i) not in done_chunks]
+            yield audio_file, duration, None, len(todo)
+            for i in todo:
+                start, end = spans[i]
+                yield (
+                    audio_file,
+                    duration,
+                    (
+                        i,
+                        start / self._sample_rate,
+                        end / self._sample_rate,
+                        pcm[start * 2 : end * 2],
+                    ),
+                    len(todo),
+                )
+
+    def run(self, audio_files: list[str]) -> dict:
+        done_chunks, done_files = load_done(self._output_path)
+        os.makedirs(os.path.dirname(os.path.abspath(self._output_path)), exist_ok=True)
+        self._audio_secs = 0.0
+        self._chunks = 0
+        self._files = 0
+        self._failed_chunks = 0
+        self._start_time = time.perf_counter()
+
+        # audio file -> (remaining chunks, duration)
+        remaining: dict[str, list] = {}
+        with open(self._output_path, "a+", encoding="utf-8") as out:
+            # terminate the partial last line of an interrupted run
+            if out.tell() > 0:
+                out.seek(out.tell() - 1)
+                if out.read(1) != "\n":
+                    out.write("\n")
+
+            def write(record: dict):
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+
+            def on_result(record: dict):
+                write(record)
+                self._chunks += 1
+                self._audio_secs += record["end"] - record["start"]
+                remaining[record["audio"]][0] -= 1
+                if remaining[record["audio"]][0] == 0:
+                    self._files += 1
+                    write(
+                        {
+                            "audio": record["audio"],
+                            "done": True,
+                            "duration": remaining[record["audio"]][1],
+                        }
+                    )
+                    logging.info(f"{record['audio']} done, stats: {self.stats}")
+
+            def on_error(audio_file: str, chunk: int, e: BaseException):
+                # the failed chunk isn't counted as done, the audio file is left not done
+                logging.error(f"transcribe {audio_file} chunk {chunk} Exception: {e}")
+                self._failed_chunks += 1
+
+            def on_file(audio_file: str, duration: float, todo: int):
+                remaining[audio_file] = [todo, duration]
+                if todo == 0:
+                    self._files += 1
+                    write({"audio": audio_file, "done": True, "duration": duration})
+
+            chunks = self._iter_chunks(audio_files, done_chunks, done_files)
+            if self._workers <= 0:
+                init_worker(self._asr_tag, self._asr_args)
+                for audio_file, duration, chunk, todo in chunks:
+                    if chunk is None:
+                        on_file(audio_file, duration, todo)
+                        continue
+                    try:
+                        record = transcribe_chunk(audio_file, *chunk)
+                    except Exception as e:
+                        on_error(audio_file, chunk[0], e)
+                        continue
+                    on_result(record)
+                return self.stats
+
+            ctx = multiprocessing.get_context(self._mp_start_method)
+            with ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=ctx,
+                initializer=init_worker,
+                initargs=(self._asr_tag, self._asr_args),
+            ) as executor:
+                # future -> (audio file, chunk)
+                futures: dict[Future, tuple[str, int]] = {}
+
+                def on_done(done: set[Future]):
+                    for future in done:
+                        audio_file, chunk = futures.pop(future)
+                        try:
+                            record = future.result()
+                        except Exception as e:
+                            on_error(audio_file, chunk, e)
+                            continue
+                        on_result(record)
+
+                # bounded in-flight chunks, don't decode all files into memory
+                pending: set[Future] = set()
+                for audio_file, duration, chunk, todo in chunks:
+                    if chunk is None:
+                        on_file(audio_file, duration, todo)
+                        continue
+                    future = executor.submit(transcribe_chunk, audio_file, *chunk)
+                    futures[future] = (audio_file, chunk[0])
+                    pending.add(future)
+                    if len(pending) >= self._workers * 2:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        on_done(done)
+                on_done(wait(pending).done)
+
+        return self.stats
+
+
+if __name__ == "__main__":
+    """
+    python -m src.cmd.bots.rag.data_process.batch_audio_transcribe \
+        -i videos/AndrejKarpathy -o videos/AndrejKarpathy/transcripts.jsonl \
+        --asr_tag whisper_faster_asr \
+        --asr_args '{"model_name_or_path": "base", "language": "en"}' \
+        --workers 2
+    """
+    Logger.init(os.getenv("LOG_LEVEL", "info").upper(), is_file=False)
+
+    parser = argparse.ArgumentParser(description="Batch audio transcribe")
+    parser.add_argument("-i", type=str, required=True, help="audio files dir or manifest file")
+    parser.add_argument("-o", type=str, required=True, help="output jsonl file (resumable)")
+    parser.add_argument("--asr_tag", type=str, default="whisper_faster_asr", help="asr engine tag")
+    parser.add_argument("--asr_args", type=str, default="{}", help="asr engine args json")
+    parser.add_argument("--workers", type=int, default=1, help="asr worker processes")
+    parser.add_argument("--max_chunk_secs", type=float, default=30.0, help="max chunk secs")
+    args = parser.parse_args()
+
+    audio_files = list_audio_files(args.i)
+    logging.info(f"batch transcribe {len(audio_files)} audio files")
+    transcriber = BatchTranscriber(
+        args.asr_tag,
+        json.loads(args.asr_args),
+        args.o,
+        workers=args.workers,
+        max_chunk_secs=args.max_chunk_secs,
+    )
+    stats = transcriber.run(audio_files)
+    logging.info(
+        f"done, throughput: {stats['audio_hours_per_wall_hour']:.2f} audio hours per wall hour,"
+        f" stats: {stats}"
+    )
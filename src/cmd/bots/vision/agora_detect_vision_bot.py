@@ -45,14 +45,17 @@ class AgoraDetectVisionBot(AgoraChannelBot):
                 f"当未检测到条件对象时，说离开词。"
             )
 
-        pipeline = Pipeline(
-            [
-                transport.input_processor(),
-                detect_processor,
-                tts_processor,
-                # FrameLogger(include_frame_types=[UserImageRawFrame]),
-                transport.output_processor(),
-            ]
-        )
+        processors = [transport.input_processor()]
+        if self._bot_config.vision_detector.frame_gate is not None:
+            processors.append(
+                self.get_video_frame_gate_processor(self._bot_config.vision_detector.frame_gate)
+            )
+        processors += [
+            detect_processor,
+            tts_processor,
+            # FrameLogger(include_frame_types=[UserImageRawFrame]),
+            transport.output_processor(),
+        ]
+        pipeline = Pipeline(processors)
         self.task = PipelineTask(pipeline)
         await PipelineRunner().run(self.task)
@@ -189,7 +189,7 @@ class DailyChatToolsVisionBot(DailyRoomBot):
 
         # register function
         logging.info(f"register tool functions: {register_tool_funtions.items()}")
-        llm_processor.register_function("get_weather", self.get_weather)
+        llm_processor.register_function("get_weather", self.get_weather, start_fields=["location"])
         self.get_weather_call_cn = 0
         llm_processor.register_function("describe_image", self.describe_image)
         self.describe_image_call_cn = 0
@@ -36,15 +36,18 @@ class DailyDetectVisionBot(DailyRoomBot):
         transport.add_event_handler("on_participant_left", self.on_participant_left)
         transport.add_event_handler("on_call_state_updated", self.on_call_state_updated)
 
-        pipeline = Pipeline(
-            [
-                transport.input_processor(),
-                detect_processor,
-                self.tts_processor,
-                # FrameLogger(include_frame_types=[UserImageRawFrame]),
-                transport.output_processor(),
-            ]
-        )
+        processors = [transport.input_processor()]
+        if self._bot_config.vision_detector.frame_gate is not None:
+            processors.append(
+                self.get_video_frame_gate_processor(self._bot_config.vision_detector.frame_gate)
+            )
+        processors += [
+            detect_processor,
+            self.tts_processor,
+            # FrameLogger(include_frame_types=[UserImageRawFrame]),
+            transport.output_processor(),
+        ]
+        pipeline = Pipeline(processors)
         self.task = PipelineTask(pipeline)
         await PipelineRunner().run(self.task)
 
@@ -120,7 +120,7 @@ class LivekitDescribeVisionToolsBot(LivekitRoomBot):
         llm_assistant_ctx_aggr = OpenAIAssistantContextAggregator(llm_user_ctx_aggr)
 
         llm_processor = self.get_remote_llm_processor()
-        llm_processor.register_function("get_weather", self.get_weather)
+        llm_processor.register_function("get_weather", self.get_weather, start_fields=["location"])
         llm_processor.register_function("describe_image", self.describe_image)
         self.get_weather_call_cn = 0
         self.describe_image_cn = 0
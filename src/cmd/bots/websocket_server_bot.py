@@ -58,7 +58,9 @@ class WebsocketServerBot(AIRoomBot):
         messages = []
         if self._bot_config.llm.messages:
             messages = self._bot_config.llm.messages
-        user_response = LLMUserResponseAggregator(messages)
+        user_response = LLMUserResponseAggregator(
+            messages, speculative_args=self._bot_config.llm.speculative
+        )
         assistant_response = LLMAssistantResponseAggregator(messages)
 
         self.task = PipelineTask(
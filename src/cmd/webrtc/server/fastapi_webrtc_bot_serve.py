@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import os
+import argparse
+
+from pydantic import BaseModel
+from dotenv import load_dotenv
+
+from src.cmd.bots.bot_loader import BotLoader
+from src.cmd.bots.base_fastapi_webrtc import AIFastapiWebRTCBot
+from src.common.types import CONFIG_DIR
+from src.common.const import *
+from src.common.logger import Logger
+from src.cmd.http.server.fastapi_daily_bot_serve import app, ngrok_proxy
+from src.services.webrtc_client import RTCSessionDescription, WebRTCTransportClient
+from src.types.network.webrtc import WebRTCParams
+
+
+load_dotenv(override=True)
+Logger.init(os.getenv("LOG_LEVEL", "info").upper(), is_file=False, is_console=True)
+
+# running peer bot tasks, keep the reference until done
+peer_bot_tasks: set[asyncio.Task] = set()
+
+
+class SessionDescription(BaseModel):
+    sdp: str
+    type: str
+
+
+@app.post("/offer")
+async def offer_endpoint(offer: SessionDescription) -> SessionDescription:
+    """
+    sdp offer/answer: answer the client peer offer, then run a bot on the peer connection
+    (no trickle ice, the answer has all the host candidates)
+    """
+    run_bot: AIFastapiWebRTCBot = await BotLoader.load_bot(
+        config.f, is_re_init=True, bot_type="fastapi_webrtc_bot"
+    )
+
+    params = WebRTCParams(
+        ice_servers=[url for url in os.getenv("WEBRTC_ICE_SERVERS", "").split(",") if url],
+        data_channel_label=os.getenv("WEBRTC_DATA_CHANNEL_LABEL", "rtvi"),
+    )
+    client = WebRTCTransportClient(
+        ice_servers=params.ice_servers, data_channel_label=params.data_channel_label
+    )
+    answer = await client.answer(RTCSessionDescription(sdp=offer.sdp, type=offer.type))
+    run_bot.set_webrtc_client(client, params)
+    logging.info(f"answer peer: {client.peer_id}")
+
+    task = asyncio.get_running_loop().create_task(run_bot.try_run())
+    peer_bot_tasks.add(task)
+    task.add_done_callback(peer_bot_tasks.discard)
+
+    return SessionDescription(sdp=answer.sdp, type=answer.type)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    default_host = os.getenv("HOST", "0.0.0.0")
+    default_port = int(os.getenv("FAST_API_PORT", "4321"))
+
+    parser = argparse.ArgumentParser(description="Fastapi WebRTC Bot Runner")
+    parser.add_argument("--host", type=str, default=default_host, help="Host address")
+    parser.add_argument("--port", type=int, default=default_port, help="Port number")
+    parser.add_argument("--ngrok", action="store_true", help="use ngrok proxy")
+    parser.add_argument(
+        "-f",
+        type=str,
+        default=os.path.join(CONFIG_DIR, "bots/dummy_bot.json"),
+        help="Bot configuration json file",
+    )
+
+    config = parser.parse_args()
+
+    if config.ngrok:
+        ngrok_proxy(config.port)
+
+    # api docs: http://0.0.0.0:4321/docs
+    # NOTE: run the app object with the /offer endpoint registered in this module
+    uvicorn.run(app, host=config.host, port=config.port)
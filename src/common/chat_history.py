@@ -1,36 +1,197 @@
+import os
+from collections import deque
+from typing import Any, Callable, Iterator
+
+from src.common.interface import IChatHistoryStore
+from src.common.utils.text import estimate_tokens
+
+
+def count_message_tokens(message) -> int:
+    """
+    estimated tokens of a chat message: a prompt str or a {"role", "content"} dict,
+    only the text content parts are counted
+    """
+    if isinstance(message, str):
+        return estimate_tokens(message)
+    if not isinstance(message, dict):
+        return 0
+    content = message.get("content")
+    if isinstance(content, str):
+        return estimate_tokens(content)
+    if isinstance(content, dict):
+        content = [content]
+    tokens = 0
+    if isinstance(content, list):
+        for part in content:
+            if isinstance(part, str):
+                tokens += estimate_tokens(part)
+            elif isinstance(part, dict) and isinstance(part.get("text"), str):
+                tokens += estimate_tokens(part["text"])
+    return tokens
+
+
 class ChatHistory:
     """
     buffer the local chat hostory with limit size using to avoid OOM issues.
     - if size is None, no limit
     - if size <= 0, no history
-
-    !TODO: use kv store history like mem0. @weedge
+    - if max_tokens is set, evict the oldest messages over the token budget,
+      token count per message is counted once on append and cached
+    - store: optional write-behind persistence (e.g. SQLiteChatHistoryStore) with the session_id,
+      restore() loads the recent messages within the limits after a restart
     """
 
-    def __init__(self, size: int | None = None):
+    def __init__(
+        self,
+        size: int | None = None,
+        max_tokens: int | None = None,
+        token_counter: Callable[[Any], int] | None = None,
+        store: IChatHistoryStore | None = None,
+        session_id: str | None = None,
+    ):
         self.size = size
+        self.max_tokens = max_tokens
         self.init_chat_message = None
+        self._token_counter = token_counter or count_message_tokens
+        self._store = store
+        self.session_id = session_id
         # maxlen is necessary pair,
         # since a each new step we add an prompt and assitant answer
-        self.buffer = []
+        self.buffer: deque = deque()
+        # cached token count of each message in the buffer
+        self._tokens: deque[int] = deque()
+        self._total_tokens = 0
+
+    @classmethod
+    def from_env(cls, session_id: str | None = None) -> "ChatHistory":
+        """
+        session chat history bounded with the env config:
+        - SESSION_CHAT_HISTORY_SIZE: max chat rounds, default 10, empty no limit
+        - SESSION_CHAT_HISTORY_MAX_TOKENS: token budget, default 10240, empty no limit
+        - SESSION_CHAT_HISTORY_DB_PATH: sqlite store to persist the history, default none;
+          the recent messages of the session are restored
+        """
+        size = os.getenv("SESSION_CHAT_HISTORY_SIZE", "10")
+        max_tokens = os.getenv("SESSION_CHAT_HISTORY_MAX_TOKENS", "10240")
+        store = None
+        db_path = os.getenv("SESSION_CHAT_HISTORY_DB_PATH", "")
+        if db_path:
+            from src.common.chat_history_store import SQLiteChatHistoryStore
+
+            store = SQLiteChatHistoryStore.get_store(db_path)
+        history = cls(
+            size=int(size) if size else None,
+            max_tokens=int(max_tokens) if max_tokens else None,
+            store=store,
+            session_id=session_id,
+        )
+        history.restore()
+        return history
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.buffer)
+
+    def __getitem__(self, index):
+        return self.buffer[index]
+
+    def __repr__(self) -> str:
+        return repr(list(self.buffer))
+
+    @property
+    def total_tokens(self) -> int:
+        return self._total_tokens
 
     def append(self, item):
-        if self.size and self.size <= 0:
+        if self.size is not None and self.size <= 0:
             return
 
+        self._append(item)
+        if self._store is not None and self.session_id:
+            self._store.append(self.session_id, item)
+
+    def _append(self, item):
+        tokens = self._token_counter(item)
         self.buffer.append(item)
-        if self.size is None:
+        self._tokens.append(tokens)
+        self._total_tokens += tokens
+        self._evict()
+
+    def _evict(self):
+        if self.size is not None and len(self.buffer) >= 2 * (self.size + 1):
+            self.popleft()
+            self.popleft()
+        if self.max_tokens is None:
             return
+        # keep the latest message even if it is over the budget
+        while self._total_tokens > self.max_tokens and len(self.buffer) > 1:
+            self.popleft()
+            # don't start with the answer of the evicted prompt
+            while len(self.buffer) > 1 and self._is_reply(self.buffer[0]):
+                self.popleft()
+
+    @staticmethod
+    def _is_reply(message) -> bool:
+        return isinstance(message, dict) and message.get("role") in ("assistant", "tool")
+
+    def popleft(self):
+        self._total_tokens -= self._tokens.popleft()
+        return self.buffer.popleft()
+
+    def pop(self, index: int = -1):
+        """
+        list compatible pop, pop(0) is O(1)
+        """
+        if index == 0 or index == -len(self.buffer):
+            return self.popleft()
+        if index == -1 or index == len(self.buffer) - 1:
+            self._total_tokens -= self._tokens.pop()
+            return self.buffer.pop()
+        item = self.buffer[index]
+        self._total_tokens -= self._tokens[index]
+        del self.buffer[index]
+        del self._tokens[index]
+        return item
+
+    def clear(self):
+        self.buffer.clear()
+        self._tokens.clear()
+        self._total_tokens = 0
 
-        if len(self.buffer) == 2 * (self.size + 1):
-            self.buffer.pop(0)
-            self.buffer.pop(0)
+    def restore(self) -> int:
+        """
+        load the recent messages of the session from the store within the size/token limits,
+        return the number of restored messages
+        """
+        if self._store is None or not self.session_id:
+            return 0
+        self.clear()
+        if self.size is not None and self.size <= 0:
+            return 0
+        max_messages = 2 * self.size + 1 if self.size is not None else None
+        messages = []
+        tokens = 0
+        for message in self._store.iter_recent(self.session_id):
+            tokens += self._token_counter(message)
+            if messages and self.max_tokens is not None and tokens > self.max_tokens:
+                break
+            messages.append(message)
+            if max_messages is not None and len(messages) >= max_messages:
+                break
+        # don't start with the answer of a prompt which is not restored
+        while len(messages) > 1 and self._is_reply(messages[-1]):
+            messages.pop()
+        for message in reversed(messages):
+            self._append(message)
+        return len(self.buffer)
 
     def init(self, init_chat_message: dict):
         self.init_chat_message = init_chat_message
 
     def to_list(self) -> list:
         if self.init_chat_message:
-            return [self.init_chat_message] + self.buffer
+            return [self.init_chat_message] + list(self.buffer)
         else:
-            return self.buffer
+            return list(self.buffer)
@@ -0,0 +1,163 @@
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Iterator
+
+from src.common.interface import IChatHistoryStore
+
+_CLOSE = object()
+
+
+class SQLiteChatHistoryStore(IChatHistoryStore):
+    """
+    local sqlite chat history store with write-behind:
+    appends are queued and written by a background thread in batched transactions,
+    so the chat turn don't wait for the disk io.
+    - messages are json encoded, not json serializable values (e.g. images) are kept as placeholders
+    - picklable (only the db path and args), the process which unpickles it reopens the db
+    """
+
+    # path -> store, shared by the sessions in the process
+    _stores: dict[str, "SQLiteChatHistoryStore"] = {}
+    _stores_lock = threading.Lock()
+
+    @classmethod
+    def get_store(cls, path: str) -> "SQLiteChatHistoryStore":
+        with cls._stores_lock:
+            store = cls._stores.get(path)
+            if store is None or store._closed:
+                store = cls._stores[path] = cls(path)
+            return store
+
+    def __init__(self, path: str, max_batch: int = 256, busy_timeout_s: float = 5.0) -> None:
+        self.path = path
+        self.max_batch = max_batch
+        self.busy_timeout_s = busy_timeout_s
+        self._init()
+
+    def _init(self):
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+        dir_name = os.path.dirname(self.path)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS chat_history ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "session_id TEXT NOT NULL, "
+                "message TEXT NOT NULL, "
+                "created_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_chat_history_session "
+                "ON chat_history (session_id, id)"
+            )
+        conn.close()
+
+    def __getstate__(self):
+        return {
+            "path": self.path,
+            "max_batch": self.max_batch,
+            "busy_timeout_s": self.busy_timeout_s,
+        }
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=self.busy_timeout_s)
+
+    @staticmethod
+    def _encode(message) -> str:
+        return json.dumps(message, ensure_ascii=False, default=lambda o: f"<{type(o).__name__}>")
+
+    def append(self, session_id: str, message):
+        if self._closed:
+            logging.warning(f"chat history store {self.path} is closed, drop the message")
+            return
+        self._queue.put((session_id, self._encode(message), time.time()))
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._write_loop, name="chat_history_store", daemon=True
+                    )
+                    self._thread.start()
+
+    def _write_loop(self):
+        conn = self._connect()
+        try:
+            while True:
+                item = self._queue.get()
+                batch = [item]
+                while item is not _CLOSE and len(batch) < self.max_batch:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    batch.append(item)
+                rows = [row for row in batch if row is not _CLOSE]
+                try:
+                    if rows:
+                        with conn:
+                            conn.executemany(
+                                "INSERT INTO chat_history (session_id, message, created_at) "
+                                "VALUES (?, ?, ?)",
+                                rows,
+                            )
+                except sqlite3.Error as e:
+                    logging.error(f"write {len(rows)} chat history messages Exception: {e}")
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if len(rows) < len(batch):
+                    return
+        finally:
+            conn.close()
+
+    def flush(self):
+        """
+        wait until the queued messages are written
+        """
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def iter_recent(self, session_id: str) -> Iterator[Any]:
+        # read your writes
+        self.flush()
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "SELECT message FROM chat_history WHERE session_id = ? ORDER BY id DESC",
+                (session_id,),
+            )
+            for (message,) in cursor:
+                yield json.loads(message)
+        finally:
+            conn.close()
+
+    def delete(self, session_id: str):
+        self.flush()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM chat_history WHERE session_id = ?", (session_id,))
+        finally:
+            conn.close()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(_CLOSE)
+            self._thread.join()
@@ -1,16 +1,210 @@
+import asyncio
+import email.utils
+import json
+import logging
+import random
+import time
+
+import aiohttp
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# idempotent methods, same as urllib3 Retry.DEFAULT_ALLOWED_METHODS
+RETRY_ALLOWED_METHODS = ("HEAD", "GET", "PUT", "DELETE", "OPTIONS", "TRACE")
+RETRY_BACKOFF_MAX_S = 120.0
+
+
+class AsyncHTTPResponse:
+    """
+    read http response, like requests.Response
+    """
+
+    def __init__(self, status_code: int, headers, content: bytes, url: str) -> None:
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.exceptions.HTTPError(
+                f"{self.status_code} Error for url: {self.url}", response=self
+            )
+
+
+class AsyncHTTPRequest:
+    """
+    async http client on aiohttp, don't block the event loop
+    - shared keep-alive connection pool (per host limit) and dns cache, one per event loop
+    - same retry semantics as HTTPRequest (urllib3 Retry):
+      connect errors are retried for all methods; status in forcelist,
+      read errors and timeouts are retried for idempotent methods only;
+      exponential backoff with jitter, respect Retry-After header
+    - per-request deadline (timeout_s) covers all retries
+    """
+
+    # event loop id -> (event loop, aiohttp.ClientSession)
+    _sessions: dict[int, tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = {}
+
+    def __init__(
+        self,
+        max_retries=3,
+        backoff_factor=0.5,
+        backoff_jitter=0.0,
+        timeout_s: float | None = 30.0,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        dns_cache_ttl_s: int = 300,
+        keepalive_timeout_s: float = 30.0,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_jitter = backoff_jitter
+        self.timeout_s = timeout_s
+        self._connector_args = {
+            "limit": limit,
+            "limit_per_host": limit_per_host,
+            "ttl_dns_cache": dns_cache_ttl_s,
+            "use_dns_cache": True,
+            "keepalive_timeout": keepalive_timeout_s,
+        }
+
+    def get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        entry = self._sessions.get(id(loop))
+        if entry is not None and entry[0] is loop and not entry[1].closed:
+            return entry[1]
+        # drop the sessions of the closed loops
+        for key, (other_loop, _) in list(self._sessions.items()):
+            if other_loop.is_closed():
+                del self._sessions[key]
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(**self._connector_args),
+        )
+        self._sessions[id(loop)] = (loop, session)
+        return session
+
+    @classmethod
+    async def aclose(cls):
+        entry = cls._sessions.pop(id(asyncio.get_running_loop()), None)
+        if entry is not None:
+            await entry[1].close()
+
+    def _backoff_s(self, retry: int, response: AsyncHTTPResponse | None = None) -> float:
+        if response is not None and response.status_code in (413, 429, 503):
+            retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return retry_after
+        if retry <= 1:
+            # urllib3 Retry: no backoff before the first retry
+            return 0.0
+        backoff = self.backoff_factor * (2 ** (retry - 1))
+        if self.backoff_jitter:
+            backoff += random.random() * self.backoff_jitter
+        return min(backoff, RETRY_BACKOFF_MAX_S)
+
+    @staticmethod
+    def _parse_retry_after(value: str | None) -> float | None:
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            date = email.utils.parsedate_to_datetime(value)
+            return max(0.0, date.timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    async def request(
+        self, method: str, url: str, timeout_s: float | None = None, **kwargs
+    ) -> AsyncHTTPResponse:
+        """
+        kwargs: aiohttp request args, e.g.: params, headers, json, data
+        """
+        method = method.upper()
+        timeout_s = timeout_s if timeout_s is not None else self.timeout_s
+        deadline = time.monotonic() + timeout_s if timeout_s else None
+        idempotent = method in RETRY_ALLOWED_METHODS
+        session = self.get_session()
+        retry = 0
+        # the last retryable status response, returned if the retries run out
+        last_response = None
+        while True:
+            remaining = deadline - time.monotonic() if deadline else None
+            if remaining is not None and remaining <= 0:
+                if last_response is not None:
+                    return last_response
+                raise asyncio.TimeoutError(f"{method} {url} deadline {timeout_s}s exceeded")
+            response = None
+            try:
+                async with session.request(
+                    method, url, timeout=aiohttp.ClientTimeout(total=remaining), **kwargs
+                ) as res:
+                    response = AsyncHTTPResponse(res.status, res.headers, await res.read(), url)
+                if not (idempotent and response.status_code in RETRY_STATUS_CODES):
+                    return response
+                if retry >= self.max_retries:
+                    return response
+                last_response = response
+                error = f"status {response.status_code}"
+            except aiohttp.ClientConnectorError as e:
+                # not sent, safe to retry
+                if retry >= self.max_retries:
+                    raise
+                error = e
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if last_response is not None and deadline and time.monotonic() >= deadline:
+                    return last_response
+                if not idempotent or retry >= self.max_retries:
+                    raise
+                error = e
+
+            retry += 1
+            backoff_s = self._backoff_s(retry, response)
+            if deadline and time.monotonic() + backoff_s >= deadline:
+                if last_response is not None:
+                    return last_response
+                raise asyncio.TimeoutError(f"{method} {url} deadline {timeout_s}s exceeded")
+            logging.debug(
+                f"{method} {url} {error}, retry {retry}/{self.max_retries} after {backoff_s:.3f}s"
+            )
+            await asyncio.sleep(backoff_s)
+
+    async def get(self, url, **kwargs) -> AsyncHTTPResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs) -> AsyncHTTPResponse:
+        return await self.request("POST", url, **kwargs)
+
 
 class HTTPRequest:
+    """
+    sync http client on requests.Session (keep-alive, urllib3 Retry),
+    with aget/apost async facade on the shared AsyncHTTPRequest pool
+    """
+
     def __init__(self, max_retries=3, backoff_factor=0.5, backoff_jitter=0.0) -> None:
         retry_strategy = Retry(
             total=max_retries,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=list(RETRY_STATUS_CODES),
             backoff_factor=backoff_factor,  # s
             backoff_jitter=backoff_jitter,
-            allowed_methods=["HEAD", "GET", "PUT", "DELETE", "OPTIONS", "TRACE"],
+            allowed_methods=list(RETRY_ALLOWED_METHODS),
             respect_retry_after_header=True,  # add Retry-After in header
         )
 
@@ -19,6 +213,15 @@ class HTTPRequest:
         self.http_session.mount("http://", adapter)
         self.http_session.mount("https://", adapter)
 
+        self.async_requests = AsyncHTTPRequest(
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_jitter,
+        )
+
+    def request(self, method, url, **kwargs):
+        return self.http_session.request(method, url, **kwargs)
+
     def get(self, url, **kwargs):
         response = self.http_session.get(url, **kwargs)
         return response
@@ -26,3 +229,12 @@ class HTTPRequest:
     def post(self, url, **kwargs):
         response = self.http_session.post(url, **kwargs)
         return response
+
+    async def arequest(self, method, url, **kwargs) -> AsyncHTTPResponse:
+        return await self.async_requests.request(method, url, **kwargs)
+
+    async def aget(self, url, **kwargs) -> AsyncHTTPResponse:
+        return await self.async_requests.get(url, **kwargs)
+
+    async def apost(self, url, **kwargs) -> AsyncHTTPResponse:
+        return await self.async_requests.post(url, **kwargs)
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+import asyncio
 from typing import Any, Iterator, AsyncGenerator, Generator, List
 
 import numpy as np
@@ -187,6 +188,12 @@ class IFunction(ABC):
     def execute(self, session, **args):
         raise NotImplementedError("must be implemented in the child class")
 
+    async def aexecute(self, session, **args):
+        """
+        async execute, default run the sync execute in a thread, don't block the event loop
+        """
+        return await asyncio.to_thread(self.execute, session, **args)
+
     @abstractmethod
     def get_tool_call(self):
         raise NotImplementedError("must be implemented in the child class")
@@ -287,6 +294,30 @@ class IConnector(ABC):
         raise NotImplementedError("must be implemented in the child class")
 
 
+class IChatHistoryStore(ABC):
+    @abstractmethod
+    def append(self, session_id: str, message):
+        """
+        persist the message, write-behind don't block the caller
+        """
+        raise NotImplementedError("must be implemented in the child class")
+
+    @abstractmethod
+    def iter_recent(self, session_id: str) -> Iterator[Any]:
+        """
+        iterate the session messages from the newest to the oldest
+        """
+        raise NotImplementedError("must be implemented in the child class")
+
+    @abstractmethod
+    def delete(self, session_id: str):
+        raise NotImplementedError("must be implemented in the child class")
+
+    @abstractmethod
+    def close(self):
+        raise NotImplementedError("must be implemented in the child class")
+
+
 class IBot(ABC):
     @abstractmethod
     def run(self):
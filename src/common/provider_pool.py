@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable
+
+from src.common.utils.histogram import LatencyHistogram
+
+# retry remote api call with these http status codes
+RETRY_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+
+
+def is_retryable_error(e: Exception) -> bool:
+    """
+    connection/timeout errors and retryable http status errors,
+    e.g.: httpx.TransportError, groq/openai APIConnectionError, APIStatusError
+    """
+    if isinstance(e, (ConnectionError, asyncio.TimeoutError)):
+        return True
+    status_code = getattr(e, "status_code", None)
+    if status_code is None and getattr(e, "response", None) is not None:
+        status_code = getattr(e.response, "status_code", None)
+    if status_code is not None:
+        return status_code in RETRY_STATUS_CODES
+    name = type(e).__name__
+    return "Timeout" in name or "Connect" in name or "Transport" in name
+
+
+class ProviderClientPool:
+    """
+    shared async api clients per provider (e.g.: groq, deepgram), instead of one client per utterance/processor
+    - keep-alive http client (HTTP/2 if h2 is installed), one per (provider, base_url, event loop)
+    - sdk clients built on the shared http client, one per (provider, key)
+    - in-flight request limit per (provider, api key)
+    - retry with jittered exponential backoff, only for idempotent calls
+    - latency histogram per provider
+    """
+
+    _http_clients: dict = {}
+    _clients: dict = {}
+    _limiters: dict = {}
+    _histograms: dict[str, LatencyHistogram] = {}
+
+    @staticmethod
+    def _loop_id() -> int:
+        try:
+            return id(asyncio.get_running_loop())
+        except RuntimeError:
+            return 0
+
+    @classmethod
+    def get_http_client(
+        cls,
+        provider: str,
+        base_url: str = "",
+        timeout_s: float | None = 60.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry_s: float = 60.0,
+    ):
+        """
+        return shared httpx.AsyncClient with keep-alive connections
+        """
+        import httpx
+
+        key = (provider, base_url, cls._loop_id())
+        client = cls._http_clients.get(key)
+        if client is not None and not client.is_closed:
+            return client
+
+        try:
+            import h2  # noqa
+
+            http2 = True
+        except ModuleNotFoundError:
+            http2 = False
+        client = httpx.AsyncClient(
+            http2=http2,
+            timeout=timeout_s,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry_s,
+            ),
+        )
+        logging.info(f"new {provider} http client {base_url} http2: {http2}")
+        cls._http_clients[key] = client
+        return client
+
+    @classmethod
+    def get_client(cls, provider: str, key: Any, factory: Callable[[], Any]):
+        """
+        return shared sdk client per (provider, key), create with factory if not exists
+        """
+        pool_key = (provider, key, cls._loop_id())
+        if pool_key not in cls._clients:
+            cls._clients[pool_key] = factory()
+        return cls._clients[pool_key]
+
+    @classmethod
+    def get_limiter(cls, provider: str, api_key: str = "", max_in_flight: int = 8):
+        key = (provider, api_key, cls._loop_id())
+        if key not in cls._limiters:
+            cls._limiters[key] = asyncio.Semaphore(max_in_flight)
+        return cls._limiters[key]
+
+    @classmethod
+    def get_histogram(cls, provider: str) -> LatencyHistogram:
+        if provider not in cls._histograms:
+            cls._histograms[provider] = LatencyHistogram()
+        return cls._histograms[provider]
+
+    @classmethod
+    def latency_stats(cls) -> dict:
+        return {provider: h.snapshot() for provider, h in cls._histograms.items()}
+
+    @classmethod
+    async def request(
+        cls,
+        provider: str,
+        call: Callable[[], Awaitable[Any]],
+        *,
+        api_key: str = "",
+        idempotent: bool = False,
+        max_in_flight: int = 8,
+        max_retries: int = 2,
+        backoff_factor_s: float = 0.2,
+        max_backoff_s: float = 5.0,
+        is_retryable: Callable[[Exception], bool] = is_retryable_error,
+    ) -> Any:
+        """
+        run remote api call with in-flight limit per api key, record latency;
+        retry with full jitter exponential backoff if the call is idempotent
+        """
+        retries = max_retries if idempotent else 0
+        limiter = cls.get_limiter(provider, api_key, max_in_flight)
+        histogram = cls.get_histogram(provider)
+        attempt = 0
+        while True:
+            async with limiter:
+                start = time.perf_counter()
+                try:
+                    res = await call()
+                    histogram.observe(time.perf_counter() - start)
+                    return res
+                except Exception as e:
+                    if attempt >= retries or not is_retryable(e):
+                        raise
+                    err = e
+            attempt += 1
+            backoff_s = random.uniform(0, min(max_backoff_s, backoff_factor_s * 2**attempt))
+            logging.warning(
+                f"{provider} request error: {err}, retry {attempt}/{retries} after {backoff_s:.3f}s"
+            )
+            await asyncio.sleep(backoff_s)
+
+    @classmethod
+    async def aclose(cls):
+        loop_id = cls._loop_id()
+        for key in [k for k in cls._http_clients if k[-1] == loop_id]:
+            await cls._http_clients.pop(key).aclose()
+        for key in [k for k in cls._clients if k[-1] == loop_id]:
+            cls._clients.pop(key)
+        for key in [k for k in cls._limiters if k[-1] == loop_id]:
+            cls._limiters.pop(key)
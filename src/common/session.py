@@ -1,13 +1,16 @@
+from .chat_history import ChatHistory
 from .types import SessionCtx
 
 
 class Session:
-    def __init__(self, **args) -> None:
+    def __init__(self, chat_history: ChatHistory | None = None, **args) -> None:
         self.ctx = SessionCtx(**args)
         self.config = {}
         self.chat_round = 0
-        # just for local history,@todo: use kv store history like mem0
-        self.chat_history = []
+        # local history, bounded with size/max_tokens and persisted with a store if configured
+        if chat_history is None:
+            chat_history = ChatHistory.from_env(str(self.ctx.client_id))
+        self.chat_history = chat_history
 
     def __getstate__(self):
         return {
@@ -35,6 +38,9 @@ class Session:
 
     def set_client_id(self, client_id):
         self.ctx.client_id = client_id
+        if self.chat_history.session_id != str(client_id):
+            self.chat_history.session_id = str(client_id)
+            self.chat_history.restore()
 
     def update_config(self, config_data):
         self.config.update(config_data)
@@ -414,6 +414,9 @@ class CosyVoiceTTSArgs:
 class OpenWeatherMapArgs:
     lang: str = "zh_cn"
     units: str = "metric"
+    # result cache ttl (0 no cache) and max entries
+    cache_ttl_s: float = 600.0
+    cache_max_entries: int = 1024
 
 
 @dataclass
@@ -423,6 +426,9 @@ class SearchApiArgs:
     hl: str = "zh-cn"
     page: int = 1
     num: int = 5
+    # result cache ttl (0 no cache) and max entries
+    cache_ttl_s: float = 3600.0
+    cache_max_entries: int = 1024
 
 
 @dataclass
@@ -431,6 +437,9 @@ class Search1ApiArgs:
     image: bool = False
     crawl_results: int = 0
     max_results: int = 5
+    # result cache ttl (0 no cache) and max entries
+    cache_ttl_s: float = 3600.0
+    cache_max_entries: int = 1024
 
 
 @dataclass
@@ -439,6 +448,9 @@ class SerperApiArgs:
     hl: str = "zh-cn"
     page: int = 1
     num: int = 5
+    # result cache ttl (0 no cache) and max entries
+    cache_ttl_s: float = 3600.0
+    cache_max_entries: int = 1024
 
 
 # --------------- vad analyzer------------------
@@ -474,6 +486,10 @@ class AudioParams(BaseModel):
     audio_out_enabled: bool = False
     audio_out_sample_rate: int = RATE
     audio_out_channels: int = CHANNELS
+    # min interval of the upstream BotSpeakingFrame while writing the audio out
+    audio_out_bot_speaking_interval_s: float = 0.2
+    # buffer the first ms of each bot speech before writing, for slow(network) tts, 0 no buffer
+    audio_out_prebuffer_ms: int = 0
     audio_in_enabled: bool = False
     audio_in_participant_enabled: bool = False
     audio_in_sample_rate: int = RATE
@@ -485,11 +501,18 @@ class AudioVADParams(AudioParams):
     vad_enabled: bool = False
     vad_audio_passthrough: bool = False
     vad_analyzer: IVADAnalyzer | EngineClass | None = None
+    # per participant audio in of the room transports: each participant has its own
+    # resampler, vad analyzer (cloned from vad_analyzer) and asr segment buffer
+    audio_in_demux_enabled: bool = False
+    # mix the participants audio in (resampled per participant) to one stream before vad
+    audio_in_mix_enabled: bool = False
 
 
 class CameraParams(BaseModel):
     camera_in_enabled: bool = False
     camera_in_color_format: str = "RGB"
+    # downscale the input video frames to max side in the color conversion, 0 keeps the size
+    camera_in_max_side: int = 0
     camera_out_enabled: bool = False
     camera_out_is_live: bool = False
     camera_out_width: int = 1024
@@ -503,6 +526,18 @@ class AudioCameraParams(CameraParams, AudioVADParams):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
 
+class OpusCodecParams(BaseModel):
+    # opus frame duration: 2.5, 5, 10, 20, 40, 60 ms
+    frame_ms: float = 20
+    # encoder bitrate (bps), 24kbps is transparent for 16k hz speech
+    bitrate: int = 24000
+    # encoder complexity 0~10, cpu cost vs quality
+    complexity: int = 5
+    # inband forward error correction for the lossy client links
+    fec: bool = True
+    packet_loss_perc: int = 10
+
+
 # --------------- daily -------------------------------
 
 
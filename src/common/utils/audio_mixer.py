@@ -0,0 +1,64 @@
+import numpy as np
+
+
+class AudioMixer:
+    """
+    mix the int16 pcm streams of the participants to one stream:
+    - each source is buffered and cut into aligned frames (default 10ms)
+    - the frames are mixed when every source has one; a source which lags behind
+      more than max_lag_frames (muted, packet loss) is mixed as silence
+    - vectorized: stack the frames into one int32 array, accumulate, clip to int16
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        num_channels: int = 1,
+        frame_ms: int = 10,
+        max_lag_frames: int = 5,
+    ):
+        self.sample_rate = sample_rate
+        self.num_channels = num_channels
+        self.frame_bytes = sample_rate * frame_ms // 1000 * num_channels * 2
+        self.max_lag_frames = max_lag_frames
+        self._buffers: dict[str, bytearray] = {}
+
+    @property
+    def sources(self) -> list[str]:
+        return list(self._buffers.keys())
+
+    def push(self, source_id: str, audio: bytes):
+        self._buffers.setdefault(source_id, bytearray()).extend(audio)
+
+    def remove(self, source_id: str):
+        self._buffers.pop(source_id, None)
+
+    def clear(self):
+        self._buffers.clear()
+
+    def mix(self) -> bytes:
+        """
+        return the mixed frames ready to output, b"" if waiting for the lagging sources
+        """
+        if not self._buffers:
+            return b""
+        available = [len(buf) // self.frame_bytes for buf in self._buffers.values()]
+        num_frames = max(min(available), max(available) - self.max_lag_frames)
+        if num_frames <= 0:
+            return b""
+
+        num_bytes = num_frames * self.frame_bytes
+        if len(self._buffers) == 1:
+            buf = next(iter(self._buffers.values()))
+            out = bytes(buf[:num_bytes])
+            del buf[:num_bytes]
+            return out
+
+        acc = np.zeros((len(self._buffers), num_bytes // 2), dtype=np.int32)
+        for i, buf in enumerate(self._buffers.values()):
+            n = min(len(buf), num_bytes) // 2 * 2
+            acc[i, : n // 2] = np.frombuffer(buf, dtype=np.int16, count=n // 2)
+            del buf[:n]
+        mixed = acc.sum(axis=0)
+        np.clip(mixed, -32768, 32767, out=mixed)
+        return mixed.astype(np.int16).tobytes()
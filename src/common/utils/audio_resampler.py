@@ -0,0 +1,54 @@
+from math import gcd
+
+import numpy as np
+from scipy import signal
+
+
+class AudioStreamResampler:
+    """
+    streaming int16 pcm resampler of one audio stream (e.g.: one participant):
+    - polyphase fir (upfirdn) with the same anti-aliasing filter as scipy resample_poly
+    - the filter history is carried between chunks, no clicks at the 10ms chunk edges
+      (resample_audio resamples each chunk alone)
+    - input samples which don't fill a full `down` block wait for the next chunk
+    """
+
+    def __init__(self, in_rate: int, out_rate: int, num_channels: int = 1):
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.num_channels = num_channels
+        g = gcd(in_rate, out_rate)
+        self._up, self._down = out_rate // g, in_rate // g
+        if self.passthrough:
+            return
+        max_rate = max(self._up, self._down)
+        num_taps = 2 * 10 * max_rate + 1
+        self._h = signal.firwin(num_taps, 1.0 / max_rate, window=("kaiser", 5.0)) * self._up
+        # input history covering the filter, multiple of down to keep the output phase
+        hist = -(-(num_taps - 1) // self._up)
+        self._hist = -(-hist // self._down) * self._down
+        self.reset()
+
+    @property
+    def passthrough(self) -> bool:
+        return self._up == self._down
+
+    def reset(self):
+        if not self.passthrough:
+            self._buf = np.zeros((self._hist, self.num_channels), dtype=np.float32)
+
+    def resample(self, audio: bytes) -> bytes:
+        if self.passthrough:
+            return audio
+        pcm = np.frombuffer(audio, dtype=np.int16).reshape(-1, self.num_channels)
+        self._buf = np.concatenate([self._buf, pcm])
+        num_in = (len(self._buf) - self._hist) // self._down * self._down
+        if num_in <= 0:
+            return b""
+
+        y = signal.upfirdn(self._h, self._buf[: self._hist + num_in], self._up, self._down, axis=0)
+        start = self._hist * self._up // self._down
+        out = y[start : start + num_in * self._up // self._down]
+        # the last hist samples and the not consumed tail for the next chunk
+        self._buf = self._buf[num_in:]
+        return np.clip(np.rint(out), -32768, 32767).astype(np.int16).tobytes()
@@ -0,0 +1,234 @@
+import numpy as np
+
+# packed pixel format -> (bytes per pixel, r g b channel index)
+PACKED_FORMATS = {
+    "RGB": (3, (0, 1, 2)),
+    "RGB24": (3, (0, 1, 2)),
+    "BGR": (3, (2, 1, 0)),
+    "RGBA": (4, (0, 1, 2)),
+    "BGRA": (4, (2, 1, 0)),
+    "ARGB": (4, (1, 2, 3)),
+    "ABGR": (4, (3, 2, 1)),
+}
+
+
+def get_target_size(
+    width: int, height: int, target_size: tuple[int, int] | None = None, max_side: int = 0
+) -> tuple[int, int]:
+    """
+    output (width, height): target_size if set, else downscaled to max_side keeping the aspect
+    """
+    if target_size:
+        return target_size
+    if max_side and max(width, height) > max_side:
+        scale = max_side / max(width, height)
+        return max(1, round(width * scale)), max(1, round(height * scale))
+    return width, height
+
+
+class VideoFrameConverter:
+    """
+    convert the raw video frames of one participant (yuv planes or packed pixels)
+    to RGB np.ndarray (h, w, 3) uint8, downscaled in the same pass:
+    - the output pixels sample the Y/UV planes directly (nearest), no full resolution rgb frame
+    - sample indexes and work/output buffers are reused while the frame size doesn't change
+    - BT.601 full range (jpeg) yuv -> rgb, same as img_utils.yuv_to_rgb
+
+    NOTE: the returned array is the reused output buffer, valid until the next convert,
+    copy it (e.g.: tobytes()) to keep it.
+    """
+
+    def __init__(self, target_size: tuple[int, int] | None = None, max_side: int = 0):
+        self.target_size = target_size
+        self.max_side = max_side
+        # (kind, width, height, strides...) -> sample indexes and buffers
+        self._key = None
+        self._y_idx: np.ndarray | None = None
+        self._uv_idx: np.ndarray | None = None
+        self._rgb: np.ndarray | None = None
+        self._y8: np.ndarray | None = None
+        self._u8: np.ndarray | None = None
+        self._v8: np.ndarray | None = None
+        self._yf: np.ndarray | None = None
+        self._uf: np.ndarray | None = None
+        self._vf: np.ndarray | None = None
+        self._tmp: np.ndarray | None = None
+
+    def out_size(self, width: int, height: int) -> tuple[int, int]:
+        return get_target_size(width, height, self.target_size, self.max_side)
+
+    def _sample_grid(self, width: int, height: int) -> tuple[np.ndarray, np.ndarray]:
+        out_w, out_h = self.out_size(width, height)
+        # center of each output pixel in the source
+        xs = ((np.arange(out_w) * 2 + 1) * width // (2 * out_w)).astype(np.intp)
+        ys = ((np.arange(out_h) * 2 + 1) * height // (2 * out_h)).astype(np.intp)
+        return xs, ys
+
+    def _prepare(self, key: tuple, width: int, height: int, y_stride: int, uv_index_fn):
+        if key == self._key:
+            return
+        xs, ys = self._sample_grid(width, height)
+        out_h, out_w = len(ys), len(xs)
+        n = out_h * out_w
+        self._y_idx = (ys[:, None] * y_stride + xs[None, :]).ravel()
+        self._uv_idx = uv_index_fn(xs, ys).ravel()
+        self._rgb = np.empty((out_h, out_w, 3), dtype=np.uint8)
+        self._y8 = np.empty(n, dtype=np.uint8)
+        self._u8 = np.empty(n, dtype=np.uint8)
+        self._v8 = np.empty(n, dtype=np.uint8)
+        self._yf = np.empty(n, dtype=np.float32)
+        self._uf = np.empty(n, dtype=np.float32)
+        self._vf = np.empty(n, dtype=np.float32)
+        self._tmp = np.empty(n, dtype=np.float32)
+        self._key = key
+
+    @staticmethod
+    def _plane(buffer) -> np.ndarray:
+        return np.frombuffer(buffer, dtype=np.uint8)
+
+    def _yuv_to_rgb(self) -> np.ndarray:
+        yf, uf, vf, tmp = self._yf, self._uf, self._vf, self._tmp
+        np.copyto(yf, self._y8)
+        np.subtract(self._u8, np.float32(128.0), out=uf)
+        np.subtract(self._v8, np.float32(128.0), out=vf)
+        rgb = self._rgb.reshape(-1, 3)
+
+        # R = Y + 1.402 V
+        np.multiply(vf, np.float32(1.402), out=tmp)
+        tmp += yf
+        np.clip(tmp, 0, 255, out=tmp)
+        rgb[:, 0] = tmp
+        # G = Y - 0.344136 U - 0.714136 V
+        np.multiply(uf, np.float32(-0.344136), out=tmp)
+        tmp += yf
+        vf *= np.float32(0.714136)
+        tmp -= vf
+        np.clip(tmp, 0, 255, out=tmp)
+        rgb[:, 1] = tmp
+        # B = Y + 1.772 U
+        np.multiply(uf, np.float32(1.772), out=tmp)
+        tmp += yf
+        np.clip(tmp, 0, 255, out=tmp)
+        rgb[:, 2] = tmp
+        return self._rgb
+
+    def i420_to_rgb(
+        self,
+        y_buffer,
+        u_buffer,
+        v_buffer,
+        width: int,
+        height: int,
+        y_stride: int = 0,
+        uv_stride: int = 0,
+    ) -> np.ndarray:
+        """
+        YUV420P(I420): U and V planes are half width and half height
+        """
+        y_stride = y_stride or width
+        uv_stride = uv_stride or (width + 1) // 2
+        self._prepare(
+            ("i420", width, height, y_stride, uv_stride),
+            width,
+            height,
+            y_stride,
+            lambda xs, ys: (ys // 2)[:, None] * uv_stride + (xs // 2)[None, :],
+        )
+        np.take(self._plane(y_buffer), self._y_idx, out=self._y8)
+        np.take(self._plane(u_buffer), self._uv_idx, out=self._u8)
+        np.take(self._plane(v_buffer), self._uv_idx, out=self._v8)
+        return self._yuv_to_rgb()
+
+    def i422_to_rgb(
+        self,
+        y_buffer,
+        u_buffer,
+        v_buffer,
+        width: int,
+        height: int,
+        y_stride: int = 0,
+        uv_stride: int = 0,
+    ) -> np.ndarray:
+        """
+        YUV422P(I422): U and V planes are half width and full height
+        """
+        y_stride = y_stride or width
+        uv_stride = uv_stride or (width + 1) // 2
+        self._prepare(
+            ("i422", width, height, y_stride, uv_stride),
+            width,
+            height,
+            y_stride,
+            lambda xs, ys: ys[:, None] * uv_stride + (xs // 2)[None, :],
+        )
+        np.take(self._plane(y_buffer), self._y_idx, out=self._y8)
+        np.take(self._plane(u_buffer), self._uv_idx, out=self._u8)
+        np.take(self._plane(v_buffer), self._uv_idx, out=self._v8)
+        return self._yuv_to_rgb()
+
+    def nv12_to_rgb(
+        self, y_buffer, uv_buffer, width: int, height: int, y_stride: int = 0, uv_stride: int = 0
+    ) -> np.ndarray:
+        """
+        NV12: Y plane + interleaved half size UVUV plane (NV21 is VUVU)
+        """
+        return self._semi_planar_to_rgb(
+            "nv12", y_buffer, uv_buffer, width, height, y_stride, uv_stride, u_first=True
+        )
+
+    def nv21_to_rgb(
+        self, y_buffer, vu_buffer, width: int, height: int, y_stride: int = 0, uv_stride: int = 0
+    ) -> np.ndarray:
+        return self._semi_planar_to_rgb(
+            "nv21", y_buffer, vu_buffer, width, height, y_stride, uv_stride, u_first=False
+        )
+
+    def _semi_planar_to_rgb(
+        self,
+        kind: str,
+        y_buffer,
+        uv_buffer,
+        width: int,
+        height: int,
+        y_stride: int,
+        uv_stride: int,
+        u_first: bool,
+    ) -> np.ndarray:
+        y_stride = y_stride or width
+        # interleaved 2 bytes per chroma sample
+        uv_stride = uv_stride or ((width + 1) // 2) * 2
+        self._prepare(
+            (kind, width, height, y_stride, uv_stride),
+            width,
+            height,
+            y_stride,
+            lambda xs, ys: (ys // 2)[:, None] * uv_stride + (xs // 2 * 2)[None, :],
+        )
+        uv = self._plane(uv_buffer)
+        np.take(self._plane(y_buffer), self._y_idx, out=self._y8)
+        first, second = (self._u8, self._v8) if u_first else (self._v8, self._u8)
+        np.take(uv, self._uv_idx, out=first)
+        np.take(uv[1:], self._uv_idx, out=second)
+        return self._yuv_to_rgb()
+
+    def packed_to_rgb(
+        self, buffer, width: int, height: int, pixel_format: str = "RGBA", stride: int = 0
+    ) -> np.ndarray:
+        """
+        packed pixels (RGB24, RGBA, BGRA, ARGB, ABGR) to RGB, alpha is dropped
+        """
+        bpp, channels = PACKED_FORMATS[pixel_format]
+        stride = stride or width * bpp
+        key = ("packed", pixel_format, width, height, stride)
+        if key != self._key:
+            xs, ys = self._sample_grid(width, height)
+            self._y_idx = (ys[:, None] * stride + xs[None, :] * bpp).ravel()
+            self._rgb = np.empty((len(ys), len(xs), 3), dtype=np.uint8)
+            self._y8 = np.empty(len(self._y_idx), dtype=np.uint8)
+            self._key = key
+        data = self._plane(buffer)
+        rgb = self._rgb.reshape(-1, 3)
+        for i, channel in enumerate(channels):
+            np.take(data[channel:], self._y_idx, out=self._y8)
+            rgb[:, i] = self._y8
+        return self._rgb
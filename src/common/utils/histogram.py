@@ -0,0 +1,57 @@
+import bisect
+import math
+
+# latency bucket upper bounds (ms), exponential
+DEFAULT_LATENCY_BUCKETS_MS = (25, 50, 100, 200, 400, 800, 1600, 3200, 6400, 12800)
+
+
+class LatencyHistogram:
+    """
+    simple fixed-bucket latency histogram (ms), like prometheus histogram
+    """
+
+    def __init__(self, buckets_ms: tuple = DEFAULT_LATENCY_BUCKETS_MS) -> None:
+        self._bounds = tuple(sorted(buckets_ms))
+        # the last bucket is +inf
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._count = 0
+        self._sum_ms = 0.0
+        self._max_ms = 0.0
+
+    def observe(self, latency_s: float):
+        latency_ms = latency_s * 1000
+        self._counts[bisect.bisect_left(self._bounds, latency_ms)] += 1
+        self._count += 1
+        self._sum_ms += latency_ms
+        self._max_ms = max(self._max_ms, latency_ms)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def percentile(self, q: float) -> float:
+        """
+        approximate percentile (ms) with bucket upper bound, q in [0, 100]
+        """
+        if self._count == 0:
+            return 0.0
+        rank = math.ceil(self._count * q / 100)
+        acc = 0
+        for i, cn in enumerate(self._counts):
+            acc += cn
+            if acc >= rank:
+                return float(self._bounds[i]) if i < len(self._bounds) else self._max_ms
+        return self._max_ms
+
+    def snapshot(self) -> dict:
+        buckets = {f"le_{b}ms": cn for b, cn in zip(self._bounds, self._counts)}
+        buckets["le_inf"] = self._counts[-1]
+        return {
+            "count": self._count,
+            "avg_ms": self._sum_ms / self._count if self._count else 0.0,
+            "max_ms": self._max_ms,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "buckets": buckets,
+        }
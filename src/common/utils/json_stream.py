@@ -0,0 +1,131 @@
+import json
+import logging
+
+_WHITESPACE = " \t\r\n"
+
+
+class StreamingJSONParser:
+    """
+    incremental parser of a streamed json object (e.g.: llm tool call arguments),
+    feed the text chunks, get the top-level fields as soon as their values are complete
+    - string/object/array values are complete at the closing quote/bracket
+    - number/true/false/null values are complete at the next , } or whitespace
+    - stops parsing on invalid json, the caller parses the whole text as before
+    """
+
+    def __init__(self) -> None:
+        self._buf = ""
+        self._pos = 0
+        # depth of {} and [] nesting, the top-level object is 1
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        # object, key, colon, value, string, nested, primitive, comma, done
+        self._state = "object"
+        self._key: str | None = None
+        self._start = 0
+        self.fields: dict = {}
+        self.error: Exception | None = None
+
+    @property
+    def done(self) -> bool:
+        return self._state == "done"
+
+    @property
+    def text(self) -> str:
+        return self._buf
+
+    def feed(self, text: str) -> dict:
+        """
+        return the new completed top-level fields
+        """
+        if self.error is not None or self.done:
+            return {}
+        self._buf += text
+        new_fields = {}
+        try:
+            self._parse(new_fields)
+        except ValueError as e:
+            logging.debug(f"streaming json parse error: {e}, text: {self._buf}")
+            self.error = e
+        self.fields.update(new_fields)
+        return new_fields
+
+    def _complete(self, end: int, new_fields: dict):
+        new_fields[self._key] = json.loads(self._buf[self._start : end])
+        self._key = None
+        self._state = "comma"
+
+    def _parse(self, new_fields: dict):
+        buf = self._buf
+        i = self._pos
+        while i < len(buf):
+            c = buf[i]
+            state = self._state
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if state == "key":
+                        self._key = json.loads(buf[self._start : i + 1])
+                        self._state = "colon"
+                    elif state == "string":
+                        self._complete(i + 1, new_fields)
+            elif state == "nested":
+                if c == '"':
+                    self._in_string = True
+                elif c in "{[":
+                    self._depth += 1
+                elif c in "}]":
+                    self._depth -= 1
+                    if self._depth == 1:
+                        self._complete(i + 1, new_fields)
+            elif state == "primitive":
+                if c in _WHITESPACE or c in ",}":
+                    self._complete(i, new_fields)
+                    # the , or } is handled in the comma state
+                    continue
+            elif c in _WHITESPACE:
+                pass
+            elif state == "object":
+                if c != "{":
+                    raise ValueError(f"expect {{ at {i}")
+                self._depth = 1
+                self._state = "key"
+            elif state == "key":
+                if c == '"':
+                    self._in_string = True
+                    self._start = i
+                elif c == "}" and not self.fields and not new_fields:
+                    self._state = "done"
+                else:
+                    raise ValueError(f"expect key at {i}")
+            elif state == "colon":
+                if c != ":":
+                    raise ValueError(f"expect : at {i}")
+                self._state = "value"
+            elif state == "value":
+                self._start = i
+                if c == '"':
+                    self._in_string = True
+                    self._state = "string"
+                elif c in "{[":
+                    self._depth += 1
+                    self._state = "nested"
+                else:
+                    self._state = "primitive"
+            elif state == "comma":
+                if c == ",":
+                    self._state = "key"
+                elif c == "}":
+                    self._depth = 0
+                    self._state = "done"
+                else:
+                    raise ValueError(f"expect , or }} at {i}")
+            elif state == "done":
+                break
+            i += 1
+        self._pos = i
@@ -0,0 +1,132 @@
+import logging
+
+try:
+    import opuslib
+    import opuslib.api.ctl
+    import opuslib.api.encoder
+except ModuleNotFoundError as e:
+    logging.error(f"Exception: {e}")
+    logging.error("In order to use opus audio codec, you need to `pip install achatbot[opus]`")
+    raise Exception(f"Missing module: {e}")
+
+# opus supported frame durations (ms) and sample rates (hz)
+OPUS_FRAME_MS = (2.5, 5, 10, 20, 40, 60)
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+
+def check_opus_args(sample_rate: int, frame_ms: float):
+    if sample_rate not in OPUS_SAMPLE_RATES:
+        raise ValueError(f"opus sample_rate {sample_rate} not in {OPUS_SAMPLE_RATES}")
+    if frame_ms not in OPUS_FRAME_MS:
+        raise ValueError(f"opus frame_ms {frame_ms} not in {OPUS_FRAME_MS}")
+
+
+class OpusEncoder:
+    """
+    stateful opus encoder of one connection (16-bit pcm -> opus packets),
+    pcm is buffered to whole frames, one packet per frame_ms
+    - inband fec + expected packet loss, the decoder can recover a lost packet from the next one
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        num_channels: int = 1,
+        frame_ms: float = 20,
+        bitrate: int = 24000,
+        complexity: int = 5,
+        fec: bool = True,
+        packet_loss_perc: int = 10,
+        application: str = "voip",
+    ) -> None:
+        check_opus_args(sample_rate, frame_ms)
+        self.sample_rate = sample_rate
+        self.num_channels = num_channels
+        self.frame_samples = int(sample_rate * frame_ms / 1000)
+        self.frame_bytes = self.frame_samples * num_channels * 2
+        self._encoder = opuslib.Encoder(sample_rate, num_channels, application)
+        self._encoder.bitrate = bitrate
+        self._encoder.complexity = complexity
+        if fec:
+            # NOTE: opuslib Encoder.inband_fec setter doesn't pass the value, use the ctl api
+            opuslib.api.encoder.encoder_ctl(
+                self._encoder.encoder_state, opuslib.api.ctl.set_inband_fec, 1
+            )
+            self._encoder.packet_loss_perc = packet_loss_perc
+        self._buffer = bytearray()
+
+    def encode(self, pcm: bytes) -> list[bytes]:
+        """
+        return the opus packets of the whole frames, the remaining pcm is kept for the next call
+        """
+        self._buffer += pcm
+        packets = []
+        offset = 0
+        while len(self._buffer) - offset >= self.frame_bytes:
+            frame = bytes(self._buffer[offset : offset + self.frame_bytes])
+            packets.append(self._encoder.encode(frame, self.frame_samples))
+            offset += self.frame_bytes
+        if offset:
+            del self._buffer[:offset]
+        return packets
+
+    def flush(self) -> list[bytes]:
+        """
+        encode the remaining pcm padded with silence
+        """
+        if not self._buffer:
+            return []
+        pad = self.frame_bytes - len(self._buffer)
+        return self.encode(b"\x00" * pad)
+
+    def clear(self):
+        """
+        drop the buffered pcm, e.g.: on interruption
+        """
+        self._buffer.clear()
+
+
+class OpusDecoder:
+    """
+    stateful opus decoder of one connection (opus packets -> 16-bit pcm)
+    - packet loss concealment: an empty/None packet or a corrupt packet is decoded
+      as a concealed frame with the last frame size, so the audio timing is kept
+    - decode_lost(next_packet) recovers the lost packet with the inband fec of the next packet
+    """
+
+    def __init__(self, sample_rate: int = 16000, num_channels: int = 1, frame_ms: float = 20):
+        check_opus_args(sample_rate, frame_ms)
+        self.sample_rate = sample_rate
+        self.num_channels = num_channels
+        # max opus frame is 120ms
+        self.max_frame_samples = int(sample_rate * 0.12)
+        self.frame_samples = int(sample_rate * frame_ms / 1000)
+        self._decoder = opuslib.Decoder(sample_rate, num_channels)
+        self.concealed_cn = 0
+
+    def decode(self, packet: bytes | None) -> bytes:
+        if not packet:
+            return self.conceal()
+        try:
+            pcm = self._decoder.decode(packet, self.max_frame_samples)
+        except opuslib.OpusError as e:
+            logging.warning(f"opus decode Exception: {e}, conceal the frame")
+            return self.conceal()
+        self.frame_samples = len(pcm) // (2 * self.num_channels)
+        return pcm
+
+    def decode_lost(self, next_packet: bytes) -> bytes:
+        """
+        pcm of the lost packet before next_packet, then decode(next_packet) as usual
+        """
+        try:
+            pcm = self._decoder.decode(next_packet, self.frame_samples, decode_fec=True)
+            self.concealed_cn += 1
+            return pcm
+        except opuslib.OpusError as e:
+            logging.warning(f"opus fec decode Exception: {e}, conceal the frame")
+            return self.conceal()
+
+    def conceal(self) -> bytes:
+        self.concealed_cn += 1
+        return self._decoder.decode(b"", self.frame_samples)
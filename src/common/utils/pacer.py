@@ -30,3 +30,44 @@ class Pacer:
         if elapsed_time < time_interval_s:
             await asyncio.sleep(time_interval_s - elapsed_time)
         self.last_call_time = time.time()
+
+
+class AsyncMediaPacer:
+    """
+    drift-free async pacer for real-time media sending, on the monotonic clock
+    - send deadlines accumulate the media duration from the stream start,
+      not from the wakeup time, so the sleep jitter doesn't accumulate
+    - keep lead_s of media ahead of real time (for the client jitter buffer), burst up to the lead
+    - restart the stream clock on underrun (media produced slower than real time) and reset()
+    """
+
+    def __init__(self, lead_s: float = 0.2):
+        self.lead_s = lead_s
+        self._start_time: float | None = None
+        self._sent_s = 0.0
+
+    @property
+    def buffered_s(self) -> float:
+        """
+        sent media not played yet on the client
+        """
+        if self._start_time is None:
+            return 0.0
+        return max(0.0, self._start_time + self._sent_s - time.monotonic())
+
+    async def pace(self, duration_s: float):
+        """
+        wait until the media with duration_s can be sent
+        """
+        now = time.monotonic()
+        if self._start_time is None or self._start_time + self._sent_s < now:
+            self._start_time = now
+            self._sent_s = 0.0
+        wait_s = self._start_time + self._sent_s - self.lead_s - now
+        if wait_s > 0:
+            await asyncio.sleep(wait_s)
+        self._sent_s += duration_s
+
+    def reset(self):
+        self._start_time = None
+        self._sent_s = 0.0
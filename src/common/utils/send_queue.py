@@ -0,0 +1,164 @@
+import asyncio
+import collections
+import logging
+import time
+from typing import Awaitable, Callable, Literal
+
+SendKind = Literal["control", "audio", "video", "metrics"]
+
+
+class BoundedSendQueue:
+    """
+    bounded send queue of one client connection, a writer task sends the payloads,
+    so the pipeline doesn't wait for the client network (slow client):
+    - over high_water_bytes: drop the stale video/metrics payloads first,
+      then the audio queued longer than audio_horizon_s (would be played late)
+    - over max_bytes: drop the oldest audio/video/metrics, the control payloads are never dropped
+    - slow client: over the high water mark, until the queue drains under half of it
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str | bytes], Awaitable[None]],
+        high_water_bytes: int = 256 * 1024,
+        max_bytes: int = 1024 * 1024,
+        audio_horizon_s: float = 1.0,
+        on_slow: Callable[[bool, dict], Awaitable[None]] | None = None,
+    ):
+        self._send = send
+        self._high_water_bytes = high_water_bytes
+        self._max_bytes = max(max_bytes, high_water_bytes)
+        self._audio_horizon_s = audio_horizon_s
+        self._on_slow = on_slow
+
+        # (kind, payload, queued time)
+        self._queue: collections.deque[tuple[SendKind, str | bytes, float]] = collections.deque()
+        self._queued_bytes = 0
+        self._event = asyncio.Event()
+        self._writer_task: asyncio.Task | None = None
+
+        self._slow = False
+        self._slow_count = 0
+        self._max_queued_bytes = 0
+        self._send_latency_s = 0.0
+        self._dropped: dict[SendKind, int] = collections.defaultdict(int)
+
+    @property
+    def slow(self) -> bool:
+        return self._slow
+
+    @property
+    def queued_bytes(self) -> int:
+        return self._queued_bytes
+
+    def stats(self) -> dict:
+        """
+        slow client metrics of the connection
+        """
+        return {
+            "slow": self._slow,
+            "slow_count": self._slow_count,
+            "queued_bytes": self._queued_bytes,
+            "queued_payloads": len(self._queue),
+            "max_queued_bytes": self._max_queued_bytes,
+            # queued -> sent of the last payload
+            "send_latency_s": self._send_latency_s,
+            "dropped": dict(self._dropped),
+        }
+
+    def put(self, payload: str | bytes, kind: SendKind = "control"):
+        if self._writer_task is None:
+            self._writer_task = asyncio.get_running_loop().create_task(self._writer_task_handler())
+
+        self._queue.append((kind, payload, time.monotonic()))
+        self._queued_bytes += len(payload)
+        self._max_queued_bytes = max(self._max_queued_bytes, self._queued_bytes)
+        self._event.set()
+        if self._queued_bytes > self._high_water_bytes:
+            self._shed()
+            self._set_slow(True)
+
+    def clear(self, kind: SendKind | None = None):
+        """
+        drop the queued payloads (of the kind), e.g. the audio on interruption
+        """
+        self._drop(lambda k, t: kind is None or k == kind, count=False)
+
+    async def stop(self, timeout_s: float = 1.0):
+        """
+        send the queued payloads in timeout_s, then stop the writer task
+        """
+        if not self._writer_task:
+            return
+        deadline = time.monotonic() + timeout_s
+        while self._queue and not self._writer_task.done() and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        await self.cancel()
+
+    async def cancel(self):
+        if self._writer_task and not self._writer_task.done():
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+        self._writer_task = None
+        self.clear()
+
+    def _shed(self):
+        # stale video/metrics first
+        self._drop(lambda k, t: k in ("video", "metrics"))
+        if self._queued_bytes <= self._high_water_bytes:
+            return
+        # audio older than the horizon
+        horizon = time.monotonic() - self._audio_horizon_s
+        self._drop(lambda k, t: k == "audio" and t < horizon)
+        # bounded: the oldest droppable payloads
+        while self._queued_bytes > self._max_bytes:
+            if not self._drop(lambda k, t: k != "control", limit=1):
+                break
+
+    def _drop(self, match: Callable[[SendKind, float], bool], limit: int = 0, count=True) -> int:
+        kept = collections.deque()
+        dropped = 0
+        for item in self._queue:
+            kind, payload, queued_time = item
+            if (limit == 0 or dropped < limit) and match(kind, queued_time):
+                dropped += 1
+                self._queued_bytes -= len(payload)
+                if count:
+                    self._dropped[kind] += 1
+            else:
+                kept.append(item)
+        self._queue = kept
+        return dropped
+
+    def _set_slow(self, slow: bool):
+        if slow == self._slow:
+            return
+        self._slow = slow
+        if slow:
+            self._slow_count += 1
+            logging.warning(f"slow client, send queue: {self.stats()}")
+        else:
+            logging.info(f"client caught up, send queue: {self.stats()}")
+        if self._on_slow:
+            asyncio.get_running_loop().create_task(self._on_slow(slow, self.stats()))
+
+    async def _writer_task_handler(self):
+        while True:
+            try:
+                if not self._queue:
+                    self._event.clear()
+                    await self._event.wait()
+                    continue
+                kind, payload, queued_time = self._queue.popleft()
+                self._queued_bytes -= len(payload)
+                await self._send(payload)
+                self._send_latency_s = time.monotonic() - queued_time
+                if self._slow and self._queued_bytes < self._high_water_bytes // 2:
+                    self._set_slow(False)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logging.error(f"send queue writer error: {e}")
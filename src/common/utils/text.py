@@ -0,0 +1,54 @@
+import re
+
+
+def normalize_text(text: str) -> str:
+    """
+    lower case, punctuation and extra spaces removed, for transcript comparison
+    """
+    return re.sub(r"[\W_]+", " ", text.lower()).strip()
+
+
+def count_words(text: str) -> int:
+    """
+    space separated words, each cjk char is counted as a word
+    """
+    words = 0
+    for word in text.split():
+        cjk = sum(1 for c in word if "⺀" <= c <= "鿿" or "豈" <= c <= "﫿")
+        words += cjk + (1 if cjk < len(word) else 0)
+    return words
+
+
+def edit_distance(a: str, b: str) -> int:
+    """
+    levenshtein distance of chars
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+def normalized_edit_distance(a: str, b: str) -> float:
+    """
+    edit distance of the normalized texts / max length, 0.0 same ~ 1.0 different
+    """
+    a, b = normalize_text(a), normalize_text(b)
+    if not a and not b:
+        return 0.0
+    return edit_distance(a, b) / max(len(a), len(b))
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    estimated llm token count without a tokenizer: ~4 ascii chars per token, ~1 token per cjk char
+    """
+    if not text:
+        return 0
+    ascii_cn = sum(1 for c in text if c.isascii())
+    return (ascii_cn + 3) // 4 + len(text) - ascii_cn
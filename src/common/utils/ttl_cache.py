@@ -0,0 +1,166 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from src.common.utils.histogram import LatencyHistogram
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.value = None
+        self.error: BaseException | None = None
+
+
+class TTLCache:
+    """
+    ttl result cache with lru eviction (bounded entries) and single-flight request coalescing:
+    concurrent calls with the same key share one upstream call (threads and asyncio tasks).
+    - cacheable: only cache the results it accepts, e.g.: not error results
+    - stats: hits, misses, coalesced calls, hit ratio and upstream latency histogram
+    """
+
+    # name -> cache, for stats
+    _caches: dict[str, "TTLCache"] = {}
+
+    def __init__(
+        self,
+        name: str,
+        ttl_s: float = 600.0,
+        max_entries: int = 1024,
+        cacheable: Callable[[Any], bool] | None = None,
+    ) -> None:
+        self.name = name
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._cacheable = cacheable
+        # key -> (expire_at, value)
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._flights: dict[Hashable, _Flight] = {}
+        self._aflights: dict[Hashable, asyncio.Future] = {}
+
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._upstream_latency = LatencyHistogram()
+        TTLCache._caches[name] = self
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        with self._lock:
+            return self._get(key)
+
+    def _get(self, key: Hashable) -> tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if entry[0] < time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        if self.ttl_s <= 0 or (self._cacheable and not self._cacheable(value)):
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_s, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_call(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        return cached value, or call fn once for concurrent callers (threads) with the same key
+        """
+        with self._lock:
+            hit, value = self._get(key)
+            if hit:
+                self._hits += 1
+                return value
+            flight = self._flights.get(key)
+            if flight is not None:
+                self._coalesced += 1
+                leader = False
+            else:
+                self._misses += 1
+                flight = self._flights[key] = _Flight()
+                leader = True
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            start = time.perf_counter()
+            flight.value = fn()
+            self._upstream_latency.observe(time.perf_counter() - start)
+            self.set(key, flight.value)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+
+    async def aget_or_call(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        return cached value, or await fn once for concurrent tasks with the same key
+        """
+        hit, value = self.get(key)
+        if hit:
+            self._hits += 1
+            return value
+        future = self._aflights.get(key)
+        if future is not None and future.get_loop() is asyncio.get_running_loop():
+            self._coalesced += 1
+            return await asyncio.shield(future)
+
+        self._misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._aflights[key] = future
+        try:
+            start = time.perf_counter()
+            value = await fn()
+            self._upstream_latency.observe(time.perf_counter() - start)
+            self.set(key, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # retrieved by the leader, no "exception was never retrieved" warning
+            future.exception()
+            raise
+        finally:
+            if self._aflights.get(key) is future:
+                del self._aflights[key]
+
+    @property
+    def stats(self) -> dict:
+        lookups = self._hits + self._misses + self._coalesced
+        return {
+            "size": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+            "coalesced": self._coalesced,
+            # coalesced calls don't hit the upstream either
+            "hit_ratio": (self._hits + self._coalesced) / lookups if lookups else 0.0,
+            "upstream_latency": self._upstream_latency.snapshot(),
+        }
+
+    @classmethod
+    def all_stats(cls) -> dict:
+        return {name: cache.stats for name, cache in cls._caches.items()}
@@ -24,3 +24,8 @@ class FunctionManager:
     def execute(name: str, session, **args):
         func_cls = FunctionManager.functions[name]
         return func_cls.execute(session, **args)
+
+    @staticmethod
+    async def aexecute(name: str, session, **args):
+        func_cls = FunctionManager.functions[name]
+        return await func_cls.aexecute(session, **args)
@@ -1,7 +1,11 @@
+import json
 import os
 import logging
 
+import requests
+
 from src.common.http import HTTPRequest
+from src.common.utils.ttl_cache import TTLCache
 from src.common.factory import EngineClass, EngineFactory
 from src.common import interface
 from src.modules.functions.function import FunctionManager
@@ -9,9 +13,30 @@ from src.common.types import SearchApiArgs, Search1ApiArgs, SerperApiArgs
 import src.modules.functions.search
 
 
+def is_cacheable_result(result) -> bool:
+    return isinstance(result, str) and not result.startswith('{"error"')
+
+
 class SearchBaseApi(EngineClass, interface.IFunction):
     def __init__(self) -> None:
         self.requests = HTTPRequest()
+        self._cache: TTLCache | None = None
+
+    @property
+    def cache(self) -> TTLCache:
+        if self._cache is None:
+            self._cache = TTLCache(
+                f"web_search_{self.TAG}",
+                ttl_s=self.args.cache_ttl_s,
+                max_entries=self.args.cache_max_entries,
+                cacheable=is_cacheable_result,
+            )
+        return self._cache
+
+    @staticmethod
+    def cache_key(query: str = "", **args) -> tuple:
+        # near-identical queries share the cached result
+        return (" ".join(str(query).lower().split()), tuple(sorted(args.items())))
 
     def get_tool_call(self):
         return {
@@ -28,10 +53,49 @@ class SearchBaseApi(EngineClass, interface.IFunction):
         }
 
     def execute(self, session, **args):
-        return self._web_search(session, **args)
-
-    def _web_search(self, session, **args) -> str:
-        pass
+        return self.cache.get_or_call(
+            self.cache_key(**args), lambda: self._web_search(session, **args)
+        )
+
+    async def aexecute(self, session, **args):
+        return await self.cache.aget_or_call(
+            self.cache_key(**args), lambda: self._aweb_search(session, **args)
+        )
+
+    def _search_request(self, query: str) -> tuple[str, str, dict]:
+        """
+        return method, url and request kwargs (params, headers, json)
+        """
+        raise NotImplementedError("must be implemented in the child class")
+
+    def _search_snippets(self, data: dict) -> list:
+        raise NotImplementedError("must be implemented in the child class")
+
+    def _web_search(self, session, query: str) -> str:
+        method, url, kwargs = self._search_request(query)
+        try:
+            response = self.requests.request(method, url, **kwargs)
+            response.raise_for_status()  # Raises for HTTP errors
+            return json.dumps(self._search_snippets(response.json()))
+        except requests.exceptions.HTTPError as http_err:
+            logging.error(f"HTTP error occurred: {http_err}")
+            return json.dumps({"error": "Failed to fetch search results"})
+        except Exception as err:
+            logging.error(f"An error occurred: {err}")
+            return json.dumps({"error": "Failed to fetch search results"})
+
+    async def _aweb_search(self, session, query: str) -> str:
+        method, url, kwargs = self._search_request(query)
+        try:
+            response = await self.requests.arequest(method, url, **kwargs)
+            response.raise_for_status()  # Raises for HTTP errors
+            return json.dumps(self._search_snippets(response.json()))
+        except requests.exceptions.HTTPError as http_err:
+            logging.error(f"HTTP error occurred: {http_err}")
+            return json.dumps({"error": "Failed to fetch search results"})
+        except Exception as err:
+            logging.error(f"An error occurred: {err}")
+            return json.dumps({"error": "Failed to fetch search results"})
 
 
 class SearchFuncEnvInit:
@@ -55,6 +119,7 @@ class SearchFuncEnvInit:
             hl=os.getenv("SERPER_HL", "zh-cn"),
             page=int(os.getenv("SERPER_PAGE", "1")),
             num=int(os.getenv("SERPER_NUM", "5")),
+            cache_ttl_s=float(os.getenv("FUNC_SEARCH_CACHE_TTL_S", "3600")),
         ).__dict__
 
     @staticmethod
@@ -65,6 +130,7 @@ class SearchFuncEnvInit:
             hl=os.getenv("SEARCH_HL", "zh-cn"),
             page=int(os.getenv("SERPER_PAGE", "1")),
             num=int(os.getenv("SERPER_NUM", "5")),
+            cache_ttl_s=float(os.getenv("FUNC_SEARCH_CACHE_TTL_S", "3600")),
         ).__dict__
 
     @staticmethod
@@ -74,6 +140,7 @@ class SearchFuncEnvInit:
             image=bool(os.getenv("SEARCH1_IMAGE", "")),
             crawl_results=int(os.getenv("CRAWL_RESULTS", "0")),
             max_results=int(os.getenv("MAX_RESULTS", "5")),
+            cache_ttl_s=float(os.getenv("FUNC_SEARCH_CACHE_TTL_S", "3600")),
         ).__dict__
 
     # TAG : config
@@ -93,3 +160,7 @@ class SearchFunc:
     @staticmethod
     def execute(session, **args):
         return SearchFuncEnvInit.initSearchEngine().execute(session, **args)
+
+    @staticmethod
+    async def aexecute(session, **args):
+        return await SearchFuncEnvInit.initSearchEngine().aexecute(session, **args)
@@ -1,6 +1,3 @@
-import requests
-import logging
-import json
 import os
 
 from src.common.types import Search1ApiArgs
@@ -19,9 +16,8 @@ class Search1Api(SearchBaseApi):
         super().__init__()
         self.args = Search1ApiArgs(**args)
 
-    def _web_search(self, session, query: str) -> str:
+    def _search_request(self, query: str) -> tuple[str, str, dict]:
         api_key = os.getenv("SEARCH1_API_KEY", "")
-        url = self.BASE_URL
         headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
@@ -33,16 +29,7 @@ class Search1Api(SearchBaseApi):
             "max_results": self.args.max_results,
             "crawl_results": self.args.crawl_results,
         }
+        return "POST", self.BASE_URL, {"headers": headers, "json": payload}
 
-        try:
-            response = self.requests.post(url, headers=headers, data=json.dumps(payload))
-            response.raise_for_status()  # Raises for HTTP errors
-            data = response.json()
-            snippets = [item["snippet"] for item in data["results"]]
-            return json.dumps(snippets)
-        except requests.exceptions.HTTPError as http_err:
-            print(f"HTTP error occurred: {http_err}")
-            return json.dumps({"error": "Failed to fetch search results"})
-        except Exception as err:
-            print(f"An error occurred: {err}")
-            return json.dumps({"error": "Failed to fetch search results"})
+    def _search_snippets(self, data: dict) -> list:
+        return [item["snippet"] for item in data["results"]]
@@ -1,6 +1,3 @@
-import requests
-import logging
-import json
 import os
 
 
@@ -20,7 +17,7 @@ class SearchApi(SearchBaseApi):
         super().__init__()
         self.args = SearchApiArgs(**args)
 
-    def _web_search(self, session, query: str) -> str:
+    def _search_request(self, query: str) -> tuple[str, str, dict]:
         api_key = os.getenv("SEARCH_API_KEY", "")
         params = {
             "engine": self.args.engine,
@@ -31,16 +28,7 @@ class SearchApi(SearchBaseApi):
             "page": self.args.page,
             "num": self.args.num,
         }
+        return "GET", self.BASE_URL, {"params": params}
 
-        try:
-            response = self.requests.get(self.BASE_URL, params=params)
-            response.raise_for_status()  # Raises for HTTP errors
-            data = response.json()
-            snippets = [item["snippet"] for item in data["organic_results"]]
-            return f"{json.dumps(snippets)}"
-        except requests.exceptions.HTTPError as http_err:
-            print(f"HTTP error occurred: {http_err}")
-            return json.dumps({"error": "Failed to fetch search results"})
-        except Exception as err:
-            print(f"An error occurred: {err}")
-            return json.dumps({"error": "Failed to fetch search results"})
+    def _search_snippets(self, data: dict) -> list:
+        return [item["snippet"] for item in data["organic_results"]]
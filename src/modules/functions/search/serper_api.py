@@ -1,9 +1,5 @@
-import requests
-import json
 import os
 
-import logging
-
 from src.common.types import SerperApiArgs
 from .api import SearchBaseApi
 
@@ -20,9 +16,8 @@ class SerperApi(SearchBaseApi):
         super().__init__()
         self.args = SerperApiArgs(**args)
 
-    def _web_search(self, session, query: str) -> str:
+    def _search_request(self, query: str) -> tuple[str, str, dict]:
         api_key = os.getenv("SERPER_API_KEY", "")
-        url = self.BASE_URL
         headers = {
             "X-API-KEY": api_key,
             "Content-Type": "application/json",
@@ -34,16 +29,7 @@ class SerperApi(SearchBaseApi):
             "page": self.args.page,
             "num": self.args.num,
         }
+        return "POST", self.BASE_URL, {"headers": headers, "json": payload}
 
-        try:
-            response = self.requests.post(url, headers=headers, json=payload)
-            response.raise_for_status()  # Raises for HTTP errors
-            data = response.json()
-            snippets = [item["snippet"] for item in data["organic"]]
-            return json.dumps(snippets)
-        except requests.exceptions.HTTPError as http_err:
-            print(f"HTTP error occurred: {http_err}")
-            return json.dumps({"error": "Failed to fetch search results"})
-        except Exception as err:
-            print(f"An error occurred: {err}")
-            return json.dumps({"error": "Failed to fetch search results"})
+    def _search_snippets(self, data: dict) -> list:
+        return [item["snippet"] for item in data["organic"]]
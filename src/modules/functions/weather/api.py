@@ -1,7 +1,11 @@
+import json
 import os
 import logging
 
+import requests
+
 from src.common.http import HTTPRequest
+from src.common.utils.ttl_cache import TTLCache
 from src.common.factory import EngineFactory, EngineClass
 from src.common import interface
 from src.modules.functions.function import FunctionManager
@@ -9,9 +13,30 @@ from src.common.types import OpenWeatherMapArgs
 import src.modules.functions.weather
 
 
+def is_cacheable_result(result) -> bool:
+    return isinstance(result, str) and not result.startswith('{"error"')
+
+
 class WeatherBaseApi(EngineClass, interface.IFunction):
     def __init__(self) -> None:
         self.requests = HTTPRequest()
+        self._cache: TTLCache | None = None
+
+    @property
+    def cache(self) -> TTLCache:
+        if self._cache is None:
+            self._cache = TTLCache(
+                f"get_weather_{self.TAG}",
+                ttl_s=self.args.cache_ttl_s,
+                max_entries=self.args.cache_max_entries,
+                cacheable=is_cacheable_result,
+            )
+        return self._cache
+
+    @staticmethod
+    def cache_key(longitude: float = 0.0, latitude: float = 0.0, **args) -> tuple:
+        # ~1km grid, nearby locations share the cached weather
+        return (round(float(longitude), 2), round(float(latitude), 2), tuple(sorted(args.items())))
 
     def get_tool_call(self):
         return {
@@ -37,10 +62,47 @@ class WeatherBaseApi(EngineClass, interface.IFunction):
         }
 
     def execute(self, session, **args):
-        return self._get_weather(session, **args)
+        return self.cache.get_or_call(
+            self.cache_key(**args), lambda: self._get_weather(session, **args)
+        )
+
+    async def aexecute(self, session, **args):
+        return await self.cache.aget_or_call(
+            self.cache_key(**args), lambda: self._aget_weather(session, **args)
+        )
+
+    def _weather_request(self, longitude: float, latitude: float) -> tuple[str, str, dict]:
+        """
+        return method, url and request kwargs (params, headers, json)
+        """
+        raise NotImplementedError("must be implemented in the child class")
 
-    def _get_weather(self, session, **args) -> str:
-        pass
+    def _get_weather(self, session, longitude: float, latitude: float) -> str:
+        method, url, kwargs = self._weather_request(longitude, latitude)
+        try:
+            response = self.requests.request(method, url, **kwargs)
+            # Raises a HTTPError if the HTTP request returned an unsuccessful status code
+            response.raise_for_status()
+            return json.dumps(response.json())
+        except requests.exceptions.HTTPError as http_err:
+            logging.error(f"HTTP error occurred: {http_err}")
+            return json.dumps({"error": "Failed to fetch weather data"})
+        except Exception as err:
+            logging.error(f"An error occurred: {err}")
+            return json.dumps({"error": "Failed to fetch weather data"})
+
+    async def _aget_weather(self, session, longitude: float, latitude: float) -> str:
+        method, url, kwargs = self._weather_request(longitude, latitude)
+        try:
+            response = await self.requests.arequest(method, url, **kwargs)
+            response.raise_for_status()
+            return json.dumps(response.json())
+        except requests.exceptions.HTTPError as http_err:
+            logging.error(f"HTTP error occurred: {http_err}")
+            return json.dumps({"error": "Failed to fetch weather data"})
+        except Exception as err:
+            logging.error(f"An error occurred: {err}")
+            return json.dumps({"error": "Failed to fetch weather data"})
 
 
 class WeatherFuncEnvInit:
@@ -64,6 +126,7 @@ class WeatherFuncEnvInit:
         return OpenWeatherMapArgs(
             units=os.getenv("OPEN_WEATHER_MAP_UNITS", "metric"),
             lang=os.getenv("OPEN_WEATHER_MAP_LANG", "zh_cn"),
+            cache_ttl_s=float(os.getenv("FUNC_WEATHER_CACHE_TTL_S", "600")),
         ).__dict__
 
     # TAG : config
@@ -81,3 +144,7 @@ class WeatherFunc:
     @staticmethod
     def execute(session, **args):
         return WeatherFuncEnvInit.initWeatherEngine().execute(session, **args)
+
+    @staticmethod
+    async def aexecute(session, **args):
+        return await WeatherFuncEnvInit.initWeatherEngine().aexecute(session, **args)
@@ -1,6 +1,3 @@
-import requests
-import logging
-import json
 import os
 
 from src.common.types import OpenWeatherMapArgs
@@ -20,18 +17,13 @@ class OpenWeatherMap(WeatherBaseApi):
         super().__init__()
         self.args = OpenWeatherMapArgs(**args)
 
-    def _get_weather(self, session, longitude: float, latitude: float) -> str:
+    def _weather_request(self, longitude: float, latitude: float) -> tuple[str, str, dict]:
         api_key = os.getenv("OPENWEATHERMAP_API_KEY", "")
-        url = f"{OpenWeatherMap.BASE_URL}?appid={api_key}&lat={latitude}&lon={longitude}&lang={self.args.lang}&units={self.args.units}"
-        try:
-            response = requests.get(url)
-            # Raises a HTTPError if the HTTP request returned an unsuccessful status code
-            response.raise_for_status()
-            data = response.json()
-            return json.dumps(data)
-        except requests.exceptions.HTTPError as http_err:
-            logging.error(f"HTTP error occurred: {http_err}")
-            return json.dumps({"error": "Failed to fetch weather data"})
-        except Exception as err:
-            logging.error(f"An error occurred: {err}")
-            return json.dumps({"error": "Failed to fetch weather data"})
+        params = {
+            "appid": api_key,
+            "lat": latitude,
+            "lon": longitude,
+            "lang": self.args.lang,
+            "units": self.args.units,
+        }
+        return "GET", self.BASE_URL, {"params": params}
@@ -4,16 +4,33 @@ from typing import Generator
 
 from src.common.session import Session
 from src.common.factory import EngineClass
-from src.types.speech.asr.base import ASRArgs
+from src.types.speech.asr.base import ASR_LATENCY_PROFILES, ASRArgs, ASRCapabilities
 from src.common.utils import task
 from src.common.interface import IAsr
 
 
 class ASRBase(EngineClass, IAsr):
+    # language arg value to let asr engine detect language
+    AUTO_LANGUAGE = None
+    CAPABILITIES = ASRCapabilities()
+
     @classmethod
     def get_args(cls, **kwargs) -> dict:
         return {**ASRArgs().__dict__, **kwargs}
 
+    @classmethod
+    def get_latency_profile_args(cls, profile: str) -> dict:
+        """
+        return the latency profile decode args which this engine honors
+        """
+        if profile not in ASR_LATENCY_PROFILES:
+            raise ValueError(f"unknown asr latency profile: {profile}")
+        return {
+            k: v
+            for k, v in ASR_LATENCY_PROFILES[profile].items()
+            if getattr(cls.CAPABILITIES, k, False)
+        }
+
     def __init__(self, **args) -> None:
         self.args = ASRArgs(**args)
         self.asr_audio = None
@@ -0,0 +1,108 @@
+import logging
+from dataclasses import dataclass
+
+from src.common.factory import EngineClass
+from src.common.interface import IAsr
+from src.types.speech.asr.base import ASRLanguageTrackerArgs
+
+
+@dataclass
+class SessionLanguageState:
+    language: str | None = None
+    confidence: float = 0.0
+    detected_cn: int = 0
+    # pinned by ASRLanguageUpdateFrame, no decay and no detection
+    pinned: bool = False
+
+
+class ASRLanguageTracker:
+    """
+    per-session language tracker for multilingual asr
+    - detect language on the first utterances (asr engine language=None/auto)
+    - cache detected language with confidence decay, pass it explicitly to later transcriptions
+    - re-detect when cached language confidence decays below min_confidence
+    - optional route session to a smaller language-specific asr engine
+      (loaded once per tracker, not shared with the other asr processors)
+    """
+
+    def __init__(self, **args) -> None:
+        self.args = ASRLanguageTrackerArgs(**args)
+        self._states: dict[str, SessionLanguageState] = {}
+        # (tag, model_name_or_path) -> asr engine
+        self._route_engines: dict = {}
+
+    def get_state(self, session_id: str) -> SessionLanguageState:
+        if session_id not in self._states:
+            self._states[session_id] = SessionLanguageState()
+        return self._states[session_id]
+
+    def get_language(self, session_id: str) -> str | None:
+        """
+        return cached language to transcribe with, None if need detect language
+        """
+        state = self.get_state(session_id)
+        if state.pinned:
+            return state.language
+        if state.language is None or state.detected_cn < self.args.detect_utterances:
+            return None
+        if state.confidence < self.args.min_confidence:
+            logging.debug(f"{session_id} language {state.language} confidence decayed, re-detect")
+            return None
+        state.confidence *= self.args.confidence_decay
+        return state.language
+
+    def update(self, session_id: str, language: str | None, probability: float | None = None):
+        """
+        update session language with detect result from asr engine transcribe
+        """
+        state = self.get_state(session_id)
+        if state.pinned or not language:
+            return
+        if not isinstance(probability, (int, float)):
+            probability = self.args.default_probability
+        state.detected_cn += 1
+        if state.language == language:
+            state.confidence = max(state.confidence, probability)
+        elif state.language is None or probability >= state.confidence:
+            logging.info(
+                f"{session_id} language {state.language}({state.confidence:.2f})"
+                f" -> {language}({probability:.2f})"
+            )
+            state.language = language
+            state.confidence = probability
+
+    def set_language(self, session_id: str, language: str | None):
+        """
+        override session language, e.g.: from ASRLanguageUpdateFrame;
+        set None to unpin and detect again
+        """
+        state = self.get_state(session_id)
+        state.language = language
+        state.confidence = 1.0 if language else 0.0
+        state.pinned = language is not None
+
+    def reset(self, session_id: str):
+        self._states.pop(session_id, None)
+
+    def clear(self):
+        self._states.clear()
+
+    def route(self, language: str | None) -> IAsr | EngineClass | None:
+        """
+        return language-specific asr engine from model routes, None use default asr engine
+        """
+        if not language or not self.args.model_routes:
+            return None
+        route = self.args.model_routes.get(language)
+        if not route or not route.get("tag"):
+            return None
+
+        tag = route["tag"]
+        args = route.get("args") or {}
+        key = (tag, args.get("model_name_or_path", ""))
+        if key not in self._route_engines:
+            from src.modules.speech.asr import ASREnvInit
+
+            logging.info(f"load {language} route asr engine {key}")
+            self._route_engines[key] = ASREnvInit.getEngine(tag, **args)
+        return self._route_engines[key]
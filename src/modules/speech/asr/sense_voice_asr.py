@@ -6,10 +6,13 @@ from src.common.device_cuda import CUDAInfo
 from src.common.utils.audio_utils import bytes2TorchTensorWith16
 from src.common.session import Session
 from src.modules.speech.asr.base import ASRBase
+from src.types.speech.asr.base import ASRCapabilities
 
 
 class SenseVoiceAsr(ASRBase):
     TAG = "sense_voice_asr"
+    AUTO_LANGUAGE = "auto"
+    CAPABILITIES = ASRCapabilities(language_detection=True)
 
     def __init__(self, **args) -> None:
         from deps.SenseVoice.model import SenseVoiceSmall
@@ -57,8 +60,13 @@ class SenseVoiceAsr(ASRBase):
             **self.kwargs,
         )
         clean_text = re.sub(r"<\|.*?\|>", "", transcription[0]["text"])
+        language = self.args.language
+        if language == self.AUTO_LANGUAGE:
+            # rich transcription starts with language tag, e.g.: <|zh|><|NEUTRAL|>...
+            match = re.match(r"<\|(\w+)\|>", transcription[0]["text"])
+            language = match.group(1) if match else None
         res = {
-            "language": self.args.language,
+            "language": language,
             "language_probability": None,
             "text": clean_text,
             "words": [],
@@ -5,6 +5,7 @@ from src.common.utils.audio_utils import bytes2NpArrayWith16
 from src.common.session import Session
 from src.common.device_cuda import CUDAInfo
 from src.modules.speech.asr.base import ASRBase
+from src.types.speech.asr.base import ASRCapabilities
 
 """
 https://huggingface.co/learn/audio-course/en/chapter5/asr_models
@@ -13,6 +14,9 @@ https://huggingface.co/learn/audio-course/en/chapter5/asr_models
 
 class WhisperAsr(ASRBase):
     TAG = "whisper_asr"
+    CAPABILITIES = ASRCapabilities(
+        beam_size=True, word_timestamps=True, segment_stream=True, language_detection=True
+    )
 
     def __init__(self, **args) -> None:
         import whisper
@@ -29,42 +33,54 @@ class WhisperAsr(ASRBase):
             self.asr_audio = audio_data
         return
 
-    async def transcribe_stream(self, session: Session) -> AsyncGenerator[str, None]:
-        transcription = await asyncio.to_thread(
-            self.model.transcribe,
+    def _transcribe(self):
+        # openai-whisper decodes greedy when beam_size is None
+        beam_size = self.args.beam_size if self.args.beam_size and self.args.beam_size > 1 else None
+        return self.model.transcribe(
             self.asr_audio,
             verbose=self.args.verbose,
             language=self.args.language,
-            word_timestamps=True,
+            beam_size=beam_size,
+            word_timestamps=self.args.word_timestamps,
             condition_on_previous_text=True,
         )
+
+    async def transcribe_stream(self, session: Session) -> AsyncGenerator[str, None]:
+        transcription = await asyncio.to_thread(self._transcribe)
         for segment in transcription["segments"]:
+            if not self.args.word_timestamps:
+                yield segment["text"]
+                continue
             for word in segment["words"]:
                 yield word["word"]
 
     async def transcribe(self, session: Session) -> dict:
-        transcription = await asyncio.to_thread(
-            self.model.transcribe,
-            self.asr_audio,
-            verbose=self.args.verbose,
-            language=self.args.language,
-            word_timestamps=True,
-            condition_on_previous_text=True,
-        )
+        transcription = await asyncio.to_thread(self._transcribe)
         flattened_words = [
-            word for segment in transcription["segments"] for word in segment["words"]
+            word for segment in transcription["segments"] for word in segment.get("words", [])
         ]
         res = {
-            "language": self.args.language,
+            "language": self.args.language or transcription["language"],
             "language_probability": transcription["language"],
             "text": transcription["text"].strip(),
             "words": flattened_words,
+            "segments": [
+                {
+                    "text": segment["text"],
+                    "avg_logprob": segment["avg_logprob"],
+                    "compression_ratio": segment["compression_ratio"],
+                    "no_speech_prob": segment["no_speech_prob"],
+                }
+                for segment in transcription["segments"]
+            ],
         }
         return res
 
 
 class WhisperTimestampedAsr(WhisperAsr):
     TAG = "whisper_timestamped_asr"
+    # always align word timestamps
+    CAPABILITIES = ASRCapabilities(language_detection=True)
 
     async def transcribe_stream(self, session: Session) -> AsyncGenerator[str, None]:
         from whisper_timestamped import transcribe_timestamped
@@ -114,6 +130,9 @@ class WhisperTimestampedAsr(WhisperAsr):
 
 class WhisperFasterAsr(ASRBase):
     TAG = "whisper_faster_asr"
+    CAPABILITIES = ASRCapabilities(
+        beam_size=True, word_timestamps=True, segment_stream=True, language_detection=True
+    )
 
     def __init__(self, **args) -> None:
         """
@@ -164,11 +183,18 @@ class WhisperFasterAsr(ASRBase):
             self.model.transcribe,
             self.asr_audio,
             language=self.args.language,
-            beam_size=5,
-            word_timestamps=True,
+            beam_size=self.args.beam_size or 5,
+            word_timestamps=self.args.word_timestamps,
             condition_on_previous_text=True,
         )
-        for segment in segmentsIter:
+        # segments are decoded lazily, yield each one as soon as it is decoded
+        while True:
+            segment = await asyncio.to_thread(next, segmentsIter, None)
+            if segment is None:
+                break
+            if not self.args.word_timestamps:
+                yield segment.text
+                continue
             for w in segment.words:
                 yield w.word
 
@@ -177,13 +203,13 @@ class WhisperFasterAsr(ASRBase):
             self.model.transcribe,
             self.asr_audio,
             language=self.args.language,
-            beam_size=5,
-            word_timestamps=True,
+            beam_size=self.args.beam_size or 5,
+            word_timestamps=self.args.word_timestamps,
             condition_on_previous_text=True,
         )
         # The transcription will actually run here.
-        segments = list(segmentsIter)
-        flattened_words = [word for segment in segments for word in segment.words]
+        segments = await asyncio.to_thread(list, segmentsIter)
+        flattened_words = [word for segment in segments for word in segment.words or []]
 
         # print(type(flattened_words[0]))
         res = {
@@ -194,12 +220,22 @@ class WhisperFasterAsr(ASRBase):
                 {"word": w.word, "start": w.start, "end": w.end, "probability": w.probability}
                 for w in flattened_words
             ],
+            "segments": [
+                {
+                    "text": s.text,
+                    "avg_logprob": s.avg_logprob,
+                    "compression_ratio": s.compression_ratio,
+                    "no_speech_prob": s.no_speech_prob,
+                }
+                for s in segments
+            ],
         }
         return res
 
 
 class WhisperTransformersAsr(ASRBase):
     TAG = "whisper_transformers_asr"
+    CAPABILITIES = ASRCapabilities(beam_size=True, word_timestamps=True)
 
     def __init__(self, **args) -> None:
         super().__init__(**args)
@@ -234,36 +270,37 @@ class WhisperTransformersAsr(ASRBase):
             self.asr_audio = audio_data
         return
 
-    async def transcribe_stream(self, session: Session) -> AsyncGenerator[str, None]:
-        outputs = await asyncio.to_thread(
-            self.pipe,
+    def _pipe(self):
+        generate_kwargs = {"language": self.args.language}
+        if self.args.beam_size:
+            generate_kwargs["num_beams"] = self.args.beam_size
+        # for Word-level timestamps batch-size must be 1.
+        # https://huggingface.co/openai/whisper-large-v3/discussions/12
+        return self.pipe(
             self.asr_audio,
             chunk_length_s=30,
             batch_size=1,
-            generate_kwargs={"language": self.args.language},
-            return_timestamps="word",
+            generate_kwargs=generate_kwargs,
+            return_timestamps="word" if self.args.word_timestamps else False,
         )
+
+    async def transcribe_stream(self, session: Session) -> AsyncGenerator[str, None]:
+        outputs = await asyncio.to_thread(self._pipe)
+        if not self.args.word_timestamps:
+            yield outputs["text"]
+            return
         for item in outputs["chunks"]:
             yield item["text"]
 
     async def transcribe(self, session: Session) -> dict:
-        # for Word-level timestamps batch-size must be 1.
-        # https://huggingface.co/openai/whisper-large-v3/discussions/12
-        outputs = await asyncio.to_thread(
-            self.pipe,
-            self.asr_audio,
-            chunk_length_s=30,
-            batch_size=1,
-            generate_kwargs={"language": self.args.language},
-            return_timestamps="word",
-        )
+        outputs = await asyncio.to_thread(self._pipe)
         res = {
             "language": self.args.language,
             "language_probability": None,
             "text": outputs["text"].strip(),
             "words": [
                 {"text": item["text"], "start": item["timestamp"][0], "end": item["timestamp"][1]}
-                for item in outputs["chunks"]
+                for item in outputs.get("chunks", [])
             ],
         }
         return res
@@ -271,6 +308,7 @@ class WhisperTransformersAsr(ASRBase):
 
 class WhisperMLXAsr(ASRBase):
     TAG = "whisper_mlx_asr"
+    CAPABILITIES = ASRCapabilities(word_timestamps=True, segment_stream=True)
 
     def set_audio_data(self, audio_data):
         if isinstance(audio_data, (bytes, bytearray)):
@@ -288,9 +326,13 @@ class WhisperMLXAsr(ASRBase):
             mlx_whisper.transcribe,
             self.asr_audio,
             path_or_hf_repo=self.args.model_name_or_path,
-            word_timestamps=True,
+            word_timestamps=self.args.word_timestamps,
             **transcribe_kargs,
         )
+        if not self.args.word_timestamps:
+            for segment in outputs["segments"]:
+                yield segment["text"]
+            return
         for item in outputs["words"]:
             yield item["text"]
 
@@ -303,7 +345,7 @@ class WhisperMLXAsr(ASRBase):
             mlx_whisper.transcribe,
             self.asr_audio,
             path_or_hf_repo=self.args.model_name_or_path,
-            word_timestamps=True,
+            word_timestamps=self.args.word_timestamps,
             **transcribe_kargs,
         )
         res = {
@@ -317,7 +359,7 @@ class WhisperMLXAsr(ASRBase):
                     "end": item["end"],
                     "probability": item["confidence"],
                 }
-                for item in outputs["words"]
+                for item in outputs.get("words", [])
             ],
         }
         return res
@@ -1,23 +1,44 @@
+import io
+import os
+import wave
 from pathlib import Path
 from typing import AsyncGenerator
-import logging
 
-from src.common.utils.wav import save_audio_to_file
+from src.common.provider_pool import ProviderClientPool
 from src.common.session import Session
-from src.common.types import RECORDS_DIR
 from src.types.speech.asr.whisper import WhisperGroqASRArgs
+from src.types.speech.asr.base import ASRCapabilities
 from src.modules.speech.asr.base import ASRBase
 
 
 class WhisperGroqAsr(ASRBase):
     TAG = "whisper_groq_asr"
+    CAPABILITIES = ASRCapabilities(language_detection=True)
+    PROVIDER = "groq"
 
     def __init__(self, **args) -> None:
-        from groq import Groq
-
         self.args = WhisperGroqASRArgs(**args)
         self.asr_audio = None
-        self.client = Groq()
+        self._api_key = self.args.api_key or os.getenv("GROQ_API_KEY", "")
+        self._base_url = self.args.base_url or os.getenv("GROQ_BASE_URL")
+
+    @property
+    def client(self):
+        """shared keep-alive async client per (api key, base url)"""
+        from groq import AsyncGroq
+
+        def new_client():
+            return AsyncGroq(
+                api_key=self._api_key,
+                base_url=self._base_url,
+                # retry idempotent transcription in provider pool
+                max_retries=0,
+                http_client=ProviderClientPool.get_http_client(self.PROVIDER, self._base_url or ""),
+            )
+
+        return ProviderClientPool.get_client(
+            self.PROVIDER, (self._api_key, self._base_url), new_client
+        )
 
     def set_audio_data(self, audio_data):
         if isinstance(audio_data, (bytes, bytearray)):
@@ -25,35 +46,48 @@ class WhisperGroqAsr(ASRBase):
         if isinstance(audio_data, str):
             self.asr_audio = Path(audio_data)
 
-    async def transcribe_stream(self, session: Session) -> AsyncGenerator[str, None]:
-        if isinstance(self.asr_audio, bytes):
-            file_path = await save_audio_to_file(self.asr_audio, "tmp.wav", audio_dir=RECORDS_DIR)
-            self.asr_audio = Path(file_path)
-        transcription = self.client.audio.transcriptions.create(
-            file=self.asr_audio,
-            model=self.args.model_name_or_path,
-            prompt=self.args.prompt,  # Optional
-            response_format="text",  # Optional
-            language=self.args.language,  # Optional
-            temperature=self.args.temperature,  # Optional
-            timeout=self.args.timeout_s,  # Optional
+    def _get_file(self):
+        """
+        encode request audio in memory, no temp file
+        """
+        if not isinstance(self.asr_audio, bytes):
+            return self.asr_audio
+        if self.asr_audio[:4] == b"RIFF":
+            return ("audio.wav", self.asr_audio)
+        content = io.BytesIO()
+        with wave.open(content, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.args.sample_rate)
+            wav_file.writeframes(self.asr_audio)
+        return ("audio.wav", content.getvalue())
+
+    async def _transcribe(self, response_format: str):
+        file = self._get_file()
+        return await ProviderClientPool.request(
+            self.PROVIDER,
+            lambda: self.client.audio.transcriptions.create(
+                file=file,
+                model=self.args.model_name_or_path,
+                prompt=self.args.prompt,  # Optional
+                response_format=response_format,  # Optional
+                language=self.args.language,  # Optional
+                temperature=self.args.temperature,  # Optional
+                timeout=self.args.timeout_s,  # Optional
+            ),
+            api_key=self._api_key,
+            # transcription has no side effect, safe to retry
+            idempotent=True,
+            max_in_flight=self.args.max_in_flight,
+            max_retries=self.args.max_retries,
         )
+
+    async def transcribe_stream(self, session: Session) -> AsyncGenerator[str, None]:
+        transcription = await self._transcribe("text")
         yield transcription
 
     async def transcribe(self, session: Session) -> dict:
-        if isinstance(self.asr_audio, bytes):
-            file_path = await save_audio_to_file(self.asr_audio, "tmp.wav", audio_dir=RECORDS_DIR)
-            self.asr_audio = Path(file_path)
-
-        transcription = self.client.audio.transcriptions.create(
-            file=self.asr_audio,
-            model=self.args.model_name_or_path,
-            prompt=self.args.prompt,  # Optional
-            response_format="verbose_json",  # Optional
-            language=self.args.language,  # Optional
-            temperature=self.args.temperature,  # Optional
-            timeout=self.args.timeout_s,  # Optional
-        )
+        transcription = await self._transcribe("verbose_json")
         res = {
             "language": self.args.language,
             "language_probability": transcription.language,
@@ -0,0 +1,101 @@
+import logging
+import zlib
+
+from src.common.factory import EngineClass
+from src.common.interface import IHallucination
+from src.common.session import Session
+from src.common.utils.text import normalize_text
+from src.types.speech.hallucination import ASRHallucinationArgs
+
+
+def compression_ratio(text: str) -> float:
+    text_bytes = text.encode("utf-8")
+    return len(text_bytes) / len(zlib.compress(text_bytes))
+
+
+class ASRHallucinationFilter(EngineClass, IHallucination):
+    """
+    post-asr hallucination filter with segment compression ratio and avg logprob,
+    input: session.ctx.state["transcribe_res"] (asr transcribe result)
+    - segments with avg_logprob/compression_ratio/no_speech_prob (whisper), or
+    - text only, check text compression ratio and blacklist
+    """
+
+    TAG = "asr_hallucination_filter"
+
+    def __init__(self, **args) -> None:
+        self.args = ASRHallucinationArgs(**args)
+        self._blacklist = {normalize_text(item) for item in self.args.blacklist}
+
+        self._checked = 0
+        self._hallucinated = 0
+        self._dropped_segments = 0
+        self._dropped_chars = 0
+
+    @staticmethod
+    def _get(segment, key: str):
+        if isinstance(segment, dict):
+            return segment.get(key)
+        return getattr(segment, key, None)
+
+    def _get_segments(self, session: Session) -> list:
+        res = session.ctx.state.get("transcribe_res") or {}
+        segments = res.get("segments")
+        if not segments:
+            segments = [{"text": res.get("text", "")}]
+        return segments
+
+    def is_hallucination(self, segment) -> bool:
+        text = (self._get(segment, "text") or "").strip()
+        norm_text = normalize_text(text)
+        if not norm_text or norm_text in self._blacklist:
+            return True
+
+        ratio = self._get(segment, "compression_ratio")
+        if ratio is None and len(text.encode("utf-8")) >= self.args.min_compression_text_len:
+            ratio = compression_ratio(text)
+        if ratio is not None and ratio > self.args.compression_ratio_threshold:
+            return True
+
+        avg_logprob = self._get(segment, "avg_logprob")
+        if avg_logprob is not None and avg_logprob < self.args.logprob_threshold:
+            no_speech_prob = self._get(segment, "no_speech_prob")
+            if no_speech_prob is None or no_speech_prob > self.args.no_speech_threshold:
+                return True
+
+        return False
+
+    def check(self, session: Session) -> bool:
+        """
+        return True if the transcription has hallucinated segments
+        """
+        self._checked += 1
+        is_hallucinated = any(self.is_hallucination(seg) for seg in self._get_segments(session))
+        if is_hallucinated:
+            self._hallucinated += 1
+        return is_hallucinated
+
+    def filter(self, session: Session) -> str:
+        """
+        return the transcription text without hallucinated segments
+        """
+        texts = []
+        for segment in self._get_segments(session):
+            text = self._get(segment, "text") or ""
+            if self.is_hallucination(segment):
+                self._dropped_segments += 1
+                self._dropped_chars += len(text)
+                logging.debug(f"drop hallucinated segment: {segment}")
+                continue
+            texts.append(text)
+        return "".join(texts).strip()
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "checked": self._checked,
+            "hallucinated": self._hallucinated,
+            "dropped_segments": self._dropped_segments,
+            # dropped text don't go to llm/tts
+            "dropped_chars": self._dropped_chars,
+        }
@@ -0,0 +1,117 @@
+import logging
+
+import numpy as np
+
+from src.common.factory import EngineClass
+from src.common.interface import IVADAnalyzer
+from src.common.types import INT16_MAX_ABS_VALUE
+from src.common.utils.helper import exp_smoothing
+from src.types.speech.hallucination import SpeechSegmentGateArgs
+
+
+class SpeechSegmentGate(EngineClass):
+    """
+    cheap pre-asr gate, drop non-speech segments before asr decoding with:
+    - vad speech ratio over the segment (vad analyzer confidence or frame energy)
+    - minimum voiced duration
+    - spectral flatness of voiced frames (noise, clicks are flat)
+
+    NOTE: vad analyzer is stateful (e.g.: silero), don't share it with the transport vad
+    """
+
+    TAG = "speech_segment_gate"
+
+    def __init__(self, vad_analyzer: IVADAnalyzer | EngineClass | None = None, **args) -> None:
+        self.args = SpeechSegmentGateArgs(**args)
+        self._vad_analyzer = vad_analyzer
+        if vad_analyzer is not None:
+            self._frame_len = vad_analyzer.num_frames_required()
+        else:
+            self._frame_len = int(self.args.sample_rate * self.args.frame_ms / 1000)
+        self._window = np.hanning(self._frame_len).astype(np.float32)
+
+        self._segments = 0
+        self._dropped_segments = 0
+        self._audio_secs = 0.0
+        self._dropped_audio_secs = 0.0
+        # asr realtime factor (decode secs / audio secs) exponential smoothing
+        self._asr_rtf = 0.0
+        self._smoothing_factor = 0.2
+
+    def analyze(self, audio: bytes) -> dict:
+        """
+        analyze 16-bit mono pcm segment
+        return speech_ratio, voiced_secs, spectral_flatness
+        """
+        samples = np.frombuffer(audio, dtype=np.int16)
+        num_frames = len(samples) // self._frame_len
+        if num_frames == 0:
+            return {"speech_ratio": 0.0, "voiced_secs": 0.0, "spectral_flatness": 1.0}
+
+        frames = samples[: num_frames * self._frame_len].reshape(num_frames, self._frame_len)
+        if self._vad_analyzer is not None:
+            voiced = np.array(
+                [
+                    self._vad_analyzer.voice_confidence(frame.tobytes()) >= self.args.vad_confidence
+                    for frame in frames
+                ]
+            )
+        else:
+            float_frames = frames.astype(np.float32) / INT16_MAX_ABS_VALUE
+            rms = np.sqrt(np.mean(float_frames**2, axis=1))
+            voiced = 20 * np.log10(rms + 1e-10) >= self.args.energy_threshold_dbfs
+
+        voiced_frames = frames[voiced] if voiced.any() else frames
+        spectrum = np.abs(np.fft.rfft(voiced_frames.astype(np.float32) * self._window, axis=1))
+        power = spectrum**2 + 1e-10
+        flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+
+        return {
+            "speech_ratio": float(voiced.mean()),
+            "voiced_secs": float(voiced.sum() * self._frame_len / self.args.sample_rate),
+            "spectral_flatness": float(flatness.mean()),
+        }
+
+    def is_speech(self, audio: bytes) -> bool:
+        """
+        return False if the segment should be dropped before asr
+        """
+        audio_secs = len(audio) / 2 / self.args.sample_rate
+        res = self.analyze(audio)
+        is_speech = (
+            res["speech_ratio"] >= self.args.min_speech_ratio
+            and res["voiced_secs"] >= self.args.min_voiced_secs
+            and res["spectral_flatness"] <= self.args.max_spectral_flatness
+        )
+
+        self._segments += 1
+        self._audio_secs += audio_secs
+        if not is_speech:
+            self._dropped_segments += 1
+            self._dropped_audio_secs += audio_secs
+            logging.debug(f"drop non-speech segment {audio_secs:.2f}s: {res}")
+        return is_speech
+
+    def update_asr_rtf(self, audio_secs: float, elapsed_secs: float):
+        """
+        update asr realtime factor with the decoded segment, to estimate saved asr compute
+        """
+        if audio_secs <= 0:
+            return
+        rtf = elapsed_secs / audio_secs
+        if self._asr_rtf == 0:
+            self._asr_rtf = rtf
+            return
+        self._asr_rtf = exp_smoothing(rtf, self._asr_rtf, self._smoothing_factor)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "segments": self._segments,
+            "dropped_segments": self._dropped_segments,
+            "audio_secs": self._audio_secs,
+            "dropped_audio_secs": self._dropped_audio_secs,
+            "asr_rtf": self._asr_rtf,
+            # estimated asr decode time saved
+            "saved_asr_secs": self._dropped_audio_secs * self._asr_rtf,
+        }
@@ -28,6 +28,10 @@ class BaseVADAnalyzer(IVADAnalyzer, EngineClass):
     def sample_rate(self):
         return self._args.sample_rate
 
+    def clone(self) -> "BaseVADAnalyzer":
+        """a new analyzer with the same args and its own state, e.g.: one per participant"""
+        return self.__class__(**self._args.__dict__)
+
     def num_frames_required(self) -> int:
         return int(self.sample_rate / 100.0)
 
@@ -36,15 +40,19 @@ class BaseVADAnalyzer(IVADAnalyzer, EngineClass):
         return exp_smoothing(volume, self._prev_volume, self._smoothing_factor)
 
     def analyze_audio(self, buffer) -> VADState:
+        """
+        analyze all the whole vad frames in the buffer (batched reads), the rest waits
+        """
         self._vad_buffer += buffer
 
         num_required_bytes = self._vad_frames_num_bytes
-        if len(self._vad_buffer) < num_required_bytes:
-            return self._vad_state
-
-        audio_frames = self._vad_buffer[:num_required_bytes]
-        self._vad_buffer = self._vad_buffer[num_required_bytes:]
+        while len(self._vad_buffer) >= num_required_bytes:
+            audio_frames = self._vad_buffer[:num_required_bytes]
+            self._vad_buffer = self._vad_buffer[num_required_bytes:]
+            self._analyze_vad_frames(audio_frames)
+        return self._vad_state
 
+    def _analyze_vad_frames(self, audio_frames: bytes):
         confidence = self.voice_confidence(audio_frames)
 
         volume = self._get_smoothed_volume(audio_frames)
@@ -86,5 +94,3 @@ class BaseVADAnalyzer(IVADAnalyzer, EngineClass):
         ):
             self._vad_state = VADState.QUIET
             self._vad_stopping_count = 0
-
-        return self._vad_state
@@ -48,6 +48,10 @@ class SileroVADAnalyzer(BaseVADAnalyzer):
     def vad(self):
         return self._vad
 
+    def clone(self) -> "SileroVADAnalyzer":
+        # the silero model keeps the stream states, a model per analyzer
+        return self.__class__(**self.args.__dict__)
+
     def num_frames_required(self) -> int:
         return self._vad.get_sample_info()[1]
 
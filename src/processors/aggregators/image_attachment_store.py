@@ -0,0 +1,160 @@
+import base64
+import hashlib
+import io
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from PIL import Image
+
+from src.types.frames.data_frames import VisionImageRawFrame
+from src.types.llm.context import LLMImageAttachmentArgs
+
+
+@dataclass
+class ImageAttachment:
+    hash: str
+    mime_type: str
+    data: bytes
+    size: tuple[int, int]
+    # base64 data url, encoded once on first request
+    url: str = ""
+
+    def get_url(self) -> str:
+        if not self.url:
+            self.url = f"data:{self.mime_type};base64,{base64.b64encode(self.data).decode('utf-8')}"
+        return self.url
+
+
+def image_url_message(message: dict, url: str) -> dict:
+    """
+    openai request message with image_url content from the context image message
+    """
+    request_message = {
+        k: v for k, v in message.items() if k not in ("data", "mime_type", "image_hash")
+    }
+    request_message["content"] = [
+        {"type": "text", "text": message.get("content") or ""},
+        {"type": "image_url", "image_url": {"url": url}},
+    ]
+    return request_message
+
+
+class ImageAttachmentStore:
+    """
+    image attachments for the llm chat context
+    - downscale to max side and encode (JPEG/WEBP) once, cached by content hash
+    - context messages reference the encoded image:
+      {"role": "user", "content": text, "data": BytesIO, "mime_type": mime, "image_hash": hash}
+    - openai request messages use the cached base64 data url, the context is not mutated
+    - image messages older than max image turns are replaced with text placeholders
+    """
+
+    def __init__(self, **args) -> None:
+        self.args = LLMImageAttachmentArgs(**args)
+        self._cache: OrderedDict[str, ImageAttachment] = OrderedDict()
+
+    @staticmethod
+    def hash_bytes(*items: bytes) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        for item in items:
+            h.update(item)
+        return h.hexdigest()
+
+    def _put(self, attachment: ImageAttachment):
+        self._cache[attachment.hash] = attachment
+        self._cache.move_to_end(attachment.hash)
+        while len(self._cache) > self.args.cache_size:
+            self._cache.popitem(last=False)
+
+    def get(self, image_hash: str) -> ImageAttachment | None:
+        attachment = self._cache.get(image_hash)
+        if attachment is not None:
+            self._cache.move_to_end(image_hash)
+        return attachment
+
+    def encode(self, image: Image.Image) -> tuple[bytes, str, tuple[int, int]]:
+        if self.args.max_side > 0 and max(image.size) > self.args.max_side:
+            image = image.copy()
+            image.thumbnail((self.args.max_side, self.args.max_side), Image.Resampling.BILINEAR)
+        img_format = self.args.format.upper()
+        if img_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        buffer = io.BytesIO()
+        image.save(buffer, format=img_format, quality=self.args.quality)
+        return buffer.getvalue(), f"image/{img_format.lower()}", image.size
+
+    def add_frame(self, frame: VisionImageRawFrame) -> ImageAttachment:
+        image_hash = self.hash_bytes(f"{frame.mode}{frame.size}".encode(), frame.image)
+        attachment = self.get(image_hash)
+        if attachment is not None:
+            return attachment
+
+        image = Image.frombytes(frame.mode, frame.size, frame.image)
+        data, mime_type, size = self.encode(image)
+        attachment = ImageAttachment(image_hash, mime_type, data, size)
+        self._put(attachment)
+        logging.debug(
+            f"encode image {frame.size} {len(frame.image)} B -> {mime_type} {len(data)} B"
+        )
+        return attachment
+
+    def image_message(self, frame: VisionImageRawFrame) -> dict:
+        attachment = self.add_frame(frame)
+        return {
+            "content": frame.text,
+            "role": "user",
+            "data": io.BytesIO(attachment.data),
+            "mime_type": attachment.mime_type,
+            "image_hash": attachment.hash,
+        }
+
+    def _get_message_attachment(self, message: dict) -> ImageAttachment:
+        image_hash = message.get("image_hash")
+        attachment = self.get(image_hash) if image_hash else None
+        if attachment is not None:
+            return attachment
+        # evicted from the cache, or raw image bytes message
+        data = message["data"].getvalue()
+        image_hash = image_hash or self.hash_bytes(data)
+        attachment = ImageAttachment(image_hash, message["mime_type"], data, (0, 0))
+        self._put(attachment)
+        return attachment
+
+    def to_openai_message(self, message: dict) -> dict:
+        """
+        openai request message with image_url content, the context message is kept as is
+        """
+        if message.get("data") is None or not message.get("mime_type"):
+            return message
+        attachment = self._get_message_attachment(message)
+        return image_url_message(message, attachment.get_url())
+
+    def apply_placeholders(self, context) -> int:
+        """
+        replace image messages older than max image turns with text placeholders in the context,
+        return the number of replaced images
+        """
+        if self.args.max_image_turns <= 0:
+            return 0
+        messages = context.get_messages()
+        replaced = 0
+        user_turns = 0
+        for i in range(len(messages) - 1, -1, -1):
+            message = messages[i]
+            is_image = message.get("data") is not None and message.get("mime_type")
+            if is_image and user_turns >= self.args.max_image_turns:
+                # new message dict, cached token count of the image message is dropped
+                placeholder = {
+                    k: v for k, v in message.items() if k not in ("data", "mime_type", "image_hash")
+                }
+                placeholder["content"] = self.args.placeholder.format(
+                    text=message.get("content") or ""
+                ).strip()
+                messages[i] = placeholder
+                replaced += 1
+            if message.get("role") == "user":
+                user_turns += 1
+        if replaced:
+            logging.debug(f"replace {replaced} old images with placeholders")
+        return replaced
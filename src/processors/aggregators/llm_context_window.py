@@ -0,0 +1,211 @@
+import logging
+from typing import Callable, List
+
+from src.common.utils.text import estimate_tokens
+from src.types.llm.context import LLMContextWindowArgs
+
+# name of the summary system message with summarize strategy
+SUMMARY_MESSAGE_NAME = "context_summary"
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+class LLMContextWindow:
+    """
+    token-budgeted context window for OpenAILLMContext messages,
+    used by the openai/litellm/google llm processors before each chat completion
+    - token count per message is counted once and cached, not re-counted per turn
+    - over budget: evict the oldest turns, or fold them into a summary system message
+    - system messages, tool call/result messages and the recent turns are pinned
+    - an assistant tool_calls message and its tool results are evicted together
+    """
+
+    def __init__(self, summarizer: Callable[[List[dict]], str] | None = None, **args) -> None:
+        self.args = LLMContextWindowArgs(**args)
+        # summarize evicted messages (with the previous summary message first) to text
+        self._summarizer = summarizer or self.summarize
+        self._encoding = None
+        try:
+            import tiktoken
+
+            self._encoding = tiktoken.get_encoding(self.args.tokenizer)
+        except Exception as e:
+            logging.warning(f"use estimated token count, load tokenizer Exception: {e}")
+        # id(message) -> (message, tokens), keep the message ref so the id is not reused
+        self._token_cache: dict[int, tuple[dict, int]] = {}
+        self._total_tokens = 0
+        self._evicted_cn = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self._total_tokens
+
+    @property
+    def evicted_cn(self) -> int:
+        return self._evicted_cn
+
+    def count_text_tokens(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return estimate_tokens(text)
+
+    def count_message_tokens(self, message: dict) -> int:
+        tokens = self.args.per_message_tokens
+        content = message.get("content")
+        if isinstance(content, str):
+            tokens += self.count_text_tokens(content)
+        elif isinstance(content, list):
+            for part in content:
+                if not isinstance(part, dict):
+                    continue
+                if part.get("type") == "text":
+                    tokens += self.count_text_tokens(part.get("text", ""))
+                else:
+                    tokens += self.args.image_tokens
+        # image bytes attachment, see OpenAILLMContext.from_image_frame
+        if message.get("data") is not None:
+            tokens += self.args.image_tokens
+        for tool_call in message.get("tool_calls") or []:
+            function = tool_call.get("function", {})
+            tokens += self.count_text_tokens(function.get("name", ""))
+            tokens += self.count_text_tokens(function.get("arguments", ""))
+        return tokens
+
+    def get_message_tokens(self, message: dict) -> int:
+        entry = self._token_cache.get(id(message))
+        if entry is not None and entry[0] is message:
+            return entry[1]
+        tokens = self.count_message_tokens(message)
+        self._token_cache[id(message)] = (message, tokens)
+        return tokens
+
+    def _is_pinned(self, messages: List[dict]) -> bool:
+        for message in messages:
+            if message.get("role") == "system":
+                return True
+            if self.args.pin_tool_messages and (
+                message.get("role") == "tool" or message.get("tool_calls")
+            ):
+                return True
+        return False
+
+    @staticmethod
+    def _turn_groups(messages: List[dict]) -> List[tuple[int, int]]:
+        """
+        message index ranges [start, end) evicted as a whole
+        """
+        groups = []
+        i = 0
+        while i < len(messages):
+            j = i + 1
+            if messages[i].get("role") == "assistant" and messages[i].get("tool_calls"):
+                while j < len(messages) and messages[j].get("role") == "tool":
+                    j += 1
+            groups.append((i, j))
+            i = j
+        return groups
+
+    def _truncate_head(self, text: str, max_tokens: int) -> str:
+        """
+        keep the tail (latest) of the text within max tokens
+        """
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            if len(tokens) <= max_tokens:
+                return text
+            return self._encoding.decode(tokens[-max_tokens:])
+        tokens = self.count_text_tokens(text)
+        if tokens <= max_tokens:
+            return text
+        return text[-int(len(text) * max_tokens / tokens) :]
+
+    def summarize(self, messages: List[dict]) -> str:
+        """
+        default extractive summary: the latest role: text lines within summary max tokens
+        """
+        lines = []
+        for message in messages:
+            content = message.get("content")
+            if message.get("name") == SUMMARY_MESSAGE_NAME and isinstance(content, str):
+                lines.append(content.removeprefix(SUMMARY_PREFIX))
+                continue
+            if isinstance(content, list):
+                content = " ".join(
+                    part.get("text", "")
+                    for part in content
+                    if isinstance(part, dict) and part.get("type") == "text"
+                )
+            if content:
+                lines.append(f"{message.get('role')}: {content}")
+        return self._truncate_head("\n".join(lines), self.args.summary_max_tokens)
+
+    def fit(self, context) -> int:
+        """
+        fit the context messages into the token budget in place,
+        return the number of evicted messages
+        """
+        messages = context.get_messages()
+        counts = [self.get_message_tokens(message) for message in messages]
+        # drop the cached counts of the messages which are not in the context
+        if len(self._token_cache) > len(messages):
+            self._token_cache = {id(m): (m, c) for m, c in zip(messages, counts)}
+        total = sum(counts)
+        self._total_tokens = total
+        if not self.args.max_tokens or total <= self.args.max_tokens:
+            return 0
+
+        summarize = self.args.strategy == "summarize"
+        budget = self.args.max_tokens
+        if summarize:
+            budget -= (
+                self.args.summary_max_tokens
+                + self.args.per_message_tokens
+                + self.count_text_tokens(SUMMARY_PREFIX)
+            )
+        recent_start = len(messages) - self.args.keep_recent_messages
+        evict = []
+        for start, end in self._turn_groups(messages):
+            if total <= budget or end > recent_start:
+                break
+            if self._is_pinned(messages[start:end]):
+                continue
+            evict.extend(range(start, end))
+            total -= sum(counts[start:end])
+        if not evict:
+            logging.warning(
+                f"context tokens {total} over budget {self.args.max_tokens}, nothing to evict"
+            )
+            return 0
+
+        evict_set = set(evict)
+        evicted = [messages[i] for i in evict]
+        kept = [m for i, m in enumerate(messages) if i not in evict_set]
+        if summarize:
+            summary_idx = next(
+                (i for i, m in enumerate(kept) if m.get("name") == SUMMARY_MESSAGE_NAME), None
+            )
+            if summary_idx is not None:
+                prev_summary = kept.pop(summary_idx)
+                total -= self.get_message_tokens(prev_summary)
+                evicted.insert(0, prev_summary)
+            summary = {
+                "role": "system",
+                "name": SUMMARY_MESSAGE_NAME,
+                "content": SUMMARY_PREFIX + self._summarizer(evicted),
+            }
+            # after the leading system prompt messages
+            idx = 0
+            while idx < len(kept) and kept[idx].get("role") == "system":
+                idx += 1
+            kept.insert(idx, summary)
+            total += self.get_message_tokens(summary)
+
+        context.set_messages(kept)
+        self._total_tokens = total
+        self._evicted_cn += len(evict)
+        logging.info(
+            f"context window {self.args.strategy} {len(evict)} messages,"
+            f" tokens: {sum(counts)} -> {total}, budget: {self.args.max_tokens}"
+        )
+        return len(evict)
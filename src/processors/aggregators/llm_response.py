@@ -17,6 +17,7 @@ from src.types.frames.control_frames import (
     UserStartedSpeakingFrame,
     UserStoppedSpeakingFrame,
 )
+from src.common.utils.text import count_words, normalize_text
 from src.types.frames.data_frames import (
     Frame,
     InterimTranscriptionFrame,
@@ -24,10 +25,12 @@ from src.types.frames.data_frames import (
     LLMMessagesFrame,
     LLMMessagesUpdateFrame,
     LLMSetToolsFrame,
+    LLMSpeculativeMessagesFrame,
     TranscriptionFrame,
     TextFrame,
 )
 from src.types.frames.sys_frames import FunctionCallInProgressFrame
+from src.types.llm.speculation import LLMSpeculativeArgs
 
 
 class LLMResponseAggregator(FrameProcessor):
@@ -41,6 +44,7 @@ class LLMResponseAggregator(FrameProcessor):
         accumulator_frame: TextFrame,
         interim_accumulator_frame: TextFrame | None = None,
         handle_interruptions: bool = False,
+        speculative_args: dict | None = None,
     ):
         super().__init__()
 
@@ -51,6 +55,10 @@ class LLMResponseAggregator(FrameProcessor):
         self._accumulator_frame = accumulator_frame
         self._interim_accumulator_frame = interim_accumulator_frame
         self._handle_interruptions = handle_interruptions
+        # push the messages with a stable interim transcript for speculative llm generation
+        self._speculative_args = (
+            LLMSpeculativeArgs(**speculative_args) if speculative_args is not None else None
+        )
 
         # Reset our accumulator state.
         self._reset()
@@ -95,6 +103,7 @@ class LLMResponseAggregator(FrameProcessor):
             self._seen_start_frame = True
             self._seen_end_frame = False
             self._seen_interim_results = False
+            self._reset_speculation()
             await self.push_frame(frame, direction)
         elif isinstance(frame, self._end_frame):
             self._seen_end_frame = True
@@ -121,6 +130,8 @@ class LLMResponseAggregator(FrameProcessor):
             self._seen_interim_results = False
         elif self._interim_accumulator_frame and isinstance(frame, self._interim_accumulator_frame):
             self._seen_interim_results = True
+            if self._speculative_args and self._aggregating:
+                await self._speculate(frame.text)
         elif self._handle_interruptions and isinstance(frame, StartInterruptionFrame):
             await self._push_aggregation()
             # Reset anyways
@@ -149,6 +160,37 @@ class LLMResponseAggregator(FrameProcessor):
             frame = LLMMessagesFrame(self._messages)
             await self.push_frame(frame)
 
+    async def _speculate(self, interim_text: str):
+        """
+        push the speculative messages once the interim text is stable
+        (the same text in n consecutive interim transcripts)
+        """
+        text = f"{self._aggregation}{interim_text}"
+        normalized = normalize_text(text)
+        if normalized == self._interim_text:
+            self._stable_interims += 1
+        else:
+            self._interim_text = normalized
+            self._stable_interims = 1
+        if (
+            self._stable_interims < self._speculative_args.stable_interims
+            or normalized == self._speculated_text
+            or count_words(normalized) < self._speculative_args.min_words
+        ):
+            return
+        self._speculated_text = normalized
+        await self.push_frame(self.get_speculative_frame(text))
+
+    def get_speculative_frame(self, text: str) -> LLMSpeculativeMessagesFrame:
+        return LLMSpeculativeMessagesFrame(
+            messages=[*self._messages, {"role": self._role, "content": text}], text=text
+        )
+
+    def _reset_speculation(self):
+        self._interim_text = ""
+        self._stable_interims = 0
+        self._speculated_text = ""
+
     def _add_messages(self, messages):
         self._messages.extend(messages)
 
@@ -166,6 +208,7 @@ class LLMResponseAggregator(FrameProcessor):
         self._seen_start_frame = False
         self._seen_end_frame = False
         self._seen_interim_results = False
+        self._reset_speculation()
 
 
 class LLMAssistantResponseAggregator(LLMResponseAggregator):
@@ -181,7 +224,7 @@ class LLMAssistantResponseAggregator(LLMResponseAggregator):
 
 
 class LLMUserResponseAggregator(LLMResponseAggregator):
-    def __init__(self, messages: List[dict] = []):
+    def __init__(self, messages: List[dict] = [], speculative_args: dict | None = None):
         super().__init__(
             messages=messages,
             role="user",
@@ -189,6 +232,7 @@ class LLMUserResponseAggregator(LLMResponseAggregator):
             end_frame=UserStoppedSpeakingFrame,
             accumulator_frame=TranscriptionFrame,
             interim_accumulator_frame=InterimTranscriptionFrame,
+            speculative_args=speculative_args,
         )
 
 
@@ -6,6 +6,7 @@
 
 from dataclasses import dataclass
 from typing import Any, Awaitable, Callable, List
+import asyncio
 import io
 import json
 import logging
@@ -26,12 +27,14 @@ except ModuleNotFoundError as e:
 from apipeline.processors.frame_processor import FrameProcessor
 from apipeline.frames.sys_frames import StartInterruptionFrame
 
+from src.processors.aggregators.image_attachment_store import ImageAttachmentStore
 from src.processors.aggregators.llm_response import LLMResponseAggregator
 from src.types.frames.data_frames import (
     Frame,
     InterimTranscriptionFrame,
     TextFrame,
     FunctionCallResultFrame,
+    LLMSpeculativeMessagesFrame,
     TranscriptionFrame,
     VisionImageRawFrame,
 )
@@ -81,14 +84,28 @@ class OpenAILLMContext:
         return context
 
     @staticmethod
-    def from_image_frame(frame: VisionImageRawFrame) -> "OpenAILLMContext":
+    def from_speculative_frame(frame: LLMSpeculativeMessagesFrame) -> "OpenAILLMContext":
+        return OpenAILLMContext(
+            messages=frame.messages,
+            tools=frame.tools or NOT_GIVEN,
+            tool_choice=frame.tool_choice or NOT_GIVEN,
+        )
+
+    @staticmethod
+    def from_image_frame(
+        frame: VisionImageRawFrame, image_store: ImageAttachmentStore | None = None
+    ) -> "OpenAILLMContext":
         """
         For images, we are deviating from the OpenAI messages shape. OpenAI
         expects images to be base64 encoded, but other vision models may not.
         So we'll store the image as bytes and do the base64 encoding as needed
         in the LLM service.
+        With an image store, the image is downscaled and encoded once (cached by content hash).
         """
         context = OpenAILLMContext()
+        if image_store is not None:
+            context.add_message(image_store.image_message(frame))
+            return context
         buffer = io.BytesIO()
         Image.frombytes(frame.mode, frame.size, frame.image).save(buffer, format=frame.format)
         context.add_message(
@@ -147,20 +164,69 @@ class OpenAILLMContext:
         tool_call_id: str,
         arguments: dict,
         llm: FrameProcessor,
+        timeout_s: float | None = None,
     ) -> None:
+        await self.call_functions(
+            [(f, function_name, tool_call_id, arguments)], llm=llm, timeout_s=timeout_s
+        )
+
+    async def call_functions(
+        self,
+        function_calls: List[tuple[Callable, str, str, dict]],
+        *,
+        llm: FrameProcessor,
+        timeout_s: float | None = None,
+    ) -> None:
+        """
+        run (f, function_name, tool_call_id, arguments) function calls concurrently,
+        each with timeout; the assistant context aggregator adds all results
+        to the context and re-prompts the llm once.
+        """
         # Push a SystemFrame downstream. This frame will let our assistant context aggregator
         # know that we are in the middle of a function call. Some contexts/aggregators may
         # not need this. But some definitely do (Anthropic, for example).
-        await llm.push_frame(
-            FunctionCallInProgressFrame(
-                function_name=function_name,
-                tool_call_id=tool_call_id,
-                arguments=arguments,
+        # Push all of them before running, so the aggregator waits for all results.
+        for _, function_name, tool_call_id, arguments in function_calls:
+            await llm.push_frame(
+                FunctionCallInProgressFrame(
+                    function_name=function_name,
+                    tool_call_id=tool_call_id,
+                    arguments=arguments,
+                )
             )
+
+        await asyncio.gather(
+            *[
+                self._run_function(
+                    f,
+                    function_name=function_name,
+                    tool_call_id=tool_call_id,
+                    arguments=arguments,
+                    llm=llm,
+                    timeout_s=timeout_s,
+                )
+                for f, function_name, tool_call_id, arguments in function_calls
+            ]
         )
 
+    async def _run_function(
+        self,
+        f: Callable,
+        *,
+        function_name: str,
+        tool_call_id: str,
+        arguments: dict,
+        llm: FrameProcessor,
+        timeout_s: float | None = None,
+    ) -> None:
+        result_pushed = False
+
         # Define a callback function that pushes a FunctionCallResultFrame downstream.
         async def function_call_result_callback(result):
+            nonlocal result_pushed
+            if result_pushed:
+                return
+            result_pushed = True
             await llm.push_frame(
                 FunctionCallResultFrame(
                     function_name=function_name,
@@ -170,7 +236,21 @@ class OpenAILLMContext:
                 )
             )
 
-        await f(function_name, tool_call_id, arguments, llm, self, function_call_result_callback)
+        try:
+            await asyncio.wait_for(
+                f(function_name, tool_call_id, arguments, llm, self, function_call_result_callback),
+                timeout_s,
+            )
+        except asyncio.TimeoutError:
+            logging.warning(f"function {function_name} {tool_call_id} timeout after {timeout_s}s")
+            await function_call_result_callback(
+                {"error": f"{function_name} timed out after {timeout_s} seconds"}
+            )
+        except Exception as e:
+            logging.exception(f"function {function_name} {tool_call_id} Exception: {e}")
+            await function_call_result_callback({"error": f"{function_name} failed: {e}"})
+        # no result, let the aggregator stop waiting for this call
+        await function_call_result_callback(None)
 
 
 @dataclass
@@ -203,6 +283,16 @@ class LLMContextAggregator(LLMResponseAggregator):
         frame = self.get_context_frame()
         await self.push_frame(frame)
 
+    def get_speculative_frame(self, text: str) -> LLMSpeculativeMessagesFrame:
+        tools = self._context.tools
+        tool_choice = self._context.tool_choice
+        return LLMSpeculativeMessagesFrame(
+            messages=[*self._context.get_messages(), {"role": self._role, "content": text}],
+            text=text,
+            tools=None if isinstance(tools, NotGiven) else tools,
+            tool_choice=None if isinstance(tool_choice, NotGiven) else tool_choice,
+        )
+
     def _add_messages(self, messages):
         self._context.add_messages(messages)
 
@@ -228,7 +318,7 @@ class LLMContextAggregator(LLMResponseAggregator):
 
 
 class LLMUserContextAggregator(LLMContextAggregator):
-    def __init__(self, context: OpenAILLMContext):
+    def __init__(self, context: OpenAILLMContext, speculative_args: dict | None = None):
         super().__init__(
             messages=[],
             context=context,
@@ -237,6 +327,7 @@ class LLMUserContextAggregator(LLMContextAggregator):
             end_frame=UserStoppedSpeakingFrame,
             accumulator_frame=TranscriptionFrame,
             interim_accumulator_frame=InterimTranscriptionFrame,
+            speculative_args=speculative_args,
         )
 
 
@@ -254,42 +345,40 @@ class LLMAssistantContextAggregator(LLMContextAggregator):
 
 
 class OpenAIUserContextAggregator(LLMUserContextAggregator):
-    def __init__(self, context: OpenAILLMContext):
-        super().__init__(context=context)
+    def __init__(self, context: OpenAILLMContext, speculative_args: dict | None = None):
+        super().__init__(context=context, speculative_args=speculative_args)
 
 
 class OpenAIAssistantContextAggregator(LLMAssistantContextAggregator):
     def __init__(self, user_context_aggregator: OpenAIUserContextAggregator):
         super().__init__(context=user_context_aggregator._context)
         self._user_context_aggregator = user_context_aggregator
-        self._function_call_in_progress = None
-        self._function_call_result = None
+        # tool_call_id -> FunctionCallInProgressFrame, parallel function calls
+        self._function_calls_in_progress: dict[str, FunctionCallInProgressFrame] = {}
+        self._function_call_results: List[FunctionCallResultFrame] = []
 
     async def process_frame(self, frame, direction):
         await super().process_frame(frame, direction)
         # See note above about not calling push_frame() here.
         if isinstance(frame, StartInterruptionFrame):
-            self._function_call_in_progress = None
-            self._function_call_finished = None
+            self._function_calls_in_progress.clear()
+            self._function_call_results = []
         elif isinstance(frame, FunctionCallInProgressFrame):
-            self._function_call_in_progress = frame
+            self._function_calls_in_progress[frame.tool_call_id] = frame
         elif isinstance(frame, FunctionCallResultFrame):
-            if (
-                self._function_call_in_progress
-                and self._function_call_in_progress.tool_call_id == frame.tool_call_id
-            ):
-                self._function_call_in_progress = None
-                self._function_call_result = frame
-                await self._push_aggregation()
+            if frame.tool_call_id in self._function_calls_in_progress:
+                del self._function_calls_in_progress[frame.tool_call_id]
+                self._function_call_results.append(frame)
+                # wait for all parallel function calls to finish, then re-prompt once
+                if not self._function_calls_in_progress:
+                    await self._push_aggregation()
             else:
                 logging.warning(
                     "FunctionCallResultFrame tool_call_id does not match FunctionCallInProgressFrame tool_call_id"
                 )
-                self._function_call_in_progress = None
-                self._function_call_result = None
 
     async def _push_aggregation(self):
-        if not (self._aggregation or self._function_call_result):
+        if not (self._aggregation or self._function_call_results):
             return
 
         run_llm = False
@@ -298,10 +387,10 @@ class OpenAIAssistantContextAggregator(LLMAssistantContextAggregator):
         self._aggregation = ""
 
         try:
-            if self._function_call_result:
-                frame = self._function_call_result
-                self._function_call_result = None
-                if frame.result:
+            if self._function_call_results:
+                frames = [frame for frame in self._function_call_results if frame.result]
+                self._function_call_results = []
+                if frames:
                     self._context.add_message(
                         {
                             "role": "assistant",
@@ -314,16 +403,18 @@ class OpenAIAssistantContextAggregator(LLMAssistantContextAggregator):
                                     },
                                     "type": "function",
                                 }
+                                for frame in frames
                             ],
                         }
                     )
-                    self._context.add_message(
-                        {
-                            "role": "tool",
-                            "content": json.dumps(frame.result),
-                            "tool_call_id": frame.tool_call_id,
-                        }
-                    )
+                    for frame in frames:
+                        self._context.add_message(
+                            {
+                                "role": "tool",
+                                "content": json.dumps(frame.result),
+                                "tool_call_id": frame.tool_call_id,
+                            }
+                        )
                     run_llm = True
             else:
                 self._context.add_message({"role": "assistant", "content": aggregation})
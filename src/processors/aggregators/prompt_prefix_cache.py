@@ -0,0 +1,144 @@
+import copy
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, List
+
+from src.processors.aggregators.llm_context_window import SUMMARY_MESSAGE_NAME
+from src.types.llm.context import LLMPromptCacheArgs
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+@dataclass
+class PromptPrefix:
+    key: str
+    # copied leading static system messages, with cache_control marker on the last one
+    messages: List[dict]
+    # copied tools, with cache_control marker on the last one; None if no tools
+    tools: List[dict] | None
+
+
+class PromptPrefixCache:
+    """
+    static prompt prefix (system prompt + tools) of the openai compatible chat completion request
+    - request messages start with the static prefix, then the dynamic messages
+      (context summary, chat turns), so automatic prefix caching providers get hits
+    - cache_control markers on the last system message and tool for the providers which need them,
+      the marked prefix is built once per content and shared by the processors (rooms)
+      with the same bot config
+    - the content key is hashed only when the system messages, their contents or the tools
+      are other objects than the last turn, so an in place changed system message content
+      or tools list isn't stale; call invalidate() after changing them deeper in place
+    """
+
+    # max shared prefixes (distinct bot configs) in the process, lru
+    MAX_PREFIXES = 64
+    # content key -> PromptPrefix, shared in the process
+    _prefixes: OrderedDict[str, PromptPrefix] = OrderedDict()
+
+    def __init__(self, **args) -> None:
+        self.args = LLMPromptCacheArgs(**args)
+        self._builds = 0
+        self._version = 0
+        # the prefix objects of the last turn (kept alive, compared by identity) and their key
+        self._last_objects: tuple = ()
+        self._last_key = ""
+
+    @property
+    def builds(self) -> int:
+        return self._builds
+
+    def use_cache_control(self, model: str) -> bool:
+        if self.args.cache_control == "auto":
+            model = (model or "").lower()
+            return any(name in model for name in self.args.cache_control_models)
+        return self.args.cache_control == "on"
+
+    @staticmethod
+    def split_messages(messages: List[dict]) -> tuple[List[dict], List[dict]]:
+        """
+        split into the leading static system messages and the rest (dynamic) messages,
+        the context summary system message is dynamic
+        """
+        static, dynamic = [], []
+        i = 0
+        while i < len(messages) and messages[i].get("role") == "system":
+            if messages[i].get("name") == SUMMARY_MESSAGE_NAME:
+                dynamic.append(messages[i])
+            else:
+                static.append(messages[i])
+            i += 1
+        dynamic.extend(messages[i:])
+        return static, dynamic
+
+    def invalidate(self):
+        """
+        the system messages or tools are changed in place, e.g. a nested tool field
+        """
+        self._version += 1
+
+    def get_key(self, static: List[dict], tools: List[dict] | None) -> str:
+        objects = (
+            self._version,
+            *static,
+            *(message.get("content") for message in static),
+            tools,
+            *(tools or ()),
+        )
+        if len(objects) == len(self._last_objects) and all(
+            a is b for a, b in zip(objects, self._last_objects)
+        ):
+            return self._last_key
+        content = json.dumps([static, tools], sort_keys=True, default=str)
+        self._last_key = hashlib.sha1(content.encode()).hexdigest()
+        self._last_objects = objects
+        return self._last_key
+
+    def get_prefix(self, static: List[dict], tools: List[dict] | None) -> PromptPrefix:
+        key = self.get_key(static, tools)
+        prefix = self._prefixes.get(key)
+        if prefix is None:
+            prefix = self._build_prefix(key, static, tools)
+            self._prefixes[key] = prefix
+            while len(self._prefixes) > self.MAX_PREFIXES:
+                self._prefixes.popitem(last=False)
+        self._prefixes.move_to_end(key)
+        return prefix
+
+    def _build_prefix(self, key: str, static: List[dict], tools: List[dict] | None) -> PromptPrefix:
+        """
+        copy the prefix with the cache_control markers, the context messages and tools
+        are not changed
+        """
+        self._builds += 1
+        messages = copy.deepcopy(static)
+        tools = copy.deepcopy(tools) if tools else None
+        if messages:
+            content = messages[-1].get("content")
+            if isinstance(content, str):
+                content = [{"type": "text", "text": content}]
+            if isinstance(content, list) and content:
+                content[-1]["cache_control"] = CACHE_CONTROL
+                messages[-1]["content"] = content
+        if tools:
+            tools[-1]["cache_control"] = CACHE_CONTROL
+        logging.info(
+            f"build prompt prefix {key[:8]}: {len(messages)} system messages,"
+            f" {len(tools or [])} tools with cache_control"
+        )
+        return PromptPrefix(key=key, messages=messages, tools=tools)
+
+    def build(self, messages: List[dict], tools: Any, model: str = "") -> tuple[List[dict], Any]:
+        """
+        request messages and tools with the static prefix first,
+        tools is returned as is if it's not a list (e.g.: NOT_GIVEN)
+        """
+        static, dynamic = self.split_messages(messages)
+        tool_list = tools if isinstance(tools, list) and tools else None
+        if not self.use_cache_control(model) or (not static and tool_list is None):
+            return static + dynamic, tools
+        prefix = self.get_prefix(static, tool_list)
+        return prefix.messages + dynamic, prefix.tools if tool_list is not None else tools
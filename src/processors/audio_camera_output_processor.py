@@ -43,8 +43,14 @@ class AudioCameraOutputProcessor(OutputProcessor):
             int(self._params.audio_out_sample_rate / 100) * self._params.audio_out_channels * 2
         )
         self._audio_chunk_size = audio_bytes_10ms * 2
-        # Audio accumlation buffer for 16-bit samples to write out stream device
+        # Audio accumlation buffer for 16-bit samples to write out stream device,
+        # written in whole chunks, the remainder waits for the next audio frame
         self._audio_out_buff = bytearray()
+        # buffer the start of the bot speech for slow tts
+        self._audio_prebuffer_size = audio_bytes_10ms * self._params.audio_out_prebuffer_ms // 10
+        self._audio_prebuffering = self._audio_prebuffer_size > 0
+        # last upstream BotSpeakingFrame time
+        self._bot_speaking_time = 0.0
 
         # Indicates if the bot is currently speaking. This is useful when we
         # have an interruption since all the queued messages will be thrown
@@ -85,6 +91,9 @@ class AudioCameraOutputProcessor(OutputProcessor):
     async def _handle_interruptions(self, frame: Frame):
         await super()._handle_interruptions(frame)
         if isinstance(frame, StartInterruptionFrame):
+            if self.interruptions_allowed:
+                # drop the buffered audio with the sink queue
+                self._audio_out_buff.clear()
             # Let's send a bot stopped speaking if we have to.
             if self._bot_speaking:
                 await self._bot_stopped_speaking()
@@ -114,13 +123,18 @@ class AudioCameraOutputProcessor(OutputProcessor):
             await self._bot_started_speaking()
             await self.queue_frame(frame)
         elif isinstance(frame, TTSStoppedFrame):
+            await self._flush_audio_out()
             await self._bot_stopped_speaking()
             await self.queue_frame(frame)
+        elif isinstance(frame, EndFrame):
+            await self._flush_audio_out()
         return await super().sink_control_frame(frame)
 
     async def _bot_started_speaking(self):
         logging.debug("Bot started speaking")
         self._bot_speaking = True
+        self._audio_prebuffering = self._audio_prebuffer_size > 0
+        self._bot_speaking_time = 0.0
         await self.queue_frame(BotStartedSpeakingFrame(), FrameDirection.UPSTREAM)
 
     async def _bot_stopped_speaking(self):
@@ -139,19 +153,40 @@ class AudioCameraOutputProcessor(OutputProcessor):
         if not self._params.audio_out_enabled:
             return
 
-        audio = frame.audio
-        #!TODO: if tts processor is slow(network,best way to deloy all model on local machine(CPU,GPU)), we need to buffer the audio,e.g.buff 1 second :)
-        # print(f"len audio:{len(audio)}, audio_chunk_size:{self._audio_chunk_size}")
-        # self._audio_out_buff.extend(audio)
-        # if len(audio) >= self._audio_chunk_size:
-        # print( f"len audio_out_buff:{len(self._audio_out_buff)}, audio_chunk_size{self._audio_chunk_size}")
-        for i in range(0, len(audio), self._audio_chunk_size):
-            chunk = audio[i : i + self._audio_chunk_size]
-            # if len(chunk) % 2 != 0: don't do that, need subclass to do
-            #    chunk = chunk[:len(chunk) - 1]
-            await self.write_raw_audio_frames(chunk)
-            await self.push_frame(BotSpeakingFrame(), FrameDirection.UPSTREAM)
-        # self._audio_out_buff.clear()
+        self._audio_out_buff.extend(frame.audio)
+        if self._audio_prebuffering:
+            if len(self._audio_out_buff) < self._audio_prebuffer_size:
+                return
+            self._audio_prebuffering = False
+        await self._write_audio_out(len(self._audio_out_buff) // self._audio_chunk_size)
+
+    async def _write_audio_out(self, num_chunks: int):
+        """
+        write the buffered audio in whole chunks (20ms), BotSpeakingFrame at most
+        once per audio_out_bot_speaking_interval_s
+        """
+        for i in range(num_chunks):
+            start = i * self._audio_chunk_size
+            await self.write_raw_audio_frames(
+                bytes(self._audio_out_buff[start : start + self._audio_chunk_size])
+            )
+            now = time.monotonic()
+            if now - self._bot_speaking_time >= self._params.audio_out_bot_speaking_interval_s:
+                self._bot_speaking_time = now
+                await self.push_frame(BotSpeakingFrame(), FrameDirection.UPSTREAM)
+        del self._audio_out_buff[: num_chunks * self._audio_chunk_size]
+
+    async def _flush_audio_out(self):
+        """
+        write the rest of the bot speech, the remainder padded with silence to a whole chunk
+        """
+        self._audio_prebuffering = False
+        if not self._audio_out_buff:
+            return
+        remainder = len(self._audio_out_buff) % self._audio_chunk_size
+        if remainder:
+            self._audio_out_buff.extend(bytes(self._audio_chunk_size - remainder))
+        await self._write_audio_out(len(self._audio_out_buff) // self._audio_chunk_size)
 
     async def write_raw_audio_frames(self, frames: bytes):
         """
@@ -16,7 +16,14 @@ from apipeline.processors.input_processor import InputProcessor
 
 from src.common.interface import IVADAnalyzer
 from src.common.types import AudioVADParams, VADState
-from src.types.frames.control_frames import UserStartedSpeakingFrame, UserStoppedSpeakingFrame
+from src.common.utils.audio_mixer import AudioMixer
+from src.common.utils.audio_resampler import AudioStreamResampler
+from src.types.frames.control_frames import (
+    UserLeftFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from src.types.frames.data_frames import UserAudioRawFrame
 from src.types.frames.sys_frames import BotInterruptionFrame
 
 
@@ -34,6 +41,14 @@ class AudioVADInputProcessor(InputProcessor):
 
         self._vad_analyzer: IVADAnalyzer | None = params.vad_analyzer
 
+        # per participant audio in (audio_in_demux_enabled / audio_in_mix_enabled)
+        # participant_id -> {resampler, vad_analyzer, vad_state}
+        self._participants: dict[str, dict] = {}
+        self._speaking_participants: set[str] = set()
+        self._mixer: AudioMixer | None = None
+        if params.audio_in_mix_enabled:
+            self._mixer = AudioMixer(params.audio_in_sample_rate, params.audio_in_channels)
+
     @property
     def vad_analyzer(self) -> IVADAnalyzer | None:
         return self._params.vad_analyzer
@@ -88,6 +103,14 @@ class AudioVADInputProcessor(InputProcessor):
             try:
                 frame: AudioRawFrame = await self._audio_in_queue.get()
 
+                if self._params.audio_in_demux_enabled:
+                    await self._handle_participant_audio(frame)
+                    continue
+                if self._mixer is not None:
+                    frame = await self._mix_participant_audio(frame)
+                    if frame is None:
+                        continue
+
                 audio_passthrough = True
 
                 # Check VAD and push event if necessary. We just care about
@@ -104,11 +127,14 @@ class AudioVADInputProcessor(InputProcessor):
             except Exception as e:
                 logging.exception(f"{self} error reading audio frames: {e}")
 
-    async def _vad_analyze(self, audio_frames: bytes) -> VADState:
+    async def _vad_analyze(
+        self, audio_frames: bytes, vad_analyzer: IVADAnalyzer | None = None
+    ) -> VADState:
         state = VADState.QUIET
-        if self.vad_analyzer:
+        vad_analyzer = vad_analyzer or self.vad_analyzer
+        if vad_analyzer:
             state = await self.get_event_loop().run_in_executor(
-                self._executor, self.vad_analyzer.analyze_audio, audio_frames
+                self._executor, vad_analyzer.analyze_audio, audio_frames
             )
         return state
 
@@ -131,6 +157,121 @@ class AudioVADInputProcessor(InputProcessor):
             vad_state = new_vad_state
         return vad_state
 
+    #
+    # Per participant audio in
+    #
+
+    async def _get_participant(self, participant_id: str) -> dict:
+        participant = self._participants.get(participant_id)
+        if participant is None:
+            vad_analyzer = None
+            if (
+                self._params.audio_in_demux_enabled
+                and self._params.vad_enabled
+                and self.vad_analyzer
+            ):
+                # the vad model/states can't be shared by the participants streams
+                vad_analyzer = await self.get_event_loop().run_in_executor(
+                    self._executor, self.vad_analyzer.clone
+                )
+            participant = self._participants[participant_id] = {
+                "resampler": None,
+                "vad_analyzer": vad_analyzer,
+                "vad_state": VADState.QUIET,
+            }
+        return participant
+
+    def _resample(self, participant: dict, frame: AudioRawFrame) -> bytes:
+        resampler: AudioStreamResampler | None = participant["resampler"]
+        if (
+            resampler is None
+            or resampler.in_rate != frame.sample_rate
+            or resampler.num_channels != frame.num_channels
+        ):
+            resampler = participant["resampler"] = AudioStreamResampler(
+                frame.sample_rate, self._params.audio_in_sample_rate, frame.num_channels
+            )
+        return resampler.resample(frame.audio)
+
+    async def _handle_participant_audio(self, frame: AudioRawFrame):
+        participant_id = str(getattr(frame, "user_id", "") or "")
+        participant = await self._get_participant(participant_id)
+        audio = self._resample(participant, frame)
+        if not audio:
+            return
+        frame = UserAudioRawFrame(
+            user_id=participant_id,
+            audio=audio,
+            sample_rate=self._params.audio_in_sample_rate,
+            num_channels=frame.num_channels,
+        )
+
+        audio_passthrough = True
+        if self._params.vad_enabled:
+            await self._handle_participant_vad(participant_id, participant, audio)
+            audio_passthrough = self._params.vad_audio_passthrough
+        if audio_passthrough:
+            await self.queue_frame(frame)
+
+    async def _handle_participant_vad(self, participant_id: str, participant: dict, audio: bytes):
+        """
+        the speaking frames of each participant, interruption on the first speaking one
+        and stop interruption when all are quiet
+        """
+        new_vad_state = await self._vad_analyze(audio, participant["vad_analyzer"])
+        if new_vad_state == participant["vad_state"] or new_vad_state in (
+            VADState.STARTING,
+            VADState.STOPPING,
+        ):
+            return
+        participant["vad_state"] = new_vad_state
+
+        if new_vad_state == VADState.SPEAKING:
+            interruption = not self._speaking_participants
+            self._speaking_participants.add(participant_id)
+            frame = UserStartedSpeakingFrame(user_id=participant_id)
+        else:
+            self._speaking_participants.discard(participant_id)
+            interruption = not self._speaking_participants
+            frame = UserStoppedSpeakingFrame(user_id=participant_id)
+
+        if interruption:
+            await self._handle_interruptions(frame, True)
+        else:
+            await self.queue_frame(frame)
+
+    async def _mix_participant_audio(self, frame: AudioRawFrame) -> AudioRawFrame | None:
+        participant_id = str(getattr(frame, "user_id", "") or "")
+        participant = await self._get_participant(participant_id)
+        self._mixer.push(participant_id, self._resample(participant, frame))
+        audio = self._mixer.mix()
+        if not audio:
+            return None
+        return AudioRawFrame(
+            audio=audio,
+            sample_rate=self._params.audio_in_sample_rate,
+            num_channels=self._params.audio_in_channels,
+        )
+
+    async def remove_participant_audio(self, participant_id: str):
+        """
+        participant left, drop the audio in states;
+        push the stopped speaking frame if the participant was speaking,
+        then the left frame for the downstream per participant states
+        """
+        participant_id = str(participant_id)
+        self._participants.pop(participant_id, None)
+        if self._mixer is not None:
+            self._mixer.remove(participant_id)
+        if participant_id in self._speaking_participants:
+            self._speaking_participants.discard(participant_id)
+            frame = UserStoppedSpeakingFrame(user_id=participant_id)
+            if not self._speaking_participants:
+                await self._handle_interruptions(frame, True)
+            else:
+                await self.queue_frame(frame)
+        await self.queue_frame(UserLeftFrame(user_id=participant_id))
+
     #
     # Handle interruptions
     #
@@ -1,10 +1,32 @@
+import asyncio
+import base64
+import json
 import logging
+import random
+import time
 
+from apipeline.frames.control_frames import EndFrame
+from apipeline.frames.sys_frames import CancelFrame
 from apipeline.pipeline.pipeline import FrameDirection
 from apipeline.processors.frame_processor import FrameProcessorMetrics, MetricsFrame
 
+from src.common.utils.histogram import LatencyHistogram
+from src.common.utils.json_stream import StreamingJSONParser
+from src.common.utils.text import normalized_edit_distance
+from src.processors.aggregators.image_attachment_store import (
+    ImageAttachmentStore,
+    image_url_message,
+)
+from src.processors.aggregators.llm_context_window import LLMContextWindow
+from src.processors.aggregators.prompt_prefix_cache import PromptPrefixCache
 from src.processors.ai_processor import AIProcessor
-from src.types.frames.control_frames import UserImageRequestFrame
+from src.types.frames.control_frames import (
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    UserImageRequestFrame,
+)
+from src.types.frames.data_frames import TextFrame, TTSSpeakFrame
+from src.types.llm.speculation import LLMSpeculativeArgs
 
 
 class UnhandledFunctionException(Exception):
@@ -17,6 +39,24 @@ class LLMProcessorMetrics(FrameProcessorMetrics):
         return MetricsFrame(tokens=[tokens])
 
 
+class LLMSpeculation:
+    """
+    a speculative chat completion on an interim transcript,
+    the pushed frames are held until commit
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.task: asyncio.Task | None = None
+        # (frame, direction) held before commit
+        self.frames: list = []
+        self.committed = False
+        self.commit_event = asyncio.Event()
+        self.started_at = time.monotonic()
+        # streamed text chunks, ~1 token per chunk
+        self.text_chunks = 0
+
+
 class LLMProcessor(AIProcessor):
     """This class is a no-op but serves as a base class for LLM processors."""
 
@@ -24,8 +64,27 @@ class LLMProcessor(AIProcessor):
         super().__init__(**kwargs)
         self._callbacks = {}
         self._start_callbacks = {}
+        # function name -> argument fields to start the callback before the llm stream ends
+        self._start_fields = {}
         self._metrics = LLMProcessorMetrics(name=self.name)
         self._model = ""
+        self._context_window: LLMContextWindow | None = None
+        # image attachments encoded once, with placeholders for old images, disabled if None
+        self._image_store: ImageAttachmentStore | None = None
+        # shared static prompt prefix for the provider prompt caching, disabled if None
+        self._prompt_cache: PromptPrefixCache | None = None
+        # parallel function calls
+        self._function_call_timeout_s: float | None = None
+        self._function_filler_texts: list[str] = []
+        self._function_filler_delay_s = 1.5
+        # speculative generation on interim transcripts, disabled if None
+        self._speculative_args: LLMSpeculativeArgs | None = None
+        self._speculation: LLMSpeculation | None = None
+        self._speculation_started = 0
+        self._speculation_committed = 0
+        self._speculation_cancelled = 0
+        self._speculation_wasted_tokens = 0
+        self._speculation_saved_latency = LatencyHistogram()
 
     def set_model(self, model: str):
         self._model: str = model
@@ -36,17 +95,430 @@ class LLMProcessor(AIProcessor):
     def set_llm_args(self, **args):
         pass
 
+    def set_context_window(self, context_window: LLMContextWindow | None):
+        self._context_window = context_window
+
+    def set_image_store(self, image_store: ImageAttachmentStore | None):
+        self._image_store = image_store
+
+    def set_prompt_cache(self, prompt_cache: PromptPrefixCache | None):
+        self._prompt_cache = prompt_cache
+
+    @staticmethod
+    def get_cached_tokens(usage: dict) -> dict:
+        """
+        provider reported prompt cache tokens in the usage:
+        - openai: prompt_tokens_details.cached_tokens
+        - anthropic (litellm): cache_read_input_tokens, cache_creation_input_tokens
+        - deepseek: prompt_cache_hit_tokens
+        """
+        tokens = {}
+        cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens")
+        for key in ("cache_read_input_tokens", "prompt_cache_hit_tokens"):
+            if cached_tokens is None:
+                cached_tokens = usage.get(key)
+        if cached_tokens is not None:
+            tokens["cached_tokens"] = cached_tokens
+        if usage.get("cache_creation_input_tokens") is not None:
+            tokens["cache_creation_tokens"] = usage["cache_creation_input_tokens"]
+        return tokens
+
+    def prepare_context(self, context) -> None:
+        """
+        before chat completion:
+        - replace old images with text placeholders, with the image store
+        - bound the OpenAILLMContext messages with the token budget
+        """
+        if self._image_store:
+            self._image_store.apply_placeholders(context)
+        if self._context_window:
+            self._context_window.fit(context)
+
+    def to_openai_message(self, message: dict) -> dict:
+        """
+        openai request message with the base64 data url image, the context message is kept as is;
+        with the image store, the image is downscaled and encoded once
+        """
+        if self._image_store:
+            return self._image_store.to_openai_message(message)
+        if message.get("data") is None or not message.get("mime_type"):
+            return message
+        encoded_image = base64.b64encode(message["data"].getvalue()).decode("utf-8")
+        return image_url_message(message, f"data:{message['mime_type']};base64,{encoded_image}")
+
+    def set_speculative_args(self, **args):
+        """
+        e.g.: {"max_distance": 0.1}, see LLMSpeculativeArgs;
+        the user aggregator pushes LLMSpeculativeMessagesFrame on stable interim transcripts
+        """
+        self._speculative_args = LLMSpeculativeArgs(**args)
+
+    @property
+    def speculation_stats(self) -> dict:
+        return {
+            "started": self._speculation_started,
+            "committed": self._speculation_committed,
+            "cancelled": self._speculation_cancelled,
+            # streamed text chunks of the cancelled generations
+            "wasted_tokens": self._speculation_wasted_tokens,
+            # head start of the committed generations
+            "saved_latency": self._speculation_saved_latency.snapshot(),
+        }
+
+    def _in_speculation(self) -> LLMSpeculation | None:
+        """
+        the uncommitted speculation if called from its generation task
+        """
+        speculation = self._speculation
+        if (
+            speculation is not None
+            and not speculation.committed
+            and asyncio.current_task() is speculation.task
+        ):
+            return speculation
+        return None
+
+    async def push_frame(self, frame, direction: FrameDirection = FrameDirection.DOWNSTREAM):
+        speculation = self._in_speculation()
+        if speculation is not None:
+            if len(speculation.frames) >= self._speculative_args.max_buffer_frames:
+                # hold the generation until commit (or cancel)
+                await speculation.commit_event.wait()
+            else:
+                if isinstance(frame, TextFrame):
+                    speculation.text_chunks += 1
+                speculation.frames.append((frame, direction))
+                return
+        await super().push_frame(frame, direction)
+
+    async def start_speculation(self, text: str, context) -> None:
+        """
+        run the chat completion of the speculative context in the background,
+        restart if the interim text changed
+        """
+        if self._speculative_args is None:
+            return
+        if self._speculation is not None:
+            if normalized_edit_distance(text, self._speculation.text) == 0.0:
+                return
+            await self.cancel_speculation()
+
+        speculation = LLMSpeculation(text)
+        speculation.task = self.get_event_loop().create_task(self._run_speculation(context))
+        self._speculation = speculation
+        self._speculation_started += 1
+        logging.debug(f"start speculative generation on interim text: {text}")
+
+    async def _run_speculation(self, context):
+        try:
+            await self._process_context(context)
+        except Exception as e:
+            # the final context runs again without speculation
+            logging.warning(f"speculative generation Exception: {e}")
+            raise
+
+    async def cancel_speculation(self) -> None:
+        speculation = self._speculation
+        if speculation is None:
+            return
+        self._speculation = None
+        speculation.task.cancel()
+        try:
+            await speculation.task
+        except (asyncio.CancelledError, Exception):
+            pass
+        self._speculation_cancelled += 1
+        self._speculation_wasted_tokens += speculation.text_chunks
+        logging.debug(
+            f"cancel speculative generation on interim text: {speculation.text},"
+            f" wasted tokens: {speculation.text_chunks}"
+        )
+        await self.push_speculation_metrics(wasted_tokens=speculation.text_chunks)
+
+    @staticmethod
+    def _get_last_user_text(context) -> str | None:
+        messages = context.get_messages()
+        if not messages or messages[-1].get("role") != "user":
+            return None
+        content = messages[-1].get("content")
+        if isinstance(content, list):
+            content = " ".join(
+                part.get("text", "")
+                for part in content
+                if isinstance(part, dict) and part.get("type") == "text"
+            )
+        return content if isinstance(content, str) else None
+
+    async def commit_speculation(self, context) -> bool:
+        """
+        commit the speculative generation if the final user text of the context matches
+        the interim text: push the held frames and continue the generation;
+        else cancel it. return True if committed
+        """
+        speculation = self._speculation
+        if speculation is None:
+            return False
+        text = self._get_last_user_text(context)
+        failed = speculation.task.done() and (
+            speculation.task.cancelled() or speculation.task.exception() is not None
+        )
+        if (
+            failed
+            or text is None
+            or normalized_edit_distance(text, speculation.text)
+            > self._speculative_args.max_distance
+        ):
+            await self.cancel_speculation()
+            return False
+
+        saved_latency_s = time.monotonic() - speculation.started_at
+        while speculation.frames:
+            frame, direction = speculation.frames.pop(0)
+            await super().push_frame(frame, direction)
+        speculation.committed = True
+        speculation.commit_event.set()
+        self._speculation_committed += 1
+        self._speculation_saved_latency.observe(saved_latency_s)
+        logging.debug(
+            f"commit speculative generation on interim text: {speculation.text},"
+            f" final text: {text}, saved latency: {saved_latency_s:.3f}s"
+        )
+        await self.push_speculation_metrics(saved_latency_s=saved_latency_s)
+        try:
+            await speculation.task
+        finally:
+            if self._speculation is speculation:
+                self._speculation = None
+        return True
+
+    async def push_speculation_metrics(
+        self, *, wasted_tokens: int | None = None, saved_latency_s: float | None = None
+    ):
+        if not (self.can_generate_metrics() and self.metrics_enabled):
+            return
+        if wasted_tokens is not None:
+            tokens = {
+                "processor": self.name,
+                "model": self._model,
+                "speculative_wasted_tokens": wasted_tokens,
+            }
+            await self.push_frame(MetricsFrame(tokens=[tokens]))
+        if saved_latency_s is not None:
+            processing = {
+                "processor": self.name,
+                "speculative_saved_latency": saved_latency_s,
+            }
+            await self.push_frame(MetricsFrame(processing=[processing]))
+
+    async def process_llm_context(self, context) -> None:
+        """
+        generate the llm response of the context, or commit the matched speculative one
+        """
+        await self.push_frame(LLMFullResponseStartFrame())
+        await self.start_processing_metrics()
+        if not await self.commit_speculation(context):
+            await self._process_context(context)
+        await self.stop_processing_metrics()
+        await self.push_frame(LLMFullResponseEndFrame())
+
+    async def _process_context(self, context) -> None:
+        raise NotImplementedError
+
+    async def process_frame(self, frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, (EndFrame, CancelFrame)):
+            await self.cancel_speculation()
+
     # !TODO: use callback function type @weedge
-    def register_function(self, function_name: str | None, callback, start_callback=None):
+    def register_function(
+        self,
+        function_name: str | None,
+        callback,
+        start_callback=None,
+        start_fields: list[str] | None = None,
+    ):
         # Registering a function with the function_name set to None will run that callback
         # for all functions
         self._callbacks[function_name] = callback
         # QUESTION FOR CB: maybe this isn't needed anymore?
         if start_callback:
             self._start_callbacks[function_name] = start_callback
+        # start the callback with the streamed arguments once these fields are complete,
+        # e.g.: ["query"] for web_search, the other arguments may not be there yet
+        if start_fields:
+            self._start_fields[function_name] = list(start_fields)
+
+    def set_function_call_args(
+        self,
+        timeout_s: float | None = None,
+        filler_texts: list[str] | None = None,
+        filler_delay_s: float = 1.5,
+    ):
+        """
+        - timeout_s: per function call timeout, the llm gets a timeout error result
+        - filler_texts: say one of them with tts if function calls are not done in filler_delay_s
+        """
+        self._function_call_timeout_s = timeout_s
+        self._function_filler_texts = filler_texts or []
+        self._function_filler_delay_s = filler_delay_s
+
+    def get_function_callback(self, function_name: str):
+        if function_name in self._callbacks.keys():
+            return self._callbacks[function_name]
+        if None in self._callbacks.keys():
+            return self._callbacks[None]
+        return None
+
+    @staticmethod
+    def accumulate_tool_call_deltas(function_calls: dict[int, dict], tool_calls) -> list[int]:
+        """
+        accumulate streamed openai tool call deltas by index into
+        {"tool_call_id", "function_name", "arguments"}, return the indexes of new function calls
+        """
+        new_indexes = []
+        for tool_call in tool_calls:
+            index = tool_call.index
+            if index is None:
+                # some compatible apis don't send index, new call has id
+                index = (
+                    len(function_calls)
+                    if tool_call.id or not function_calls
+                    else max(function_calls)
+                )
+            if index not in function_calls:
+                function_calls[index] = {"tool_call_id": "", "function_name": "", "arguments": ""}
+                new_indexes.append(index)
+            function_call = function_calls[index]
+            if tool_call.id:
+                function_call["tool_call_id"] = tool_call.id
+            if tool_call.function and tool_call.function.name:
+                function_call["function_name"] += tool_call.function.name
+            if tool_call.function and tool_call.function.arguments:
+                function_call["arguments"] += tool_call.function.arguments
+        return new_indexes
+
+    async def call_function(
+        self, *, context, tool_call_id: str, function_name: str, arguments: dict
+    ) -> None:
+        await self.call_functions(
+            context,
+            [
+                {
+                    "tool_call_id": tool_call_id,
+                    "function_name": function_name,
+                    "arguments": arguments,
+                }
+            ],
+        )
+
+    def get_function_start_fields(self, function_name: str) -> list[str] | None:
+        if function_name in self._callbacks.keys():
+            return self._start_fields.get(function_name)
+        if None in self._callbacks.keys():
+            return self._start_fields.get(None)
+        return None
+
+    async def start_early_function_calls(self, context, function_calls: dict[int, dict]) -> None:
+        """
+        feed the streamed arguments of the accumulated function calls to the incremental json
+        parser, start the callbacks once their start fields are complete, before the llm
+        stream ends; call_functions waits for them
+        """
+        if self._in_speculation() is not None:
+            return
+        for call in function_calls.values():
+            if "early_call" in call or not call["function_name"]:
+                continue
+            start_fields = self.get_function_start_fields(call["function_name"])
+            if not start_fields:
+                continue
+            parser = call.setdefault("args_parser", StreamingJSONParser())
+            parser.feed(call["arguments"][len(parser.text) :])
+            if all(field in parser.fields for field in start_fields):
+                call["early_call"] = self._start_early_function(context, call, dict(parser.fields))
+
+    def _start_early_function(self, context, call: dict, arguments: dict):
+        """
+        run the callback in a task, its result is passed on by the returned proxy callback
+        """
+        f = self.get_function_callback(call["function_name"])
+        result = self.get_event_loop().create_future()
+
+        async def result_callback(res):
+            if not result.done():
+                result.set_result(res)
+
+        async def run():
+            try:
+                await f(
+                    call["function_name"],
+                    call["tool_call_id"],
+                    arguments,
+                    self,
+                    context,
+                    result_callback,
+                )
+            finally:
+                await result_callback(None)
+
+        task = self.get_event_loop().create_task(run())
+        logging.debug(
+            f"start function {call['function_name']} {call['tool_call_id']} early with {arguments}"
+        )
+
+        async def proxy(function_name, tool_call_id, args, llm, context, result_callback):
+            await task
+            await result_callback(result.result())
+
+        proxy.task = task
+        return proxy
+
+    @staticmethod
+    def cancel_early_function_calls(function_calls: dict[int, dict]) -> None:
+        for call in function_calls.values():
+            if "early_call" in call:
+                call.pop("early_call").task.cancel()
+
+    async def call_functions(self, context, function_calls: list[dict]) -> None:
+        """
+        run the registered callbacks of {"tool_call_id", "function_name", "arguments"} concurrently;
+        arguments is a dict or a json string; early started callbacks are waited
+        """
+        calls = []
+        for call in function_calls:
+            f = call.get("early_call") or self.get_function_callback(call["function_name"])
+            if f is None:
+                continue
+            arguments = call["arguments"]
+            if isinstance(arguments, str):
+                arguments = json.loads(arguments) if arguments else {}
+            calls.append((f, call["function_name"], call["tool_call_id"], arguments))
+        if not calls:
+            return
+
+        speculation = self._in_speculation()
+        if speculation is not None:
+            # no function side effects before commit
+            await speculation.commit_event.wait()
+
+        filler_task = None
+        if self._function_filler_texts:
+            filler_task = self.get_event_loop().create_task(self._push_function_filler())
+        try:
+            await context.call_functions(calls, llm=self, timeout_s=self._function_call_timeout_s)
+        finally:
+            if filler_task:
+                filler_task.cancel()
+
+    async def _push_function_filler(self):
+        await asyncio.sleep(self._function_filler_delay_s)
+        # the voice path is never silent with slow function calls
+        await self.push_frame(TTSSpeakFrame(text=random.choice(self._function_filler_texts)))
 
     def unregister_function(self, function_name: str | None):
         del self._callbacks[function_name]
+        self._start_fields.pop(function_name, None)
         if self._start_callbacks[function_name]:
             del self._start_callbacks[function_name]
 
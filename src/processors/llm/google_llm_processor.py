@@ -23,12 +23,12 @@ except ModuleNotFoundError as e:
 
 from src.processors.aggregators.openai_llm_context import OpenAILLMContext, OpenAILLMContextFrame
 from src.processors.llm.base import LLMProcessor, UnhandledFunctionException
-from src.types.frames.control_frames import (
-    LLMFullResponseEndFrame,
-    LLMFullResponseStartFrame,
-    LLMModelUpdateFrame,
+from src.types.frames.control_frames import LLMModelUpdateFrame
+from src.types.frames.data_frames import (
+    LLMMessagesFrame,
+    LLMSpeculativeMessagesFrame,
+    VisionImageRawFrame,
 )
-from src.types.frames.data_frames import LLMMessagesFrame, VisionImageRawFrame
 
 
 class GoogleAILLMProcessor(LLMProcessor):
@@ -136,7 +136,7 @@ class GoogleAILLMProcessor(LLMProcessor):
         ]
         """
         openai_messages = context.get_messages()
-        logging.debug(f"openai_messages-->{openai_messages}")
+        logging.debug("openai_messages-->%s", openai_messages)
         google_messages = []
 
         for message in openai_messages:
@@ -198,7 +198,7 @@ class GoogleAILLMProcessor(LLMProcessor):
                     parts = [function_response]
                     google_messages.append({"role": role, "parts": parts})
 
-        logging.debug(f"google_messages-->{google_messages}")
+        logging.debug("google_messages-->%s", google_messages)
 
         return google_messages
 
@@ -225,6 +225,8 @@ class GoogleAILLMProcessor(LLMProcessor):
             tokens["prompt_tokens"] = chunk_dict["usage_metadata"]["prompt_token_count"]
             tokens["completion_tokens"] = chunk_dict["usage_metadata"]["candidates_token_count"]
             tokens["total_tokens"] = chunk_dict["usage_metadata"]["total_token_count"]
+            if chunk_dict["usage_metadata"].get("cached_content_token_count") is not None:
+                tokens["cached_tokens"] = chunk_dict["usage_metadata"]["cached_content_token_count"]
             await self.start_llm_usage_metrics(tokens)
 
     async def infer(
@@ -257,11 +259,14 @@ class GoogleAILLMProcessor(LLMProcessor):
 
     async def _process_context(self, context: OpenAILLMContext):
         try:
-            logging.debug(f"Generating chat: {context.get_messages_json()}")
+            self.prepare_context(context)
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug(f"Generating chat: {context.get_messages_json()}")
             messages = self._get_messages_from_openai_context(context)
             tools = self._get_tools_from_openai_context(context)
             await self.start_ttfb_metrics()
             responese = await self.infer(messages, tools=tools, stream=True)
+            function_calls = []
             async for chunk in responese:
                 logging.debug(f"chunk:{chunk}")
                 await self.record_llm_usage_tokens(chunk_dict=chunk.to_dict())
@@ -272,7 +277,7 @@ class GoogleAILLMProcessor(LLMProcessor):
                 # Google LLMs seem to flag safety issues a lot!
                 if chunk.candidates[0].finish_reason == 3:
                     logging.warning(
-                        f"LLM refused to generate content" f" for safety reasons - {messages}."
+                        f"LLM refused to generate content for safety reasons - {messages}."
                     )
                     continue
 
@@ -285,12 +290,16 @@ class GoogleAILLMProcessor(LLMProcessor):
                     for key, item in func_call.args.items():
                         args[key] = item
                     if self.has_function(func_call.name):
-                        # no tool_call_id, use func_call.name
-                        await self.call_function(
-                            context=context,
-                            tool_call_id=func_call.name,
-                            function_name=func_call.name,
-                            arguments=args,
+                        # no tool_call_id, use func_call.name (with index if called again)
+                        tool_call_id = func_call.name
+                        if any(c["tool_call_id"] == tool_call_id for c in function_calls):
+                            tool_call_id = f"{func_call.name}_{len(function_calls)}"
+                        function_calls.append(
+                            {
+                                "tool_call_id": tool_call_id,
+                                "function_name": func_call.name,
+                                "arguments": args,
+                            }
                         )
                     else:
                         raise UnhandledFunctionException(
@@ -298,23 +307,13 @@ class GoogleAILLMProcessor(LLMProcessor):
                             f"but there isn't a callback registered for that function."
                         )
 
+            # run parallel function calls concurrently
+            if function_calls:
+                await self.call_functions(context, function_calls)
+
         except Exception as e:
             logging.exception(f"{self} exception: {e}")
 
-    async def call_function(
-        self, *, context: OpenAILLMContext, tool_call_id: str, function_name: str, arguments: dict
-    ) -> None:
-        f = None
-        if function_name in self._callbacks.keys():
-            f = self._callbacks[function_name]
-        elif None in self._callbacks.keys():
-            f = self._callbacks[None]
-        else:
-            return None
-        await context.call_function(
-            f, function_name=function_name, tool_call_id=tool_call_id, arguments=arguments, llm=self
-        )
-
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
 
@@ -325,7 +324,12 @@ class GoogleAILLMProcessor(LLMProcessor):
         elif isinstance(frame, LLMMessagesFrame):
             context = OpenAILLMContext.from_messages(frame.messages)
         elif isinstance(frame, VisionImageRawFrame):
-            context = OpenAILLMContext.from_image_frame(frame)
+            context = OpenAILLMContext.from_image_frame(frame, self._image_store)
+        elif isinstance(frame, LLMSpeculativeMessagesFrame):
+            if self._speculative_args:
+                await self.start_speculation(
+                    frame.text, OpenAILLMContext.from_speculative_frame(frame)
+                )
         elif isinstance(frame, LLMModelUpdateFrame):
             logging.debug(f"Switching LLM model to: [{frame.model}]")
             self._model = frame.model
@@ -333,8 +337,4 @@ class GoogleAILLMProcessor(LLMProcessor):
             await self.push_frame(frame, direction)
 
         if context:
-            await self.push_frame(LLMFullResponseStartFrame())
-            await self.start_processing_metrics()
-            await self._process_context(context)
-            await self.stop_processing_metrics()
-            await self.push_frame(LLMFullResponseEndFrame())
+            await self.process_llm_context(context)
@@ -1,5 +1,3 @@
-import base64
-import json
 import os
 import logging
 from typing import List
@@ -28,12 +26,12 @@ from apipeline.pipeline.pipeline import FrameDirection
 
 from src.processors.aggregators.openai_llm_context import OpenAILLMContext, OpenAILLMContextFrame
 from src.processors.llm.base import LLMProcessor, UnhandledFunctionException
-from src.types.frames.control_frames import (
-    LLMFullResponseEndFrame,
-    LLMFullResponseStartFrame,
-    LLMModelUpdateFrame,
+from src.types.frames.control_frames import LLMModelUpdateFrame
+from src.types.frames.data_frames import (
+    LLMMessagesFrame,
+    LLMSpeculativeMessagesFrame,
+    VisionImageRawFrame,
 )
-from src.types.frames.data_frames import LLMMessagesFrame, VisionImageRawFrame
 
 
 class LiteLLMProcessor(LLMProcessor):
@@ -51,20 +49,6 @@ class LiteLLMProcessor(LLMProcessor):
         litellm.set_verbose = set_verbose
         # self._response_format = {"type": "json_object"}
 
-    async def call_function(
-        self, *, context: OpenAILLMContext, tool_call_id: str, function_name: str, arguments: dict
-    ) -> None:
-        f = None
-        if function_name in self._callbacks.keys():
-            f = self._callbacks[function_name]
-        elif None in self._callbacks.keys():
-            f = self._callbacks[None]
-        else:
-            return None
-        await context.call_function(
-            f, function_name=function_name, tool_call_id=tool_call_id, arguments=arguments, llm=self
-        )
-
     # QUESTION FOR CB: maybe this isn't needed anymore?
     async def call_start_function(self, context: OpenAILLMContext, function_name: str):
         if function_name in self._start_callbacks.keys():
@@ -73,7 +57,10 @@ class LiteLLMProcessor(LLMProcessor):
             return await self._start_callbacks[None](function_name, self, context)
 
     async def get_chat_completions(
-        self, context: OpenAILLMContext, messages: List[ChatCompletionMessageParam]
+        self,
+        context: OpenAILLMContext,
+        messages: List[ChatCompletionMessageParam],
+        tools: List[ChatCompletionToolParam] | None = None,
     ) -> AsyncStream[ChatCompletionChunk]:
         chunks = await litellm.acompletion(
             model=self._model,
@@ -83,7 +70,7 @@ class LiteLLMProcessor(LLMProcessor):
             # issue: https://github.com/BerriAI/litellm/issues/6505
             # messages=litellm.utils.trim_messages(messages, self._model),
             messages=messages,
-            tools=context.tools,
+            tools=tools if tools is not None else context.tools,
             tool_choice=context.tool_choice,
             stream_options={"include_usage": True},
             # stream Structured Outputs json mode !TODO @weedge -> partial support
@@ -95,26 +82,20 @@ class LiteLLMProcessor(LLMProcessor):
     async def _stream_chat_completions(
         self, context: OpenAILLMContext
     ) -> AsyncStream[ChatCompletionChunk]:
-        logging.info(f"Generating chat context messages: {context.get_messages_json()}")
-
+        self.prepare_context(context)
         messages: List[ChatCompletionMessageParam] = context.get_messages()
+        logging.info(f"Generating chat context messages: {len(messages)}")
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(f"Generating chat context messages: {context.get_messages_json()}")
 
-        # base64 encode any images
-        for message in messages:
-            if message.get("mime_type") == "image/jpeg":
-                encoded_image = base64.b64encode(message["data"].getvalue()).decode("utf-8")
-                text = message["content"]
-                message["content"] = [
-                    {"type": "text", "text": text},
-                    {
-                        "type": "image_url",
-                        "image_url": {"url": f"data:image/jpeg;base64,{encoded_image}"},
-                    },
-                ]
-                del message["data"]
-                del message["mime_type"]
-
-        chunks = await self.get_chat_completions(context, messages)
+        tools = context.tools
+        if self._prompt_cache:
+            # the shared static prefix (system prompt + tools) first, for provider prompt caching
+            messages, tools = self._prompt_cache.build(messages, tools, self._model)
+        # base64 data url images
+        messages = [self.to_openai_message(message) for message in messages]
+
+        chunks = await self.get_chat_completions(context, messages, tools)
 
         return chunks
 
@@ -123,16 +104,16 @@ class LiteLLMProcessor(LLMProcessor):
             "processor": self.name,
             "model": self._model,
         }
-        if hasattr(chunk_dict, "usage") and chunk_dict["usage"]:
+        if chunk_dict.get("usage"):
             tokens["prompt_tokens"] = chunk_dict["usage"]["prompt_tokens"]
             tokens["completion_tokens"] = chunk_dict["usage"]["completion_tokens"]
             tokens["total_tokens"] = chunk_dict["usage"]["total_tokens"]
+            tokens.update(self.get_cached_tokens(chunk_dict["usage"]))
             await self.start_llm_usage_metrics(tokens)
 
     async def _process_context(self, context: OpenAILLMContext):
-        function_name = ""
-        arguments = ""
-        tool_call_id = ""
+        # index -> {"tool_call_id", "function_name", "arguments"}, parallel tool calls
+        function_calls: dict[int, dict] = {}
 
         await self.start_ttfb_metrics()
 
@@ -140,59 +121,56 @@ class LiteLLMProcessor(LLMProcessor):
             context
         )
 
-        async for chunk in chunk_stream:
-            # logging.info(f"chunk:{chunk.model_dump_json()}")
-            await self.record_llm_usage_tokens(chunk_dict=chunk.model_dump())
-
-            if len(chunk.choices) == 0:
-                continue
-            await self.stop_ttfb_metrics()
-
-            if chunk.choices[0].delta.tool_calls:
-                # We're streaming the LLM response to enable the fastest response times.
-                # For text, we just yield each chunk as we receive it and count on consumers
-                # to do whatever coalescing they need (eg. to pass full sentences to TTS)
-                #
-                # If the LLM is a function call, we'll do some coalescing here.
-                # If the response contains a function name, we'll yield a frame to tell consumers
-                # that they can start preparing to call the function with that name.
-                # We accumulate all the arguments for the rest of the streamed response, then when
-                # the response is done, we package up all the arguments and the function name and
-                # yield a frame containing the function name and the arguments.
-
-                tool_call = chunk.choices[0].delta.tool_calls[0]
-                if tool_call.function and tool_call.function.name:
-                    function_name += tool_call.function.name
-                    tool_call_id = tool_call.id
-                    await self.call_start_function(context, function_name)
-                if tool_call.function and tool_call.function.arguments:
-                    # Keep iterating through the response to collect all the argument fragments
-                    arguments += tool_call.function.arguments
-            elif chunk.choices[0].delta.content:
-                await self.push_frame(TextFrame(chunk.choices[0].delta.content))
-
-        # if we got a function name and arguments, check to see if it's a function with
-        # a registered handler. If so, run the registered callback, save the result to
-        # the context, and re-prompt to get a chat answer. If we don't have a registered
+        try:
+            async for chunk in chunk_stream:
+                # logging.info(f"chunk:{chunk.model_dump_json()}")
+                await self.record_llm_usage_tokens(chunk_dict=chunk.model_dump())
+
+                if len(chunk.choices) == 0:
+                    continue
+                await self.stop_ttfb_metrics()
+
+                if chunk.choices[0].delta.tool_calls:
+                    # We're streaming the LLM response to enable the fastest response times.
+                    # For text, we just yield each chunk as we receive it and count on consumers
+                    # to do whatever coalescing they need (eg. to pass full sentences to TTS)
+                    #
+                    # If the LLM is a function call, we'll do some coalescing here.
+                    # If the response contains a function name, we'll yield a frame to tell consumers
+                    # that they can start preparing to call the function with that name.
+                    # We accumulate all the arguments for the rest of the streamed response, then when
+                    # the response is done, we package up all the arguments and the function name and
+                    # yield a frame containing the function name and the arguments.
+                    # Multiple tool calls in one response are accumulated by index.
+
+                    new_indexes = self.accumulate_tool_call_deltas(
+                        function_calls, chunk.choices[0].delta.tool_calls
+                    )
+                    for index in new_indexes:
+                        if function_calls[index]["function_name"]:
+                            await self.call_start_function(
+                                context, function_calls[index]["function_name"]
+                            )
+                    # start the functions which have their start fields streamed
+                    await self.start_early_function_calls(context, function_calls)
+                elif chunk.choices[0].delta.content:
+                    await self.push_frame(TextFrame(chunk.choices[0].delta.content))
+        except BaseException:
+            self.cancel_early_function_calls(function_calls)
+            raise
+
+        # if we got function names and arguments, check to see if they are functions with
+        # registered handlers. If so, run the registered callbacks concurrently, save the results
+        # to the context, and re-prompt to get a chat answer. If we don't have a registered
         # handler, raise an exception.
-        if function_name and arguments:
-            if self.has_function(function_name):
-                await self._handle_function_call(context, tool_call_id, function_name, arguments)
-            else:
+        calls = [call for call in function_calls.values() if call["function_name"]]
+        for call in calls:
+            if not self.has_function(call["function_name"]):
                 raise UnhandledFunctionException(
-                    f"The LLM tried to call a function named '{function_name}', but there isn't a callback registered for that function."
+                    f"The LLM tried to call a function named '{call['function_name']}', but there isn't a callback registered for that function."
                 )
-
-    async def _handle_function_call(
-        self, context: OpenAILLMContext, tool_call_id: str, function_name: str, arguments: str
-    ):
-        arguments = json.loads(arguments)
-        await self.call_function(
-            context=context,
-            tool_call_id=tool_call_id,
-            function_name=function_name,
-            arguments=arguments,
-        )
+        if calls:
+            await self.call_functions(context, calls)
 
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
@@ -203,7 +181,12 @@ class LiteLLMProcessor(LLMProcessor):
         elif isinstance(frame, LLMMessagesFrame):
             context = OpenAILLMContext.from_messages(frame.messages)
         elif isinstance(frame, VisionImageRawFrame):
-            context = OpenAILLMContext.from_image_frame(frame)
+            context = OpenAILLMContext.from_image_frame(frame, self._image_store)
+        elif isinstance(frame, LLMSpeculativeMessagesFrame):
+            if self._speculative_args:
+                await self.start_speculation(
+                    frame.text, OpenAILLMContext.from_speculative_frame(frame)
+                )
         elif isinstance(frame, LLMModelUpdateFrame):
             logging.debug(f"Switching LLM model to: [{frame.model}]")
             self._model = frame.model
@@ -211,8 +194,4 @@ class LiteLLMProcessor(LLMProcessor):
             await self.push_frame(frame, direction)
 
         if context:
-            await self.push_frame(LLMFullResponseStartFrame())
-            await self.start_processing_metrics()
-            await self._process_context(context)
-            await self.stop_processing_metrics()
-            await self.push_frame(LLMFullResponseEndFrame())
+            await self.process_llm_context(context)
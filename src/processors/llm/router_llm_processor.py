@@ -0,0 +1,272 @@
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, List
+
+from src.common.utils.histogram import LatencyHistogram
+from src.processors.aggregators.openai_llm_context import OpenAILLMContext
+from src.processors.aggregators.prompt_prefix_cache import PromptPrefixCache
+from src.processors.llm.openai_llm_processor import BaseOpenAILLMProcessor
+from src.types.llm.router import LLMRouterArgs
+
+
+class LLMBackendStats:
+    """
+    rolling latency and health of a router backend
+    """
+
+    def __init__(self, name: str, alpha: float = 0.3) -> None:
+        self.name = name
+        self.alpha = alpha
+        self.ttft_ewma_s: float | None = None
+        self.tps_ewma: float | None = None
+        self.ttft = LatencyHistogram()
+        self.requests = 0
+        self.wins = 0
+        self.hedged = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+
+    def _ewma(self, prev: float | None, value: float) -> float:
+        return value if prev is None else self.alpha * value + (1 - self.alpha) * prev
+
+    def observe_ttft(self, ttft_s: float):
+        self.ttft_ewma_s = self._ewma(self.ttft_ewma_s, ttft_s)
+        self.ttft.observe(ttft_s)
+
+    def observe_ttft_lower_bound(self, elapsed_s: float):
+        # cancelled before the first token, only raise the estimate
+        if self.ttft_ewma_s is None or elapsed_s > self.ttft_ewma_s:
+            self.ttft_ewma_s = elapsed_s
+
+    def observe_tps(self, tokens_per_s: float):
+        self.tps_ewma = self._ewma(self.tps_ewma, tokens_per_s)
+
+    def observe_success(self):
+        self.consecutive_failures = 0
+
+    def observe_failure(self, max_failures: int, cooldown_s: float):
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= max_failures:
+            self.unhealthy_until = time.monotonic() + cooldown_s
+            logging.warning(
+                f"llm backend {self.name} unhealthy after {self.consecutive_failures} failures,"
+                f" cooldown {cooldown_s}s"
+            )
+
+    def is_healthy(self) -> bool:
+        return time.monotonic() >= self.unhealthy_until
+
+    def score(self) -> tuple:
+        # the lowest ttft first, then the highest tokens/s; new backends are tried first
+        return (self.ttft_ewma_s or 0.0, -(self.tps_ewma or 0.0))
+
+    @property
+    def snapshot(self) -> dict:
+        return {
+            "ttft_ewma_s": self.ttft_ewma_s,
+            "tps_ewma": self.tps_ewma,
+            "requests": self.requests,
+            "wins": self.wins,
+            "hedged": self.hedged,
+            "failures": self.failures,
+            "healthy": self.is_healthy(),
+            "ttft": self.ttft.snapshot(),
+        }
+
+
+class LLMRouterProcessor(BaseOpenAILLMProcessor):
+    """
+    route chat completions over several openai compatible llm processor backends
+    (e.g.: openai, groq, together), instead of one provider per bot
+    - send each request to the fastest healthy backend (ttft/tokens-per-second ewma)
+    - hedge: if no first token after the ttft percentile threshold of the backend,
+      send a second request to the next backend, the first one to stream wins,
+      the loser is cancelled
+    - failover: errors before the first token go to the next backend,
+      consecutive failures mark the backend unhealthy for a cooldown
+    """
+
+    TAG = "llm_router_processor"
+
+    def __init__(
+        self,
+        *,
+        backends: List[BaseOpenAILLMProcessor],
+        router_args: dict | None = None,
+        **kwargs,
+    ):
+        if not backends:
+            raise ValueError("llm router needs at least one backend")
+        # requests go to the backend clients
+        super().__init__(model=backends[0]._model, client=backends[0]._client, **kwargs)
+        self.args = LLMRouterArgs(**(router_args or {}))
+        self._backends = backends
+        self._stats = [
+            LLMBackendStats(f"{i}:{backend._model}", self.args.ewma_alpha)
+            for i, backend in enumerate(backends)
+        ]
+
+    def set_prompt_cache(self, prompt_cache: PromptPrefixCache | None):
+        super().set_prompt_cache(prompt_cache)
+        # the requests are sent by the backends, e.g. with the usage chunk
+        for backend in self._backends:
+            backend.set_prompt_cache(prompt_cache)
+
+    @property
+    def router_stats(self) -> dict:
+        return {stats.name: stats.snapshot for stats in self._stats}
+
+    def rank_backends(self) -> List[int]:
+        healthy = [i for i, stats in enumerate(self._stats) if stats.is_healthy()]
+        # all unhealthy, try them anyway
+        candidates = healthy or list(range(len(self._backends)))
+        return sorted(candidates, key=lambda i: self._stats[i].score())
+
+    def hedge_delay_s(self, i: int) -> float:
+        stats = self._stats[i]
+        if stats.ttft.count < self.args.hedge_min_samples:
+            return self.args.hedge_min_s
+        delay_s = stats.ttft.percentile(self.args.hedge_percentile) / 1000
+        return min(max(delay_s, self.args.hedge_min_s), self.args.hedge_max_s)
+
+    @staticmethod
+    async def _close_stream(stream):
+        close = getattr(stream, "close", None) or getattr(stream, "aclose", None)
+        if close is None:
+            return
+        try:
+            await close()
+        except Exception as e:
+            logging.debug(f"close llm stream Exception: {e}")
+
+    async def _first_chunk(self, i: int, context: OpenAILLMContext, messages, tools):
+        """
+        start the backend chat completion stream, return (stream, first chunk, ttft)
+        """
+        self._stats[i].requests += 1
+        start = time.monotonic()
+        stream = await self._backends[i].get_chat_completions(context, messages, tools)
+        try:
+            first = await stream.__anext__()
+        except StopAsyncIteration:
+            first = None
+        except BaseException:
+            await self._close_stream(stream)
+            raise
+        return stream, first, time.monotonic() - start
+
+    async def get_chat_completions(
+        self, context: OpenAILLMContext, messages, tools=None
+    ) -> AsyncIterator:
+        return self._route(context, messages, tools)
+
+    async def _route(self, context: OpenAILLMContext, messages, tools) -> AsyncIterator:
+        ranked = self.rank_backends()
+        # task -> (backend index, start time)
+        pending: dict[asyncio.Task, tuple[int, float]] = {}
+        loop = self.get_event_loop()
+
+        deadline = time.monotonic() + self.args.first_token_timeout_s
+        hedge_at = deadline
+        last = ranked[0]
+
+        def launch(i: int):
+            nonlocal hedge_at, last
+            task = loop.create_task(self._first_chunk(i, context, messages, tools))
+            pending[task] = (i, time.monotonic())
+            # the next hedge waits for the delay of the latest launched backend
+            hedge_at = time.monotonic() + self.hedge_delay_s(i)
+            last = i
+
+        launch(ranked.pop(0))
+        hedges = 0
+        winner = None
+        last_error: BaseException | None = None
+        try:
+            while pending and winner is None:
+                can_hedge = ranked and hedges < self.args.max_hedges
+                wait_until = min(hedge_at, deadline) if can_hedge else deadline
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=max(0.0, wait_until - time.monotonic()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    if can_hedge and time.monotonic() < deadline:
+                        hedges += 1
+                        for i, _ in pending.values():
+                            self._stats[i].hedged += 1
+                        logging.info(
+                            f"hedge llm request to {self._stats[ranked[0]].name},"
+                            f" no first token in {self.hedge_delay_s(last):.3f}s"
+                        )
+                        launch(ranked.pop(0))
+                        continue
+                    raise asyncio.TimeoutError(
+                        f"no first token in {self.args.first_token_timeout_s}s"
+                    )
+                for task in done:
+                    i, _ = pending.pop(task)
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        logging.warning(
+                            f"llm backend {self._stats[i].name} Exception: {last_error}"
+                        )
+                        self._stats[i].observe_failure(
+                            self.args.max_failures, self.args.unhealthy_cooldown_s
+                        )
+                        continue
+                    if winner is None:
+                        winner = (i, *task.result())
+                    else:
+                        # finished at the same time, keep the first one
+                        await self._close_stream(task.result()[0])
+                if winner is None and not pending:
+                    if not ranked:
+                        raise last_error
+                    # failover
+                    launch(ranked.pop(0))
+        finally:
+            for task, (i, start) in pending.items():
+                task.cancel()
+                # the loser's ttft is at least the elapsed time
+                self._stats[i].observe_ttft_lower_bound(time.monotonic() - start)
+            for task in pending:
+                try:
+                    stream, _, _ = await task
+                    await self._close_stream(stream)
+                except (asyncio.CancelledError, Exception):
+                    pass
+
+        i, stream, first, ttft_s = winner
+        stats = self._stats[i]
+        stats.wins += 1
+        stats.observe_success()
+        stats.observe_ttft(ttft_s)
+        # usage metrics with the serving model
+        self._model = self._backends[i]._model
+        logging.debug(f"llm backend {stats.name} won, ttft: {ttft_s:.3f}s")
+
+        if first is None:
+            return
+        tokens = 0
+        first_token_at = time.monotonic()
+        try:
+            yield first
+            async for chunk in stream:
+                if chunk.choices and (
+                    chunk.choices[0].delta.content or chunk.choices[0].delta.tool_calls
+                ):
+                    tokens += 1
+                yield chunk
+        except Exception:
+            stats.observe_failure(self.args.max_failures, self.args.unhealthy_cooldown_s)
+            raise
+        finally:
+            await self._close_stream(stream)
+        duration_s = time.monotonic() - first_token_at
+        if tokens and duration_s > 0:
+            stats.observe_tps(tokens / duration_s)
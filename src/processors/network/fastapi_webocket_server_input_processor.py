@@ -26,6 +26,14 @@ class FastapiWebsocketServerInputProcessor(AudioVADInputProcessor):
         self._websocket = websocket
         self._params = params
         self._callbacks = callbacks
+        # persistent decoder state of the connection
+        self._opus_decoder = None
+        if params.audio_codec == "opus":
+            from src.common.utils.opus import OpusDecoder
+
+            self._opus_decoder = OpusDecoder(
+                params.audio_in_sample_rate, params.audio_in_channels, params.opus.frame_ms
+            )
 
     async def start(self, frame: StartFrame):
         await super().start(frame)
@@ -53,6 +61,13 @@ class FastapiWebsocketServerInputProcessor(AudioVADInputProcessor):
                     continue
 
                 if isinstance(frame, AudioRawFrame):
+                    if self._opus_decoder:
+                        # an empty audio payload is a lost packet, concealed
+                        frame = AudioRawFrame(
+                            audio=self._opus_decoder.decode(frame.audio),
+                            sample_rate=self._opus_decoder.sample_rate,
+                            num_channels=self._opus_decoder.num_channels,
+                        )
                     await self.push_audio_frame(frame)
 
         except Exception as e:
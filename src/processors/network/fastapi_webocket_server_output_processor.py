@@ -4,21 +4,56 @@ import logging
 
 from fastapi import WebSocket
 from fastapi.websockets import WebSocketState
-from apipeline.frames.data_frames import Frame, AudioRawFrame, TextFrame
-from apipeline.frames.sys_frames import StartInterruptionFrame
+from apipeline.frames.control_frames import EndFrame
+from apipeline.frames.data_frames import Frame, AudioRawFrame, ImageRawFrame, TextFrame
+from apipeline.frames.sys_frames import CancelFrame, MetricsFrame, StartInterruptionFrame
 from apipeline.processors.frame_processor import FrameDirection
 
+from src.common.utils.pacer import AsyncMediaPacer
+from src.common.utils.send_queue import BoundedSendQueue
 from src.processors.audio_camera_output_processor import AudioCameraOutputProcessor
-from src.types.network.fastapi_websocket import FastapiWebsocketServerParams
+from src.types.network.fastapi_websocket import (
+    FastapiWebsocketServerCallbacks,
+    FastapiWebsocketServerParams,
+)
 
 
 class FastapiWebsocketServerOutputProcessor(AudioCameraOutputProcessor):
-    def __init__(self, websocket: WebSocket, params: FastapiWebsocketServerParams, **kwargs):
+    def __init__(
+        self,
+        websocket: WebSocket,
+        params: FastapiWebsocketServerParams,
+        callbacks: FastapiWebsocketServerCallbacks | None = None,
+        **kwargs,
+    ):
         super().__init__(params, **kwargs)
 
         self._websocket = websocket
         self._params = params
+        self._callbacks = callbacks
+        # payloads are sent by the send queue writer task, a slow client doesn't stall the pipeline
+        self._send_queue = BoundedSendQueue(
+            self._send,
+            high_water_bytes=params.send_queue_high_water_bytes,
+            max_bytes=params.send_queue_max_bytes,
+            audio_horizon_s=params.send_queue_audio_horizon_s,
+            on_slow=self._on_client_slow,
+        )
         self._websocket_audio_buffer = bytes()
+        # persistent encoder state of the connection
+        self._opus_encoder = None
+        if params.audio_codec == "opus":
+            from src.common.utils.opus import OpusEncoder
+
+            self._opus_encoder = OpusEncoder(
+                params.audio_out_sample_rate, params.audio_out_channels, **params.opus.model_dump()
+            )
+        # audio is sent in the sink task, pacing it keeps the not sent audio in the sink queue,
+        # which is dropped by the sink task cancellation on interruption
+        self._audio_out_pacer = (
+            AsyncMediaPacer(params.audio_out_lead_s) if params.audio_out_paced else None
+        )
+        self._audio_bytes_per_s = params.audio_out_sample_rate * params.audio_out_channels * 2
 
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
@@ -26,10 +61,62 @@ class FastapiWebsocketServerOutputProcessor(AudioCameraOutputProcessor):
         if isinstance(frame, StartInterruptionFrame):
             await self._write_frame(frame)
 
+    @property
+    def send_queue_stats(self) -> dict:
+        """
+        slow client metrics of the connection
+        """
+        return self._send_queue.stats()
+
+    async def stop(self, frame: EndFrame):
+        await super().stop(frame)
+        await self._send_queue.stop()
+
+    async def cancel(self, frame: CancelFrame):
+        await super().cancel(frame)
+        await self._send_queue.cancel()
+
+    async def _handle_interruptions(self, frame: Frame):
+        if isinstance(frame, StartInterruptionFrame) and self.interruptions_allowed:
+            # the queued audio is stale
+            self._send_queue.clear("audio")
+        if isinstance(frame, StartInterruptionFrame):
+            self._websocket_audio_buffer = bytes()
+            self._opus_encoder and self._opus_encoder.clear()
+            self._audio_out_pacer and self._audio_out_pacer.reset()
+        await super()._handle_interruptions(frame)
+
+    async def _pace_audio(self, duration_s: float):
+        if self._audio_out_pacer:
+            await self._audio_out_pacer.pace(duration_s)
+
+    async def _bot_stopped_speaking(self):
+        if self._opus_encoder:
+            # the tail of the speech padded to a whole opus frame
+            await self._send_opus_packets(self._opus_encoder.flush())
+        await super()._bot_stopped_speaking()
+
     async def send_text(self, frame: TextFrame):
         await self.send_payload(frame)
 
+    async def _send_opus_packets(self, packets: list[bytes]):
+        for packet in packets:
+            await self._pace_audio(
+                self._opus_encoder.frame_samples / self._params.audio_out_sample_rate
+            )
+            await self.send_payload(
+                AudioRawFrame(
+                    audio=packet,
+                    sample_rate=self._params.audio_out_sample_rate,
+                    num_channels=self._params.audio_out_channels,
+                )
+            )
+
     async def write_raw_audio_frames(self, frames: bytes):
+        if self._opus_encoder:
+            await self._send_opus_packets(self._opus_encoder.encode(frames))
+            return
+
         self._websocket_audio_buffer += frames
         while len(self._websocket_audio_buffer):
             frame = AudioRawFrame(
@@ -37,6 +124,7 @@ class FastapiWebsocketServerOutputProcessor(AudioCameraOutputProcessor):
                 sample_rate=self._params.audio_out_sample_rate,
                 num_channels=self._params.audio_out_channels,
             )
+            await self._pace_audio(len(frame.audio) / self._audio_bytes_per_s)
 
             if self._params.add_wav_header:
                 content = io.BytesIO()
@@ -67,16 +155,30 @@ class FastapiWebsocketServerOutputProcessor(AudioCameraOutputProcessor):
             if not payload:
                 logging.warning(f"serialize frame: {frame} no payload")
                 return
-            if self._websocket.client_state != WebSocketState.CONNECTED:
-                logging.warning(
-                    f"websocket not connected, client_state:{self._websocket.client_state}"
-                )
-                return
-
-            if isinstance(payload, str):
-                await self._websocket.send_text(payload)
-            else:
-                await self._websocket.send_bytes(payload)
-            # logging.debug(f"send payload: {type(payload)} len:{len(payload)}")
         except Exception as e:
             logging.error(f"send_payload error: {e}")
+            return
+
+        kind = "control"
+        if isinstance(frame, AudioRawFrame):
+            kind = "audio"
+        elif isinstance(frame, ImageRawFrame):
+            kind = "video"
+        elif isinstance(frame, MetricsFrame):
+            kind = "metrics"
+        self._send_queue.put(payload, kind)
+
+    async def _send(self, payload: str | bytes):
+        if self._websocket.client_state != WebSocketState.CONNECTED:
+            logging.warning(f"websocket not connected, client_state:{self._websocket.client_state}")
+            return
+
+        if isinstance(payload, str):
+            await self._websocket.send_text(payload)
+        else:
+            await self._websocket.send_bytes(payload)
+        # logging.debug(f"send payload: {type(payload)} len:{len(payload)}")
+
+    async def _on_client_slow(self, slow: bool, stats: dict):
+        if self._callbacks and self._callbacks.on_client_slow:
+            await self._callbacks.on_client_slow(self._websocket, slow, stats)
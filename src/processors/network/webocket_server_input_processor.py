@@ -27,6 +27,7 @@ class WebsocketServerInputProcessor(AudioVADInputProcessor):
         self._callbacks = callbacks
 
         self._websocket: websockets.WebSocketServerProtocol | None = None
+        self._opus_decoder = None
 
         self._stop_server_event = asyncio.Event()
 
@@ -57,6 +58,15 @@ class WebsocketServerInputProcessor(AudioVADInputProcessor):
             logging.warning("Only one client connected, using new connection")
 
         self._websocket = websocket
+        if self._params.audio_codec == "opus":
+            from src.common.utils.opus import OpusDecoder
+
+            # new decoder state for each client connection
+            self._opus_decoder = OpusDecoder(
+                self._params.audio_in_sample_rate,
+                self._params.audio_in_channels,
+                self._params.opus.frame_ms,
+            )
 
         # Notify
         await self._callbacks.on_client_connected(websocket)
@@ -69,6 +79,13 @@ class WebsocketServerInputProcessor(AudioVADInputProcessor):
                 continue
 
             if isinstance(frame, AudioRawFrame):
+                if self._opus_decoder:
+                    # an empty audio payload is a lost packet, concealed
+                    frame = AudioRawFrame(
+                        audio=self._opus_decoder.decode(frame.audio),
+                        sample_rate=self._opus_decoder.sample_rate,
+                        num_channels=self._opus_decoder.num_channels,
+                    )
                 await self.push_audio_frame(frame)
             else:
                 await self.push_frame(frame)
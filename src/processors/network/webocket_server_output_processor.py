@@ -3,9 +3,13 @@ import logging
 import wave
 
 import websockets
-from apipeline.frames.data_frames import AudioRawFrame
+from apipeline.frames.control_frames import EndFrame
+from apipeline.frames.data_frames import AudioRawFrame, Frame
+from apipeline.frames.sys_frames import CancelFrame, StartInterruptionFrame
 import websockets.connection
 
+from src.common.utils.pacer import AsyncMediaPacer
+from src.common.utils.send_queue import BoundedSendQueue
 from src.processors.audio_camera_output_processor import AudioCameraOutputProcessor
 from src.types.network.websocket import WebsocketServerParams
 
@@ -17,19 +21,101 @@ class WebsocketServerOutputProcessor(AudioCameraOutputProcessor):
         self._params = params
 
         self._websocket: websockets.WebSocketServerProtocol | None = None
+        # send queue of the client connection, a slow client doesn't stall the pipeline
+        self._send_queue: BoundedSendQueue | None = None
 
         self._websocket_audio_buffer = bytes()
+        self._opus_encoder = None
+        # audio is sent in the sink task, pacing it keeps the not sent audio in the sink queue,
+        # which is dropped by the sink task cancellation on interruption
+        self._audio_out_pacer = (
+            AsyncMediaPacer(params.audio_out_lead_s) if params.audio_out_paced else None
+        )
+        self._audio_bytes_per_s = params.audio_out_sample_rate * params.audio_out_channels * 2
 
     async def set_client_connection(self, websocket: websockets.WebSocketServerProtocol | None):
         if self._websocket:
             await self._websocket.close()
             logging.warning("Only one client allowed, using new connection")
         self._websocket = websocket
+        if self._send_queue:
+            await self._send_queue.cancel()
+            self._send_queue = None
+        if websocket:
+            self._send_queue = BoundedSendQueue(
+                websocket.send,
+                high_water_bytes=self._params.send_queue_high_water_bytes,
+                max_bytes=self._params.send_queue_max_bytes,
+                audio_horizon_s=self._params.send_queue_audio_horizon_s,
+            )
+        self._audio_out_pacer and self._audio_out_pacer.reset()
+        if websocket and self._params.audio_codec == "opus":
+            from src.common.utils.opus import OpusEncoder
+
+            # new encoder state for each client connection
+            self._opus_encoder = OpusEncoder(
+                self._params.audio_out_sample_rate,
+                self._params.audio_out_channels,
+                **self._params.opus.model_dump(),
+            )
+
+    @property
+    def send_queue_stats(self) -> dict:
+        """
+        slow client metrics of the connection
+        """
+        return self._send_queue.stats() if self._send_queue else {}
+
+    async def stop(self, frame: EndFrame):
+        await super().stop(frame)
+        self._send_queue and await self._send_queue.stop()
+
+    async def cancel(self, frame: CancelFrame):
+        await super().cancel(frame)
+        self._send_queue and await self._send_queue.cancel()
+
+    async def _handle_interruptions(self, frame: Frame):
+        if isinstance(frame, StartInterruptionFrame) and self.interruptions_allowed:
+            # the queued audio is stale
+            self._send_queue and self._send_queue.clear("audio")
+        if isinstance(frame, StartInterruptionFrame):
+            self._websocket_audio_buffer = bytes()
+            self._opus_encoder and self._opus_encoder.clear()
+            self._audio_out_pacer and self._audio_out_pacer.reset()
+        await super()._handle_interruptions(frame)
+
+    async def _pace_audio(self, duration_s: float):
+        if self._audio_out_pacer:
+            await self._audio_out_pacer.pace(duration_s)
+
+    async def _bot_stopped_speaking(self):
+        if self._opus_encoder:
+            # the tail of the speech padded to a whole opus frame
+            await self._send_opus_packets(self._opus_encoder.flush())
+        await super()._bot_stopped_speaking()
+
+    async def _send_opus_packets(self, packets: list[bytes]):
+        for packet in packets:
+            await self._pace_audio(
+                self._opus_encoder.frame_samples / self._params.audio_out_sample_rate
+            )
+            frame = AudioRawFrame(
+                audio=packet,
+                sample_rate=self._params.audio_out_sample_rate,
+                num_channels=self._params.audio_out_channels,
+            )
+            proto = self._params.serializer.serialize(frame)
+            if proto and self._send_queue:
+                self._send_queue.put(proto, "audio")
 
     async def write_raw_audio_frames(self, frames: bytes):
         if not self._websocket:
             return
 
+        if self._opus_encoder:
+            await self._send_opus_packets(self._opus_encoder.encode(frames))
+            return
+
         self._websocket_audio_buffer += frames
         while len(self._websocket_audio_buffer) >= self._params.audio_frame_size:
             frame = AudioRawFrame(
@@ -37,6 +123,7 @@ class WebsocketServerOutputProcessor(AudioCameraOutputProcessor):
                 sample_rate=self._params.audio_out_sample_rate,
                 num_channels=self._params.audio_out_channels,
             )
+            await self._pace_audio(len(frame.audio) / self._audio_bytes_per_s)
 
             if self._params.add_wav_header:
                 content = io.BytesIO()
@@ -53,8 +140,8 @@ class WebsocketServerOutputProcessor(AudioCameraOutputProcessor):
                 frame = wav_frame
 
             proto = self._params.serializer.serialize(frame)
-            if proto:
-                await self._websocket.send(proto)
+            if proto and self._send_queue:
+                self._send_queue.put(proto, "audio")
 
             self._websocket_audio_buffer = self._websocket_audio_buffer[
                 self._params.audio_frame_size :
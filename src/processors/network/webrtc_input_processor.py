@@ -0,0 +1,74 @@
+import asyncio
+import logging
+
+from apipeline.frames.control_frames import StartFrame
+from apipeline.frames.sys_frames import CancelFrame
+
+from src.processors.audio_input_processor import AudioVADInputProcessor
+from src.processors.rtvi.rtvi_serializer import RTVIMessageSerializer
+from src.services.webrtc_client import WebRTCTransportClient
+from src.types.frames.data_frames import TransportMessageFrame
+from src.types.network.webrtc import WebRTCParams
+
+
+class WebRTCInputProcessor(AudioVADInputProcessor):
+    def __init__(self, client: WebRTCTransportClient, params: WebRTCParams, **kwargs):
+        super().__init__(params, **kwargs)
+        self._client = client
+        self._params = params
+        self._audio_in_task: asyncio.Task | None = None
+
+    async def start(self, frame: StartFrame):
+        await super().start(frame)
+        await self._client.start()
+        if not self._audio_in_task and (self._params.audio_in_enabled or self._params.vad_enabled):
+            self._audio_in_task = self.get_event_loop().create_task(self._audio_in_task_handler())
+
+    async def stop(self):
+        await self._cancel_audio_in_task()
+        await super().stop()
+        await self._client.close()
+
+    async def cancel(self, frame: CancelFrame):
+        await self._cancel_audio_in_task()
+        await super().cancel(frame)
+        await self._client.close()
+
+    async def _cancel_audio_in_task(self):
+        if self._audio_in_task and not self._audio_in_task.done():
+            self._audio_in_task.cancel()
+            await self._audio_in_task
+        self._audio_in_task = None
+
+    #
+    # Frames
+    #
+
+    async def push_app_message(self, message: str | bytes):
+        try:
+            # json text or msgpack binary
+            message = RTVIMessageSerializer.decode(message)
+        except Exception as e:
+            logging.warning(f"data channel message: {message} decode error: {e}")
+            return
+        await self.queue_frame(TransportMessageFrame(message=message))
+
+    #
+    # Audio in
+    #
+
+    async def _audio_in_task_handler(self):
+        logging.info("Start peer audio in task")
+        while True:
+            try:
+                frame = await self._client.read_next_audio_frame()
+                if frame is None:
+                    # peer closed
+                    break
+                await self.push_audio_frame(frame)
+            except asyncio.CancelledError:
+                logging.info("Cancelled peer audio in task")
+                break
+            except Exception as e:
+                logging.error(f"peer audio in error: {e}")
+                break
@@ -0,0 +1,59 @@
+from apipeline.frames.control_frames import EndFrame
+from apipeline.frames.data_frames import Frame
+from apipeline.frames.sys_frames import CancelFrame, MetricsFrame, StartInterruptionFrame
+
+from src.common.utils.pacer import AsyncMediaPacer
+from src.processors.audio_camera_output_processor import AudioCameraOutputProcessor
+from src.processors.rtvi.rtvi_serializer import RTVIMessageSerializer, metrics_message
+from src.services.webrtc_client import WebRTCTransportClient
+from src.types.frames.data_frames import TransportMessageFrame
+from src.types.network.webrtc import WebRTCParams
+
+
+class WebRTCOutputProcessor(AudioCameraOutputProcessor):
+    def __init__(self, client: WebRTCTransportClient, params: WebRTCParams, **kwargs):
+        super().__init__(params, **kwargs)
+        self._client = client
+        self._params = params
+        # the peer connection reads the audio out track in real time, pacing the writes keeps
+        # only lead_s in the track, the not sent audio stays in the sink queue,
+        # which is dropped by the sink task cancellation on interruption
+        self._audio_out_pacer = AsyncMediaPacer(params.audio_out_lead_s)
+        self._audio_bytes_per_s = params.audio_out_sample_rate * params.audio_out_channels * 2
+        # json encode the message dict, the msgpack negotiated rtvi messages are encoded
+        self._message_serializer = RTVIMessageSerializer()
+
+    async def stop(self, frame: EndFrame):
+        await super().stop(frame)
+        await self._client.close()
+
+    async def cancel(self, frame: CancelFrame):
+        await super().cancel(frame)
+        await self._client.close()
+
+    async def _handle_interruptions(self, frame: Frame):
+        if isinstance(frame, StartInterruptionFrame) and self.interruptions_allowed:
+            self._client.clear_audio_out()
+            self._audio_out_pacer.reset()
+        await super()._handle_interruptions(frame)
+
+    async def send_message(self, frame: TransportMessageFrame):
+        await self._client.send_message(self._message_serializer.encode(frame.message))
+
+    async def send_metrics(self, frame: MetricsFrame):
+        metrics = {}
+        if frame.ttfb:
+            metrics["ttfb"] = frame.ttfb
+        if frame.processing:
+            metrics["processing"] = frame.processing
+        if frame.tokens:
+            metrics["tokens"] = frame.tokens
+        if frame.characters:
+            metrics["characters"] = frame.characters
+        await self._client.send_message(self._message_serializer.encode(metrics_message(metrics)))
+
+    async def write_raw_audio_frames(self, frames: bytes):
+        await self._audio_out_pacer.pace(len(frames) / self._audio_bytes_per_s)
+        await self._client.write_raw_audio_frames(
+            frames, self._params.audio_out_sample_rate, self._params.audio_out_channels
+        )
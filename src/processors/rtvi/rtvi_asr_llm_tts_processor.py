@@ -15,6 +15,7 @@ from apipeline.processors.frame_processor import FrameDirection, FrameProcessor
 from apipeline.frames.sys_frames import SystemFrame, MetricsFrame
 from apipeline.frames.control_frames import StartFrame
 
+from src.processors.rtvi.rtvi_serializer import static_message, transcription_message
 from src.processors.rtvi.tts_text_processor import RTVITTSTextProcessor
 from src.types.frames.sys_frames import BotInterruptionFrame
 from src.types.frames.control_frames import (
@@ -299,34 +300,25 @@ class RTVIProcessor(FrameProcessor):
         # be in the pipeline after this processor. This means the STT will have to
         # push transcriptions upstream as well.
 
-        message = None
-        if isinstance(frame, TranscriptionFrame):
-            message = RTVITranscriptionMessage(
-                data=RTVITranscriptionMessageData(
-                    text=frame.text, user_id=frame.user_id, timestamp=frame.timestamp, final=True
-                )
-            )
-        elif isinstance(frame, InterimTranscriptionFrame):
-            message = RTVITranscriptionMessage(
-                data=RTVITranscriptionMessageData(
-                    text=frame.text, user_id=frame.user_id, timestamp=frame.timestamp, final=False
-                )
-            )
-
-        if message:
-            frame = TransportMessageFrame(message=message.model_dump(exclude_none=True))
-            await self.push_frame(frame)
+        # same as RTVITranscriptionMessage model_dump
+        message = transcription_message(
+            frame.text,
+            frame.user_id,
+            frame.timestamp,
+            final=isinstance(frame, TranscriptionFrame),
+            label="rtvi",
+        )
+        await self.push_frame(TransportMessageFrame(message=message))
 
     async def _handle_interruptions(self, frame: Frame):
         message = None
         if isinstance(frame, UserStartedSpeakingFrame):
-            message = RTVIUserStartedSpeakingMessage()
+            message = static_message("user-started-speaking", label="rtvi")
         elif isinstance(frame, UserStoppedSpeakingFrame):
-            message = RTVIUserStoppedSpeakingMessage()
+            message = static_message("user-stopped-speaking", label="rtvi")
 
         if message:
-            frame = TransportMessageFrame(message=message.model_dump(exclude_none=True))
-            await self.push_frame(frame)
+            await self.push_frame(TransportMessageFrame(message=message))
 
     async def _handle_message(self, frame: TransportMessageFrame):
         try:
@@ -34,6 +34,14 @@ from src.types.frames.data_frames import (
     TransportMessageFrame,
 )
 from src.processors.aggregators.openai_llm_context import OpenAILLMContext
+from src.transports.base import BaseTransport
+from src.processors.rtvi.rtvi_serializer import (
+    RTVIMessageSerializer,
+    batch_message,
+    is_msgpack_available,
+    static_message,
+    transcription_message,
+)
 
 from dotenv import load_dotenv
 
@@ -200,6 +208,9 @@ class RTVIActionResponse(BaseModel):
 class RTVIBotReadyData(BaseModel):
     version: str
     config: List[RTVIServiceConfig]
+    # negotiated with the client-ready message data
+    encoding: Optional[Literal["json", "msgpack"]] = None
+    batch: Optional[bool] = None
 
 
 class RTVIBotReady(BaseModel):
@@ -273,6 +284,13 @@ class RTVIBotStoppedSpeakingMessage(BaseModel):
 
 class RTVIProcessorParams(BaseModel):
     send_bot_ready: bool = True
+    # the client asks in the client-ready message data, e.g. {"encoding": "msgpack", "batch": true}
+    # msgpack binary messages, only negotiated if the transport can send binary messages
+    # (BaseTransport.binary_messages, e.g.: webrtc data channel)
+    msgpack_enabled: bool = False
+    # the high frequency messages (transcriptions, speaking events) queued in one tick
+    # are sent in one batch message
+    batch_enabled: bool = True
 
 
 class RTVIProcessor(FrameProcessor):
@@ -281,16 +299,22 @@ class RTVIProcessor(FrameProcessor):
         *,
         config: RTVIConfig = RTVIConfig(config_list=[]),
         params: RTVIProcessorParams = RTVIProcessorParams(),
+        transport: BaseTransport | None = None,
     ):
         super().__init__()
         self._config = config
         self._params = params
+        # the output transport of the rtvi messages can send msgpack (binary) messages
+        self._binary_messages = transport is not None and transport.binary_messages
 
         self._pipeline: FrameProcessor | None = None
         self._pipeline_started = False
 
         self._client_ready = False
         self._client_ready_id = ""
+        # negotiated with the client, None: the transport encodes the message dict
+        self._serializer: RTVIMessageSerializer | None = None
+        self._batch = False
 
         self._registered_actions: Dict[str, RTVIAction] = {}
         self._registered_services: Dict[str, RTVIService] = {}
@@ -436,55 +460,88 @@ class RTVIProcessor(FrameProcessor):
         while running:
             try:
                 (frame, direction) = await self._push_queue.get()
-                await super().push_frame(frame, direction)
                 self._push_queue.task_done()
+                if self._batch and self._is_batchable(frame):
+                    frame, next_item = self._batch_messages(frame)
+                    await super().push_frame(self._encode_message_frame(frame), direction)
+                    if next_item is None:
+                        continue
+                    (frame, direction) = next_item
+                await super().push_frame(self._encode_message_frame(frame), direction)
                 running = not isinstance(frame, EndFrame)
             except asyncio.CancelledError:
                 break
 
+    def _is_batchable(self, frame: Frame | None) -> bool:
+        # the high frequency messages are not urgent
+        return isinstance(frame, TransportMessageFrame) and not frame.urgent
+
+    def _batch_messages(self, frame: TransportMessageFrame):
+        """
+        batch the queued not urgent messages into one message, stop at the first other frame
+        which is returned to push next in order
+        """
+        messages = [frame.message]
+        while not self._push_queue.empty():
+            item = self._push_queue.get_nowait()
+            self._push_queue.task_done()
+            if not self._is_batchable(item[0]):
+                return self._batch_frame(messages), item
+            messages.append(item[0].message)
+        return self._batch_frame(messages), None
+
+    def _batch_frame(self, messages: List[dict]) -> TransportMessageFrame:
+        if len(messages) == 1:
+            return TransportMessageFrame(message=messages[0])
+        return TransportMessageFrame(message=batch_message(messages))
+
+    def _encode_message_frame(self, frame: Frame) -> Frame:
+        if self._serializer and isinstance(frame, TransportMessageFrame):
+            frame.message = self._serializer.encode(frame.message)
+        return frame
+
     async def _push_transport_message(self, model: BaseModel, exclude_none: bool = True):
         frame = TransportMessageFrame(
             message=model.model_dump(exclude_none=exclude_none), urgent=True
         )
         await self.push_frame(frame)
 
-    async def _handle_transcriptions(self, frame: Frame):
-        message = None
-        if isinstance(frame, TranscriptionFrame):
-            message = RTVITranscriptionMessage(
-                data=RTVITranscriptionMessageData(
-                    text=frame.text, user_id=frame.user_id, timestamp=frame.timestamp, final=True
-                )
-            )
-        elif isinstance(frame, InterimTranscriptionFrame):
-            message = RTVITranscriptionMessage(
-                data=RTVITranscriptionMessageData(
-                    text=frame.text, user_id=frame.user_id, timestamp=frame.timestamp, final=False
-                )
-            )
+    async def _push_message(self, message: dict, urgent: bool = True):
+        """
+        push the message dict built on the fast path, not urgent messages can be batched
+        """
+        await self.push_frame(TransportMessageFrame(message=message, urgent=urgent))
 
-        if message:
-            await self._push_transport_message(message)
+    async def _handle_transcriptions(self, frame: Frame):
+        # same as RTVITranscriptionMessage model_dump
+        message = transcription_message(
+            frame.text,
+            frame.user_id,
+            frame.timestamp,
+            final=isinstance(frame, TranscriptionFrame),
+        )
+        # the final transcription is sent in order with the other messages
+        await self._push_message(message, urgent=isinstance(frame, TranscriptionFrame))
 
     async def _handle_interruptions(self, frame: Frame):
         message = None
         if isinstance(frame, UserStartedSpeakingFrame):
-            message = RTVIUserStartedSpeakingMessage()
+            message = static_message("user-started-speaking")
         elif isinstance(frame, UserStoppedSpeakingFrame):
-            message = RTVIUserStoppedSpeakingMessage()
+            message = static_message("user-stopped-speaking")
 
         if message:
-            await self._push_transport_message(message)
+            await self._push_message(message, urgent=False)
 
     async def _handle_bot_speaking(self, frame: Frame):
         message = None
         if isinstance(frame, BotStartedSpeakingFrame):
-            message = RTVIBotStartedSpeakingMessage()
+            message = static_message("bot-started-speaking")
         elif isinstance(frame, BotStoppedSpeakingFrame):
-            message = RTVIBotStoppedSpeakingMessage()
+            message = static_message("bot-stopped-speaking")
 
         if message:
-            await self._push_transport_message(message)
+            await self._push_message(message, urgent=False)
 
     async def _message_task_handler(self):
         while True:
@@ -509,7 +566,7 @@ class RTVIProcessor(FrameProcessor):
         try:
             match message.type:
                 case "client-ready":
-                    await self._handle_client_ready(message.id)
+                    await self._handle_client_ready(message.id, message.data)
                 case "describe-actions":
                     await self._handle_describe_actions(message.id)
                 case "describe-config":
@@ -536,11 +593,26 @@ class RTVIProcessor(FrameProcessor):
             await self._send_error_response(message.id, f"Exception processing message: {e}")
             logging.warning(f"Exception processing message: {e}", exc_info=True)
 
-    async def _handle_client_ready(self, request_id: str):
+    async def _handle_client_ready(self, request_id: str, data: Dict[str, Any] | None = None):
         self._client_ready = True
         self._client_ready_id = request_id
+        self._negotiate_serialization(data or {})
         await self._maybe_send_bot_ready()
 
+    def _negotiate_serialization(self, data: Dict[str, Any]):
+        self._batch = self._params.batch_enabled and bool(data.get("batch", False))
+        if (
+            data.get("encoding") == "msgpack"
+            and self._params.msgpack_enabled
+            and self._binary_messages
+            and is_msgpack_available()
+        ):
+            self._serializer = RTVIMessageSerializer("msgpack")
+        logging.info(
+            f"rtvi client serialization: batch={self._batch} "
+            f"encoding={self._serializer.encoding if self._serializer else 'json'}"
+        )
+
     async def _handle_describe_config(self, request_id: str):
         services = list(self._registered_services.values())
         message = RTVIDescribeConfig(id=request_id, data=RTVIDescribeConfigData(config=services))
@@ -625,7 +697,12 @@ class RTVIProcessor(FrameProcessor):
 
         message = RTVIBotReady(
             id=self._client_ready_id,
-            data=RTVIBotReadyData(version=RTVI_PROTOCOL_VERSION, config=self._config.config_list),
+            data=RTVIBotReadyData(
+                version=RTVI_PROTOCOL_VERSION,
+                config=self._config.config_list,
+                encoding=self._serializer.encoding if self._serializer else None,
+                batch=self._batch or None,
+            ),
         )
         await self._push_transport_message(message)
 
@@ -0,0 +1,126 @@
+"""
+fast path of the high frequency RTVI messages (transcriptions, speaking events, tts text, metrics):
+- the messages are built as plain dicts, same as the pydantic message models model_dump,
+  without the model validation and dump on every message
+- the static messages (speaking events) are built once, their encoded payload is cached
+- json encoded with one precompiled encoder, msgpack (binary) encoding is optional,
+  negotiated with the client in the client-ready message
+- batch the messages of one tick into one transport message, negotiated with the client
+"""
+
+import json
+import logging
+from typing import Any, Literal
+
+RTVI_LABEL = "rtvi-ai"
+RTVI_BATCH_TYPE = "batch"
+
+RTVIEncoding = Literal["json", "msgpack"]
+
+# compact, no ascii escape, no circular check: the messages are built from the frames
+_json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), check_circular=False)
+
+# (label, type) -> static message
+_static_messages: dict[tuple[str, str], dict] = {}
+_static_message_ids: set[int] = set()
+
+
+def static_message(type: str, label: str = RTVI_LABEL) -> dict:
+    """
+    message without data, e.g. user-started-speaking, bot-stopped-speaking
+    NOTE: shared dict, don't change it
+    """
+    key = (label, type)
+    message = _static_messages.get(key)
+    if message is None:
+        message = {"label": label, "type": type}
+        _static_messages[key] = message
+        _static_message_ids.add(id(message))
+    return message
+
+
+def transcription_message(
+    text: str, user_id: str, timestamp: str, final: bool, label: str = RTVI_LABEL
+) -> dict:
+    return {
+        "label": label,
+        "type": "user-transcription",
+        "data": {"text": text, "user_id": user_id, "timestamp": timestamp, "final": final},
+    }
+
+
+def tts_text_message(text: str, label: str = RTVI_LABEL) -> dict:
+    return {"label": label, "type": "tts-text", "data": {"text": text}}
+
+
+def metrics_message(metrics: dict) -> dict:
+    return {"type": "chatbot-metrics", "metrics": metrics}
+
+
+def batch_message(messages: list[dict], label: str = RTVI_LABEL) -> dict:
+    return {"label": label, "type": RTVI_BATCH_TYPE, "data": {"messages": messages}}
+
+
+def is_msgpack_available() -> bool:
+    try:
+        import msgpack  # noqa: F401
+    except ModuleNotFoundError:
+        return False
+    return True
+
+
+class RTVIMessageSerializer:
+    """
+    encode/decode the RTVI messages of the transport data channel (webrtc, websocket):
+    json text (default) or msgpack binary
+    """
+
+    def __init__(self, encoding: RTVIEncoding = "json"):
+        self._encoding = encoding
+        self._packer = None
+        if encoding == "msgpack":
+            try:
+                import msgpack
+            except ModuleNotFoundError as e:
+                logging.error(f"Exception: {e}")
+                logging.error(
+                    "In order to use msgpack, you need to `pip install achatbot[msgpack]`."
+                )
+                raise Exception(f"Missing module: {e}")
+            self._packer = msgpack.Packer()
+        # id(static message) -> encoded payload
+        self._static_cache: dict[int, str | bytes] = {}
+
+    @property
+    def encoding(self) -> RTVIEncoding:
+        return self._encoding
+
+    def encode(self, message: Any) -> str | bytes:
+        if isinstance(message, (str, bytes)):
+            # encoded
+            return message
+        if id(message) in _static_message_ids:
+            payload = self._static_cache.get(id(message))
+            if payload is None:
+                payload = self._encode(message)
+                self._static_cache[id(message)] = payload
+            return payload
+        return self._encode(message)
+
+    def _encode(self, message: Any) -> str | bytes:
+        if self._packer:
+            return self._packer.pack(message)
+        return _json_encoder.encode(message)
+
+    @staticmethod
+    def decode(payload: str | bytes) -> Any:
+        """
+        decode json text or msgpack binary from the client
+        """
+        if isinstance(payload, bytes):
+            if payload[:1] in (b"{", b"["):
+                return json.loads(payload)
+            import msgpack
+
+            return msgpack.unpackb(payload)
+        return json.loads(payload)
@@ -3,6 +3,7 @@ from typing import Literal
 from pydantic import BaseModel
 from apipeline.processors.frame_processor import FrameProcessor, FrameDirection
 
+from src.processors.rtvi.rtvi_serializer import tts_text_message
 from src.types.frames.data_frames import (
     Frame,
     TextFrame,
@@ -28,9 +29,7 @@ class RTVITTSTextProcessor(FrameProcessor):
         await super().process_frame(frame, direction)
 
         if isinstance(frame, TextFrame):
-            message = RTVITTSTextMessage(data=RTVITTSTextMessageData(text=frame.text))
-            await self.push_frame(
-                TransportMessageFrame(message=message.model_dump(exclude_none=True))
-            )
+            # same as RTVITTSTextMessage model_dump
+            await self.push_frame(TransportMessageFrame(message=tts_text_message(frame.text)))
 
         await self.push_frame(frame, direction)
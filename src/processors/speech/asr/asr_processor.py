@@ -1,13 +1,15 @@
 import logging
 from typing import AsyncGenerator
 
+from apipeline.frames.control_frames import EndFrame
 from apipeline.frames.data_frames import Frame
-from apipeline.frames.sys_frames import ErrorFrame
+from apipeline.frames.sys_frames import CancelFrame, ErrorFrame
 
 from src.common.factory import EngineClass
 from src.common.session import Session
 from src.common.utils.time import time_now_iso8601
-from src.common.interface import IAsr
+from src.common.interface import IAsr, IHallucination
+from src.modules.speech.asr.language_tracker import ASRLanguageTracker
 from src.processors.speech.asr.base import SegmentedASRProcessor
 from src.types.frames.data_frames import TranscriptionFrame
 from src.types.speech.language import Language
@@ -24,6 +26,9 @@ class ASRProcessor(SegmentedASRProcessor):
         num_channels: int = 1,
         asr: IAsr | EngineClass | None = None,
         session: Session | None = None,
+        language_tracker: ASRLanguageTracker | None = None,
+        latency_profile: str | None = None,
+        hallucination: IHallucination | EngineClass | None = None,
         **kwargs,
     ):
         super().__init__(
@@ -34,15 +39,136 @@ class ASRProcessor(SegmentedASRProcessor):
             num_channels=num_channels,
             **kwargs,
         )
+        # post-asr hallucination filter
+        self._hallucination = hallucination
         self._asr = asr
         self._session = session
+        self._language_tracker = language_tracker
+        # the language tracker ids of the participants (user_id) in the session
+        self._language_ids: set[str] = set()
+        # ASR_LATENCY_PROFILES name, None use engine args
+        self._latency_profile = latency_profile
+        self._profiled_asr_ids = set()
+        if asr is not None:
+            self._apply_latency_profile(asr)
 
     def set_asr(self, asr: IAsr):
         self._asr = asr
+        self._apply_latency_profile(asr)
+
+    def _apply_latency_profile(self, asr: IAsr | EngineClass):
+        """
+        request only the decode options this processor uses (just concatenate text),
+        filtered by the engine capability matrix
+        """
+        if not self._latency_profile or id(asr) in self._profiled_asr_ids:
+            return
+        self._profiled_asr_ids.add(id(asr))
+        if not hasattr(asr, "get_latency_profile_args"):
+            return
+        args = asr.get_latency_profile_args(self._latency_profile)
+        logging.info(f"{asr} use latency profile {self._latency_profile}: {args}")
+        if args:
+            asr.set_args(**args)
 
     async def set_asr_args(self, **args):
         self._asr.set_args(**args)
 
+    async def set_language(self, language: Language):
+        if self._language_tracker is not None:
+            # pin the session and the participants language
+            for language_id in {self._session_id, *self._language_ids}:
+                self._language_tracker.set_language(language_id, language)
+            return
+        self._asr.set_args(language=language)
+
+    async def stop(self, frame: EndFrame):
+        await super().stop(frame)
+        self._reset_languages()
+
+    async def cancel(self, frame: CancelFrame):
+        await super().cancel(frame)
+        self._reset_languages()
+
+    async def remove_user(self, user_id: str):
+        await super().remove_user(user_id)
+        if self._language_tracker is None or not user_id:
+            return
+        language_id = f"{self._session_id}:{user_id}"
+        self._language_ids.discard(language_id)
+        self._language_tracker.reset(language_id)
+
+    def _reset_languages(self):
+        if self._language_tracker is None:
+            return
+        for language_id in {self._session_id, *self._language_ids}:
+            self._language_tracker.reset(language_id)
+        self._language_ids.clear()
+
+    @property
+    def _session_id(self) -> str:
+        return str(self._session.ctx.client_id) if self._session else ""
+
+    def _get_language_id(self, user_id: str) -> str:
+        """
+        language tracker id of the segment user, the participants in one room (demux)
+        speak their own language
+        """
+        if not user_id:
+            return self._session_id
+        language_id = f"{self._session_id}:{user_id}"
+        if language_id not in self._language_ids:
+            self._language_ids.add(language_id)
+            # participant joined after the session language pinned
+            state = self._language_tracker.get_state(self._session_id)
+            if state.pinned:
+                self._language_tracker.set_language(language_id, state.language)
+        return language_id
+
+    async def _transcribe(self, audio: bytes) -> tuple[str, str | None]:
+        """
+        - with session language tracker:
+          - cached language: transcribe with explicit language (skip detection)
+          - no cached language: transcribe with detection, update tracker
+        - with hallucination filter: transcribe with segments info, drop hallucinated segments
+        """
+        asr = self._asr
+        language = None
+        language_id = ""
+        if self._language_tracker is not None:
+            language_id = self._get_language_id(self._segment_user_id)
+            language = self._language_tracker.get_language(language_id)
+            asr = self._language_tracker.route(language) or self._asr
+            self._apply_latency_profile(asr)
+            asr.set_args(language=language or asr.AUTO_LANGUAGE)
+        asr.set_audio_data(audio)
+
+        is_detect = self._language_tracker is not None and language is None
+        if not is_detect and self._hallucination is None:
+            text: str = ""
+            async for segment in asr.transcribe_stream(self._session):
+                text += f"{segment}"
+            return text, language or asr.get_args_dict().get("language")
+
+        res = await asr.transcribe(self._session)
+        if is_detect:
+            language = res.get("language")
+            if language == asr.AUTO_LANGUAGE:
+                language = None
+            self._language_tracker.update(language_id, language, res.get("language_probability"))
+        language = language or asr.get_args_dict().get("language")
+
+        text = res.get("text", "")
+        if self._hallucination is not None and self._session is not None:
+            self._session.ctx.state["transcribe_res"] = res
+            if self._hallucination.check(self._session):
+                text = self._hallucination.filter(self._session)
+                logging.info(
+                    f"{self} filter hallucination: [{res.get('text')}] -> [{text}],"
+                    f" stats: {getattr(self._hallucination, 'stats', None)}"
+                )
+        return text, language
+
     async def run_asr(self, audio: bytes) -> AsyncGenerator[Frame, None]:
         if self._asr is None:
             logging.error(f"{self} error: ASR engine not available")
@@ -52,19 +178,16 @@ class ASRProcessor(SegmentedASRProcessor):
         await self.start_processing_metrics()
         await self.start_ttfb_metrics()
 
-        self._asr.set_audio_data(audio)
-        text: str = ""
-        async for segment in self._asr.transcribe_stream(self._session):
-            text += f"{segment}"
+        text, language = await self._transcribe(audio)
 
         await self.stop_ttfb_metrics()
         await self.stop_processing_metrics()
 
-        language = None
-        args = self._asr.get_args_dict()
-        if "language" in args:
-            language = Language(args["language"])
+        try:
+            language = Language(language) if language else None
+        except ValueError:
+            language = None
 
         if text:
             logging.info(f"{self._asr.SELECTED_TAG} Transcription: [{text}]")
-            yield TranscriptionFrame(text, "", time_now_iso8601(), language)
+            yield TranscriptionFrame(text, self._segment_user_id, time_now_iso8601(), language)
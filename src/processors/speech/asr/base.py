@@ -11,6 +11,7 @@ from apipeline.frames.control_frames import EndFrame
 from apipeline.frames.data_frames import Frame, AudioRawFrame
 
 from src.processors.speech.audio_volume_time_processor import AudioVolumeTimeProcessor
+from src.modules.speech.hallucination.segment_gate import SpeechSegmentGate
 from src.processors.ai_processor import AsyncAIProcessor
 from src.common.utils.helper import exp_smoothing, calculate_audio_volume
 from src.types.frames.data_frames import DailyTransportMessageFrame, TranscriptionFrame
@@ -19,6 +20,7 @@ from src.types.frames.control_frames import (
     ASRArgsUpdateFrame,
     ASRLanguageUpdateFrame,
     ASRModelUpdateFrame,
+    UserLeftFrame,
 )
 
 
@@ -45,6 +47,10 @@ class ASRProcessorBase(AsyncAIProcessor):
         """Returns transcript as a string"""
         pass
 
+    async def remove_user(self, user_id: str):
+        """participant left, drop the per participant states"""
+        pass
+
     async def process_audio_frame(self, frame: AudioRawFrame):
         await self.process_generator(self.run_asr(frame.audio))
 
@@ -62,12 +68,46 @@ class ASRProcessorBase(AsyncAIProcessor):
             await self.set_language(frame.language)
         elif isinstance(frame, ASRArgsUpdateFrame):
             await self.set_asr_args(frame.args)
+        elif isinstance(frame, UserLeftFrame):
+            await self.remove_user(frame.user_id)
+            await self.push_frame(frame, direction)
         else:
             await self.push_frame(frame, direction)
 
 
+class AudioSegmentBuffer:
+    """the speech segment wave buffer of one participant"""
+
+    def __init__(self, sample_rate: int, num_channels: int):
+        self.sample_rate = sample_rate
+        self.num_channels = num_channels
+        self.silence_num_frames = 0
+        self.prev_volume = 0
+        self.reset()
+
+    def reset(self):
+        self.content = io.BytesIO()
+        self.wave = wave.open(self.content, "wb")
+        self.wave.setsampwidth(2)
+        self.wave.setnchannels(self.num_channels)
+        self.wave.setframerate(self.sample_rate)
+
+    def read(self) -> bytes:
+        self.wave.close()
+        self.content.seek(0)
+        audio = self.content.read()
+        self.reset()
+        return audio
+
+    def close(self):
+        self.wave.close()
+
+
 class SegmentedASRProcessor(ASRProcessorBase):
-    """SegmentedASRProcessor is a segement audio asr class for speech-to-text processors."""
+    """SegmentedASRProcessor is a segement audio asr class for speech-to-text processors.
+    the audio frames are segmented per user_id (UserAudioRawFrame), interleaved frames
+    of the participants don't mix in one segment.
+    """
 
     def __init__(
         self,
@@ -77,68 +117,90 @@ class SegmentedASRProcessor(ASRProcessorBase):
         max_buffer_secs: float = 1.5,
         sample_rate: int = 16000,
         num_channels: int = 1,
+        segment_gate: SpeechSegmentGate | None = None,
         **kwargs,
     ):
         super().__init__(**kwargs)
+        self._segment_gate = segment_gate
         self._min_volume = min_volume
         self._max_silence_secs = max_silence_secs
         self._max_buffer_secs = max_buffer_secs
         self._sample_rate = sample_rate
         self._num_channels = num_channels
-        (self._content, self._wave) = self._new_wave()
-        self._silence_num_frames = 0
+        # user_id -> segment buffer
+        self._segments: dict[str, AudioSegmentBuffer] = {}
+        # the user_id of the segment in run_asr
+        self._segment_user_id = ""
         # Volume exponential smoothing
         self._smoothing_factor = 0.2
-        self._prev_volume = 0
 
-    def _new_wave(self):
-        content = io.BytesIO()
-        ww = wave.open(content, "wb")
-        ww.setsampwidth(2)
-        ww.setnchannels(self._num_channels)
-        ww.setframerate(self._sample_rate)
-        return (content, ww)
+    def _get_segment(self, user_id: str) -> AudioSegmentBuffer:
+        segment = self._segments.get(user_id)
+        if segment is None:
+            segment = self._segments[user_id] = AudioSegmentBuffer(
+                self._sample_rate, self._num_channels
+            )
+        return segment
+
+    async def remove_user(self, user_id: str):
+        # the not transcribed audio of the left participant is dropped
+        segment = self._segments.pop(user_id, None)
+        if segment is not None:
+            segment.close()
 
     async def stop(self, frame: EndFrame):
-        self._wave.close()
+        for segment in self._segments.values():
+            segment.close()
 
     async def cancel(self, frame: CancelFrame):
-        self._wave.close()
+        for segment in self._segments.values():
+            segment.close()
 
-    def _get_smoothed_volume(self, frame: AudioRawFrame) -> float:
+    def _get_smoothed_volume(self, frame: AudioRawFrame, prev_volume: float) -> float:
         volume = calculate_audio_volume(frame.audio, frame.sample_rate)
-        return exp_smoothing(volume, self._prev_volume, self._smoothing_factor)
+        return exp_smoothing(volume, prev_volume, self._smoothing_factor)
 
     async def process_audio_frame(self, frame: AudioRawFrame):
+        user_id = str(getattr(frame, "user_id", "") or "")
+        segment = self._get_segment(user_id)
         # Try to filter out empty background noise
-        volume = self._get_smoothed_volume(frame)
+        volume = self._get_smoothed_volume(frame, segment.prev_volume)
         if volume >= self._min_volume and frame.audio and len(frame.audio) > 0:
             # If volume is high enough, write new data to wave file
-            # Check if _wave is not None before writing
-            if self._wave is not None:
-                self._wave.writeframes(frame.audio)
-            else:
-                logging.error("Wave object is None, cannot write frames.")
-
-            self._silence_num_frames = 0
+            segment.wave.writeframes(frame.audio)
+            segment.silence_num_frames = 0
         else:
-            self._silence_num_frames += frame.num_frames
-        self._prev_volume = volume
+            segment.silence_num_frames += frame.num_frames
+        segment.prev_volume = volume
 
         # If buffer is not empty and we have enough data or there's been a long
         # silence, transcribe the audio gathered so far.
-        silence_secs = self._silence_num_frames / self._sample_rate
-        buffer_secs = self._wave.getnframes() / self._sample_rate
-        if self._content.tell() > 0 and (
+        silence_secs = segment.silence_num_frames / self._sample_rate
+        buffer_secs = segment.wave.getnframes() / self._sample_rate
+        if segment.content.tell() > 0 and (
             buffer_secs > self._max_buffer_secs or silence_secs > self._max_silence_secs
         ):
-            self._silence_num_frames = 0
-            self._wave.close()
-            self._content.seek(0)
-            await self.start_processing_metrics()
-            await self.process_generator(self.run_asr(self._content.read()))
-            await self.stop_processing_metrics()
-            (self._content, self._wave) = self._new_wave()
+            segment.silence_num_frames = 0
+            audio = segment.read()
+            if self._is_speech_segment(audio):
+                start_time = time.perf_counter()
+                self._segment_user_id = user_id
+                await self.start_processing_metrics()
+                await self.process_generator(self.run_asr(audio))
+                await self.stop_processing_metrics()
+                if self._segment_gate is not None:
+                    self._segment_gate.update_asr_rtf(buffer_secs, time.perf_counter() - start_time)
+
+    def _is_speech_segment(self, audio: bytes) -> bool:
+        """pre-asr gate, drop non-speech segments (cough, click, background tv) before decoding"""
+        if self._segment_gate is None or self._num_channels != 1:
+            return True
+        with wave.open(io.BytesIO(audio), "rb") as ww:
+            pcm = ww.readframes(ww.getnframes())
+        if self._segment_gate.is_speech(pcm):
+            return True
+        logging.info(f"{self} skip non-speech segment, asr gate stats: {self._segment_gate.stats}")
+        return False
 
 
 class TranscriptionTimingLogProcessor(FrameProcessor):
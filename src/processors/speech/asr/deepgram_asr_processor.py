@@ -1,4 +1,5 @@
 import os
+import time
 import logging
 from typing import AsyncGenerator
 
@@ -6,6 +7,7 @@ from apipeline.frames.sys_frames import CancelFrame
 from apipeline.frames.control_frames import EndFrame, StartFrame
 from apipeline.frames.data_frames import Frame
 
+from src.common.provider_pool import ProviderClientPool
 from src.processors.speech.asr.base import ASRProcessorBase
 from src.common.utils.time import time_now_iso8601
 from src.types.frames.data_frames import InterimTranscriptionFrame, TranscriptionFrame
@@ -36,6 +38,7 @@ class DeepgramAsrProcessor(ASRProcessorBase):
         url: str = "",
         language: str = "en",
         model: str = "nova-2",
+        max_connections: int = 100,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -50,15 +53,26 @@ class DeepgramAsrProcessor(ASRProcessorBase):
             smart_format=True,
         )
         api_key = os.getenv("DEEPGRAM_API_KEY", api_key)
-        self._client = DeepgramClient(
-            api_key, config=DeepgramClientOptions(url=url, options={"keepalive": "true"})
+        # shared client (config and keep-alive) per (api key, url)
+        self._client = ProviderClientPool.get_client(
+            "deepgram",
+            (api_key, url),
+            lambda: DeepgramClient(
+                api_key, config=DeepgramClientOptions(url=url, options={"keepalive": "true"})
+            ),
         )
         self._connection: AsyncListenWebSocketClient = self._client.listen.asyncwebsocket.v("1")
         self._connection.on(LiveTranscriptionEvents.Transcript, self._on_message)
+        # live connections limit per api key
+        self._limiter = ProviderClientPool.get_limiter("deepgram", api_key, max_connections)
+        self._has_connection_slot = False
+        # sent audio secs on the live connection, to measure transcript lag
+        self._sent_audio_secs = 0.0
 
     async def run_asr(self, audio: bytes) -> AsyncGenerator[Frame, None]:
         await self.start_processing_metrics()
         await self._connection.send(audio)
+        self._sent_audio_secs += len(audio) / (2 * self._live_options.sample_rate)
         yield None
         await self.stop_processing_metrics()
 
@@ -87,15 +101,30 @@ class DeepgramAsrProcessor(ASRProcessorBase):
         await self._disconnect()
 
     async def _connect(self):
+        if not self._has_connection_slot:
+            await self._limiter.acquire()
+            self._has_connection_slot = True
+        self._sent_audio_secs = 0.0
+        start = time.perf_counter()
         if await self._connection.start(self._live_options):
+            ProviderClientPool.get_histogram("deepgram_connect").observe(
+                time.perf_counter() - start
+            )
             logging.info(f"{self}: Connected to Deepgram")
         else:
             logging.error(f"{self}: Unable to connect to Deepgram")
+            self._release_connection_slot()
 
     async def _disconnect(self):
         if self._connection.is_connected:
             await self._connection.finish()
             logging.info(f"{self}: Disconnected from Deepgram")
+        self._release_connection_slot()
+
+    def _release_connection_slot(self):
+        if self._has_connection_slot:
+            self._limiter.release()
+            self._has_connection_slot = False
 
     async def _on_message(self, *args, **kwargs):
         result: LiveResultResponse = kwargs["result"]
@@ -109,6 +138,9 @@ class DeepgramAsrProcessor(ASRProcessorBase):
             language = Language(language)
         if len(transcript) > 0:
             if is_final:
+                # transcript lag: sent audio ahead of the transcribed audio end
+                lag_s = self._sent_audio_secs - (result.start + result.duration)
+                ProviderClientPool.get_histogram("deepgram").observe(max(lag_s, 0.0))
                 logging.info(f"transcript Text: [{transcript}]")
                 await self.push_frame(
                     TranscriptionFrame(
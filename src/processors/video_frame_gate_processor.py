@@ -0,0 +1,104 @@
+import time
+
+import numpy as np
+from apipeline.frames.data_frames import Frame, ImageRawFrame
+from apipeline.processors.frame_processor import FrameDirection, FrameProcessor
+
+from src.types.frames.data_frames import UserImageRawFrame
+from src.types.vision.frame_gate import VideoFrameGateArgs
+
+# luma weights (BT.601) of the RGB channels
+LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+class VideoFrameGateProcessor(FrameProcessor):
+    """
+    drop the input image frames before the vision processors (YOLO/OCR/VLM):
+    - rate limit: forward at most target_fps frames per participant
+    - change detect: drop the frame if the luma thumbnail mean absolute difference
+      to the last forwarded frame is under diff_threshold (unchanged scene)
+    forwarded/dropped counts per participant in stats
+    """
+
+    def __init__(self, gate_args: dict | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self._args = VideoFrameGateArgs(**(gate_args or {}))
+        # participant_id -> {last_forward_time, thumb, forwarded, dropped_rate, dropped_unchanged}
+        self._participants: dict[str, dict] = {}
+
+    @property
+    def stats(self) -> dict:
+        return {
+            participant_id: {
+                "forwarded": state["forwarded"],
+                "dropped_rate": state["dropped_rate"],
+                "dropped_unchanged": state["dropped_unchanged"],
+            }
+            for participant_id, state in self._participants.items()
+        }
+
+    def luma_thumbnail(self, frame: ImageRawFrame) -> np.ndarray | None:
+        """
+        strided luma samples of the raw image (RGB, RGBA, L), not resized
+        """
+        width, height = frame.size
+        channels = len(frame.mode) if frame.mode in ("RGB", "RGBA", "L") else 0
+        if not channels or len(frame.image) != width * height * channels:
+            return None
+        pixels = np.frombuffer(frame.image, dtype=np.uint8).reshape(height, width, channels)
+        step_y = max(1, height // self._args.thumb_size)
+        step_x = max(1, width // self._args.thumb_size)
+        thumb = pixels[::step_y, ::step_x]
+        if channels == 1:
+            return thumb[..., 0].astype(np.float32)
+        return thumb[..., :3] @ LUMA_WEIGHTS
+
+    def gate(self, frame: ImageRawFrame) -> bool:
+        """
+        return True to forward the frame
+        """
+        participant_id = frame.user_id if isinstance(frame, UserImageRawFrame) else ""
+        state = self._participants.get(participant_id)
+        if state is None:
+            state = self._participants[participant_id] = {
+                "last_forward_time": None,
+                "thumb": None,
+                "forwarded": 0,
+                "dropped_rate": 0,
+                "dropped_unchanged": 0,
+            }
+
+        now = time.monotonic()
+        last = state["last_forward_time"]
+        if last is not None and self._args.target_fps > 0:
+            if now - last < 1.0 / self._args.target_fps:
+                state["dropped_rate"] += 1
+                return False
+
+        thumb = None
+        if self._args.diff_threshold > 0:
+            thumb = self.luma_thumbnail(frame)
+        prev = state["thumb"]
+        if (
+            thumb is not None
+            and prev is not None
+            and prev.shape == thumb.shape
+            and not (self._args.max_interval_s and now - last >= self._args.max_interval_s)
+        ):
+            diff = float(np.mean(np.abs(thumb - prev)))
+            if diff < self._args.diff_threshold:
+                state["dropped_unchanged"] += 1
+                return False
+
+        state["last_forward_time"] = now
+        state["thumb"] = thumb
+        state["forwarded"] += 1
+        return True
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, ImageRawFrame) and direction == FrameDirection.DOWNSTREAM:
+            if not self.gate(frame):
+                return
+        await self.push_frame(frame, direction)
@@ -16,6 +16,7 @@ from apipeline.frames.data_frames import AudioRawFrame, ImageRawFrame
 from src.common import const
 from src.common.types import SAMPLE_WIDTH, AgoraParams, LOG_DIR, VIDEOS_DIR
 from src.common.utils.audio_utils import resample_audio
+from src.common.utils.frame_convert import VideoFrameConverter
 from src.types.frames.data_frames import (
     AgoraTransportMessageFrame,
     TransportMessageFrame,
@@ -592,13 +593,20 @@ class AgoraTransportClient:
         # self._on_participant_audio_frame_task: asyncio.Task | None = None
         # active sub
         self._in_audio_queue = asyncio.Queue[bytes]()
+        # per participant audio in (demux/mix): sub all participants audio,
+        # user_id -> audio frames task, demux/mix in the input processor
+        self._in_participant_audio_tasks: dict[int, asyncio.Task] = {}
         self._in_audio_task: asyncio.Task = (
-            self._loop.create_task(self.in_audio_handle()) if params.audio_in_enabled else None
+            self._loop.create_task(self.in_audio_handle())
+            if params.audio_in_enabled and not self._is_audio_in_per_participant
+            else None
         )
 
         # video in
         # passive sub the participant video frame
         self._on_participant_video_frame_task: asyncio.Task | None = None
+        # participant_id -> yuv to rgb converter with reused buffers
+        self._video_frame_converters: dict[str, VideoFrameConverter] = {}
         # active sub
         # self._in_video_queue = asyncio.Queue[bytes]()
         # self._in_video_task: asyncio.Task = self._loop.create_task(
@@ -635,6 +643,10 @@ class AgoraTransportClient:
             self._in_audio_task.cancel()
             await self._in_audio_task
             # logging.info("Cancelled in_audio_task")
+        for task in self._in_participant_audio_tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._in_participant_audio_tasks.values(), return_exceptions=True)
+        self._in_participant_audio_tasks.clear()
 
         if (
             self._on_participant_video_frame_task
@@ -847,6 +859,12 @@ class AgoraTransportClient:
 
     def on_participant_connected(self, agora_rtc_conn: rtc.RTCConnection, user_id: str):
         async def participant_connected():
+            if self._params.audio_in_enabled and self._is_audio_in_per_participant:
+                await self.subscribe(user_id)
+                if user_id not in self._in_participant_audio_tasks:
+                    self._in_participant_audio_tasks[user_id] = self._loop.create_task(
+                        self.in_participant_audio_handle(user_id)
+                    )
             await self._callbacks.on_participant_connected(agora_rtc_conn, user_id)
 
         # wait
@@ -864,6 +882,9 @@ class AgoraTransportClient:
                 await self.unsubscribe(user_id)
 
             self._channel.destory_when_user_left(user_id)
+            self._video_frame_converters.pop(user_id, None)
+            task = self._in_participant_audio_tasks.pop(user_id, None)
+            task and task.cancel()
 
             # after destory
             participant_ids = self.get_participant_ids()
@@ -985,6 +1006,20 @@ class AgoraTransportClient:
             logging.info("Cancelled Audio task")
             return
 
+    @property
+    def _is_audio_in_per_participant(self) -> bool:
+        return self._params.audio_in_demux_enabled or self._params.audio_in_mix_enabled
+
+    async def in_participant_audio_handle(self, user_id: int) -> None:
+        """sub the participant audio frames, per participant audio in"""
+        try:
+            while self._channel.get_audio_frames(user_id) is None:
+                await asyncio.sleep(0.1)
+            async for audio_frame in self._channel.get_audio_frames(user_id):
+                await self._in_audio_queue.put((audio_frame, user_id))
+        except asyncio.CancelledError:
+            logging.info(f"Cancelled participant {user_id} audio task")
+
     async def read_next_audio_frame(self) -> AudioRawFrame | None:
         """get room sub the first participant audio frame from a queue"""
         pcm_audio_frame, participant_id = await self._in_audio_queue.get()
@@ -1001,6 +1036,15 @@ class AgoraTransportClient:
         original_sample_rate = pcm_audio_frame.sample_rate
         original_num_channels = pcm_audio_frame.number_of_channels
 
+        if self._is_audio_in_per_participant:
+            # resampled per participant in the input processor, shared params unchanged
+            return UserAudioRawFrame(
+                user_id=participant_id,
+                audio=pcm_data.tobytes(),
+                sample_rate=original_sample_rate,
+                num_channels=original_num_channels,
+            )
+
         # Allow 8kHz and 16kHz, other sampple rate convert to 16kHz
         if original_sample_rate not in [8000, 16000]:
             sample_rate = 16000
@@ -1097,40 +1141,61 @@ class AgoraTransportClient:
         """Convert input video frame to image
         target_color_mode from PIL.Image.Image convert method mode param
 
-        cpu/gpu binding optimization:)
-        - now just use opencv to optimize the performance, when use cpu (c/c++)
-        - SIMD Vectorization
-        - GPU Acceleration
-        - use Numba jit to run fast
+        yuv planes are converted to RGB np.ndarray and downscaled to camera_in_max_side
+        in one numpy pass (VideoFrameConverter), no PIL image unless another color mode
         """
+        converter = self._video_frame_converters.get(participant_id)
+        if converter is None:
+            converter = VideoFrameConverter(max_side=self._params.camera_in_max_side)
+            self._video_frame_converters[participant_id] = converter
+        width, height = video_frame.width, video_frame.height
         match video_frame.type:
             case const.AGORA_VIDEO_PIXEL_I420:  # default use yuv420
-                # too slow use python lib 64 ms with cpu, need use GPU optimized
-                # image = convert_I420_to_RGB(video_frame)
-                image = convert_I420_to_RGB_with_cv(video_frame)  # cv use c/c++ lib 2 ms with cpu
+                rgb = converter.i420_to_rgb(
+                    video_frame.y_buffer,
+                    video_frame.u_buffer,
+                    video_frame.v_buffer,
+                    width,
+                    height,
+                    video_frame.y_stride,
+                    video_frame.u_stride,
+                )
             # case const.AGORA_VIDEO_PIXEL_RGBA:
             # need to check RGBA from video
             #    image = convert_RGBA_to_RGB(video_frame)
             case const.AGORA_VIDEO_PIXEL_NV21:
-                # image = convert_NV21_to_RGB(video_frame)
-                image = convert_NV21_to_RGB_optimized(video_frame)
+                # NV21 u_buffer is the interleaved VU plane
+                rgb = converter.nv21_to_rgb(
+                    video_frame.y_buffer, video_frame.u_buffer, width, height, video_frame.y_stride
+                )
             case const.AGORA_VIDEO_PIXEL_I422:
-                # image = convert_I422_to_RGB(video_frame)
-                image = convert_I422_to_RGB_with_cv(video_frame)
+                rgb = converter.i422_to_rgb(
+                    video_frame.y_buffer,
+                    video_frame.u_buffer,
+                    video_frame.v_buffer,
+                    width,
+                    height,
+                    video_frame.y_stride,
+                    video_frame.u_stride,
+                )
             case const.AGORA_VIDEO_PIXEL_NV12:
-                # image = convert_NV12_to_RGB(video_frame)
-                image = convert_NV12_to_RGB_optimized(video_frame)
+                # NV12 u_buffer is the interleaved UV plane
+                rgb = converter.nv12_to_rgb(
+                    video_frame.y_buffer, video_frame.u_buffer, width, height, video_frame.y_stride
+                )
             case _:
                 logging.warning(f"buffer type:{video_frame.type} un support convert")
                 return None
 
         if target_color_mode != "RGB":
-            image = image.convert(target_color_mode)
+            image_bytes = PIL.Image.fromarray(rgb).convert(target_color_mode).tobytes()
+        else:
+            image_bytes = rgb.tobytes()
 
         return UserImageRawFrame(
             user_id=participant_id,
-            image=image.tobytes(),
-            size=(video_frame.width, video_frame.height),
+            image=image_bytes,
+            size=(rgb.shape[1], rgb.shape[0]),
             mode=target_color_mode,
             format="JPEG",
         )
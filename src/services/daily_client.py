@@ -1,5 +1,6 @@
 import logging
 import asyncio
+import time
 from typing import Any, Awaitable, Callable, Mapping
 from concurrent.futures import ThreadPoolExecutor
 
@@ -42,6 +43,13 @@ class DailyCallbacks(BaseModel):
     on_participant_left: Callable[[Mapping[str, Any], str], Awaitable[None]]
 
 
+# audio in read chunk and the max chunks of one read when the pipeline falls behind
+AUDIO_IN_CHUNK_S = 0.02
+AUDIO_IN_MAX_BATCH_CHUNKS = 10
+# max sleep between empty reads (participants without audio, e.g.: muted)
+AUDIO_IN_MAX_BACKOFF_S = 0.2
+
+
 def completion_callback(future):
     def _callback(*args):
         if not future.cancelled():
@@ -83,6 +91,12 @@ class DailyTransportClient(EventHandler):
         self._video_renderers = {}
         self._transcription_renderers = {}
         self._other_participant_has_joined = False
+        # remote participant ids, the audio in reading waits for the first one to join
+        self._remote_participant_ids: set[str] = set()
+        self._remote_participants_event = asyncio.Event()
+        # last audio in read done time, 0 to read one chunk
+        self._audio_in_read_time = 0.0
+        self._audio_in_backoff_s = 0.0
 
         self._joined = False
         self._joining = False
@@ -135,22 +149,50 @@ class DailyTransportClient(EventHandler):
         await future
 
     async def read_next_audio_frame(self) -> AudioRawFrame | None:
+        """
+        read the speaker audio, event driven:
+        - no remote participant: block until one joins (daily-python returns no audio at once)
+        - the pipeline fell behind: read the audio buffered since the last read in one batch
+        - empty read (participants without audio): back off up to AUDIO_IN_MAX_BACKOFF_S
+        """
+        if not self._remote_participants_event.is_set():
+            self._audio_in_read_time = 0.0
+            await self._remote_participants_event.wait()
+
         sample_rate = self._params.audio_in_sample_rate
         num_channels = self._params.audio_in_channels
-        num_frames = int(sample_rate / 100) * 2  # 20ms of audio
+        num_chunks = 1
+        if self._audio_in_read_time:
+            behind_s = time.monotonic() - self._audio_in_read_time
+            num_chunks = max(1, min(int(behind_s / AUDIO_IN_CHUNK_S), AUDIO_IN_MAX_BATCH_CHUNKS))
+        num_frames = int(sample_rate * AUDIO_IN_CHUNK_S) * num_chunks
 
         future = self._loop.create_future()
         self._speaker.read_frames(num_frames, completion=completion_callback(future))
         audio = await future
 
         if len(audio) > 0:
+            self._audio_in_read_time = time.monotonic()
+            self._audio_in_backoff_s = 0.0
             return AudioRawFrame(audio=audio, sample_rate=sample_rate, num_channels=num_channels)
+
+        self._audio_in_read_time = 0.0
+        self._audio_in_backoff_s = min(
+            max(self._audio_in_backoff_s * 2, AUDIO_IN_CHUNK_S), AUDIO_IN_MAX_BACKOFF_S
+        )
+        await asyncio.sleep(self._audio_in_backoff_s)
+        return None
+
+    def _set_remote_participant(self, participant_id: str, joined: bool):
+        """run in the loop thread, wake up the audio in reading"""
+        if joined:
+            self._remote_participant_ids.add(participant_id)
         else:
-            # If we don't read any audio it could be there's no participant
-            # connected. daily-python will return immediately if that's the
-            # case, so let's sleep for a little bit (i.e. busy wait).
-            await asyncio.sleep(0.01)
-            return None
+            self._remote_participant_ids.discard(participant_id)
+        if self._remote_participant_ids:
+            self._remote_participants_event.set()
+        else:
+            self._remote_participants_event.clear()
 
     async def write_raw_audio_frames(self, frames: bytes):
         if not self._mic:
@@ -191,6 +233,10 @@ class DailyTransportClient(EventHandler):
                 self._joining = False
 
                 logging.info(f"Joined {self._room_url}")
+                # the participants in the room before the bot joined
+                for participant_id in self.participants():
+                    if participant_id != "local":
+                        self._set_remote_participant(participant_id, True)
 
                 if self._token and self._params.transcription_enabled:
                     logging.info(
@@ -266,6 +312,8 @@ class DailyTransportClient(EventHandler):
 
         self._joined = False
         self._leaving = True
+        self._remote_participant_ids.clear()
+        self._remote_participants_event.clear()
 
         logging.info(f"Leaving {self._room_url}")
 
@@ -384,6 +432,7 @@ class DailyTransportClient(EventHandler):
     def on_participant_joined(self, participant):
         id = participant["id"]
         logging.info(f"Participant joined {id}")
+        self._loop.call_soon_threadsafe(self._set_remote_participant, id, True)
 
         if not self._other_participant_has_joined:
             self._other_participant_has_joined = True
@@ -394,6 +443,7 @@ class DailyTransportClient(EventHandler):
     def on_participant_left(self, participant, reason):
         id = participant["id"]
         logging.info(f"Participant left {id}")
+        self._loop.call_soon_threadsafe(self._set_remote_participant, id, False)
 
         self._call_async_callback(self._callbacks.on_participant_left, participant, reason)
 
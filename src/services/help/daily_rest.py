@@ -11,7 +11,6 @@ Methods that wrap the Daily API to create rooms, check room URLs, and get meetin
 
 """
 
-# TODO: use async aiohttp @weedge
 import requests
 import time
 
@@ -20,6 +19,8 @@ from urllib.parse import urlparse
 from pydantic import Field, BaseModel, ValidationError
 from typing import Literal, Optional
 
+from src.common.http import AsyncHTTPRequest
+
 
 class DailyRoomSipParams(BaseModel):
     display_name: str = "sw-sip-dialin"
@@ -75,6 +76,12 @@ class DailyRESTHelper:
     def __init__(self, daily_api_key: str, daily_api_url: str = "https://api.daily.co/v1"):
         self.daily_api_key = daily_api_key
         self.daily_api_url = daily_api_url
+        # async methods with the shared aiohttp pool, don't block the event loop
+        self.async_requests = AsyncHTTPRequest(timeout_s=10.0)
+
+    @property
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.daily_api_key}"}
 
     @staticmethod
     def get_name_from_url(room_url: str) -> str:
@@ -174,3 +181,70 @@ class DailyRESTHelper:
             raise Exception(f"Invalid response: {e}")
 
         return token
+
+    async def acreate_room(self, params: DailyRoomParams) -> DailyRoomObject:
+        res = await self.async_requests.post(
+            f"{self.daily_api_url}/rooms",
+            headers=self.headers,
+            json={**params.model_dump(exclude_none=True)},
+        )
+
+        if res.status_code != 200:
+            raise Exception(f"Unable to create room: {res.text}")
+
+        try:
+            room = DailyRoomObject(**res.json())
+        except ValidationError as e:
+            raise Exception(f"Invalid response: {e}")
+
+        return room
+
+    async def aget_room_from_name(self, room_name: str) -> DailyRoomObject:
+        res = await self.async_requests.get(
+            f"{self.daily_api_url}/rooms/{room_name}",
+            headers=self.headers,
+        )
+
+        if res.status_code != 200:
+            raise Exception(f"Room not found: {room_name}")
+
+        try:
+            room = DailyRoomObject(**res.json())
+        except ValidationError as e:
+            raise Exception(f"Invalid response: {e}")
+
+        return room
+
+    async def aget_token_by_name(
+        self, room_name: str, expiry_time: float = 60 * 60, owner: bool = True
+    ) -> str:
+        expiration: float = time.time() + expiry_time
+        res = await self.async_requests.post(
+            f"{self.daily_api_url}/meeting-tokens",
+            headers=self.headers,
+            json={"properties": {"room_name": room_name, "is_owner": owner, "exp": expiration}},
+        )
+
+        if res.status_code != 200:
+            raise Exception(f"Failed to create meeting token: {res.status_code} {res.text}")
+
+        return res.json()["token"]
+
+    async def averify_token(self, token: str) -> TokenObject:
+        if not token:
+            return False
+
+        res = await self.async_requests.get(
+            f"{self.daily_api_url}/meeting-tokens/{token}",
+            headers=self.headers,
+        )
+
+        if res.status_code != 200:
+            raise Exception(f"Token not found: {token}")
+
+        try:
+            token = TokenObject(**res.json())
+        except ValidationError as e:
+            raise Exception(f"Invalid response: {e}")
+
+        return token
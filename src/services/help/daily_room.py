@@ -40,7 +40,7 @@ class DailyRoom(EngineClass, IRoomManager):
         if not room_name:
             return await self.create_random_room(exp_time_s=exp_time_s)
         try:
-            room = self.daily_rest_helper.get_room_from_name(room_name)
+            room = await self.daily_rest_helper.aget_room_from_name(room_name)
         except Exception as ex:
             logging.info(
                 f"Failed to get room {room_name} from Daily REST API: {ex}, to new a room: {room_name}"
@@ -54,7 +54,7 @@ class DailyRoom(EngineClass, IRoomManager):
                         exp=time.time() + exp_time_s,
                     ),
                 )
-                room = self.daily_rest_helper.create_room(params=params)
+                room = await self.daily_rest_helper.acreate_room(params=params)
             except Exception as e:
                 raise Exception(f"{e}")
 
@@ -79,7 +79,7 @@ class DailyRoom(EngineClass, IRoomManager):
                     exp=time.time() + exp_time_s,
                 ),
             )
-            room = self.daily_rest_helper.create_room(params=params)
+            room = await self.daily_rest_helper.acreate_room(params=params)
         except Exception as e:
             raise Exception(f"{e}")
 
@@ -93,13 +93,13 @@ class DailyRoom(EngineClass, IRoomManager):
         )
 
     async def gen_token(self, room_name: str, exp_time_s: int = ROOM_TOKEN_EXPIRE_TIME) -> str:
-        token = self.daily_rest_helper.get_token_by_name(room_name, exp_time_s)
+        token = await self.daily_rest_helper.aget_token_by_name(room_name, exp_time_s)
         logging.debug(f"token:{token}")
         return token
 
     async def get_room(self, room_name: str) -> GeneralRoomInfo:
         try:
-            room = self.daily_rest_helper.get_room_from_name(room_name)
+            room = await self.daily_rest_helper.aget_room_from_name(room_name)
             logging.debug(f"room:{room}")
             g_room = GeneralRoomInfo(
                 sid=room.id,
@@ -119,7 +119,7 @@ class DailyRoom(EngineClass, IRoomManager):
 
         if self.args.privacy == "private":
             try:
-                token = self.daily_rest_helper.verify_token(token)
+                token = await self.daily_rest_helper.averify_token(token)
                 logging.debug(f"token:{token}")
             except Exception as ex:
                 logging.warning(f"{token} verify Exception: {ex}")
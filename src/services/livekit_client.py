@@ -10,6 +10,7 @@ from apipeline.frames.data_frames import AudioRawFrame, ImageRawFrame
 
 from src.common.types import SAMPLE_WIDTH, LivekitParams
 from src.common.utils.audio_utils import resample_audio
+from src.common.utils.frame_convert import VideoFrameConverter
 from src.types.frames.data_frames import (
     LivekitTransportMessageFrame,
     TransportMessageFrame,
@@ -90,6 +91,8 @@ class LivekitTransportClient:
         self._participant_audio_stream: rtc.AudioStream | None = None
         self._in_audio_queue = asyncio.Queue()
         self._in_audio_task: asyncio.Task | None = None
+        # per participant audio in (demux/mix): participant_id -> audio stream task
+        self._in_participant_audio_tasks: Dict[str, asyncio.Task] = {}
 
         # video out
         # local participant video stream
@@ -101,6 +104,8 @@ class LivekitTransportClient:
         self._in_participant_video_tracks: Dict[str, rtc.VideoTrack] = {}
         self._on_participant_video_frame_task: asyncio.Task | None = None
         self._capture_participant_video_stream: rtc.VideoStream | None = None
+        # participant_id -> video frame to rgb converter with reused buffers
+        self._video_frame_converters: Dict[str, VideoFrameConverter] = {}
 
         # Set up room event handlers to call register handlers
         # https://docs.livekit.io/home/client/events/#Events
@@ -137,6 +142,10 @@ class LivekitTransportClient:
         if self._in_audio_task and not self._in_audio_task.cancelled():
             self._in_audio_task.cancel()
             await self._in_audio_task
+        for task in self._in_participant_audio_tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._in_participant_audio_tasks.values(), return_exceptions=True)
+        self._in_participant_audio_tasks.clear()
         if (
             self._on_participant_audio_frame_task
             and not self._on_participant_audio_frame_task.cancelled()
@@ -395,6 +404,7 @@ class LivekitTransportClient:
 
     async def _async_on_participant_disconnected(self, participant: rtc.RemoteParticipant):
         logging.info(f"Participant:{participant} disconnected")
+        self._video_frame_converters.pop(participant.sid, None)
         await self._callbacks.on_participant_disconnected(participant)
         if len(self.get_participants()) == 0:
             self._other_participant_has_joined = False
@@ -412,6 +422,18 @@ class LivekitTransportClient:
             if self._params.audio_in_participant_enabled:
                 # dispatch particpant track for capture participant audio stream
                 self._in_participant_audio_tracks[participant.sid] = track
+            elif self._params.audio_in_demux_enabled or self._params.audio_in_mix_enabled:
+                # a stream task per participant, demux/mix in the input processor
+                audio_stream = rtc.AudioStream(
+                    track=track,
+                    sample_rate=self._params.audio_in_sample_rate,
+                    num_channels=self._params.audio_in_channels,
+                )
+                prev_task = self._in_participant_audio_tasks.pop(participant.sid, None)
+                prev_task and prev_task.cancel()
+                self._in_participant_audio_tasks[participant.sid] = asyncio.create_task(
+                    self._process_audio_stream(audio_stream, participant.sid)
+                )
             else:
                 # sub a new particpant track stream
                 self._participant_audio_stream = rtc.AudioStream(
@@ -443,6 +465,8 @@ class LivekitTransportClient:
         if track.kind == rtc.TrackKind.KIND_AUDIO:
             if participant.sid in self._in_participant_audio_tracks:
                 self._in_participant_audio_tracks.pop(participant.sid)
+            task = self._in_participant_audio_tasks.pop(participant.sid, None)
+            task and task.cancel()
             await self._callbacks.on_audio_track_unsubscribed(participant)
         elif track.kind == rtc.TrackKind.KIND_VIDEO:
             if participant.sid in self._in_participant_video_tracks:
@@ -580,6 +604,15 @@ class LivekitTransportClient:
         original_sample_rate = audio_frame_event.frame.sample_rate
         original_num_channels = audio_frame_event.frame.num_channels
 
+        if self._params.audio_in_demux_enabled or self._params.audio_in_mix_enabled:
+            # resampled per participant in the input processor, shared params unchanged
+            return UserAudioRawFrame(
+                user_id=participant_id,
+                audio=pcm_data.tobytes(),
+                sample_rate=original_sample_rate,
+                num_channels=original_num_channels,
+            )
+
         # Allow 8kHz and 16kHz, other sampple rate convert to 16kHz
         if original_sample_rate not in [8000, 16000]:
             sample_rate = 16000
@@ -643,34 +676,34 @@ class LivekitTransportClient:
 
         match buffer.type:
             case rtc.VideoBufferType.RGBA:
-                image = Image.frombuffer(
-                    "RGBA", (buffer.width, buffer.height), buffer.data, "raw", "RGBA", 0, 1
-                )
+                pixel_format = "RGBA"
             case rtc.VideoBufferType.ABGR:
-                image = Image.frombuffer(
-                    "ABGR", (buffer.width, buffer.height), buffer.data, "raw", "ABGR", 0, 1
-                )
+                pixel_format = "ABGR"
             case rtc.VideoBufferType.ARGB:
-                image = Image.frombuffer(
-                    "ARGB", (buffer.width, buffer.height), buffer.data, "raw", "ARGB", 0, 1
-                )
+                pixel_format = "ARGB"
             case rtc.VideoBufferType.BGRA:
-                image = Image.frombuffer(
-                    "BGRA", (buffer.width, buffer.height), buffer.data, "raw", "BGRA", 0, 1
-                )
+                pixel_format = "BGRA"
             case rtc.VideoBufferType.RGB24:
-                image = Image.frombuffer(
-                    "RGB", (buffer.width, buffer.height), buffer.data, "raw", "RGB", 0, 1
-                )
+                pixel_format = "RGB24"
             case _:
                 logging.warning(f"buffer type:{buffer.type} un support convert")
                 return None
 
-        image = image.convert(target_color_mode)
+        # packed pixels to RGB np.ndarray, downscaled to camera_in_max_side in one pass
+        converter = self._video_frame_converters.get(participant_id)
+        if converter is None:
+            converter = VideoFrameConverter(max_side=self._params.camera_in_max_side)
+            self._video_frame_converters[participant_id] = converter
+        rgb = converter.packed_to_rgb(buffer.data, buffer.width, buffer.height, pixel_format)
+
+        if target_color_mode != "RGB":
+            image_bytes = Image.fromarray(rgb).convert(target_color_mode).tobytes()
+        else:
+            image_bytes = rgb.tobytes()
         return UserImageRawFrame(
             user_id=participant_id,
-            image=image.tobytes(),
-            size=(buffer.width, buffer.height),
+            image=image_bytes,
+            size=(rgb.shape[1], rgb.shape[0]),
             mode=target_color_mode,
             format="JPEG",
         )
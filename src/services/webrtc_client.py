@@ -0,0 +1,297 @@
+import asyncio
+import fractions
+import logging
+import time
+import uuid
+
+import numpy as np
+from apipeline.frames.data_frames import AudioRawFrame
+
+from src.common.utils.audio_resampler import AudioStreamResampler
+from src.types.network.webrtc import WebRTCCallbacks
+
+try:
+    import av
+    from aiortc import (
+        MediaStreamTrack,
+        RTCBundlePolicy,
+        RTCConfiguration,
+        RTCDataChannel,
+        RTCIceServer,
+        RTCPeerConnection,
+        RTCRtpSender,
+        RTCSessionDescription,
+    )
+    from aiortc.mediastreams import MediaStreamError
+except ModuleNotFoundError as e:
+    logging.error(f"Exception: {e}")
+    logging.error("In order to use webrtc, you need to `pip install achatbot[webrtc]`.")
+    raise Exception(f"Missing module: {e}")
+
+# opus native sample rate and frame duration
+AUDIO_OUT_SAMPLE_RATE = 48000
+AUDIO_OUT_PTIME_S = 0.02
+
+
+class AudioOutStreamTrack(MediaStreamTrack):
+    """
+    local audio track of the bot, the peer connection reads it in real time (20ms frames)
+    and encodes to opus:
+    - written pcm is resampled to 48k hz mono (opus native rate), not re-resampled by the encoder
+    - silence when no audio written, so the remote jitter buffer keeps running
+    - clear() drops the not played audio on interruption
+    """
+
+    kind = "audio"
+
+    def __init__(self):
+        super().__init__()
+        self._buffer = bytearray()
+        self._resamplers: dict[int, AudioStreamResampler] = {}
+        self._frame_samples = int(AUDIO_OUT_SAMPLE_RATE * AUDIO_OUT_PTIME_S)
+        self._start: float | None = None
+        self._timestamp = 0
+
+    @property
+    def buffered_s(self) -> float:
+        return len(self._buffer) / 2 / AUDIO_OUT_SAMPLE_RATE
+
+    def write(self, audio: bytes, sample_rate: int, num_channels: int = 1):
+        if num_channels > 1:
+            # downmix to mono, the speech is mono
+            audio = (
+                np.frombuffer(audio, dtype=np.int16)
+                .reshape(-1, num_channels)
+                .mean(axis=1)
+                .astype(np.int16)
+                .tobytes()
+            )
+        if sample_rate not in self._resamplers:
+            self._resamplers[sample_rate] = AudioStreamResampler(sample_rate, AUDIO_OUT_SAMPLE_RATE)
+        self._buffer.extend(self._resamplers[sample_rate].resample(audio))
+
+    def clear(self):
+        self._buffer.clear()
+        for resampler in self._resamplers.values():
+            resampler.reset()
+
+    async def recv(self) -> av.AudioFrame:
+        if self.readyState != "live":
+            raise MediaStreamError
+
+        if self._start is None:
+            self._start = time.monotonic()
+        else:
+            self._timestamp += self._frame_samples
+            wait = self._start + self._timestamp / AUDIO_OUT_SAMPLE_RATE - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+        num_bytes = self._frame_samples * 2
+        chunk = bytes(self._buffer[:num_bytes])
+        del self._buffer[:num_bytes]
+        if len(chunk) < num_bytes:
+            chunk += b"\x00" * (num_bytes - len(chunk))
+
+        frame = av.AudioFrame(format="s16", layout="mono", samples=self._frame_samples)
+        frame.planes[0].update(chunk)
+        frame.pts = self._timestamp
+        frame.sample_rate = AUDIO_OUT_SAMPLE_RATE
+        frame.time_base = fractions.Fraction(1, AUDIO_OUT_SAMPLE_RATE)
+        return frame
+
+
+class WebRTCTransportClient:
+    """
+    one peer connection with a pure python webrtc stack (aiortc):
+    - opus audio in/out, no media server
+    - a data channel for the RTVI messages
+    - ice with the host candidates only by default (no stun/turn)
+    the server answers the client offer (sdp offer/answer over http),
+    offer() is for the python client peer.
+    """
+
+    def __init__(
+        self,
+        ice_servers: list[str] | None = None,
+        data_channel_label: str = "rtvi",
+    ):
+        self._peer_id = str(uuid.uuid4())
+        self._data_channel_label = data_channel_label
+        self._pc = RTCPeerConnection(
+            RTCConfiguration(
+                iceServers=[RTCIceServer(urls=url) for url in ice_servers or []],
+                bundlePolicy=RTCBundlePolicy.MAX_BUNDLE,
+            )
+        )
+        self._callbacks: WebRTCCallbacks | None = None
+        self._connected = False
+        self._closed = False
+
+        # audio out
+        self._audio_out_track = AudioOutStreamTrack()
+        sender = self._pc.addTrack(self._audio_out_track)
+        for transceiver in self._pc.getTransceivers():
+            if transceiver.sender == sender:
+                transceiver.setCodecPreferences(
+                    [
+                        codec
+                        for codec in RTCRtpSender.getCapabilities("audio").codecs
+                        if codec.mimeType.lower() == "audio/opus"
+                    ]
+                )
+
+        # audio in
+        self._audio_in_track: MediaStreamTrack | None = None
+        self._audio_in_track_event = asyncio.Event()
+        self._audio_in_resampler: av.AudioResampler | None = None
+        self._audio_in_sample_rate = 16000
+        self._audio_in_channels = 1
+
+        # data channel
+        self._data_channel: RTCDataChannel | None = None
+
+        self._pc.on("track", self._on_track)
+        self._pc.on("datachannel", self._on_datachannel)
+        self._pc.on("connectionstatechange", self._on_connection_state_change)
+
+    @property
+    def peer_id(self) -> str:
+        return self._peer_id
+
+    @property
+    def connection_state(self) -> str:
+        return self._pc.connectionState
+
+    def setup(
+        self,
+        callbacks: WebRTCCallbacks,
+        audio_in_sample_rate: int = 16000,
+        audio_in_channels: int = 1,
+    ):
+        self._callbacks = callbacks
+        self._audio_in_sample_rate = audio_in_sample_rate
+        self._audio_in_channels = audio_in_channels
+
+    async def start(self):
+        # the peer may be connected before the transport started
+        if self._connected and self._callbacks:
+            await self._callbacks.on_client_connected(self._peer_id)
+
+    #
+    # sdp offer/answer
+    #
+
+    async def offer(self) -> RTCSessionDescription:
+        self._set_data_channel(self._pc.createDataChannel(self._data_channel_label))
+        await self._pc.setLocalDescription(await self._pc.createOffer())
+        # aiortc gathers all the candidates in setLocalDescription, no trickle ice
+        return self._pc.localDescription
+
+    async def answer(self, offer: RTCSessionDescription) -> RTCSessionDescription:
+        await self._pc.setRemoteDescription(offer)
+        await self._pc.setLocalDescription(await self._pc.createAnswer())
+        return self._pc.localDescription
+
+    async def set_answer(self, answer: RTCSessionDescription):
+        await self._pc.setRemoteDescription(answer)
+
+    async def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._audio_out_track.stop()
+        await self._pc.close()
+        self._audio_in_track_event.set()
+
+    #
+    # audio in
+    #
+
+    async def read_next_audio_frame(self) -> AudioRawFrame | None:
+        await self._audio_in_track_event.wait()
+        if self._closed or not self._audio_in_track:
+            return None
+        try:
+            frame = await self._audio_in_track.recv()
+        except MediaStreamError:
+            logging.info(f"peer {self._peer_id} audio in track ended")
+            self._audio_in_track = None
+            return None
+
+        if not self._audio_in_resampler:
+            # the opus decoder outputs 48k hz stereo
+            self._audio_in_resampler = av.AudioResampler(
+                format="s16",
+                layout="mono" if self._audio_in_channels == 1 else "stereo",
+                rate=self._audio_in_sample_rate,
+            )
+        audio = b"".join(
+            bytes(f.planes[0])[: f.samples * 2 * self._audio_in_channels]
+            for f in self._audio_in_resampler.resample(frame)
+        )
+        return AudioRawFrame(
+            audio=audio,
+            sample_rate=self._audio_in_sample_rate,
+            num_channels=self._audio_in_channels,
+        )
+
+    #
+    # audio out
+    #
+
+    @property
+    def audio_out_buffered_s(self) -> float:
+        return self._audio_out_track.buffered_s
+
+    async def write_raw_audio_frames(self, frames: bytes, sample_rate: int, num_channels: int = 1):
+        self._audio_out_track.write(frames, sample_rate, num_channels)
+
+    def clear_audio_out(self):
+        self._audio_out_track.clear()
+
+    #
+    # data channel
+    #
+
+    async def send_message(self, message: str | bytes):
+        if not self._data_channel or self._data_channel.readyState != "open":
+            logging.warning(f"peer {self._peer_id} data channel not open, drop message")
+            return
+        self._data_channel.send(message)
+
+    def _set_data_channel(self, channel: RTCDataChannel):
+        self._data_channel = channel
+
+        @channel.on("message")
+        async def on_message(message):
+            if self._callbacks:
+                await self._callbacks.on_data_received(message)
+
+    #
+    # peer connection events
+    #
+
+    def _on_track(self, track: MediaStreamTrack):
+        logging.info(f"peer {self._peer_id} track {track.kind} received")
+        if track.kind == "audio":
+            self._audio_in_track = track
+            self._audio_in_track_event.set()
+
+    def _on_datachannel(self, channel: RTCDataChannel):
+        logging.info(f"peer {self._peer_id} data channel {channel.label} received")
+        if channel.label == self._data_channel_label:
+            self._set_data_channel(channel)
+
+    async def _on_connection_state_change(self):
+        state = self._pc.connectionState
+        logging.info(f"peer {self._peer_id} connection state: {state}")
+        if state == "connected" and not self._connected:
+            self._connected = True
+            if self._callbacks:
+                await self._callbacks.on_client_connected(self._peer_id)
+        elif state in ("failed", "closed") and self._connected:
+            self._connected = False
+            if self._callbacks:
+                await self._callbacks.on_client_disconnected(self._peer_id)
+            await self.close()
@@ -126,6 +126,12 @@ class AgoraTransport(BaseTransport):
         await self._call_event_handler(
             "on_participant_disconnected", agora_rtc_conn, user_id, reason
         )
+        if self._params.audio_in_demux_enabled or self._params.audio_in_mix_enabled:
+            # multi participants room, end when the last participant left
+            if self._input:
+                await self._input.remove_participant_audio(user_id)
+            if len(self._client.get_participant_ids()) > 0:
+                return
         if self._input:
             await self._input.process_frame(EndFrame(), FrameDirection.DOWNSTREAM)
         if self._output:
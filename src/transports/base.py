@@ -18,6 +18,14 @@ class BaseTransport(EventHandlerManager, ABC):
         self._output_name = output_name
         self._loop = loop or asyncio.get_running_loop()
 
+    @property
+    def binary_messages(self) -> bool:
+        """
+        the transport can send binary (bytes) transport messages,
+        e.g.: the msgpack encoded rtvi messages
+        """
+        return False
+
     @abstractmethod
     def input_processor(self) -> FrameProcessor:
         raise NotImplementedError
@@ -36,19 +36,21 @@ class FastapiWebsocketTransport(BaseTransport):
         self._callbacks = FastapiWebsocketServerCallbacks(
             on_client_connected=self._on_client_connected,
             on_client_disconnected=self._on_client_disconnected,
+            on_client_slow=self._on_client_slow,
         )
 
         self._input_processor = FastapiWebsocketServerInputProcessor(
             websocket, self._params, self._callbacks, name=self._input_name
         )
         self._output_processor = FastapiWebsocketServerOutputProcessor(
-            websocket, self._params, name=self._output_name
+            websocket, self._params, self._callbacks, name=self._output_name
         )
 
         # Register supported handlers. The user will only be able to register
         # these handlers.
         self._register_event_handler("on_client_connected")
         self._register_event_handler("on_client_disconnected")
+        self._register_event_handler("on_client_slow")
 
     def input_processor(self) -> FastapiWebsocketServerInputProcessor:
         return self._input_processor
@@ -61,3 +63,6 @@ class FastapiWebsocketTransport(BaseTransport):
 
     async def _on_client_disconnected(self, websocket):
         await self._call_event_handler("on_client_disconnected", websocket)
+
+    async def _on_client_slow(self, websocket, slow: bool, stats: dict):
+        await self._call_event_handler("on_client_slow", websocket, slow, stats)
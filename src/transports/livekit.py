@@ -132,6 +132,12 @@ class LivekitTransport(BaseTransport):
 
     async def _on_participant_disconnected(self, participant: rtc.RemoteParticipant):
         await self._call_event_handler("on_participant_disconnected", participant)
+        if self._params.audio_in_demux_enabled or self._params.audio_in_mix_enabled:
+            # multi participants room, end when the last participant left
+            if self._input:
+                await self._input.remove_participant_audio(participant.sid)
+            if len(self._client.get_participant_ids()) > 0:
+                return
         if self._input:
             await self._input.process_frame(EndFrame(), FrameDirection.DOWNSTREAM)
         if self._output:
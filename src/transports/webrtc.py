@@ -0,0 +1,76 @@
+import asyncio
+import logging
+
+from src.processors.network.webrtc_input_processor import WebRTCInputProcessor
+from src.processors.network.webrtc_output_processor import WebRTCOutputProcessor
+from src.services.webrtc_client import WebRTCTransportClient
+from src.transports.base import BaseTransport
+from src.types.frames.data_frames import TransportMessageFrame
+from src.types.network.webrtc import WebRTCCallbacks, WebRTCParams
+
+
+class WebRTCTransport(BaseTransport):
+    """
+    peer to peer webrtc transport, the client peer connection is answered
+    (sdp offer/answer) before the transport runs, e.g. by the fastapi webrtc bot server
+    """
+
+    def __init__(
+        self,
+        client: WebRTCTransportClient,
+        params: WebRTCParams,
+        input_name: str | None = None,
+        output_name: str | None = None,
+        loop: asyncio.AbstractEventLoop | None = None,
+    ):
+        super().__init__(input_name=input_name, output_name=output_name, loop=loop)
+        self._params = params
+        self._client = client
+        self._client.setup(
+            WebRTCCallbacks(
+                on_client_connected=self._on_client_connected,
+                on_client_disconnected=self._on_client_disconnected,
+                on_data_received=self._on_data_received,
+            ),
+            audio_in_sample_rate=params.audio_in_sample_rate,
+            audio_in_channels=params.audio_in_channels,
+        )
+
+        self._input = WebRTCInputProcessor(self._client, self._params, name=self._input_name)
+        self._output = WebRTCOutputProcessor(self._client, self._params, name=self._output_name)
+
+        # Register supported handlers. The user will only be able to register
+        # these handlers.
+        self._register_event_handler("on_client_connected")
+        self._register_event_handler("on_client_disconnected")
+        self._register_event_handler("on_data_received")
+
+    def input_processor(self) -> WebRTCInputProcessor:
+        return self._input
+
+    def output_processor(self) -> WebRTCOutputProcessor:
+        return self._output
+
+    @property
+    def binary_messages(self) -> bool:
+        # the data channel sends str as text and bytes as binary messages
+        return True
+
+    @property
+    def peer_id(self) -> str:
+        return self._client.peer_id
+
+    async def send_message(self, message: str | dict):
+        await self._output.send_message(TransportMessageFrame(message=message))
+
+    async def _on_client_connected(self, peer_id: str):
+        logging.info(f"peer {peer_id} connected")
+        await self._call_event_handler("on_client_connected", peer_id)
+
+    async def _on_client_disconnected(self, peer_id: str):
+        logging.info(f"peer {peer_id} disconnected")
+        await self._call_event_handler("on_client_disconnected", peer_id)
+
+    async def _on_data_received(self, message: str | bytes):
+        await self._input.push_app_message(message)
+        await self._call_event_handler("on_data_received", message)
@@ -42,6 +42,8 @@ class VADConfig(BaseModel):
 class VisionDetectorConfig(BaseModel):
     tag: Optional[str] = None
     args: Optional[dict] = None
+    # VideoFrameGateArgs, rate limit/change detect the video frames before detecting
+    frame_gate: Optional[dict] = None
 
 
 class VisionOCRConfig(BaseModel):
@@ -58,6 +60,15 @@ class ImageGenConfig(BaseModel):
 class ASRConfig(BaseModel):
     tag: Optional[str] = None
     args: Optional[dict] = None
+    # ASRLanguageTrackerArgs, per-session language tracker for multilingual asr
+    language_tracker: Optional[dict] = None
+    # ASR_LATENCY_PROFILES name, e.g.: fast (greedy, no word timestamps)
+    latency_profile: Optional[str] = None
+    # SpeechSegmentGateArgs, pre-asr gate to drop non-speech segments,
+    # with the gate vad analyzer: use_vad (default true), vad_tag/vad_args (default the bot vad)
+    segment_gate: Optional[dict] = None
+    # ASRHallucinationArgs, post-asr hallucination filter
+    hallucination: Optional[dict] = None
 
 
 class LLMConfig(BaseModel):
@@ -68,6 +79,20 @@ class LLMConfig(BaseModel):
     tools: Optional[List[dict]] = None
     tag: Optional[str] = None
     args: Optional[dict] = None
+    # LLMContextWindowArgs, token budget for the remote llm context messages
+    context_window: Optional[dict] = None
+    # LLMImageAttachmentArgs, downscale/encode images once, placeholders for old images
+    image_store: Optional[dict] = None
+    # parallel function calls, e.g.: {"timeout_s": 10, "filler_texts": ["Let me check."]}
+    function_call: Optional[dict] = None
+    # LLMPromptCacheArgs, shared static prompt prefix, e.g.: {"cache_control": "on"}
+    prompt_cache: Optional[dict] = None
+    # LLMSpeculativeArgs, speculative generation on stable interim transcripts
+    speculative: Optional[dict] = None
+    # openai compatible backends (base_url, model) of the llm router, routed by latency
+    backends: Optional[List["LLMConfig"]] = None
+    # LLMRouterArgs, e.g.: {"hedge_percentile": 90, "max_failures": 3}
+    router: Optional[dict] = None
 
 
 class TTSConfig(BaseModel):
@@ -51,14 +51,23 @@ class UserStartedSpeakingFrame(ControlFrame):
 
     """
 
-    pass
+    # the speaking participant with per participant audio in, "" for one audio stream
+    user_id: str = ""
 
 
 @dataclass
 class UserStoppedSpeakingFrame(ControlFrame):
     """Emitted by the VAD to indicate that a user stopped speaking."""
 
-    pass
+    user_id: str = ""
+
+
+@dataclass
+class UserLeftFrame(ControlFrame):
+    """Emitted by the input transport when a participant of the room left,
+    the per participant states (e.g.: asr segment buffer) can be dropped."""
+
+    user_id: str = ""
 
 
 @dataclass
@@ -102,6 +102,24 @@ class LLMMessagesFrame(DataFrame):
         return f"{self.name}(messages: {self.messages})"
 
 
+@dataclass
+class LLMSpeculativeMessagesFrame(DataFrame):
+    """A frame containing the LLM messages with a stable interim user transcript
+    (text) as the last message. LLM processors with speculation enabled start a
+    chat completion and hold the response until the final transcript arrives, then
+    commit it if the final transcript matches the text, or cancel it otherwise.
+
+    """
+
+    messages: List[dict]
+    text: str
+    tools: List[dict] | None = None
+    tool_choice: Any = None
+
+    def __str__(self):
+        return f"{self.name}(text: {self.text}, messages: {len(self.messages)})"
+
+
 @dataclass
 class TransportMessageFrame(DataFrame):
     message: Any
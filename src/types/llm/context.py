@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class LLMContextWindowArgs:
+    r"""
+    token budget for the llm chat context window
+    """
+
+    # max prompt tokens of the context messages, 0 is unbounded
+    max_tokens: int = 4096
+    # evict: drop old turns; summarize: fold old turns into a summary system message
+    strategy: str = "evict"
+    # keep the latest n messages even if over budget
+    keep_recent_messages: int = 4
+    # pin tool call/result messages, system messages are always pinned
+    pin_tool_messages: bool = True
+    # tiktoken encoding name, fall back to estimate if tiktoken is not available
+    tokenizer: str = "cl100k_base"
+    # chat format overhead tokens per message
+    per_message_tokens: int = 4
+    # estimated tokens per image attachment
+    image_tokens: int = 765
+    # max tokens of the summary message with summarize strategy
+    summary_max_tokens: int = 256
+
+
+@dataclass
+class LLMImageAttachmentArgs:
+    r"""
+    image attachments in the llm chat context
+    """
+
+    # downscale the longer side to max_side before encoding, 0 keeps the original size
+    max_side: int = 1024
+    # JPEG or WEBP
+    format: str = "JPEG"
+    quality: int = 85
+    # replace the image with a text placeholder after n user turns, 0 never
+    max_image_turns: int = 2
+    placeholder: str = "[image omitted] {text}"
+    # encoded images cached by content hash (lru)
+    cache_size: int = 32
+
+
+@dataclass
+class LLMPromptCacheArgs:
+    r"""
+    shared static prompt prefix (system prompt + tools) for provider prompt caching
+    """
+
+    # auto: add cache_control markers for the providers which need them (anthropic/claude models)
+    # on: always add; off: never add (automatic prefix caching providers, e.g.: openai, deepseek)
+    cache_control: str = "auto"
+    # model name substrings which need cache_control markers with auto
+    cache_control_models: tuple = ("claude", "anthropic")
+    # request the last stream chunk with the usage (cached tokens) by stream_options,
+    # off for the openai compatible servers which reject it
+    include_usage: bool = True
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class LLMRouterArgs:
+    r"""
+    multi-provider llm router with latency-aware failover and hedged requests
+    """
+
+    # ewma smoothing factor of the backend ttft (time to first token) and tokens/s
+    ewma_alpha: float = 0.3
+    # hedge a second request to the next backend if no first token after
+    # the ttft percentile (0~100) of the backend, clamped to [hedge_min_s, hedge_max_s]
+    hedge_percentile: float = 90.0
+    hedge_min_s: float = 0.5
+    hedge_max_s: float = 3.0
+    # use hedge_min_s before the backend has enough ttft samples
+    hedge_min_samples: int = 10
+    # 0 disables hedging, only failover
+    max_hedges: int = 1
+    # mark the backend unhealthy after n consecutive failures, for cooldown seconds
+    max_failures: int = 3
+    unhealthy_cooldown_s: float = 30.0
+    # give up the request if no backend sends the first token in time
+    first_token_timeout_s: float = 15.0
@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class LLMSpeculativeArgs:
+    r"""
+    speculative llm generation on stable interim transcripts
+    """
+
+    # user aggregator: speculate after n consecutive interim transcripts with the same text
+    stable_interims: int = 2
+    # user aggregator: min words (each cjk char is a word) of the interim text to speculate
+    min_words: int = 3
+    # llm processor: commit the speculative response if the normalized edit distance
+    # between the final and the interim transcript <= max_distance, else cancel and restart
+    max_distance: float = 0.1
+    # llm processor: max frames held before commit, the generation waits when it's full
+    max_buffer_frames: int = 256
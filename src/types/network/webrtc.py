@@ -0,0 +1,22 @@
+from typing import Awaitable, Callable
+
+from pydantic import BaseModel
+
+from src.common.types import AudioCameraParams
+
+
+class WebRTCParams(AudioCameraParams):
+    # ice server urls (stun/turn), default none: only gather the host candidates,
+    # no stun/turn roundtrip to connect the local/lan peers
+    ice_servers: list[str] = []
+    # data channel label of the RTVI messages, created by the client(offer) peer
+    data_channel_label: str = "rtvi"
+    # pace the audio out to real time with lead_s ahead, the audio is opus encoded in 20ms frames
+    # by the peer connection, queued audio is dropped on interruption
+    audio_out_lead_s: float = 0.04
+
+
+class WebRTCCallbacks(BaseModel):
+    on_client_connected: Callable[[str], Awaitable[None]]
+    on_client_disconnected: Callable[[str], Awaitable[None]]
+    on_data_received: Callable[[str | bytes], Awaitable[None]]
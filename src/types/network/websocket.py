@@ -4,13 +4,25 @@ from pydantic import BaseModel
 import websockets
 from apipeline.serializers.protobuf import ProtobufFrameSerializer, FrameSerializer
 
-from src.common.types import AudioCameraParams
+from src.common.types import AudioCameraParams, OpusCodecParams
 
 
 class WebsocketServerParams(AudioCameraParams):
     add_wav_header: bool = False
     audio_frame_size: int = 6400  # 200ms with 16K hz 1 channel 2 sample_width
     serializer: FrameSerializer = ProtobufFrameSerializer()
+    # audio payload codec of the AudioRawFrame in both directions: pcm or opus (one packet per frame)
+    audio_codec: str = "pcm"
+    opus: OpusCodecParams = OpusCodecParams()
+    # pace the audio out to real time with lead_s ahead, queued audio is dropped on interruption
+    audio_out_paced: bool = True
+    audio_out_lead_s: float = 0.2
+    # bounded send queue per connection, sent by a writer task: the pipeline doesn't wait for
+    # the client network; over the high water mark (slow client) drop the stale video/metrics,
+    # then the audio queued longer than send_queue_audio_horizon_s
+    send_queue_high_water_bytes: int = 256 * 1024
+    send_queue_max_bytes: int = 1024 * 1024
+    send_queue_audio_horizon_s: float = 1.0
 
 
 class WebsocketServerCallbacks(BaseModel):
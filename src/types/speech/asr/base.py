@@ -22,3 +22,47 @@ class ASRArgs:
     prompt: str = ""
     sample_rate: int = RATE
     device: str | dict | None = None
+    # decode options, the engine honors them if in its ASRCapabilities
+    # None is engine default decoding, 1 is greedy decoding
+    beam_size: int | None = None
+    # if False, transcribe_stream yields segment-level text
+    word_timestamps: bool = True
+
+
+@dataclass
+class ASRCapabilities:
+    """
+    asr engine capability matrix: which decode options the engine honors,
+    processors request only what they use
+    """
+
+    beam_size: bool = False
+    word_timestamps: bool = False
+    # transcribe_stream yields segment text when word_timestamps is False
+    segment_stream: bool = False
+    language_detection: bool = False
+
+
+# asr latency profiles, chosen per processor
+# - accurate: beam search with word timestamps
+# - fast: greedy, no word timestamps (no cross-attention DTW pass), segment-level streaming
+ASR_LATENCY_PROFILES = {
+    "accurate": {"beam_size": 5, "word_timestamps": True},
+    "fast": {"beam_size": 1, "word_timestamps": False},
+}
+
+
+@dataclass
+class ASRLanguageTrackerArgs:
+    # detect language on the first n utterances of a session before caching
+    detect_utterances: int = 1
+    # cached language confidence decay factor per served utterance
+    confidence_decay: float = 0.95
+    # re-detect when cached language confidence is below this value
+    min_confidence: float = 0.5
+    # when engine don't return language probability, use this value
+    default_probability: float = 0.8
+    # language -> {"tag": asr engine tag, "args": asr engine args}
+    # route the session to a smaller language-specific model, e.g.:
+    # {"en": {"tag": "whisper_faster_asr", "args": {"model_name_or_path": "base.en"}}}
+    model_routes: dict | None = None
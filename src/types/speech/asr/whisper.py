@@ -21,6 +21,13 @@ class WhisperTransformersASRArgs(ASRArgs):
 
 @dataclass
 class WhisperGroqASRArgs(ASRArgs):
+    # None use env GROQ_API_KEY / GROQ_BASE_URL
+    api_key: str | None = None
+    base_url: str | None = None
+    # in-flight requests limit per api key
+    max_in_flight: int = 8
+    # retry transcription (idempotent) with jittered backoff
+    max_retries: int = 2
     timeout_s: float = None
     """
     temperature: The sampling temperature, between 0 and 1. Higher values like 0.8 will make the
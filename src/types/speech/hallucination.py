@@ -0,0 +1,50 @@
+from dataclasses import dataclass, field
+
+from src.common.types import RATE
+
+
+@dataclass
+class SpeechSegmentGateArgs:
+    """
+    pre-asr gate args, drop non-speech segments (cough, click, background tv) before decoding
+    """
+
+    sample_rate: int = RATE
+    # frame size to analyze, if use vad analyzer, use vad analyzer required frames
+    frame_ms: int = 30
+    # voiced frames / total frames of the segment
+    min_speech_ratio: float = 0.2
+    min_voiced_secs: float = 0.2
+    # mean spectral flatness of voiced frames, speech is tonal (low),
+    # noise/click is flat (near 1.0)
+    max_spectral_flatness: float = 0.45
+    # voiced frame vad confidence threshold, if use vad analyzer
+    vad_confidence: float = 0.5
+    # voiced frame energy threshold, if don't use vad analyzer
+    energy_threshold_dbfs: float = -45.0
+
+
+# common whisper hallucinations on non-speech audio
+DEFAULT_HALLUCINATION_BLACKLIST = [
+    "thank you for watching",
+    "thanks for watching",
+    "please subscribe",
+    "subtitles by the amara.org community",
+    "请不吝点赞 订阅 转发 打赏支持明镜与点点栏目",
+    "字幕由amara.org社区提供",
+    "谢谢观看",
+]
+
+
+@dataclass
+class ASRHallucinationArgs:
+    """
+    post-asr hallucination filter args, the same thresholds as whisper temperature fallback
+    """
+
+    compression_ratio_threshold: float = 2.4
+    logprob_threshold: float = -1.0
+    no_speech_threshold: float = 0.6
+    # compression ratio of too short text is meaningless
+    min_compression_text_len: int = 24
+    blacklist: list = field(default_factory=lambda: list(DEFAULT_HALLUCINATION_BLACKLIST))
@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class VideoFrameGateArgs:
+    r"""
+    gate the input video frames before the vision processors (detect, ocr, vlm)
+    """
+
+    # max forwarded frames per second of each participant, 0 is unlimited
+    target_fps: float = 2.0
+    # forward a frame if the mean absolute luma difference (0~255) to the last forwarded one
+    # is over the threshold, 0 forwards all frames within the target fps
+    diff_threshold: float = 3.0
+    # the luma thumbnail side (px) to compare, sampled from the frame
+    thumb_size: int = 32
+    # forward an unchanged frame at least every max_interval_s, 0 never
+    max_interval_s: float = 5.0
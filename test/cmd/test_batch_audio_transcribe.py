@@ -0,0 +1,125 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from src.cmd.bots.rag.data_process.batch_audio_transcribe import (
+    BatchTranscriber,
+    list_audio_files,
+    load_audio,
+    load_done,
+    load_transcripts,
+    split_at_silence,
+)
+from src.common.factory import EngineClass
+from src.common.types import TEST_DIR
+
+r"""
+python -m unittest test.cmd.test_batch_audio_transcribe.TestBatchAudioTranscribe
+"""
+
+
+class DummyAsr(EngineClass):
+    TAG = "test_dummy_asr"
+
+    def __init__(self, **args) -> None:
+        self.asr_audio = None
+
+    def set_audio_data(self, audio_data):
+        self.asr_audio = audio_data
+
+    async def transcribe(self, session) -> dict:
+        return {"language": "en", "text": f"{len(self.asr_audio)}"}
+
+
+class TestBatchAudioTranscribe(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.output_path = os.path.join(self.tmp_dir, "transcripts.jsonl")
+        self.audio_files = [
+            os.path.join(TEST_DIR, "audio_files/eng_speech.wav"),
+            os.path.join(TEST_DIR, "audio_files/hi.wav"),
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_list_audio_files(self):
+        files = list_audio_files(os.path.join(TEST_DIR, "audio_files"))
+        self.assertIn(self.audio_files[0], files)
+
+        manifest = os.path.join(self.tmp_dir, "manifest.txt")
+        with open(manifest, "w") as f:
+            f.write("\n".join(self.audio_files))
+        self.assertEqual(list_audio_files(manifest), self.audio_files)
+
+    def test_split_at_silence(self):
+        pcm = load_audio(self.audio_files[0])
+        spans = split_at_silence(pcm, max_chunk_secs=5.0, search_secs=2.0)
+        print(spans)
+        self.assertEqual(spans[0][0], 0)
+        self.assertEqual(spans[-1][1], len(pcm) // 2)
+        for (_, end), (start, _) in zip(spans, spans[1:]):
+            self.assertEqual(end, start)
+        for start, end in spans:
+            self.assertLessEqual(end - start, 5 * 16000)
+
+    def test_resume(self):
+        transcriber = BatchTranscriber(
+            "test_dummy_asr", {}, self.output_path, workers=0, max_chunk_secs=5.0
+        )
+        stats = transcriber.run(self.audio_files)
+        print(stats)
+        self.assertEqual(stats["files"], 2)
+        with open(self.output_path) as f:
+            lines = f.readlines()
+        expected = load_transcripts(self.output_path)
+
+        # interrupted run: keep the first chunks and a partial line
+        with open(self.output_path, "w") as f:
+            f.writelines(lines[:3])
+            f.write(lines[3][:10])
+        done_chunks, done_files = load_done(self.output_path)
+        self.assertEqual(len(done_chunks), 3)
+        self.assertEqual(len(done_files), 0)
+
+        transcriber = BatchTranscriber(
+            "test_dummy_asr", {}, self.output_path, workers=0, max_chunk_secs=5.0
+        )
+        stats = transcriber.run(self.audio_files)
+        self.assertEqual(stats["chunks"], len(lines) - 2 - 3)
+        self.assertEqual(load_transcripts(self.output_path), expected)
+        _, done_files = load_done(self.output_path)
+        self.assertEqual(done_files, set(self.audio_files))
+
+        # all done, skip
+        stats = transcriber.run(self.audio_files)
+        self.assertEqual(stats["chunks"], 0)
+
+    def test_failed_chunk(self):
+        # the second chunk of the first file fails, the file is left not done
+        calls = []
+
+        async def transcribe(self, session) -> dict:
+            calls.append(len(self.asr_audio))
+            if len(calls) == 2:
+                raise RuntimeError("asr error")
+            return {"language": "en", "text": f"{len(self.asr_audio)}"}
+
+        transcriber = BatchTranscriber(
+            "test_dummy_asr", {}, self.output_path, workers=0, max_chunk_secs=5.0
+        )
+        with mock.patch.object(DummyAsr, "transcribe", transcribe):
+            stats = transcriber.run(self.audio_files)
+        self.assertEqual(stats["failed_chunks"], 1)
+        self.assertEqual(stats["files"], 1)
+        _, done_files = load_done(self.output_path)
+        self.assertEqual(done_files, {self.audio_files[1]})
+
+        # resumed run retries the failed chunk
+        stats = transcriber.run(self.audio_files)
+        self.assertEqual(stats["chunks"], 1)
+        self.assertEqual(stats["failed_chunks"], 0)
+        _, done_files = load_done(self.output_path)
+        self.assertEqual(done_files, set(self.audio_files))
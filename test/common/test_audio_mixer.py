@@ -0,0 +1,91 @@
+import unittest
+
+import numpy as np
+from scipy import signal
+
+from src.common.utils.audio_mixer import AudioMixer
+from src.common.utils.audio_resampler import AudioStreamResampler
+
+r"""
+python -m unittest test.common.test_audio_mixer.TestAudioMixer
+python -m unittest test.common.test_audio_mixer.TestAudioStreamResampler
+"""
+
+
+def pcm(values) -> bytes:
+    return np.asarray(values, dtype=np.int16).tobytes()
+
+
+class TestAudioMixer(unittest.TestCase):
+    def setUp(self):
+        # 10ms 16khz mono frames: 160 samples
+        self.mixer = AudioMixer(16000, max_lag_frames=2)
+
+    def test_mix_aligned_frames(self):
+        self.mixer.push("a", pcm([1000] * 240))
+        self.mixer.push("b", b"")
+        # wait for "b"
+        self.assertEqual(self.mixer.mix(), b"")
+        self.mixer.push("b", pcm([-300] * 160))
+        mixed = np.frombuffer(self.mixer.mix(), dtype=np.int16)
+        np.testing.assert_array_equal(mixed, [700] * 160)
+        # the not aligned tail waits
+        self.mixer.push("b", pcm([0] * 80))
+        self.assertEqual(self.mixer.mix(), b"")
+
+    def test_clip(self):
+        self.mixer.push("a", pcm([30000] * 160))
+        self.mixer.push("b", pcm([30000] * 160))
+        self.mixer.push("c", pcm([-30000] * 80 + [-20000] * 80))
+        mixed = np.frombuffer(self.mixer.mix(), dtype=np.int16)
+        np.testing.assert_array_equal(mixed, [30000] * 80 + [32767] * 80)
+
+        self.mixer.clear()
+        self.mixer.push("a", pcm([-30000] * 160))
+        self.mixer.push("b", pcm([-30000] * 160))
+        np.testing.assert_array_equal(
+            np.frombuffer(self.mixer.mix(), dtype=np.int16), [-32768] * 160
+        )
+
+    def test_lagging_source(self):
+        self.mixer.push("a", pcm([100] * 160))
+        self.mixer.push("b", pcm([10] * 160 * 4))
+        # "a" lags 3 frames > max_lag_frames, mixed as silence
+        mixed = np.frombuffer(self.mixer.mix(), dtype=np.int16)
+        np.testing.assert_array_equal(mixed, [110] * 160 + [10] * 160)
+        self.mixer.remove("a")
+        self.assertEqual(self.mixer.sources, ["b"])
+        self.assertEqual(len(self.mixer.mix()), 160 * 2 * 2)
+
+
+class TestAudioStreamResampler(unittest.TestCase):
+    def test_stream_same_as_resample_poly(self):
+        for in_rate, out_rate in [(48000, 16000), (44100, 16000), (8000, 16000)]:
+            t = np.arange(in_rate) / in_rate
+            x = (8000 * np.sin(2 * np.pi * 440 * t)).astype(np.int16)
+            resampler = AudioStreamResampler(in_rate, out_rate)
+            chunk = in_rate // 100
+            out = b"".join(
+                resampler.resample(x[i : i + chunk].tobytes()) for i in range(0, len(x), chunk)
+            )
+            y = np.frombuffer(out, dtype=np.int16).astype(np.float64)
+            self.assertEqual(len(y), out_rate)
+
+            g = np.gcd(in_rate, out_rate)
+            ref = signal.resample_poly(x.astype(np.float64), out_rate // g, in_rate // g)
+            # causal filter: constant delay of half the filter
+            delay = 20 if in_rate < out_rate else 10
+            diff = np.abs(y[delay + 100 :] - ref[100:-delay])
+            self.assertLessEqual(diff.max(), 0.5 + 1e-6, (in_rate, out_rate))
+
+    def test_passthrough_and_reset(self):
+        resampler = AudioStreamResampler(16000, 16000)
+        audio = pcm(range(100))
+        self.assertIs(resampler.resample(audio), audio)
+
+        resampler = AudioStreamResampler(48000, 16000)
+        # not a full down(3) block
+        self.assertEqual(resampler.resample(pcm([1])), b"")
+        self.assertEqual(len(resampler.resample(pcm([1, 1]))), 2)
+        resampler.reset()
+        self.assertEqual(len(resampler.resample(pcm([0] * 480))), 160 * 2)
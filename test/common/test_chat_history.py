@@ -0,0 +1,130 @@
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+from src.common.chat_history import ChatHistory
+from src.common.chat_history_store import SQLiteChatHistoryStore
+from src.common.session import Session
+from src.common.types import SessionCtx
+
+r"""
+python -m unittest test.common.test_chat_history.TestChatHistory
+"""
+
+
+def user(text):
+    return {"role": "user", "content": text}
+
+
+def assistant(text):
+    return {"role": "assistant", "content": text}
+
+
+class TestChatHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "chat_history.db")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_size(self):
+        history = ChatHistory(2)
+        history.init({"role": "system", "content": "sys"})
+        for i in range(5):
+            history.append(user(f"q{i}"))
+            history.append(assistant(f"a{i}"))
+        self.assertEqual(len(history), 4)
+        self.assertEqual(history[0]["content"], "q3")
+        self.assertEqual(history.to_list()[0]["role"], "system")
+
+        history = ChatHistory(0)
+        history.append(user("q"))
+        self.assertEqual(history.to_list(), [])
+
+    def test_token_budget(self):
+        history = ChatHistory(max_tokens=10)
+        for i in range(4):
+            # 12 ascii chars -> 3 tokens
+            history.append(user(f"question {i:03d}"))
+            history.append(assistant(f"answer {i:05d}"))
+        self.assertLessEqual(history.total_tokens, 10)
+        self.assertEqual(history.total_tokens, sum(3 for _ in history))
+        # evicted with the prompt, starts with a user message
+        self.assertEqual(history[0]["role"], "user")
+        self.assertEqual(history[-1]["content"], "answer 00003")
+
+        # keep the latest message over the budget
+        history.append(user("x" * 100))
+        self.assertEqual(len(history), 1)
+
+    def test_list_compatible(self):
+        history = ChatHistory()
+        for text in ["<u>hi</u>", "<a>hello</a>", "<u>bye</u>"]:
+            history.append(text)
+        self.assertEqual("".join(history), "<u>hi</u><a>hello</a><u>bye</u>")
+        self.assertEqual(history.pop(0), "<u>hi</u>")
+        self.assertEqual(history.pop(), "<u>bye</u>")
+        self.assertEqual(history.total_tokens, 3)
+
+        session = Session(**SessionCtx("test").__dict__)
+        session.chat_history.append(user("hi"))
+        session = pickle.loads(pickle.dumps(session))
+        self.assertEqual(session.chat_history.to_list(), [user("hi")])
+
+    def test_store_restore(self):
+        store = SQLiteChatHistoryStore(self.db_path)
+        history = ChatHistory(size=2, store=store, session_id="s1")
+        for i in range(5):
+            history.append(user(f"q{i}"))
+            history.append(assistant(f"a{i}"))
+        ChatHistory(store=store, session_id="s2").append(user("other"))
+        store.close()
+
+        # restart
+        store = SQLiteChatHistoryStore(self.db_path)
+        history = ChatHistory(size=2, store=store, session_id="s1")
+        self.assertEqual(history.restore(), 4)
+        self.assertEqual([m["content"] for m in history], ["q3", "a3", "q4", "a4"])
+
+        history = ChatHistory(max_tokens=3, store=store, session_id="s1")
+        history.restore()
+        self.assertEqual(history.to_list(), [user("q4"), assistant("a4")])
+
+        # the unpickled store reopens the db in the other process
+        history = pickle.loads(pickle.dumps(ChatHistory(store=store, session_id="s2")))
+        history.append(user("more"))
+        self.assertEqual(history.restore(), 2)
+        self.assertEqual(history.to_list(), [user("other"), user("more")])
+        history._store.close()
+
+        store.delete("s1")
+        self.assertEqual(ChatHistory(store=store, session_id="s1").restore(), 0)
+        store.close()
+
+    def test_session_from_env(self):
+        env = {
+            "SESSION_CHAT_HISTORY_SIZE": "1",
+            "SESSION_CHAT_HISTORY_MAX_TOKENS": "",
+            "SESSION_CHAT_HISTORY_DB_PATH": self.db_path,
+        }
+        with mock.patch.dict(os.environ, env):
+            session = Session(**SessionCtx("c1").__dict__)
+            self.assertEqual(session.chat_history.size, 1)
+            self.assertIsNone(session.chat_history.max_tokens)
+            for i in range(3):
+                session.chat_history.append(user(f"q{i}"))
+                session.chat_history.append(assistant(f"a{i}"))
+
+            # the session of the same client resumes after a restart
+            session = Session(**SessionCtx("c0").__dict__)
+            self.assertEqual(len(session.chat_history), 0)
+            session.set_client_id("c1")
+            self.assertEqual([m["content"] for m in session.chat_history], ["q2", "a2"])
+            session.chat_history._store.close()
+
+        session = Session(**SessionCtx("c2").__dict__)
+        self.assertEqual(session.chat_history.size, 10)
+        self.assertEqual(session.chat_history.max_tokens, 10240)
@@ -0,0 +1,132 @@
+import time
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from src.common.utils.frame_convert import VideoFrameConverter, get_target_size
+from src.common.utils.img_utils import nv12_to_rgb, resize_plane, yuv_to_rgb
+
+r"""
+python -m unittest test.common.test_frame_convert.TestFrameConvert
+"""
+
+
+def bench_ms(fn, n=10) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) * 1000 / n
+
+
+class TestFrameConvert(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.width, self.height = 1280, 720
+        self.y = rng.integers(0, 256, (self.height, self.width), dtype=np.uint8)
+        self.u = rng.integers(0, 256, (self.height // 2, self.width // 2), dtype=np.uint8)
+        self.v = rng.integers(0, 256, (self.height // 2, self.width // 2), dtype=np.uint8)
+
+    def upsampled_rgb(self) -> np.ndarray:
+        u = self.u.repeat(2, axis=0).repeat(2, axis=1)
+        v = self.v.repeat(2, axis=0).repeat(2, axis=1)
+        return yuv_to_rgb(self.y, u, v)
+
+    def test_i420_full_size(self):
+        converter = VideoFrameConverter()
+        rgb = converter.i420_to_rgb(
+            self.y.tobytes(), self.u.tobytes(), self.v.tobytes(), self.width, self.height
+        )
+        self.assertEqual(rgb.shape, (720, 1280, 3))
+        diff = np.abs(rgb.astype(int) - self.upsampled_rgb().astype(int))
+        self.assertLessEqual(diff.max(), 1)
+
+    def test_nv12_nv21_downscale(self):
+        uv = np.stack([self.u, self.v], axis=-1)
+        vu = np.stack([self.v, self.u], axis=-1)
+        converter = VideoFrameConverter(max_side=640)
+        self.assertEqual(converter.out_size(self.width, self.height), (640, 360))
+        rgb = converter.nv12_to_rgb(self.y.tobytes(), uv.tobytes(), self.width, self.height)
+        # each output pixel samples the source pixel at its center
+        expected = self.upsampled_rgb()[1::2, 1::2]
+        self.assertLessEqual(np.abs(rgb.astype(int) - expected.astype(int)).max(), 1)
+
+        rgb21 = VideoFrameConverter(max_side=640).nv21_to_rgb(
+            self.y.tobytes(), vu.tobytes(), self.width, self.height
+        )
+        np.testing.assert_array_equal(rgb21, rgb)
+
+    def test_stride_and_packed(self):
+        # padded rows
+        y_stride, uv_stride = 1344, 672
+        y = np.zeros((self.height, y_stride), dtype=np.uint8)
+        y[:, : self.width] = self.y
+        u = np.zeros((self.height // 2, uv_stride), dtype=np.uint8)
+        u[:, : self.width // 2] = self.u
+        v = np.zeros((self.height // 2, uv_stride), dtype=np.uint8)
+        v[:, : self.width // 2] = self.v
+        converter = VideoFrameConverter()
+        rgb = converter.i420_to_rgb(y, u, v, self.width, self.height, y_stride, uv_stride)
+        self.assertLessEqual(np.abs(rgb.astype(int) - self.upsampled_rgb().astype(int)).max(), 1)
+
+        rgb = self.upsampled_rgb()
+        bgra = np.concatenate([rgb[..., ::-1], np.full((720, 1280, 1), 255, np.uint8)], axis=-1)
+        out = VideoFrameConverter(target_size=(320, 180)).packed_to_rgb(
+            bgra.tobytes(), self.width, self.height, "BGRA"
+        )
+        np.testing.assert_array_equal(out, rgb[2::4, 2::4])
+        self.assertEqual(get_target_size(100, 50, max_side=200), (100, 50))
+
+    def test_reuse_buffers(self):
+        converter = VideoFrameConverter(max_side=640)
+        args = (self.y.tobytes(), self.u.tobytes(), self.v.tobytes(), self.width, self.height)
+        first = converter.i420_to_rgb(*args)
+        self.assertIs(converter.i420_to_rgb(*args), first)
+        # size changed
+        small = converter.i420_to_rgb(
+            self.y[:360, :640].tobytes(),
+            self.u[:180, :320].tobytes(),
+            self.v[:180, :320].tobytes(),
+            640,
+            360,
+        )
+        self.assertEqual(small.shape, (360, 640, 3))
+
+    def test_benchmark_720p(self):
+        y, u, v = self.y.tobytes(), self.u.tobytes(), self.v.tobytes()
+        uv = np.stack([self.u, self.v], axis=-1).tobytes()
+
+        def pil_i420():
+            # agora convert_I420_to_RGB path
+            y_plane = np.frombuffer(y, dtype=np.uint8).reshape(self.height, self.width)
+            u_plane = np.frombuffer(u, dtype=np.uint8).reshape(self.height // 2, self.width // 2)
+            v_plane = np.frombuffer(v, dtype=np.uint8).reshape(self.height // 2, self.width // 2)
+            u_resized = resize_plane(u_plane, (self.height, self.width))
+            v_resized = resize_plane(v_plane, (self.height, self.width))
+            Image.fromarray(yuv_to_rgb(y_plane, u_resized, v_resized)).tobytes()
+
+        def pil_nv12():
+            y_data = np.frombuffer(y, dtype=np.uint8)
+            uv_data = np.frombuffer(uv, dtype=np.uint8)
+            Image.fromarray(nv12_to_rgb(y_data, uv_data, self.width, self.height)).tobytes()
+
+        full = VideoFrameConverter()
+        down = VideoFrameConverter(max_side=640)
+        results = {
+            "img_utils i420 (bilinear chroma) + PIL": bench_ms(pil_i420, 3),
+            "img_utils nv12 + PIL": bench_ms(pil_nv12, 3),
+            "converter i420 720p": bench_ms(
+                lambda: full.i420_to_rgb(y, u, v, self.width, self.height).tobytes()
+            ),
+            "converter nv12 720p": bench_ms(
+                lambda: full.nv12_to_rgb(y, uv, self.width, self.height).tobytes()
+            ),
+            "converter i420 -> 640x360": bench_ms(
+                lambda: down.i420_to_rgb(y, u, v, self.width, self.height).tobytes()
+            ),
+        }
+        for name, ms in results.items():
+            print(f"{name}: {ms:.2f} ms")
+        self.assertLess(results["converter nv12 720p"], results["img_utils nv12 + PIL"])
+        self.assertLess(results["converter i420 -> 640x360"], results["converter i420 720p"])
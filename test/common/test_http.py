@@ -0,0 +1,154 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.common.http import AsyncHTTPRequest, HTTPRequest
+
+r"""
+python -m unittest test.common.test_http.TestAsyncHTTPRequest
+python -m unittest test.common.test_http.TestHTTPRequest
+"""
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # path -> request count
+    requests: dict[str, int] = {}
+
+    def _count(self) -> int:
+        StubHandler.requests[self.path] = StubHandler.requests.get(self.path, 0) + 1
+        return StubHandler.requests[self.path]
+
+    def _reply(self, status: int, data: dict | None = None, headers: dict | None = None):
+        body = json.dumps(data or {}).encode()
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        cn = self._count()
+        if self.path.startswith("/flaky"):
+            # fail twice, then ok
+            if cn <= 2:
+                return self._reply(503)
+            return self._reply(200, {"cn": cn})
+        if self.path.startswith("/retry_after"):
+            if cn == 1:
+                return self._reply(429, headers={"Retry-After": "0.3"})
+            return self._reply(200, {"cn": cn})
+        if self.path.startswith("/slow"):
+            time.sleep(0.5)
+            return self._reply(503)
+        return self._reply(200, {"cn": cn})
+
+    def do_POST(self):
+        self._count()
+        length = int(self.headers.get("Content-Length", 0))
+        data = json.loads(self.rfile.read(length) or b"{}")
+        if self.path.startswith("/flaky"):
+            return self._reply(503)
+        return self._reply(200, data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestAsyncHTTPRequest(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubHandler.requests = {}
+        self.http = AsyncHTTPRequest(max_retries=3, backoff_factor=0.05, timeout_s=5)
+
+    async def asyncTearDown(self):
+        await AsyncHTTPRequest.aclose()
+
+    async def test_get_retry_status(self):
+        res = await self.http.get(f"{self.base_url}/flaky")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["cn"], 3)
+
+    async def test_post_not_retried(self):
+        res = await self.http.post(f"{self.base_url}/flaky", json={"q": 1})
+        self.assertEqual(res.status_code, 503)
+        self.assertEqual(StubHandler.requests["/flaky"], 1)
+        with self.assertRaises(Exception):
+            res.raise_for_status()
+
+        res = await self.http.post(f"{self.base_url}/echo", json={"q": 1})
+        self.assertEqual(res.json(), {"q": 1})
+
+    async def test_retry_after(self):
+        start = time.monotonic()
+        res = await self.http.get(f"{self.base_url}/retry_after")
+        self.assertEqual(res.status_code, 200)
+        self.assertGreaterEqual(time.monotonic() - start, 0.3)
+
+    async def test_deadline(self):
+        start = time.monotonic()
+        # the deadline covers all retries, the last 503 response is returned
+        res = await self.http.get(f"{self.base_url}/slow", timeout_s=0.8)
+        self.assertLess(time.monotonic() - start, 1.5)
+        self.assertEqual(res.status_code, 503)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.http.get(f"{self.base_url}/slow", timeout_s=0.2)
+
+    async def test_shared_session(self):
+        other = AsyncHTTPRequest()
+        self.assertIs(self.http.get_session(), other.get_session())
+        results = await asyncio.gather(
+            *[self.http.get(f"{self.base_url}/ok/{i}") for i in range(10)]
+        )
+        self.assertTrue(all(res.ok for res in results))
+
+
+class TestHTTPRequest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubHandler.requests = {}
+
+    def test_sync_and_async(self):
+        http = HTTPRequest(max_retries=3, backoff_factor=0.05)
+        res = http.get(f"{self.base_url}/flaky")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["cn"], 3)
+
+        async def arun():
+            try:
+                return await http.aget(f"{self.base_url}/ok")
+            finally:
+                await AsyncHTTPRequest.aclose()
+
+        res = asyncio.run(arun())
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["cn"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import math
+import struct
+import unittest
+
+r"""
+pip install achatbot[opus] # need libopus
+python -m unittest test.common.test_opus.TestOpus
+"""
+
+
+class TestOpus(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from src.common.utils.opus import OpusDecoder, OpusEncoder
+
+        cls.encoder = OpusEncoder(16000, 1, frame_ms=20, bitrate=24000)
+        cls.decoder = OpusDecoder(16000, 1, frame_ms=20)
+
+    def test_encode_decode(self):
+        # 1s 440hz tone
+        pcm = b"".join(
+            struct.pack("<h", int(8000 * math.sin(2 * math.pi * 440 * i / 16000)))
+            for i in range(16000)
+        )
+        # tts chunks are not aligned to the opus frames
+        packets = []
+        for i in range(0, len(pcm), 3000):
+            packets += self.encoder.encode(pcm[i : i + 3000])
+        packets += self.encoder.flush()
+        self.assertEqual(len(packets), 50)
+        # ~10x smaller than 16-bit pcm
+        self.assertLess(sum(len(p) for p in packets), len(pcm) / 8)
+
+        pcm_out = b"".join(self.decoder.decode(p) for p in packets)
+        self.assertEqual(len(pcm_out), len(pcm))
+
+    def test_packet_loss(self):
+        packets = self.encoder.encode(b"\x01\x00" * 320 * 3)
+        self.assertEqual(len(self.decoder.decode(packets[0])), 640)
+        # lost packets[1]
+        self.assertEqual(len(self.decoder.decode_lost(packets[2])), 640)
+        self.assertEqual(len(self.decoder.decode(packets[2])), 640)
+        self.assertEqual(len(self.decoder.decode(b"")), 640)
+        self.assertEqual(self.decoder.concealed_cn, 2)
+
+        self.encoder.encode(b"\x00" * 100)
+        self.encoder.clear()
+        self.assertEqual(self.encoder.flush(), [])
@@ -0,0 +1,51 @@
+import asyncio
+import time
+import unittest
+
+from src.common.utils.pacer import AsyncMediaPacer
+
+r"""
+python -m unittest test.common.test_pacer.TestAsyncMediaPacer
+"""
+
+
+class TestAsyncMediaPacer(unittest.IsolatedAsyncioTestCase):
+    async def test_lead_and_real_time(self):
+        pacer = AsyncMediaPacer(lead_s=0.1)
+        sent = []
+        start = time.monotonic()
+        # 0.5s tts audio produced at once, 20ms chunks
+        for _ in range(25):
+            await pacer.pace(0.02)
+            sent.append(time.monotonic() - start)
+        # the lead is sent as a burst, then real time
+        self.assertLess(sent[5], 0.01)
+        self.assertAlmostEqual(sent[-1], 0.5 - 0.02 - 0.1, delta=0.03)
+        self.assertAlmostEqual(pacer.buffered_s, 0.1, delta=0.03)
+
+    async def test_no_drift(self):
+        pacer = AsyncMediaPacer(lead_s=0)
+        start = time.monotonic()
+        for _ in range(100):
+            await pacer.pace(0.005)
+        # sleep overshoots don't accumulate
+        self.assertAlmostEqual(time.monotonic() - start, 0.495, delta=0.03)
+
+    async def test_underrun_and_reset(self):
+        pacer = AsyncMediaPacer(lead_s=0.05)
+        for _ in range(10):
+            await pacer.pace(0.02)
+        # slow tts, the client played everything
+        await asyncio.sleep(0.25)
+        self.assertEqual(pacer.buffered_s, 0.0)
+        start = time.monotonic()
+        await pacer.pace(0.02)
+        await pacer.pace(0.02)
+        self.assertLess(time.monotonic() - start, 0.01)
+
+        # interruption
+        pacer.reset()
+        self.assertEqual(pacer.buffered_s, 0.0)
+        start = time.monotonic()
+        await pacer.pace(0.02)
+        self.assertLess(time.monotonic() - start, 0.01)
@@ -0,0 +1,123 @@
+import asyncio
+import unittest
+
+import httpx
+from aiohttp import web
+
+from src.common.provider_pool import ProviderClientPool
+
+r"""
+python -m unittest test.common.test_provider_pool.TestProviderClientPool
+"""
+
+
+class TestProviderClientPool(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.fail_times = 0
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.files = []
+
+        async def handle_flaky(request: web.Request):
+            self.requests += 1
+            if self.requests <= self.fail_times:
+                return web.Response(status=503)
+            return web.json_response({"ok": True})
+
+        async def handle_slow(request: web.Request):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.05)
+            self.in_flight -= 1
+            return web.json_response({"ok": True})
+
+        async def handle_transcriptions(request: web.Request):
+            data = await request.post()
+            self.files.append(data["file"].file.read())
+            return web.json_response(
+                {"text": "hello", "language": "english", "segments": [], "duration": 1.0}
+            )
+
+        app = web.Application()
+        app.router.add_get("/flaky", handle_flaky)
+        app.router.add_post("/flaky", handle_flaky)
+        app.router.add_get("/slow", handle_slow)
+        app.router.add_post("/openai/v1/audio/transcriptions", handle_transcriptions)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+
+    async def asyncTearDown(self):
+        await ProviderClientPool.aclose()
+        await self.runner.cleanup()
+
+    async def test_shared_client(self):
+        client = ProviderClientPool.get_http_client("test", self.base_url)
+        self.assertIs(client, ProviderClientPool.get_http_client("test", self.base_url))
+
+    async def test_retry_idempotent(self):
+        self.fail_times = 2
+        client = ProviderClientPool.get_http_client("test", self.base_url)
+
+        async def call():
+            res = await client.get(f"{self.base_url}/flaky")
+            res.raise_for_status()
+            return res.json()
+
+        res = await ProviderClientPool.request(
+            "test", call, idempotent=True, max_retries=2, backoff_factor_s=0.01
+        )
+        self.assertEqual(res, {"ok": True})
+        self.assertEqual(self.requests, 3)
+
+    async def test_no_retry_non_idempotent(self):
+        self.fail_times = 1
+        client = ProviderClientPool.get_http_client("test", self.base_url)
+
+        async def call():
+            res = await client.post(f"{self.base_url}/flaky")
+            res.raise_for_status()
+            return res.json()
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            await ProviderClientPool.request("test", call, max_retries=2)
+        self.assertEqual(self.requests, 1)
+
+    async def test_in_flight_limit(self):
+        client = ProviderClientPool.get_http_client("test_limit", self.base_url)
+
+        async def call():
+            res = await client.get(f"{self.base_url}/slow")
+            return res.json()
+
+        await asyncio.gather(
+            *[
+                ProviderClientPool.request("test_limit", call, api_key="key", max_in_flight=2)
+                for _ in range(6)
+            ]
+        )
+        self.assertEqual(self.max_in_flight, 2)
+        stats = ProviderClientPool.latency_stats()["test_limit"]
+        print(stats)
+        self.assertEqual(stats["count"], 6)
+        self.assertGreaterEqual(stats["p50_ms"], 50)
+
+    async def test_groq_asr(self):
+        from src.modules.speech.asr.whisper_groq_asr import WhisperGroqAsr
+        from src.common.session import Session
+        from src.common.types import SessionCtx
+
+        asr = WhisperGroqAsr(
+            api_key="test", base_url=self.base_url, model_name_or_path="whisper-large-v3"
+        )
+        session = Session(**SessionCtx("test_client_id").__dict__)
+        asr.set_audio_data(b"\x00\x00" * 1600)
+        res = await asr.transcribe(session)
+        self.assertEqual(res["text"], "hello")
+        # in memory wav encoding
+        self.assertEqual(self.files[0][:4], b"RIFF")
+        self.assertIs(asr.client, WhisperGroqAsr(api_key="test", base_url=self.base_url).client)
@@ -0,0 +1,106 @@
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+from src.common.utils.send_queue import BoundedSendQueue
+
+r"""
+python -m unittest test.common.test_send_queue.TestBoundedSendQueue
+"""
+
+
+class SlowClient:
+    def __init__(self, delay_s: float = 0.0):
+        self.delay_s = delay_s
+        self.received = []
+        self.blocked = asyncio.Event()
+        self.blocked.set()
+
+    async def send(self, payload):
+        await self.blocked.wait()
+        await asyncio.sleep(self.delay_s)
+        self.received.append(payload)
+
+
+class TestBoundedSendQueue(unittest.IsolatedAsyncioTestCase):
+    async def test_send_in_order(self):
+        client = SlowClient()
+        queue = BoundedSendQueue(client.send)
+        for i in range(10):
+            queue.put(b"%d" % i, "audio")
+        queue.put("text", "control")
+        await queue.stop()
+        self.assertEqual(client.received, [b"%d" % i for i in range(10)] + ["text"])
+        self.assertFalse(queue.stats()["slow"])
+
+    async def test_put_not_wait_slow_client(self):
+        client = SlowClient(delay_s=0.1)
+        queue = BoundedSendQueue(client.send, high_water_bytes=1000, max_bytes=2000)
+        start = time.monotonic()
+        for _ in range(100):
+            queue.put(b"\x00" * 100, "audio")
+        # the pipeline doesn't wait for the client network
+        self.assertLess(time.monotonic() - start, 0.05)
+        self.assertTrue(queue.slow)
+        self.assertLessEqual(queue.queued_bytes, 2000)
+        await queue.cancel()
+
+    async def test_drop_policy(self):
+        client = SlowClient()
+        client.blocked.clear()
+        slow_events = []
+
+        async def on_slow(slow, stats):
+            slow_events.append((slow, stats))
+
+        queue = BoundedSendQueue(
+            client.send,
+            high_water_bytes=1000,
+            max_bytes=1500,
+            audio_horizon_s=1.0,
+            on_slow=on_slow,
+        )
+        now = time.monotonic()
+        with mock.patch("src.common.utils.send_queue.time.monotonic", return_value=now - 2):
+            # stale audio
+            queue.put(b"a" * 300, "audio")
+        queue.put(b"m" * 100, "metrics")
+        queue.put(b"v" * 300, "video")
+        queue.put(b"c" * 100, "control")
+        queue.put(b"n" * 300, "audio")
+        self.assertEqual(queue.queued_bytes, 1100 - 400)
+        # video/metrics dropped first, the queue is under the high water mark
+        self.assertEqual(queue.stats()["dropped"], {"metrics": 1, "video": 1})
+
+        queue.put(b"n" * 400, "audio")
+        # then the audio older than the horizon
+        self.assertEqual(queue.stats()["dropped"], {"metrics": 1, "video": 1, "audio": 1})
+        self.assertEqual(queue.queued_bytes, 800)
+
+        # over max bytes: the oldest audio, not the control
+        queue.put(b"c" * 100, "control")
+        queue.put(b"n" * 800, "audio")
+        self.assertEqual(queue.queued_bytes, 1400)
+        self.assertEqual(queue.stats()["dropped"]["audio"], 2)
+
+        client.blocked.set()
+        await queue.stop()
+        self.assertNotIn(b"a" * 300, client.received)
+        self.assertEqual(client.received.count(b"c" * 100), 2)
+        self.assertEqual([slow for slow, _ in slow_events], [True, False])
+        self.assertEqual(slow_events[0][1]["slow_count"], 1)
+
+    async def test_clear_audio(self):
+        client = SlowClient()
+        client.blocked.clear()
+        queue = BoundedSendQueue(client.send)
+        queue.put(b"a", "audio")
+        queue.put(b"a", "audio")
+        queue.put(b"c", "control")
+        await asyncio.sleep(0)
+        queue.clear("audio")
+        client.blocked.set()
+        await queue.stop()
+        # the first audio was sending
+        self.assertEqual(client.received, [b"a", b"c"])
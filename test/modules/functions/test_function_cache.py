@@ -0,0 +1,129 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.common.http import AsyncHTTPRequest
+from src.common.utils.ttl_cache import TTLCache
+from src.modules.functions.search.serper_api import SerperApi
+from src.modules.functions.weather.openweathermap import OpenWeatherMap
+
+r"""
+python -m unittest test.modules.functions.test_function_cache.TestFunctionCache
+"""
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    requests = 0
+    delay_s = 0.2
+    fail = False
+
+    def _reply(self, data: dict):
+        StubHandler.requests += 1
+        time.sleep(StubHandler.delay_s)
+        if StubHandler.fail:
+            self.send_response(400)
+            self.end_headers()
+            return
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply({"organic": [{"snippet": "stub search result"}]})
+
+    def do_GET(self):
+        self._reply({"weather": [{"main": "Clear"}]})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestFunctionCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def setUp(self):
+        StubHandler.requests = 0
+        StubHandler.fail = False
+        self.search = SerperApi()
+        self.search.BASE_URL = f"{self.base_url}/search"
+        self.weather = OpenWeatherMap(cache_ttl_s=0.5)
+        self.weather.BASE_URL = f"{self.base_url}/weather"
+
+    def test_normalized_args_hit(self):
+        res = self.search.execute(None, query="weather in Beijing")
+        self.assertEqual(json.loads(res), ["stub search result"])
+        self.assertEqual(self.search.execute(None, query="  Weather in  beijing "), res)
+        self.assertEqual(StubHandler.requests, 1)
+        stats = self.search.cache.stats
+        print(stats)
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["hit_ratio"], 0.5)
+        self.assertEqual(stats["upstream_latency"]["count"], 1)
+        self.assertIn(self.search.cache.name, TTLCache.all_stats())
+
+    def test_ttl(self):
+        self.weather.execute(None, longitude=116.4074, latitude=39.9042)
+        self.weather.execute(None, longitude=116.4071, latitude=39.9039)
+        self.assertEqual(StubHandler.requests, 1)
+        time.sleep(0.6)
+        self.weather.execute(None, longitude=116.4074, latitude=39.9042)
+        self.assertEqual(StubHandler.requests, 2)
+
+    def test_error_not_cached(self):
+        StubHandler.fail = True
+        res = self.search.execute(None, query="error")
+        self.assertIn("error", json.loads(res))
+        self.search.execute(None, query="error")
+        self.assertEqual(StubHandler.requests, 2)
+
+    def test_single_flight_threads(self):
+        with ThreadPoolExecutor(8) as executor:
+            results = list(
+                executor.map(lambda _: self.search.execute(None, query="coalesce"), range(8))
+            )
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(StubHandler.requests, 1)
+        self.assertEqual(self.search.cache.stats["coalesced"] + self.search.cache.stats["hits"], 7)
+
+    def test_single_flight_async(self):
+        async def run():
+            try:
+                return await asyncio.gather(
+                    *[
+                        self.weather.aexecute(None, longitude=121.47, latitude=31.23)
+                        for _ in range(8)
+                    ]
+                )
+            finally:
+                await AsyncHTTPRequest.aclose()
+
+        results = asyncio.run(run())
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(StubHandler.requests, 1)
+        self.assertEqual(self.weather.cache.stats["coalesced"], 7)
+
+    def test_lru_bound(self):
+        cache = TTLCache("test_lru", ttl_s=60, max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get("b"), (False, None))
+        self.assertEqual(cache.get("a"), (True, 1))
+        self.assertEqual(cache.stats["size"], 2)
@@ -0,0 +1,139 @@
+import unittest
+from unittest import mock
+
+from src.modules.speech.asr.language_tracker import ASRLanguageTracker
+
+r"""
+python -m unittest test.modules.speech.asr.test_language_tracker.TestASRLanguageTracker
+"""
+
+
+class TestASRLanguageTracker(unittest.TestCase):
+    def setUp(self):
+        self.tracker = ASRLanguageTracker(
+            detect_utterances=2,
+            confidence_decay=0.5,
+            min_confidence=0.3,
+        )
+        self.session_id = "test_client_id"
+
+    def test_detect_then_cache(self):
+        self.assertIsNone(self.tracker.get_language(self.session_id))
+        self.tracker.update(self.session_id, "en", 0.9)
+        # still detect on the first n utterances
+        self.assertIsNone(self.tracker.get_language(self.session_id))
+        self.tracker.update(self.session_id, "en", 0.95)
+        self.assertEqual(self.tracker.get_language(self.session_id), "en")
+
+    def test_confidence_decay(self):
+        self.tracker.update(self.session_id, "zh", 1.0)
+        self.tracker.update(self.session_id, "zh", 1.0)
+        self.assertEqual(self.tracker.get_language(self.session_id), "zh")  # 1.0 -> 0.5
+        self.assertEqual(self.tracker.get_language(self.session_id), "zh")  # 0.5 -> 0.25
+        # decayed below min confidence, re-detect
+        self.assertIsNone(self.tracker.get_language(self.session_id))
+        self.tracker.update(self.session_id, "zh", 0.9)
+        self.assertEqual(self.tracker.get_language(self.session_id), "zh")
+
+    def test_switch_language(self):
+        self.tracker.update(self.session_id, "zh", 0.6)
+        self.tracker.update(self.session_id, "en", 0.4)
+        self.assertEqual(self.tracker.get_state(self.session_id).language, "zh")
+        self.tracker.update(self.session_id, "en", 0.9)
+        self.assertEqual(self.tracker.get_state(self.session_id).language, "en")
+
+    def test_default_probability(self):
+        self.tracker.update(self.session_id, "en", None)
+        self.tracker.update(self.session_id, "en", "en")
+        state = self.tracker.get_state(self.session_id)
+        self.assertEqual(state.confidence, self.tracker.args.default_probability)
+
+    def test_set_language(self):
+        self.tracker.set_language(self.session_id, "ja")
+        for _ in range(10):
+            self.assertEqual(self.tracker.get_language(self.session_id), "ja")
+        self.tracker.update(self.session_id, "en", 1.0)
+        self.assertEqual(self.tracker.get_language(self.session_id), "ja")
+
+        self.tracker.set_language(self.session_id, None)
+        self.assertIsNone(self.tracker.get_language(self.session_id))
+
+    def test_sessions(self):
+        self.tracker.set_language("a", "en")
+        self.tracker.set_language("b", "zh")
+        self.assertEqual(self.tracker.get_language("a"), "en")
+        self.assertEqual(self.tracker.get_language("b"), "zh")
+        self.tracker.reset("a")
+        self.assertIsNone(self.tracker.get_language("a"))
+
+    def test_route(self):
+        self.assertIsNone(self.tracker.route("en"))
+        tracker = ASRLanguageTracker(model_routes={"en": {"tag": ""}})
+        self.assertIsNone(tracker.route("en"))
+        self.assertIsNone(tracker.route("zh"))
+
+    def test_route_engines_per_tracker(self):
+        routes = {"en": {"tag": "mock_asr", "args": {"model_name_or_path": "en"}}}
+        with mock.patch(
+            "src.modules.speech.asr.ASREnvInit.getEngine", side_effect=lambda tag, **args: object()
+        ):
+            tracker_a = ASRLanguageTracker(model_routes=routes)
+            tracker_b = ASRLanguageTracker(model_routes=routes)
+            self.assertIs(tracker_a.route("en"), tracker_a.route("en"))
+            self.assertIsNot(tracker_a.route("en"), tracker_b.route("en"))
+
+    def test_clear(self):
+        self.tracker.set_language("a", "en")
+        self.tracker.update("b", "zh", 0.9)
+        self.tracker.clear()
+        self.assertEqual(self.tracker._states, {})
+
+
+class FakeAsr:
+    AUTO_LANGUAGE = "auto"
+    SELECTED_TAG = "fake_asr"
+
+    def __init__(self, languages: dict[bytes, str]):
+        self._languages = languages
+        self._args = {"language": "auto"}
+        self._audio = b""
+
+    def set_args(self, **args):
+        self._args.update(args)
+
+    def get_args_dict(self):
+        return self._args
+
+    def set_audio_data(self, audio):
+        self._audio = audio
+
+    async def transcribe(self, session):
+        return {"text": "hi", "language": self._languages[self._audio], "language_probability": 1.0}
+
+    async def transcribe_stream(self, session):
+        yield "hi"
+
+
+class TestASRProcessorLanguage(unittest.IsolatedAsyncioTestCase):
+    async def test_participant_languages(self):
+        from apipeline.frames.control_frames import EndFrame
+
+        from src.processors.speech.asr.asr_processor import ASRProcessor
+
+        tracker = ASRLanguageTracker(detect_utterances=1)
+        processor = ASRProcessor(asr=FakeAsr({b"a": "en", b"b": "zh"}), language_tracker=tracker)
+        for user_id, audio, language in (("a", b"a", "en"), ("b", b"b", "zh")):
+            processor._segment_user_id = user_id
+            _, detected = await processor._transcribe(audio)
+            self.assertEqual(detected, language)
+        self.assertEqual(tracker.get_language(":a"), "en")
+        self.assertEqual(tracker.get_language(":b"), "zh")
+
+        # participant left, the segment buffer and language are dropped
+        processor._get_segment("b")
+        await processor.remove_user("b")
+        self.assertNotIn("b", processor._segments)
+        self.assertNotIn(":b", tracker._states)
+
+        await processor.stop(EndFrame())
+        self.assertEqual(tracker._states, {})
@@ -18,12 +18,18 @@ ASR_LANG=zn MODEL_NAME_OR_PATH=./models/FunAudioLLM/SenseVoiceSmall ASR_VERBOSE=
 ASR_LANG=zn MODEL_NAME_OR_PATH=./models/FunAudioLLM/SenseVoiceSmall ASR_VERBOSE=True ASR_TAG=sense_voice_asr python -m unittest test.modules.speech.asr.test_whisper_asr.TestWhisperASR.test_transcribe_stream
 
 ASR_LANG=zh MODEL_NAME_OR_PATH=whisper-large-v3 ASR_TAG=whisper_groq_asr python -m unittest test.modules.speech.asr.test_whisper_asr.TestWhisperASR.test_transcribe
+
+MODEL_NAME_OR_PATH=./models/Systran/faster-whisper-base ASR_TAG=whisper_faster_asr python -m unittest test.modules.speech.asr.test_whisper_asr.TestWhisperASR.test_latency_profiles_rtf
+ASR_TAG=whisper_asr python -m unittest test.modules.speech.asr.test_whisper_asr.TestWhisperASR.test_latency_profiles_rtf
 """
 
 import logging
 import unittest
 import os
 import asyncio
+import glob
+import time
+import wave
 
 
 from src.common.logger import Logger
@@ -33,6 +39,7 @@ from src.common.factory import EngineFactory, EngineClass
 from src.common.session import Session
 from src.common.interface import IAsr
 from src.common.types import SessionCtx, TEST_DIR, MODELS_DIR, RECORDS_DIR
+from src.types.speech.asr.base import ASR_LATENCY_PROFILES
 import src.modules.speech.asr.whisper_asr
 import src.modules.speech.asr.whisper_groq_asr
 import src.modules.speech.asr.sense_voice_asr
@@ -115,6 +122,44 @@ class TestWhisperASR(unittest.TestCase):
         res = asyncio.run(self.asr.transcribe(self.session))
         print(res)
 
+    def test_latency_profiles_rtf(self):
+        """
+        realtime factor (transcribe time / audio duration) for each asr latency profile
+        over test/audio_files
+        """
+        audio_files = sorted(glob.glob(os.path.join(TEST_DIR, "audio_files/*.wav")))
+        origin_args = dict(self.asr.get_args_dict())
+        for profile in ASR_LATENCY_PROFILES:
+            self.asr.set_args(**origin_args)
+            profile_args = self.asr.get_latency_profile_args(profile)
+            self.asr.set_args(**profile_args)
+
+            total_audio_s = 0.0
+            total_elapsed_s = 0.0
+            for audio_file in audio_files:
+                with wave.open(audio_file, "rb") as wf:
+                    audio_s = wf.getnframes() / wf.getframerate()
+                self.asr.set_audio_data(audio_file)
+                start = time.perf_counter()
+                text = ""
+
+                async def run():
+                    nonlocal text
+                    async for segment in self.asr.transcribe_stream(self.session):
+                        text += segment
+
+                asyncio.run(run())
+                elapsed_s = time.perf_counter() - start
+                total_audio_s += audio_s
+                total_elapsed_s += elapsed_s
+                print(
+                    f"{profile} {os.path.basename(audio_file)} audio: {audio_s:.2f}s"
+                    f" elapsed: {elapsed_s:.2f}s RTF: {elapsed_s / audio_s:.3f} text: {text}"
+                )
+            rtf = total_elapsed_s / total_audio_s
+            print(f"{self.asr_tag} profile: {profile} args: {profile_args} RTF: {rtf:.3f}")
+            self.assertGreater(total_audio_s, 0)
+
     def test_transcribe_segments(self):
         from sentence_transformers import SentenceTransformer, util
 
@@ -0,0 +1,102 @@
+import os
+import unittest
+import wave
+
+import numpy as np
+
+from src.common.session import Session
+from src.common.types import SessionCtx, TEST_DIR
+from src.modules.speech.hallucination.asr_filter import ASRHallucinationFilter
+from src.modules.speech.hallucination.segment_gate import SpeechSegmentGate
+
+r"""
+python -m unittest test.modules.speech.hallucination.test_hallucination.TestSpeechSegmentGate
+python -m unittest test.modules.speech.hallucination.test_hallucination.TestASRHallucinationFilter
+"""
+
+
+class TestSpeechSegmentGate(unittest.TestCase):
+    def setUp(self):
+        self.gate = SpeechSegmentGate()
+        audio_file = os.path.join(TEST_DIR, "audio_files/asr_example_zh.wav")
+        with wave.open(audio_file, "rb") as wf:
+            self.speech = wf.readframes(wf.getnframes())
+
+    def test_speech(self):
+        res = self.gate.analyze(self.speech)
+        print(res)
+        self.assertTrue(self.gate.is_speech(self.speech))
+
+    def test_silence(self):
+        silence = np.zeros(16000, dtype=np.int16).tobytes()
+        self.assertFalse(self.gate.is_speech(silence))
+
+    def test_noise(self):
+        rng = np.random.default_rng(0)
+        noise = (rng.standard_normal(16000) * 3000).astype(np.int16).tobytes()
+        res = self.gate.analyze(noise)
+        print(res)
+        self.assertFalse(self.gate.is_speech(noise))
+
+    def test_click(self):
+        click = np.zeros(16000, dtype=np.int16)
+        click[8000:8080] = 20000
+        self.assertFalse(self.gate.is_speech(click.tobytes()))
+
+    def test_stats(self):
+        silence = np.zeros(16000, dtype=np.int16).tobytes()
+        self.gate.is_speech(silence)
+        self.gate.is_speech(self.speech)
+        self.gate.update_asr_rtf(1.0, 0.5)
+        stats = self.gate.stats
+        print(stats)
+        self.assertEqual(stats["segments"], 2)
+        self.assertEqual(stats["dropped_segments"], 1)
+        self.assertAlmostEqual(stats["dropped_audio_secs"], 1.0)
+        self.assertAlmostEqual(stats["saved_asr_secs"], 0.5)
+
+
+class TestASRHallucinationFilter(unittest.TestCase):
+    def setUp(self):
+        self.filter = ASRHallucinationFilter()
+        self.session = Session(**SessionCtx("test_client_id").__dict__)
+
+    def test_segments(self):
+        self.session.ctx.state["transcribe_res"] = {
+            "text": "hello world. thank you for watching",
+            "segments": [
+                {
+                    "text": " hello world.",
+                    "avg_logprob": -0.2,
+                    "compression_ratio": 1.1,
+                    "no_speech_prob": 0.01,
+                },
+                {
+                    "text": " la la la la la la la la la la la la la",
+                    "avg_logprob": -0.3,
+                    "compression_ratio": 4.2,
+                    "no_speech_prob": 0.1,
+                },
+                {
+                    "text": " what?",
+                    "avg_logprob": -1.5,
+                    "compression_ratio": 1.0,
+                    "no_speech_prob": 0.9,
+                },
+                {"text": " Thank you for watching!"},
+            ],
+        }
+        self.assertTrue(self.filter.check(self.session))
+        self.assertEqual(self.filter.filter(self.session), "hello world.")
+        self.assertEqual(self.filter.stats["dropped_segments"], 3)
+
+    def test_text(self):
+        self.session.ctx.state["transcribe_res"] = {"text": "今天天气怎么样"}
+        self.assertFalse(self.filter.check(self.session))
+
+        self.session.ctx.state["transcribe_res"] = {"text": "好的" * 30}
+        self.assertTrue(self.filter.check(self.session))
+        self.assertEqual(self.filter.filter(self.session), "")
+
+        self.session.ctx.state["transcribe_res"] = {"text": " 。"}
+        self.assertTrue(self.filter.check(self.session))
@@ -0,0 +1,49 @@
+import unittest
+
+import numpy as np
+
+from src.common.types import VADState
+from src.modules.speech.vad_analyzer.base import BaseVADAnalyzer
+
+r"""
+python -m unittest test.modules.speech.vad_analyzer.test_vad_analyzer.TestVADAnalyzer
+"""
+
+
+class LoudVADAnalyzer(BaseVADAnalyzer):
+    TAG = "test_loud_vad_analyzer"
+
+    def __init__(self, **args):
+        super().__init__(**args)
+        self.num_analyzed = 0
+
+    def voice_confidence(self, buffer) -> float:
+        self.num_analyzed += 1
+        return float(np.abs(np.frombuffer(buffer, dtype=np.int16)).mean() > 1000)
+
+
+def audio(value: int, ms: int) -> bytes:
+    return np.full(16 * ms, value, dtype=np.int16).tobytes()
+
+
+class TestVADAnalyzer(unittest.TestCase):
+    def test_batched_read(self):
+        analyzer = LoudVADAnalyzer(sample_rate=16000, start_secs=0.05, stop_secs=0.1, min_volume=0)
+        # 200ms batch read: all the 10ms vad frames are analyzed
+        self.assertEqual(analyzer.analyze_audio(audio(8000, 200)), VADState.SPEAKING)
+        self.assertEqual(analyzer.num_analyzed, 20)
+        self.assertEqual(analyzer._vad_buffer, b"")
+
+        # the not whole vad frame waits
+        self.assertEqual(analyzer.analyze_audio(audio(0, 55)), VADState.STOPPING)
+        self.assertEqual(analyzer.num_analyzed, 25)
+        self.assertEqual(analyzer.analyze_audio(audio(0, 55)), VADState.QUIET)
+        self.assertEqual(analyzer.num_analyzed, 31)
+
+    def test_clone(self):
+        analyzer = LoudVADAnalyzer(sample_rate=16000, start_secs=0.02, min_volume=0)
+        analyzer.analyze_audio(audio(8000, 30))
+        clone = analyzer.clone()
+        self.assertEqual(analyzer._vad_state, VADState.SPEAKING)
+        self.assertEqual(clone._vad_state, VADState.QUIET)
+        self.assertEqual(clone.sample_rate, 16000)
@@ -0,0 +1,108 @@
+import io
+import os
+import unittest
+
+from PIL import Image
+
+from src.common.types import TEST_DIR
+from src.processors.aggregators.image_attachment_store import ImageAttachmentStore
+from src.processors.aggregators.openai_llm_context import OpenAILLMContext
+from src.types.frames.data_frames import VisionImageRawFrame
+
+r"""
+python -m unittest test.processors.aggregators.test_image_attachment_store.TestImageAttachmentStore
+"""
+
+
+class TestImageAttachmentStore(unittest.TestCase):
+    def setUp(self):
+        image = Image.new("RGB", (1920, 1080), color=(73, 109, 137))
+        self.frame = VisionImageRawFrame(
+            text="what do you see?",
+            image=image.tobytes(),
+            size=image.size,
+            format="PNG",
+            mode=image.mode,
+        )
+        self.store = ImageAttachmentStore(max_side=512, max_image_turns=1)
+
+    def test_encode_once(self):
+        attachment = self.store.add_frame(self.frame)
+        self.assertEqual(max(attachment.size), 512)
+        self.assertEqual(attachment.mime_type, "image/jpeg")
+        self.assertLess(len(attachment.data), len(self.frame.image))
+        # cached by content hash
+        self.assertIs(self.store.add_frame(self.frame), attachment)
+        url = attachment.get_url()
+        self.assertTrue(url.startswith("data:image/jpeg;base64,"))
+        self.assertIs(attachment.get_url(), url)
+
+    def test_webp(self):
+        store = ImageAttachmentStore(format="WEBP", quality=60)
+        attachment = store.add_frame(self.frame)
+        self.assertEqual(attachment.mime_type, "image/webp")
+        self.assertEqual(attachment.size, (1024, 576))
+
+    def test_to_openai_message(self):
+        context = OpenAILLMContext.from_image_frame(self.frame, self.store)
+        message = context.get_messages()[0]
+        request_message = self.store.to_openai_message(message)
+        self.assertEqual(request_message["content"][0]["text"], "what do you see?")
+        self.assertEqual(request_message["content"][1]["type"], "image_url")
+        # context message is not mutated, still usable by other providers (google)
+        self.assertIn("data", message)
+        self.assertEqual(message["content"], "what do you see?")
+
+        text_message = {"role": "user", "content": "hi"}
+        self.assertIs(self.store.to_openai_message(text_message), text_message)
+
+    def test_placeholders(self):
+        context = OpenAILLMContext.from_image_frame(self.frame, self.store)
+        self.assertEqual(self.store.apply_placeholders(context), 0)
+        context.add_message({"role": "assistant", "content": "a blue image"})
+        context.add_message({"role": "user", "content": "what color?"})
+        self.assertEqual(self.store.apply_placeholders(context), 1)
+        message = context.get_messages()[0]
+        self.assertNotIn("data", message)
+        self.assertEqual(message["content"], "[image omitted] what do you see?")
+        self.assertEqual(self.store.apply_placeholders(context), 0)
+
+    def test_raw_image_message(self):
+        with open(os.path.join(TEST_DIR, "img_files/03-Confusing-Pictures.jpg"), "rb") as f:
+            data = f.read()
+        message = {
+            "role": "user",
+            "content": "hi",
+            "data": io.BytesIO(data),
+            "mime_type": "image/jpeg",
+        }
+        request_message = self.store.to_openai_message(message)
+        self.assertTrue(
+            request_message["content"][1]["image_url"]["url"].startswith("data:image/jpeg")
+        )
+
+
+class TestLLMProcessorImages(unittest.IsolatedAsyncioTestCase):
+    async def test_without_store(self):
+        from src.processors.llm.base import LLMProcessor
+
+        image = Image.new("RGB", (64, 64))
+        frame = VisionImageRawFrame(
+            text="what do you see?",
+            image=image.tobytes(),
+            size=image.size,
+            format="PNG",
+            mode=image.mode,
+        )
+        processor = LLMProcessor()
+        context = OpenAILLMContext.from_image_frame(frame)
+        context.add_message({"role": "user", "content": "hi"})
+        context.add_message({"role": "user", "content": "hello"})
+        processor.prepare_context(context)
+        # no placeholders, the image is sent as is
+        message = context.get_messages()[0]
+        self.assertEqual(message["mime_type"], "image/png")
+        request_message = processor.to_openai_message(message)
+        url = request_message["content"][1]["image_url"]["url"]
+        self.assertTrue(url.startswith("data:image/png;base64,"))
+        self.assertIn("data", message)
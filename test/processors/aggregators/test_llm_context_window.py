@@ -0,0 +1,102 @@
+import unittest
+
+from src.processors.aggregators.llm_context_window import (
+    SUMMARY_MESSAGE_NAME,
+    LLMContextWindow,
+)
+from src.processors.aggregators.openai_llm_context import OpenAILLMContext
+
+r"""
+python -m unittest test.processors.aggregators.test_llm_context_window.TestLLMContextWindow
+"""
+
+
+class TestLLMContextWindow(unittest.TestCase):
+    def setUp(self):
+        self.context = OpenAILLMContext(
+            messages=[{"role": "system", "content": "You are a helpful assistant."}]
+        )
+        for i in range(10):
+            self.context.add_message({"role": "user", "content": f"question {i} " * 20})
+            self.context.add_message({"role": "assistant", "content": f"answer {i} " * 20})
+
+    def test_cached_tokens(self):
+        window = LLMContextWindow(max_tokens=0)
+        message = self.context.get_messages()[1]
+        tokens = window.get_message_tokens(message)
+        self.assertGreater(tokens, window.args.per_message_tokens)
+        message["content"] = ""
+        # counted once
+        self.assertEqual(window.get_message_tokens(message), tokens)
+
+        self.assertEqual(window.fit(self.context), 0)
+        self.assertEqual(len(self.context.get_messages()), 21)
+
+    def test_evict(self):
+        window = LLMContextWindow(max_tokens=300, keep_recent_messages=2)
+        evicted = window.fit(self.context)
+        messages = self.context.get_messages()
+        self.assertGreater(evicted, 0)
+        self.assertLessEqual(window.total_tokens, 300)
+        self.assertEqual(messages[0]["role"], "system")
+        self.assertTrue(messages[-1]["content"].startswith("answer 9"))
+        self.assertEqual(len(messages), 21 - evicted)
+
+    def test_keep_recent_messages(self):
+        window = LLMContextWindow(max_tokens=10, keep_recent_messages=4)
+        window.fit(self.context)
+        messages = self.context.get_messages()
+        # over budget, but keep the system prompt and the recent messages
+        self.assertEqual(len(messages), 5)
+        self.assertEqual(messages[0]["role"], "system")
+
+    def test_pin_tool_messages(self):
+        self.context.set_messages(
+            [
+                {"role": "system", "content": "system"},
+                {"role": "user", "content": "weather? " * 50},
+                {
+                    "role": "assistant",
+                    "tool_calls": [
+                        {
+                            "id": "call_1",
+                            "type": "function",
+                            "function": {"name": "get_weather", "arguments": '{"city": "sf"}'},
+                        }
+                    ],
+                },
+                {"role": "tool", "content": "sunny " * 50, "tool_call_id": "call_1"},
+                {"role": "user", "content": "thanks"},
+                {"role": "assistant", "content": "welcome"},
+            ]
+        )
+        window = LLMContextWindow(max_tokens=60, keep_recent_messages=2)
+        window.fit(self.context)
+        roles = [m["role"] for m in self.context.get_messages()]
+        self.assertEqual(roles, ["system", "assistant", "tool", "user", "assistant"])
+
+        # tool_calls message and its tool results are evicted together
+        window = LLMContextWindow(max_tokens=60, keep_recent_messages=2, pin_tool_messages=False)
+        window.fit(self.context)
+        roles = [m["role"] for m in self.context.get_messages()]
+        self.assertEqual(roles, ["system", "user", "assistant"])
+
+    def test_summarize(self):
+        window = LLMContextWindow(
+            max_tokens=400, keep_recent_messages=2, strategy="summarize", summary_max_tokens=64
+        )
+        window.fit(self.context)
+        messages = self.context.get_messages()
+        self.assertEqual(messages[1]["name"], SUMMARY_MESSAGE_NAME)
+        self.assertLessEqual(window.total_tokens, 400)
+
+        # fold the previous summary into the new one
+        for i in range(10, 15):
+            self.context.add_message({"role": "user", "content": f"question {i} " * 20})
+            self.context.add_message({"role": "assistant", "content": f"answer {i} " * 20})
+        window.fit(self.context)
+        messages = self.context.get_messages()
+        summaries = [m for m in messages if m.get("name") == SUMMARY_MESSAGE_NAME]
+        self.assertEqual(len(summaries), 1)
+        self.assertIn("question 13", summaries[0]["content"])
+        self.assertLessEqual(window.total_tokens, 400)
@@ -0,0 +1,159 @@
+import copy
+import hashlib
+import unittest
+from unittest import mock
+
+from openai import NOT_GIVEN
+
+from src.processors.aggregators.llm_context_window import SUMMARY_MESSAGE_NAME
+from src.processors.aggregators.prompt_prefix_cache import CACHE_CONTROL, PromptPrefixCache
+from src.processors.aggregators.openai_llm_context import OpenAILLMContext
+from src.processors.llm.base import LLMProcessor
+from src.processors.llm.openai_llm_processor import OpenAILLMProcessor
+
+r"""
+python -m unittest test.processors.aggregators.test_prompt_prefix_cache.TestPromptPrefixCache
+python -m unittest test.processors.aggregators.test_prompt_prefix_cache.TestPromptCacheUsage
+"""
+
+TOOLS = [
+    {"type": "function", "function": {"name": "get_weather", "parameters": {}}},
+    {"type": "function", "function": {"name": "web_search", "parameters": {}}},
+]
+
+
+def system_prompt() -> dict:
+    return {"role": "system", "content": "You are a helpful voice assistant. " * 50}
+
+
+class TestPromptPrefixCache(unittest.TestCase):
+    def setUp(self):
+        PromptPrefixCache._prefixes.clear()
+
+    def test_shared_prefix(self):
+        cache = PromptPrefixCache()
+        model = "anthropic/claude-3-5-sonnet"
+        # two rooms with the same bot config
+        room_a = [system_prompt(), {"role": "user", "content": "hi"}]
+        room_b = [system_prompt(), {"role": "user", "content": "hello"}]
+        messages_a, tools_a = cache.build(room_a, list(TOOLS), model)
+        messages_b, tools_b = PromptPrefixCache().build(room_b, list(TOOLS), model)
+        self.assertIs(messages_a[0], messages_b[0])
+        self.assertIs(tools_a, tools_b)
+        self.assertEqual(messages_a[1:], [{"role": "user", "content": "hi"}])
+
+        # next turn, found by content, not rebuilt
+        room_a.append({"role": "assistant", "content": "hello"})
+        messages_a, _ = cache.build(room_a, list(TOOLS), model)
+        self.assertEqual(len(messages_a), 3)
+        self.assertEqual(cache.builds, 1)
+        self.assertEqual(len(PromptPrefixCache._prefixes), 1)
+
+    def test_in_place_change(self):
+        cache = PromptPrefixCache(cache_control="on")
+        prompt = system_prompt()
+        tools = list(TOOLS)
+        cache.build([prompt], tools, "gpt-4o")
+        prompt["content"] = "You are a pirate."
+        tools.pop()
+        messages, request_tools = cache.build([prompt], tools, "gpt-4o")
+        self.assertEqual(messages[0]["content"][0]["text"], "You are a pirate.")
+        self.assertEqual(len(request_tools), 1)
+        self.assertEqual(cache.builds, 2)
+
+    def test_key_hashed_on_miss(self):
+        cache = PromptPrefixCache(cache_control="on")
+        prompt = system_prompt()
+        tools = copy.deepcopy(TOOLS)
+        with mock.patch(
+            "src.processors.aggregators.prompt_prefix_cache.hashlib.sha1", wraps=hashlib.sha1
+        ) as sha1:
+            for text in ("hi", "hello", "bye"):
+                cache.build([prompt, {"role": "user", "content": text}], tools, "gpt-4o")
+            self.assertEqual(sha1.call_count, 1)
+
+            # changed deeper in place, the key is hashed again after invalidate
+            tools[0]["function"]["description"] = "weather of the city"
+            cache.invalidate()
+            _, request_tools = cache.build([prompt], tools, "gpt-4o")
+            self.assertEqual(sha1.call_count, 2)
+        self.assertEqual(request_tools[0]["function"]["description"], "weather of the city")
+
+    def test_summary_after_prefix(self):
+        cache = PromptPrefixCache(cache_control="on")
+        prompt = system_prompt()
+        summary = {"role": "system", "name": SUMMARY_MESSAGE_NAME, "content": "summary"}
+        messages, tools = cache.build(
+            [prompt, summary, {"role": "user", "content": "hi"}], None, "gpt-4o"
+        )
+        self.assertIsNone(tools)
+        self.assertEqual(messages[1:], [summary, {"role": "user", "content": "hi"}])
+
+        # a new summary doesn't change the prefix
+        summary = {"role": "system", "name": SUMMARY_MESSAGE_NAME, "content": "summary 2"}
+        cache.build([prompt, summary, {"role": "user", "content": "hi"}], None, "gpt-4o")
+        self.assertEqual(cache.builds, 1)
+
+    def test_cache_control(self):
+        cache = PromptPrefixCache()
+        prompt = system_prompt()
+        messages, tools = cache.build(
+            [prompt, {"role": "user", "content": "hi"}], TOOLS, "anthropic/claude-3-5-sonnet"
+        )
+        self.assertEqual(messages[0]["content"][-1]["cache_control"], CACHE_CONTROL)
+        self.assertEqual(tools[-1]["cache_control"], CACHE_CONTROL)
+        self.assertNotIn("cache_control", tools[0])
+        # the context messages and tools are not changed
+        self.assertIsInstance(prompt["content"], str)
+        self.assertNotIn("cache_control", TOOLS[-1])
+
+        messages, tools = PromptPrefixCache(cache_control="off").build(
+            [prompt], TOOLS, "claude-3-5-sonnet"
+        )
+        self.assertIs(messages[0], prompt)
+        self.assertIs(tools, TOOLS)
+
+        # automatic prefix caching providers, the context messages as is
+        messages, tools = cache.build([prompt, {"role": "user", "content": "hi"}], TOOLS, "gpt-4o")
+        self.assertIs(messages[0], prompt)
+        self.assertIs(tools, TOOLS)
+
+    def test_cached_tokens(self):
+        self.assertEqual(
+            LLMProcessor.get_cached_tokens(
+                {"prompt_tokens": 2000, "prompt_tokens_details": {"cached_tokens": 1920}}
+            ),
+            {"cached_tokens": 1920},
+        )
+        self.assertEqual(
+            LLMProcessor.get_cached_tokens(
+                {"cache_read_input_tokens": 1024, "cache_creation_input_tokens": 0}
+            ),
+            {"cached_tokens": 1024, "cache_creation_tokens": 0},
+        )
+        self.assertEqual(
+            LLMProcessor.get_cached_tokens({"prompt_cache_hit_tokens": 64}), {"cached_tokens": 64}
+        )
+        self.assertEqual(LLMProcessor.get_cached_tokens({"prompt_tokens": 10}), {})
+
+
+class TestPromptCacheUsage(unittest.IsolatedAsyncioTestCase):
+    async def stream_options(self, prompt_cache: PromptPrefixCache | None):
+        processor = OpenAILLMProcessor(model="gpt-4o", api_key="test")
+        processor.set_prompt_cache(prompt_cache)
+        with mock.patch.object(
+            processor._client.chat.completions, "create", new=mock.AsyncMock()
+        ) as create:
+            context = OpenAILLMContext.from_messages([{"role": "user", "content": "hi"}])
+            await processor.get_chat_completions(context, context.get_messages())
+        return create.call_args.kwargs["stream_options"]
+
+    async def test_include_usage(self):
+        # not sent to the openai compatible servers without the prompt cache
+        self.assertIs(await self.stream_options(None), NOT_GIVEN)
+        self.assertEqual(await self.stream_options(PromptPrefixCache()), {"include_usage": True})
+        self.assertIs(await self.stream_options(PromptPrefixCache(include_usage=False)), NOT_GIVEN)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,232 @@
+import asyncio
+import time
+import unittest
+from types import SimpleNamespace
+
+from apipeline.frames.data_frames import Frame
+from apipeline.processors.frame_processor import FrameDirection
+
+from src.common.utils.json_stream import StreamingJSONParser
+from src.processors.aggregators.openai_llm_context import OpenAILLMContext
+from src.processors.llm.base import LLMProcessor
+from src.types.frames.data_frames import FunctionCallResultFrame, TTSSpeakFrame
+from src.types.frames.sys_frames import FunctionCallInProgressFrame
+
+r"""
+python -m unittest test.processors.llm.test_function_calls.TestFunctionCalls
+"""
+
+
+class RecordLLMProcessor(LLMProcessor):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.frames: list[Frame] = []
+
+    async def push_frame(self, frame: Frame, direction: FrameDirection = FrameDirection.DOWNSTREAM):
+        self.frames.append(frame)
+
+
+def tool_call_delta(index, id=None, name=None, arguments=None):
+    return SimpleNamespace(
+        index=index,
+        id=id,
+        function=SimpleNamespace(name=name, arguments=arguments),
+    )
+
+
+class TestFunctionCalls(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.llm = RecordLLMProcessor()
+        self.context = OpenAILLMContext()
+
+        async def slow_weather(function_name, tool_call_id, args, llm, context, result_callback):
+            await asyncio.sleep(0.3)
+            await result_callback({"city": args["city"], "weather": "sunny"})
+
+        async def slow_search(function_name, tool_call_id, args, llm, context, result_callback):
+            await asyncio.sleep(0.3)
+            await result_callback(["result"])
+
+        async def hang(function_name, tool_call_id, args, llm, context, result_callback):
+            await asyncio.sleep(10)
+
+        async def no_result(function_name, tool_call_id, args, llm, context, result_callback):
+            pass
+
+        self.llm.register_function("get_weather", slow_weather)
+        self.llm.register_function("web_search", slow_search)
+        self.llm.register_function("hang", hang)
+        self.llm.register_function("no_result", no_result)
+
+    def test_accumulate_tool_call_deltas(self):
+        function_calls = {}
+        deltas = [
+            [tool_call_delta(0, "call_0", "get_weather", "")],
+            [tool_call_delta(0, arguments='{"city": ')],
+            [tool_call_delta(1, "call_1", "web_search", '{"query": "ai"}')],
+            [tool_call_delta(0, arguments='"Beijing"}')],
+        ]
+        new = []
+        for delta in deltas:
+            new += LLMProcessor.accumulate_tool_call_deltas(function_calls, delta)
+        self.assertEqual(new, [0, 1])
+        self.assertEqual(function_calls[0]["arguments"], '{"city": "Beijing"}')
+        self.assertEqual(function_calls[1]["function_name"], "web_search")
+
+        # no index
+        function_calls = {}
+        LLMProcessor.accumulate_tool_call_deltas(
+            function_calls, [tool_call_delta(None, "a", "get_weather", "{")]
+        )
+        LLMProcessor.accumulate_tool_call_deltas(
+            function_calls, [tool_call_delta(None, None, None, "}")]
+        )
+        LLMProcessor.accumulate_tool_call_deltas(
+            function_calls, [tool_call_delta(None, "b", "web_search", "{}")]
+        )
+        self.assertEqual(function_calls[0]["arguments"], "{}")
+        self.assertEqual(function_calls[1]["tool_call_id"], "b")
+
+    def test_streaming_json_parser(self):
+        text = '{"query": "weather in \\"Paris\\"", "n": 3, "opts": {"a": [1, "}"]}, "ok": true}'
+        parser = StreamingJSONParser()
+        completed = []
+        for i in range(0, len(text), 4):
+            completed += list(parser.feed(text[i : i + 4]))
+        self.assertEqual(completed, ["query", "n", "opts", "ok"])
+        self.assertTrue(parser.done)
+        self.assertEqual(parser.fields["query"], 'weather in "Paris"')
+        self.assertEqual(parser.fields["opts"], {"a": [1, "}"]})
+
+        parser = StreamingJSONParser()
+        self.assertEqual(parser.feed('{"n": 1'), {})
+        self.assertEqual(parser.feed("2}"), {"n": 12})
+        parser = StreamingJSONParser()
+        parser.feed("not json")
+        self.assertIsNotNone(parser.error)
+
+    async def test_early_start(self):
+        started = {}
+
+        async def search(function_name, tool_call_id, args, llm, context, result_callback):
+            started[tool_call_id] = (time.perf_counter(), dict(args))
+            await asyncio.sleep(0.3)
+            await result_callback(["result"])
+
+        self.llm.register_function("search", search, start_fields=["query"])
+        function_calls = {}
+        deltas = [
+            [tool_call_delta(0, "call_0", "search", '{"que')],
+            [tool_call_delta(0, arguments='ry": "ai news", ')],
+            [tool_call_delta(0, arguments='"max_results": 5}')],
+        ]
+        start = time.perf_counter()
+        for i, delta in enumerate(deltas):
+            LLMProcessor.accumulate_tool_call_deltas(function_calls, delta)
+            await self.llm.start_early_function_calls(self.context, function_calls)
+            # the llm streams the remaining arguments
+            await asyncio.sleep(0.1)
+            self.assertEqual("call_0" in started, i >= 1)
+        self.assertEqual(started["call_0"][1], {"query": "ai news"})
+
+        await self.llm.call_functions(self.context, list(function_calls.values()))
+        # the search io overlaps the argument streaming
+        self.assertLess(time.perf_counter() - start, 0.55)
+        results = [f for f in self.llm.frames if isinstance(f, FunctionCallResultFrame)]
+        self.assertEqual(results[0].result, ["result"])
+        self.assertEqual(results[0].arguments, {"query": "ai news", "max_results": 5})
+
+        # cancelled if the llm stream fails
+        function_calls = {}
+        LLMProcessor.accumulate_tool_call_deltas(
+            function_calls, [tool_call_delta(0, "call_1", "search", '{"query": "x"')]
+        )
+        await self.llm.start_early_function_calls(self.context, function_calls)
+        task = function_calls[0]["early_call"].task
+        LLMProcessor.cancel_early_function_calls(function_calls)
+        await asyncio.sleep(0)
+        self.assertTrue(task.cancelled())
+
+    async def test_parallel_calls(self):
+        start = time.perf_counter()
+        await self.llm.call_functions(
+            self.context,
+            [
+                {
+                    "tool_call_id": "1",
+                    "function_name": "get_weather",
+                    "arguments": '{"city": "sf"}',
+                },
+                {"tool_call_id": "2", "function_name": "web_search", "arguments": {"query": "ai"}},
+            ],
+        )
+        self.assertLess(time.perf_counter() - start, 0.5)
+        in_progress = [f for f in self.llm.frames if isinstance(f, FunctionCallInProgressFrame)]
+        results = [f for f in self.llm.frames if isinstance(f, FunctionCallResultFrame)]
+        self.assertEqual(len(in_progress), 2)
+        # in progress frames are pushed before any result
+        self.assertTrue(isinstance(self.llm.frames[1], FunctionCallInProgressFrame))
+        self.assertEqual({r.tool_call_id for r in results}, {"1", "2"})
+
+    async def test_timeout_and_filler(self):
+        self.llm.set_function_call_args(
+            timeout_s=0.2, filler_texts=["Let me check."], filler_delay_s=0.1
+        )
+        await self.llm.call_functions(
+            self.context,
+            [
+                {"tool_call_id": "1", "function_name": "hang", "arguments": ""},
+                {"tool_call_id": "2", "function_name": "no_result", "arguments": ""},
+            ],
+        )
+        fillers = [f for f in self.llm.frames if isinstance(f, TTSSpeakFrame)]
+        self.assertEqual(len(fillers), 1)
+        results = {
+            f.tool_call_id: f.result
+            for f in self.llm.frames
+            if isinstance(f, FunctionCallResultFrame)
+        }
+        self.assertIn("error", results["1"])
+        self.assertIsNone(results["2"])
+
+    async def test_no_filler_for_fast_calls(self):
+        self.llm.set_function_call_args(filler_texts=["Let me check."], filler_delay_s=1)
+        await self.llm.call_functions(
+            self.context, [{"tool_call_id": "1", "function_name": "no_result", "arguments": ""}]
+        )
+        await asyncio.sleep(0.01)
+        self.assertFalse(any(isinstance(f, TTSSpeakFrame) for f in self.llm.frames))
+
+    async def test_assistant_aggregator(self):
+        from src.processors.aggregators.openai_llm_context import (
+            OpenAIAssistantContextAggregator,
+            OpenAIUserContextAggregator,
+        )
+
+        user_aggr = OpenAIUserContextAggregator(self.context)
+        pushed = []
+
+        async def push_context_frame():
+            pushed.append(len(self.context.get_messages()))
+
+        user_aggr.push_context_frame = push_context_frame
+        assistant_aggr = OpenAIAssistantContextAggregator(user_aggr)
+        for i in range(2):
+            await assistant_aggr.process_frame(
+                FunctionCallInProgressFrame(
+                    function_name="get_weather", tool_call_id=str(i), arguments={}
+                ),
+                FrameDirection.DOWNSTREAM,
+            )
+        for i in range(2):
+            await assistant_aggr.process_frame(
+                FunctionCallResultFrame(
+                    function_name="get_weather", tool_call_id=str(i), arguments={}, result="sunny"
+                ),
+                FrameDirection.DOWNSTREAM,
+            )
+        # one assistant tool_calls message, two tool messages, re-prompt once
+        self.assertEqual(pushed, [3])
+        messages = self.context.get_messages()
+        self.assertEqual(len(messages[0]["tool_calls"]), 2)
+        self.assertEqual([m["role"] for m in messages[1:]], ["tool", "tool"])
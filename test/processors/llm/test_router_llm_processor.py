@@ -0,0 +1,178 @@
+import asyncio
+import json
+import time
+import unittest
+
+from aiohttp import web
+from apipeline.frames.data_frames import Frame, TextFrame
+from apipeline.processors.frame_processor import FrameDirection, FrameProcessor
+
+from src.processors.aggregators.openai_llm_context import OpenAILLMContext
+from src.processors.llm.openai_llm_processor import OpenAILLMProcessor
+from src.processors.llm.router_llm_processor import LLMRouterProcessor
+
+r"""
+python -m unittest test.processors.llm.test_router_llm_processor.TestLLMRouterProcessor
+"""
+
+
+class FakeOpenAIServer:
+    """
+    openai compatible /v1/chat/completions stream, with first token delay and error status
+    """
+
+    def __init__(self, name: str, ttft_s: float = 0.0, status: int = 200) -> None:
+        self.name = name
+        self.ttft_s = ttft_s
+        self.status = status
+        self.requests = 0
+        self.request_at: list[float] = []
+        self.cancelled = 0
+        self.runner = None
+        self.base_url = ""
+
+    async def chat_completions(self, request: web.Request):
+        self.requests += 1
+        self.request_at.append(time.monotonic())
+        await request.json()
+        if self.status != 200:
+            return web.json_response({"error": {"message": "unavailable"}}, status=self.status)
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        try:
+            await asyncio.sleep(self.ttft_s)
+            for word in ["hello", " from", f" {self.name}"]:
+                chunk = {
+                    "id": "chatcmpl-test",
+                    "object": "chat.completion.chunk",
+                    "created": 0,
+                    "model": self.name,
+                    "choices": [{"index": 0, "delta": {"content": word}, "finish_reason": None}],
+                }
+                await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                await asyncio.sleep(0.01)
+            await response.write(b"data: [DONE]\n\n")
+        except (asyncio.CancelledError, ConnectionError):
+            # closed by the client, found on the next write
+            self.cancelled += 1
+            raise
+        return response
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.chat_completions)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}/v1"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+class RecordProcessor(FrameProcessor):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.frames: list[Frame] = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        self.frames.append(frame)
+
+
+class TestLLMRouterProcessor(unittest.IsolatedAsyncioTestCase):
+    async def start_router(self, servers: list[FakeOpenAIServer], **router_args):
+        backends = []
+        for server in servers:
+            await server.start()
+            backend = OpenAILLMProcessor(
+                model=server.name, base_url=server.base_url, api_key="test"
+            )
+            # no sdk retries, failover by the router
+            backend._client = backend._client.with_options(max_retries=0)
+            backends.append(backend)
+        self.servers = servers
+        self.router = LLMRouterProcessor(backends=backends, router_args=router_args)
+        self.record = RecordProcessor()
+        self.router.link(self.record)
+
+    async def asyncTearDown(self):
+        for server in self.servers:
+            await server.stop()
+
+    async def run_turn(self) -> str:
+        self.record.frames = []
+        context = OpenAILLMContext.from_messages([{"role": "user", "content": "hi"}])
+        await self.router._process_context(context)
+        return "".join(f.text for f in self.record.frames if isinstance(f, TextFrame))
+
+    async def test_route_to_fastest(self):
+        slow, fast = FakeOpenAIServer("slow", ttft_s=0.3), FakeOpenAIServer("fast", ttft_s=0.02)
+        await self.start_router([slow, fast], max_hedges=0)
+        # new backends are tried first
+        self.assertEqual(await self.run_turn(), "hello from slow")
+        self.assertEqual(await self.run_turn(), "hello from fast")
+        for _ in range(3):
+            self.assertEqual(await self.run_turn(), "hello from fast")
+        self.assertEqual(slow.requests, 1)
+        stats = self.router.router_stats
+        self.assertLess(stats["1:fast"]["ttft_ewma_s"], stats["0:slow"]["ttft_ewma_s"])
+        self.assertIsNotNone(stats["1:fast"]["tps_ewma"])
+
+    async def test_hedge(self):
+        slow, fast = FakeOpenAIServer("slow", ttft_s=0.6), FakeOpenAIServer("fast", ttft_s=0.02)
+        await self.start_router([slow, fast], hedge_min_s=0.1)
+        start = time.monotonic()
+        self.assertEqual(await self.run_turn(), "hello from fast")
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual((slow.requests, fast.requests), (1, 1))
+        stats = self.router.router_stats
+        self.assertEqual(stats["0:slow"]["hedged"], 1)
+        self.assertEqual(stats["1:fast"]["wins"], 1)
+        # the loser's ttft is at least the hedge delay, the next request goes to fast
+        self.assertGreaterEqual(stats["0:slow"]["ttft_ewma_s"], 0.1)
+        self.assertEqual(await self.run_turn(), "hello from fast")
+        await asyncio.sleep(0.6)
+        self.assertEqual(slow.cancelled, 1)
+
+    async def test_hedge_spacing(self):
+        servers = [FakeOpenAIServer(name, ttft_s=0.5) for name in ("a", "b", "c")]
+        await self.start_router(servers, max_hedges=2, hedge_min_s=0.1)
+        self.assertTrue((await self.run_turn()).startswith("hello from"))
+        a, b, c = (server.request_at[0] for server in servers)
+        # one hedge per hedge delay, not all at once
+        self.assertGreaterEqual(b - a, 0.08)
+        self.assertGreaterEqual(c - b, 0.08)
+
+    async def test_hedge_loser_ttft(self):
+        slow, fast = FakeOpenAIServer("slow", ttft_s=0.6), FakeOpenAIServer("fast", ttft_s=0.02)
+        await self.start_router([slow, fast], hedge_min_s=0.1)
+        self.router._stats[1].ttft_ewma_s = 0.5
+        self.assertEqual(await self.run_turn(), "hello from fast")
+        # the cancelled loser only raises its ttft estimate
+        stats = self.router._stats[0]
+        self.assertGreaterEqual(stats.ttft_ewma_s, 0.1)
+        self.assertEqual(stats.ttft.count, 0)
+
+    async def test_failover(self):
+        down, ok = FakeOpenAIServer("down", status=503), FakeOpenAIServer("ok")
+        await self.start_router([down, ok], max_failures=1, unhealthy_cooldown_s=60)
+        self.assertEqual(await self.run_turn(), "hello from ok")
+        stats = self.router.router_stats
+        self.assertEqual(stats["0:down"]["failures"], 1)
+        self.assertFalse(stats["0:down"]["healthy"])
+        # unhealthy backend is skipped
+        self.assertEqual(await self.run_turn(), "hello from ok")
+        self.assertEqual(down.requests, 1)
+
+    async def test_all_down(self):
+        await self.start_router(
+            [FakeOpenAIServer("a", status=503), FakeOpenAIServer("b", status=500)]
+        )
+        with self.assertRaises(Exception):
+            await self.run_turn()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import asyncio
+import unittest
+
+from apipeline.frames.data_frames import Frame, TextFrame
+from apipeline.processors.frame_processor import FrameDirection, FrameProcessor
+
+from src.common.utils.text import normalized_edit_distance
+from src.processors.aggregators.llm_response import LLMUserResponseAggregator
+from src.processors.aggregators.openai_llm_context import OpenAILLMContext
+from src.processors.llm.base import LLMProcessor
+from src.types.frames.control_frames import (
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    UserStartedSpeakingFrame,
+)
+from src.types.frames.data_frames import InterimTranscriptionFrame, LLMSpeculativeMessagesFrame
+
+r"""
+python -m unittest test.processors.llm.test_speculation.TestSpeculation
+python -m unittest test.processors.llm.test_speculation.TestSpeculativeAggregator
+"""
+
+
+class RecordProcessor(FrameProcessor):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.frames: list[Frame] = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        self.frames.append(frame)
+
+
+class EchoLLMProcessor(LLMProcessor):
+    """
+    stream the last user message word by word
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.generations = 0
+
+    async def _process_context(self, context: OpenAILLMContext):
+        self.generations += 1
+        for word in context.get_messages()[-1]["content"].split():
+            await asyncio.sleep(0.05)
+            await self.push_frame(TextFrame(word))
+
+
+class TestSpeculation(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.llm = EchoLLMProcessor()
+        self.llm.set_speculative_args(max_distance=0.1, max_buffer_frames=2)
+        self.record = RecordProcessor()
+        self.llm.link(self.record)
+
+    def texts(self):
+        return [frame.text for frame in self.record.frames if isinstance(frame, TextFrame)]
+
+    async def test_commit(self):
+        await self.llm.start_speculation(
+            "what is the weather", OpenAILLMContext.from_messages([user("what is the weather")])
+        )
+        await asyncio.sleep(0.08)
+        # held until commit
+        self.assertEqual(self.texts(), [])
+
+        await self.llm.process_llm_context(
+            OpenAILLMContext.from_messages([user("What is the weather?")])
+        )
+        self.assertEqual(self.texts(), ["what", "is", "the", "weather"])
+        self.assertIsInstance(self.record.frames[0], LLMFullResponseStartFrame)
+        self.assertIsInstance(self.record.frames[-1], LLMFullResponseEndFrame)
+        self.assertEqual(self.llm.generations, 1)
+        stats = self.llm.speculation_stats
+        self.assertEqual(stats["committed"], 1)
+        self.assertEqual(stats["saved_latency"]["count"], 1)
+
+    async def test_cancel_on_mismatch(self):
+        await self.llm.start_speculation(
+            "what is the", OpenAILLMContext.from_messages([user("what is the")])
+        )
+        await asyncio.sleep(0.12)
+        await self.llm.process_llm_context(
+            OpenAILLMContext.from_messages([user("what is the time in Paris")])
+        )
+        self.assertEqual(self.texts(), ["what", "is", "the", "time", "in", "Paris"])
+        self.assertEqual(self.llm.generations, 2)
+        stats = self.llm.speculation_stats
+        self.assertEqual(stats["cancelled"], 1)
+        self.assertEqual(stats["wasted_tokens"], 2)
+
+    async def test_restart_on_new_interim(self):
+        await self.llm.start_speculation("hello there", OpenAILLMContext.from_messages([user("a")]))
+        await self.llm.start_speculation(
+            "Hello there!", OpenAILLMContext.from_messages([user("b")])
+        )
+        self.assertEqual(self.llm.speculation_stats["started"], 1)
+        await self.llm.start_speculation(
+            "hello there friend", OpenAILLMContext.from_messages([user("c")])
+        )
+        stats = self.llm.speculation_stats
+        self.assertEqual((stats["started"], stats["cancelled"]), (2, 1))
+        await self.llm.cancel_speculation()
+
+    def test_normalized_edit_distance(self):
+        self.assertEqual(normalized_edit_distance("Hello, world!", "hello world"), 0.0)
+        self.assertLess(
+            normalized_edit_distance("what is the weather", "what is the weathers"), 0.1
+        )
+        self.assertGreater(normalized_edit_distance("what is", "what is the time"), 0.1)
+
+
+class TestSpeculativeAggregator(unittest.IsolatedAsyncioTestCase):
+    async def test_stable_interims(self):
+        aggregator = LLMUserResponseAggregator(
+            [{"role": "system", "content": "be brief"}],
+            speculative_args={"stable_interims": 2, "min_words": 3},
+        )
+        record = RecordProcessor()
+        aggregator.link(record)
+
+        await aggregator.process_frame(UserStartedSpeakingFrame(), FrameDirection.DOWNSTREAM)
+        for text in [
+            "what is",
+            "what is the weather",
+            "What is the weather",
+            "what is the weather",
+        ]:
+            await aggregator.process_frame(
+                InterimTranscriptionFrame(text, "user", "", None), FrameDirection.DOWNSTREAM
+            )
+        frames = [f for f in record.frames if isinstance(f, LLMSpeculativeMessagesFrame)]
+        # once per stable text
+        self.assertEqual(len(frames), 1)
+        self.assertEqual(frames[0].text, "What is the weather")
+        self.assertEqual(frames[0].messages[-1], {"role": "user", "content": "What is the weather"})
+        self.assertEqual(len(aggregator.messages), 1)
+
+
+def user(text: str) -> dict:
+    return {"role": "user", "content": text}
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import asyncio
+import unittest
+
+import msgpack
+from apipeline.processors.frame_processor import FrameProcessor
+
+from src.processors.rtvi.rtvi_processor import (
+    RTVIBotStartedSpeakingMessage,
+    RTVIProcessor,
+    RTVIProcessorParams,
+    RTVITranscriptionMessage,
+    RTVITranscriptionMessageData,
+)
+from src.processors.rtvi.rtvi_serializer import (
+    RTVIMessageSerializer,
+    static_message,
+    transcription_message,
+    tts_text_message,
+)
+from src.processors.rtvi.tts_text_processor import RTVITTSTextMessage, RTVITTSTextMessageData
+from src.types.frames.control_frames import BotStartedSpeakingFrame, BotStoppedSpeakingFrame
+from src.types.frames.data_frames import (
+    InterimTranscriptionFrame,
+    TranscriptionFrame,
+    TransportMessageFrame,
+)
+
+r"""
+python -m unittest test.processors.rtvi.test_rtvi_serializer.TestRTVIMessageSerializer
+python -m unittest test.processors.rtvi.test_rtvi_serializer.TestRTVIProcessorBatch
+"""
+
+
+class TestRTVIMessageSerializer(unittest.TestCase):
+    def test_same_as_model_dump(self):
+        model = RTVITranscriptionMessage(
+            data=RTVITranscriptionMessageData(text="hi", user_id="u", timestamp="t", final=False)
+        )
+        self.assertEqual(transcription_message("hi", "u", "t", False), model.model_dump())
+        self.assertEqual(
+            static_message("bot-started-speaking"), RTVIBotStartedSpeakingMessage().model_dump()
+        )
+        self.assertEqual(
+            tts_text_message("hi"),
+            RTVITTSTextMessage(data=RTVITTSTextMessageData(text="hi")).model_dump(),
+        )
+
+    def test_encode(self):
+        serializer = RTVIMessageSerializer()
+        message = transcription_message("你好", "u", "t", True)
+        payload = serializer.encode(message)
+        self.assertIn("你好", payload)
+        self.assertNotIn(" ", payload)
+        self.assertEqual(RTVIMessageSerializer.decode(payload), message)
+
+        # static message encoded once
+        static = static_message("user-started-speaking")
+        self.assertIs(static, static_message("user-started-speaking"))
+        self.assertIs(serializer.encode(static), serializer.encode(static))
+
+        serializer = RTVIMessageSerializer("msgpack")
+        payload = serializer.encode(message)
+        self.assertIsInstance(payload, bytes)
+        self.assertEqual(RTVIMessageSerializer.decode(payload), message)
+        self.assertEqual(RTVIMessageSerializer.decode(payload), msgpack.unpackb(payload))
+        # encoded payload passthrough
+        self.assertIs(serializer.encode(payload), payload)
+
+
+class MessageCollector(FrameProcessor):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    async def process_frame(self, frame, direction):
+        if isinstance(frame, TransportMessageFrame):
+            self.messages.append(frame.message)
+
+
+class TestRTVIProcessorBatch(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.processor = RTVIProcessor()
+        self.collector = MessageCollector()
+        self.processor.link(self.collector)
+
+    async def asyncTearDown(self):
+        self.processor._message_task.cancel()
+        self.processor._push_frame_task.cancel()
+        await asyncio.gather(
+            self.processor._message_task, self.processor._push_frame_task, return_exceptions=True
+        )
+
+    async def push_messages(self):
+        # queued in one tick
+        await self.processor._handle_bot_speaking(BotStartedSpeakingFrame())
+        await self.processor._handle_transcriptions(InterimTranscriptionFrame("h", "u", "t", "en"))
+        await self.processor._handle_transcriptions(TranscriptionFrame("hi", "u", "t"))
+        await self.processor._handle_bot_speaking(BotStoppedSpeakingFrame())
+        await asyncio.sleep(0.01)
+
+    async def test_not_negotiated(self):
+        self.processor._negotiate_serialization({})
+        await self.push_messages()
+        self.assertEqual(len(self.collector.messages), 4)
+        self.assertTrue(all(isinstance(m, dict) for m in self.collector.messages))
+
+    async def test_msgpack_not_binary_transport(self):
+        # e.g.: daily app messages are json objects
+        self.processor._params = RTVIProcessorParams(msgpack_enabled=True)
+        self.processor._negotiate_serialization({"encoding": "msgpack"})
+        await self.push_messages()
+        self.assertTrue(all(isinstance(m, dict) for m in self.collector.messages))
+
+    async def test_batch_msgpack(self):
+        self.processor._params = RTVIProcessorParams(msgpack_enabled=True)
+        self.processor._binary_messages = True
+        self.processor._negotiate_serialization({"batch": True, "encoding": "msgpack"})
+        await self.push_messages()
+        messages = [msgpack.unpackb(m) for m in self.collector.messages]
+        # the final transcription is urgent, sent in order between the batches
+        self.assertEqual(len(messages), 3)
+        self.assertEqual(messages[0]["type"], "batch")
+        self.assertEqual(
+            [m["type"] for m in messages[0]["data"]["messages"]],
+            ["bot-started-speaking", "user-transcription"],
+        )
+        self.assertEqual(messages[1], transcription_message("hi", "u", "t", True))
+        self.assertEqual(messages[2], static_message("bot-stopped-speaking"))
+
+    async def test_batch_disabled_by_server(self):
+        self.processor._params = RTVIProcessorParams(batch_enabled=False, msgpack_enabled=False)
+        self.processor._negotiate_serialization({"batch": True, "encoding": "msgpack"})
+        await self.push_messages()
+        self.assertEqual(len(self.collector.messages), 4)
+        self.assertIsInstance(self.collector.messages[0], dict)
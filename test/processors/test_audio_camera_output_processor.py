@@ -0,0 +1,93 @@
+import asyncio
+import unittest
+
+from apipeline.processors.frame_processor import FrameDirection
+
+from src.common.types import AudioCameraParams
+from src.processors.audio_camera_output_processor import AudioCameraOutputProcessor
+from src.types.frames.control_frames import BotSpeakingFrame, TTSStartedFrame, TTSStoppedFrame
+from src.types.frames.data_frames import AudioRawFrame
+
+r"""
+python -m unittest test.processors.test_audio_camera_output_processor.TestAudioOut
+"""
+
+# 16khz mono 20ms
+CHUNK_SIZE = 640
+
+
+class AudioOutProcessor(AudioCameraOutputProcessor):
+    def __init__(self, params: AudioCameraParams, **kwargs):
+        super().__init__(params, **kwargs)
+        self.writes = []
+        self.upstream_frames = []
+
+    async def write_raw_audio_frames(self, frames: bytes):
+        self.writes.append(frames)
+
+    async def push_frame(self, frame, direction=FrameDirection.DOWNSTREAM):
+        if direction == FrameDirection.UPSTREAM:
+            self.upstream_frames.append(frame)
+
+    async def queue_frame(self, frame, direction=FrameDirection.DOWNSTREAM):
+        await self.push_frame(frame, direction)
+
+
+def tts_audio(num_bytes: int) -> AudioRawFrame:
+    return AudioRawFrame(audio=b"\x01" * num_bytes, sample_rate=16000, num_channels=1)
+
+
+class TestAudioOut(unittest.IsolatedAsyncioTestCase):
+    def new_processor(self, **params) -> AudioOutProcessor:
+        return AudioOutProcessor(
+            AudioCameraParams(audio_out_enabled=True, audio_out_sample_rate=16000, **params)
+        )
+
+    async def test_aligned_writes(self):
+        processor = self.new_processor()
+        await processor.sink_control_frame(TTSStartedFrame())
+        # tts chunks not aligned to 20ms
+        for size in (1000, 1001, 999, 77):
+            await processor._handle_audio(tts_audio(size))
+        self.assertEqual(len(processor.writes), 4)
+        self.assertTrue(all(len(w) == CHUNK_SIZE for w in processor.writes))
+        self.assertEqual(len(processor._audio_out_buff), 3077 - 4 * CHUNK_SIZE)
+
+        await processor.sink_control_frame(TTSStoppedFrame())
+        self.assertEqual(len(processor.writes), 5)
+        # the remainder padded with silence
+        self.assertEqual(processor.writes[-1], b"\x01" * 517 + b"\x00" * 123)
+        self.assertEqual(len(processor._audio_out_buff), 0)
+
+    async def test_bot_speaking_rate_limit(self):
+        processor = self.new_processor(audio_out_bot_speaking_interval_s=0.05)
+        await processor.sink_control_frame(TTSStartedFrame())
+        # 1s tts audio, 50 writes
+        await processor._handle_audio(tts_audio(CHUNK_SIZE * 50))
+        speaking = [f for f in processor.upstream_frames if isinstance(f, BotSpeakingFrame)]
+        self.assertEqual(len(processor.writes), 50)
+        self.assertEqual(len(speaking), 1)
+
+        await asyncio.sleep(0.06)
+        await processor._handle_audio(tts_audio(CHUNK_SIZE))
+        speaking = [f for f in processor.upstream_frames if isinstance(f, BotSpeakingFrame)]
+        self.assertEqual(len(speaking), 2)
+
+    async def test_prebuffer(self):
+        processor = self.new_processor(audio_out_prebuffer_ms=100)
+        await processor.sink_control_frame(TTSStartedFrame())
+        await processor._handle_audio(tts_audio(CHUNK_SIZE * 3))
+        self.assertEqual(processor.writes, [])
+        await processor._handle_audio(tts_audio(CHUNK_SIZE * 2))
+        self.assertEqual(len(processor.writes), 5)
+        # no more buffering until the next speech
+        await processor._handle_audio(tts_audio(CHUNK_SIZE))
+        self.assertEqual(len(processor.writes), 6)
+
+        # short speech under the prebuffer size is written on tts stopped
+        await processor.sink_control_frame(TTSStoppedFrame())
+        await processor.sink_control_frame(TTSStartedFrame())
+        await processor._handle_audio(tts_audio(CHUNK_SIZE))
+        self.assertEqual(len(processor.writes), 6)
+        await processor.sink_control_frame(TTSStoppedFrame())
+        self.assertEqual(len(processor.writes), 7)
@@ -0,0 +1,112 @@
+import unittest
+
+import numpy as np
+
+from src.common.types import AudioVADParams
+from src.modules.speech.vad_analyzer.base import BaseVADAnalyzer
+from src.processors.audio_input_processor import AudioVADInputProcessor
+from src.types.frames.control_frames import (
+    UserLeftFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from src.types.frames.data_frames import UserAudioRawFrame
+
+r"""
+python -m unittest test.processors.test_audio_input_processor.TestParticipantAudioIn
+"""
+
+
+class LoudVADAnalyzer(BaseVADAnalyzer):
+    TAG = "test_loud_vad_analyzer"
+
+    def voice_confidence(self, buffer) -> float:
+        return float(np.abs(np.frombuffer(buffer, dtype=np.int16)).mean() > 1000)
+
+
+def audio_frame(user_id: str, value: int, sample_rate=16000) -> UserAudioRawFrame:
+    # 10ms
+    audio = np.full(sample_rate // 100, value, dtype=np.int16).tobytes()
+    return UserAudioRawFrame(audio=audio, sample_rate=sample_rate, num_channels=1, user_id=user_id)
+
+
+class TestParticipantAudioIn(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.vad_analyzer = LoudVADAnalyzer(
+            sample_rate=16000, start_secs=0.02, stop_secs=0.02, min_volume=0
+        )
+        self.frames = []
+        self.interruptions = []
+
+    def new_processor(self, **params) -> AudioVADInputProcessor:
+        processor = AudioVADInputProcessor(
+            AudioVADParams(
+                audio_in_enabled=True,
+                audio_in_sample_rate=16000,
+                vad_enabled=True,
+                vad_audio_passthrough=True,
+                vad_analyzer=self.vad_analyzer,
+                **params,
+            )
+        )
+
+        async def queue_frame(frame, *args):
+            self.frames.append(frame)
+
+        async def handle_interruptions(frame, push_frame):
+            self.interruptions.append(frame)
+            await queue_frame(frame)
+
+        processor.queue_frame = queue_frame
+        processor._handle_interruptions = handle_interruptions
+        return processor
+
+    async def test_demux(self):
+        processor = self.new_processor(audio_in_demux_enabled=True)
+        for _ in range(4):
+            await processor._handle_participant_audio(audio_frame("a", 8000, 48000))
+            await processor._handle_participant_audio(audio_frame("b", 0))
+
+        # own resampler and vad analyzer per participant
+        a, b = processor._participants["a"], processor._participants["b"]
+        self.assertIsNot(a["vad_analyzer"], b["vad_analyzer"])
+        self.assertIsNot(a["vad_analyzer"], self.vad_analyzer)
+        self.assertEqual(a["resampler"].in_rate, 48000)
+        self.assertTrue(b["resampler"].passthrough)
+        audio_frames = [f for f in self.frames if isinstance(f, UserAudioRawFrame)]
+        self.assertTrue(all(f.sample_rate == 16000 for f in audio_frames))
+        self.assertEqual({f.user_id for f in audio_frames}, {"a", "b"})
+
+        started = [f for f in self.frames if isinstance(f, UserStartedSpeakingFrame)]
+        self.assertEqual([f.user_id for f in started], ["a"])
+
+        # b speaks while a is speaking: no second interruption
+        for _ in range(3):
+            await processor._handle_participant_audio(audio_frame("b", 8000))
+        for _ in range(3):
+            await processor._handle_participant_audio(audio_frame("a", 0, 48000))
+        self.assertEqual(len(self.interruptions), 1)
+        stopped = [f for f in self.frames if isinstance(f, UserStoppedSpeakingFrame)]
+        self.assertEqual([f.user_id for f in stopped], ["a"])
+
+        # the last speaking participant left, stop interruption
+        await processor.remove_participant_audio("b")
+        self.assertNotIn("b", processor._participants)
+        self.assertIsInstance(self.interruptions[-1], UserStoppedSpeakingFrame)
+        self.assertEqual(self.interruptions[-1].user_id, "b")
+        self.assertIsInstance(self.frames[-1], UserLeftFrame)
+        self.assertEqual(self.frames[-1].user_id, "b")
+
+    async def test_mix(self):
+        processor = self.new_processor(audio_in_mix_enabled=True)
+        frame = await processor._mix_participant_audio(audio_frame("a", 100, 48000))
+        self.assertEqual(frame.sample_rate, 16000)
+        self.assertEqual(len(frame.audio), 160 * 2)
+        # wait for the aligned frame of "a"
+        self.assertIsNone(await processor._mix_participant_audio(audio_frame("b", 20)))
+        frame = await processor._mix_participant_audio(audio_frame("a", 100, 48000))
+        mixed = np.frombuffer(frame.audio, dtype=np.int16)
+        self.assertEqual(len(mixed), 160)
+        self.assertTrue(np.all(np.abs(mixed.astype(int) - 120) <= 1))
+        # the shared vad analyzer on the mixed stream
+        self.assertIsNone(processor._participants["a"]["vad_analyzer"])
@@ -0,0 +1,79 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from src.processors.video_frame_gate_processor import VideoFrameGateProcessor
+from src.types.frames.data_frames import UserImageRawFrame
+
+r"""
+python -m unittest test.processors.test_video_frame_gate_processor.TestVideoFrameGateProcessor
+"""
+
+
+def image_frame(user_id: str, value: int, width=640, height=480) -> UserImageRawFrame:
+    rng = np.random.default_rng(value)
+    pixels = np.full((height, width, 3), value, dtype=np.uint8)
+    # small sensor noise
+    pixels += rng.integers(0, 3, pixels.shape, dtype=np.uint8)
+    return UserImageRawFrame(
+        image=pixels.tobytes(), size=(width, height), format=None, mode="RGB", user_id=user_id
+    )
+
+
+class TestVideoFrameGateProcessor(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.now = 100.0
+        patcher = mock.patch(
+            "src.processors.video_frame_gate_processor.time.monotonic", lambda: self.now
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.gate = VideoFrameGateProcessor(
+            gate_args={"target_fps": 2.0, "diff_threshold": 3.0, "max_interval_s": 5.0}
+        )
+
+    def test_rate_limit(self):
+        self.assertTrue(self.gate.gate(image_frame("a", 10)))
+        # 30fps camera
+        for i in range(14):
+            self.now += 1 / 30
+            self.assertFalse(self.gate.gate(image_frame("a", 100 + i)))
+        self.now += 0.05
+        self.assertTrue(self.gate.gate(image_frame("a", 200)))
+        self.assertEqual(
+            self.gate.stats["a"], {"forwarded": 2, "dropped_rate": 14, "dropped_unchanged": 0}
+        )
+
+    def test_change_detect(self):
+        self.assertTrue(self.gate.gate(image_frame("a", 10)))
+        # same scene, only noise
+        self.now += 1.0
+        self.assertFalse(self.gate.gate(image_frame("a", 11)))
+        self.now += 1.0
+        self.assertTrue(self.gate.gate(image_frame("a", 60)))
+        # unchanged, but no frame forwarded for max_interval_s
+        self.now += 5.0
+        self.assertTrue(self.gate.gate(image_frame("a", 60)))
+        self.assertEqual(
+            self.gate.stats["a"], {"forwarded": 3, "dropped_rate": 0, "dropped_unchanged": 1}
+        )
+
+    def test_per_participant(self):
+        self.assertTrue(self.gate.gate(image_frame("a", 10)))
+        self.assertTrue(self.gate.gate(image_frame("b", 10)))
+        self.now += 0.1
+        self.assertFalse(self.gate.gate(image_frame("a", 10)))
+        self.now += 1.0
+        self.assertFalse(self.gate.gate(image_frame("b", 10)))
+        self.assertEqual(self.gate.stats["a"]["dropped_rate"], 1)
+        self.assertEqual(self.gate.stats["b"]["dropped_unchanged"], 1)
+
+    def test_thumbnail(self):
+        thumb = self.gate.luma_thumbnail(image_frame("a", 10, 1280, 720))
+        self.assertEqual(thumb.shape, (33, 32))
+        # unknown layout, only rate limited
+        frame = UserImageRawFrame(
+            image=b"\x00" * 10, size=(4, 4), format="JPEG", mode="RGB", user_id="a"
+        )
+        self.assertIsNone(self.gate.luma_thumbnail(frame))
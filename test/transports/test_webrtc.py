@@ -0,0 +1,218 @@
+import asyncio
+import time
+import unittest
+
+import msgpack
+import numpy as np
+from apipeline.frames.control_frames import EndFrame
+from apipeline.pipeline.pipeline import Pipeline
+from apipeline.pipeline.runner import PipelineRunner
+from apipeline.pipeline.task import PipelineTask
+
+from src.processors.rtvi.rtvi_processor import RTVIProcessor, RTVIProcessorParams
+from src.services.webrtc_client import WebRTCTransportClient
+from src.transports.webrtc import WebRTCTransport
+from src.types.frames.data_frames import TranscriptionFrame, TransportMessageFrame
+from src.types.network.webrtc import WebRTCCallbacks, WebRTCParams
+
+r"""
+pip install achatbot[webrtc]
+python -m unittest test.transports.test_webrtc.TestWebRTCPeers
+python -m unittest test.transports.test_webrtc.TestWebRTCTransport
+"""
+
+# the websocket(pcm) audio out: paced 200ms ahead, sent in 200ms frames
+WEBSOCKET_AUDIO_OUT_LATENCY_S = 0.2
+
+
+def tone(sample_rate: int = 16000, duration_s: float = 1.0) -> bytes:
+    t = np.arange(int(sample_rate * duration_s)) / sample_rate
+    return (8000 * np.sin(2 * np.pi * 440 * t)).astype(np.int16).tobytes()
+
+
+async def wait_for(predicate, timeout_s: float = 5.0):
+    deadline = time.monotonic() + timeout_s
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise TimeoutError
+        await asyncio.sleep(0.01)
+
+
+async def read_voice(client: WebRTCTransportClient) -> tuple[float, bytes]:
+    while True:
+        frame = await client.read_next_audio_frame()
+        if frame is None:
+            raise EOFError
+        if np.abs(np.frombuffer(frame.audio, dtype=np.int16)).mean() > 1000:
+            return time.monotonic(), frame.audio
+
+
+class TestWebRTCPeers(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.messages = {"bot": [], "user": []}
+        self.connected = []
+        self.bot = WebRTCTransportClient()
+        self.user = WebRTCTransportClient()
+        for name, client in (("bot", self.bot), ("user", self.user)):
+            client.setup(self.callbacks(name))
+
+        # local sdp offer/answer, host candidates only
+        offer = await self.user.offer()
+        self.assertNotIn("typ srflx", offer.sdp)
+        self.assertIn("opus/48000", offer.sdp)
+        await self.user.set_answer(await self.bot.answer(offer))
+        await wait_for(lambda: len(self.connected) == 2)
+
+    async def asyncTearDown(self):
+        await self.user.close()
+        await self.bot.close()
+
+    def callbacks(self, name: str) -> WebRTCCallbacks:
+        async def on_connected(peer_id):
+            self.connected.append(peer_id)
+
+        async def on_disconnected(peer_id):
+            pass
+
+        async def on_data(message):
+            self.messages[name].append(message)
+
+        return WebRTCCallbacks(
+            on_client_connected=on_connected,
+            on_client_disconnected=on_disconnected,
+            on_data_received=on_data,
+        )
+
+    async def test_audio_latency(self):
+        # the remote jitter buffer runs on the silence
+        for _ in range(10):
+            await self.user.read_next_audio_frame()
+        reader = asyncio.create_task(read_voice(self.user))
+        await asyncio.sleep(0.1)
+
+        start = time.monotonic()
+        await self.bot.write_raw_audio_frames(tone(24000), 24000)
+        received, audio = await asyncio.wait_for(reader, 5)
+        latency = received - start
+        print(f"webrtc audio latency: {latency * 1000:.1f}ms")
+        self.assertLess(latency, WEBSOCKET_AUDIO_OUT_LATENCY_S)
+        # opus decoded, resampled to the audio in rate: 16k hz mono 20ms
+        self.assertEqual(len(audio), 640)
+
+        # the other direction
+        reader = asyncio.create_task(read_voice(self.bot))
+        await self.user.write_raw_audio_frames(tone(), 16000)
+        await asyncio.wait_for(reader, 5)
+
+    async def test_clear_audio_out(self):
+        await self.bot.write_raw_audio_frames(tone(), 16000)
+        self.assertAlmostEqual(self.bot.audio_out_buffered_s, 1.0, delta=0.05)
+        self.bot.clear_audio_out()
+        self.assertEqual(self.bot.audio_out_buffered_s, 0)
+
+    async def test_data_channel(self):
+        await wait_for(lambda: self.bot._data_channel is not None)
+        await wait_for(lambda: self.bot._data_channel.readyState == "open")
+        await self.user.send_message('{"type": "client-ready"}')
+        await self.bot.send_message('{"type": "bot-ready"}')
+        await wait_for(lambda: self.messages["bot"] and self.messages["user"])
+        self.assertEqual(self.messages["bot"], ['{"type": "client-ready"}'])
+        self.assertEqual(self.messages["user"], ['{"type": "bot-ready"}'])
+
+
+class TestWebRTCTransport(unittest.IsolatedAsyncioTestCase):
+    async def test_transport(self):
+        bot = WebRTCTransportClient()
+        user = WebRTCTransportClient()
+        transport = WebRTCTransport(
+            bot, WebRTCParams(audio_in_enabled=True, audio_out_enabled=True)
+        )
+        connected = []
+        transport.add_event_handler(
+            "on_client_connected", lambda transport, peer_id: connected.append(peer_id)
+        )
+        frames = []
+
+        async def queue_frame(frame, *args):
+            frames.append(frame)
+
+        transport.input_processor().queue_frame = queue_frame
+
+        user.setup(
+            WebRTCCallbacks(
+                on_client_connected=lambda peer_id: asyncio.sleep(0),
+                on_client_disconnected=lambda peer_id: asyncio.sleep(0),
+                on_data_received=lambda message: asyncio.sleep(0),
+            )
+        )
+        await user.set_answer(await bot.answer(await user.offer()))
+        try:
+            await wait_for(lambda: connected == [bot.peer_id])
+            for peer in (bot, user):
+                await wait_for(
+                    lambda: peer._data_channel and peer._data_channel.readyState == "open"
+                )
+
+            # rtvi message in the data channel
+            await user.send_message('{"label": "rtvi-ai", "type": "client-ready"}')
+            await wait_for(lambda: frames)
+            self.assertIsInstance(frames[0], TransportMessageFrame)
+            self.assertEqual(frames[0].message["type"], "client-ready")
+
+            # audio out written to the peer in real time, lead_s ahead
+            output = transport.output_processor()
+            start = time.monotonic()
+            for i in range(0, 16000 * 2, 640):
+                await output.write_raw_audio_frames(tone(duration_s=0.02))
+            self.assertGreater(time.monotonic() - start, 1 - 0.1 - output._params.audio_out_lead_s)
+            self.assertLessEqual(bot.audio_out_buffered_s, output._params.audio_out_lead_s + 0.02)
+        finally:
+            await user.close()
+            await bot.close()
+
+    async def test_rtvi_msgpack(self):
+        bot = WebRTCTransportClient()
+        user = WebRTCTransportClient()
+        transport = WebRTCTransport(bot, WebRTCParams())
+        rtvi = RTVIProcessor(transport=transport, params=RTVIProcessorParams(msgpack_enabled=True))
+        task = PipelineTask(
+            Pipeline([transport.input_processor(), rtvi, transport.output_processor()])
+        )
+        runner = asyncio.create_task(PipelineRunner(handle_sigint=False).run(task))
+
+        messages = []
+
+        async def on_data(message):
+            messages.append(message)
+
+        user.setup(
+            WebRTCCallbacks(
+                on_client_connected=lambda peer_id: asyncio.sleep(0),
+                on_client_disconnected=lambda peer_id: asyncio.sleep(0),
+                on_data_received=on_data,
+            )
+        )
+        await user.set_answer(await bot.answer(await user.offer()))
+        try:
+            for peer in (bot, user):
+                await wait_for(
+                    lambda: peer._data_channel and peer._data_channel.readyState == "open"
+                )
+            # the client asks for msgpack in the client-ready message (json text)
+            await user.send_message(
+                '{"label": "rtvi-ai", "type": "client-ready", "id": "1",'
+                ' "data": {"encoding": "msgpack"}}'
+            )
+            await wait_for(lambda: messages)
+            self.assertIsInstance(messages[0], bytes)
+            self.assertEqual(msgpack.unpackb(messages[0])["type"], "bot-ready")
+
+            await task.queue_frame(TranscriptionFrame("hi", "u", "t"))
+            await wait_for(lambda: len(messages) == 2)
+            self.assertIsInstance(messages[1], bytes)
+            self.assertEqual(msgpack.unpackb(messages[1])["data"]["text"], "hi")
+        finally:
+            await task.queue_frame(EndFrame())
+            await asyncio.wait_for(runner, 5)
+            await user.close()
+            await bot.close()